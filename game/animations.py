@@ -1,4 +1,5 @@
 import pygame
+from game.game_clock import get_ticks
 
 class FadeOutAnimation:
     def __init__(self, duration_ms=500):
@@ -9,7 +10,7 @@ class FadeOutAnimation:
 
     def start(self):
         """Démarre l'animation"""
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = get_ticks()
         self.is_finished = False
         self.alpha = 255
 
@@ -18,7 +19,7 @@ class FadeOutAnimation:
         if not self.start_time or self.is_finished:
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         elapsed = current_time - self.start_time
 
         if elapsed >= self.duration_ms:
@@ -0,0 +1,156 @@
+"""
+Sauvegarde automatique de la partie sans bloquer la boucle de jeu.
+
+Le thread du jeu ne fait que figer l'état (SaveData.capture : une copie de quelques
+valeurs simples, quelques microsecondes). L'encodage binaire et l'écriture du fichier se
+font sur un thread de fond. Si plusieurs demandes arrivent avant l'écriture, seule la
+plus récente est écrite.
+
+Déclencheurs :
+- périodique (tick, appelé à chaque image par la scène de jeu) ;
+- événements : progression d'une quête, victoire d'un combat, touche F5.
+
+Une nouvelle partie ne prend qu'un emplacement vide : si tous sont occupés, les
+sauvegardes périodiques et d'événement sont ignorées. Seule la touche F5 (demande
+explicite) remplace alors la sauvegarde la plus ancienne.
+"""
+
+import threading
+from typing import Optional
+
+from game.game_clock import get_ticks
+from game.save_game import SaveData, SaveError
+
+# Délai entre deux sauvegardes périodiques (temps de jeu) : au plus quelques secondes
+# de progression perdues en cas de plantage
+AUTOSAVE_INTERVAL_MS = 10000
+
+
+class AutoSaver:
+    """Sauvegardes de la partie écrites par un thread de fond"""
+
+    def __init__(self, slots, interval_ms: int = AUTOSAVE_INTERVAL_MS):
+        """
+        Args:
+            slots (SaveSlots): Emplacements de sauvegarde
+            interval_ms (int): Délai entre deux sauvegardes périodiques, 0 pour les désactiver
+        """
+        self.slots = slots
+        self.interval_ms = interval_ms
+        self.requests = 0
+        self.coalesced = 0
+        self.saves_written = 0
+        self.skipped = 0
+        self.last_reason = None
+        self._last_request_ms = None
+        self._pending = None
+        self._writing = False
+        self._stop = False
+        self._condition = threading.Condition()
+        # Thread démarré à la première demande
+        self._thread = None
+
+    def request(self, game_state, reason: str = "auto", overwrite: bool = False) -> bool:
+        """
+        Demande une sauvegarde de la partie en cours (appelé par le thread du jeu)
+
+        Args:
+            game_state (GameState): État du jeu à sauvegarder
+            reason (str): Origine de la demande (affichée dans les traces)
+            overwrite (bool): Demande explicite : sans emplacement vide, la sauvegarde
+                la plus ancienne est remplacée
+
+        Returns:
+            bool: True si la sauvegarde est en file
+        """
+        if game_state.player is None:
+            return False
+        snapshot = SaveData.capture(game_state)
+        with self._condition:
+            if self._stop:
+                return False
+            if self._pending is not None:
+                self.coalesced += 1
+                # Une demande explicite remplacée par une demande automatique reste explicite
+                overwrite = overwrite or self._pending[3]
+            self._pending = (game_state, snapshot, reason, overwrite)
+            self.requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        self._last_request_ms = get_ticks()
+        return True
+
+    def tick(self, game_state):
+        """Sauvegarde périodique : à appeler à chaque image"""
+        if not self.interval_ms or game_state.player is None:
+            return
+        now = get_ticks()
+        if self._last_request_ms is None:
+            self._last_request_ms = now
+        elif now - self._last_request_ms >= self.interval_ms:
+            self.request(game_state, "périodique")
+
+    def has_pending(self) -> bool:
+        """Vrai si une sauvegarde n'est pas encore écrite"""
+        with self._condition:
+            return self._pending is not None or self._writing
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend l'écriture de la dernière sauvegarde demandée
+
+        Returns:
+            bool: False si le délai a expiré
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def _run(self):
+        """Boucle du thread d'écriture"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._stop)
+                if self._pending is None:
+                    return
+                game_state, snapshot, reason, overwrite = self._pending
+                self._pending = None
+                self._writing = True
+            try:
+                self._write(game_state, snapshot, reason, overwrite)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, game_state, snapshot, reason, overwrite=False):
+        """Choisit l'emplacement de la partie puis écrit la sauvegarde"""
+        try:
+            # Une nouvelle partie prend un emplacement à sa première sauvegarde ; les
+            # écritures étant faites une à une, les suivantes retrouvent le même
+            slot = game_state.save_slot or self.slots.first_free()
+            if slot is None:
+                if not overwrite:
+                    self.skipped += 1
+                    print(f"Sauvegarde {reason} ignorée : aucun emplacement libre (F5 pour remplacer la plus ancienne)")
+                    return
+                slot = self.slots.oldest()
+            game_state.save_slot = slot
+            size = self.slots.write(slot, snapshot)
+            self.saves_written += 1
+            self.last_reason = reason
+            print(f"Sauvegarde {reason} dans l'emplacement {slot} ({size} octets)")
+        except (OSError, SaveError, ValueError) as e:
+            print(f"Erreur lors de la sauvegarde automatique : {e}")
+
+    def close(self):
+        """Écrit la sauvegarde en attente puis arrête le thread"""
+        with self._condition:
+            if self._stop:
+                return
+            self._stop = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
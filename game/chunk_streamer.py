@@ -0,0 +1,564 @@
+"""
+Chargement en continu (streaming) des très grandes cartes Tiled.
+
+Une carte est découpée hors jeu en chunks de taille fixe, rangés dans un fichier de
+chunks indexé :
+
+- un en-tête (signature, version, taille des métadonnées) ;
+- des métadonnées JSON : dimensions, calques, propriétés des tuiles, dépendances ;
+- l'atlas des tuiles utilisées, en pixels RGBA bruts (voir map_cache) ;
+- une table d'index (position, taille) par chunk ;
+- les chunks : les gids de chaque calque puis les drapeaux de collision.
+
+En jeu, ChunkStreamer ne garde en mémoire que les chunks proches du joueur : ceux du
+rayon demandé sont chargés immédiatement, ceux qui se trouvent devant lui dans sa
+direction de déplacement sont préchargés par un thread de fond, et les plus anciens
+sont évincés (LRU). La mémoire et le temps de chargement ne dépendent donc plus de la
+taille de la carte, seulement du rayon.
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+
+import pygame
+
+from game import map_cache
+from game.collision_grid import CollisionGrid
+
+# Signature et version du format de fichier de chunks
+CHUNK_MAGIC = b"PSCK"
+CHUNK_VERSION = 1
+
+# En-tête : signature, version, taille des métadonnées JSON
+_HEADER = struct.Struct("<4sHI")
+
+# Vecteurs de déplacement associés aux directions du joueur
+DIRECTION_VECTORS = {
+    "up": (0, -1),
+    "down": (0, 1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+
+
+def get_chunk_pack_path(tmx_path, chunk_size):
+    """Retourne le chemin du fichier de chunks associé à une carte"""
+    cache_path = map_cache.get_cache_path(tmx_path)
+    return f"{os.path.splitext(cache_path)[0]}_{chunk_size}.mapk"
+
+
+class StreamedLayer:
+    """Description d'un calque dont les tuiles sont réparties dans les chunks"""
+
+    def __init__(self, name, visible=True):
+        self.name = name
+        self.visible = visible
+
+
+class MapChunk:
+    """Bloc de chunk_size x chunk_size tuiles chargé en mémoire"""
+
+    def __init__(self, cx, cy, x, y, width, height, layers, cells):
+        """
+        Args:
+            cx (int): Colonne du chunk
+            cy (int): Ligne du chunk
+            x (int): Première colonne de tuiles couverte
+            y (int): Première ligne de tuiles couverte
+            width (int): Largeur en tuiles (plus petite au bord de la carte)
+            height (int): Hauteur en tuiles
+            layers (list): Un array('I') de gids par calque ([] si le chunk est vide)
+            cells (bytearray): Drapeaux de collision (voir CollisionGrid)
+        """
+        self.cx = cx
+        self.cy = cy
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.layers = layers
+        self.cells = cells
+
+    def get_gid(self, layer_index, local_x, local_y):
+        """Retourne le gid d'une tuile du chunk (0 si vide)"""
+        if not self.layers:
+            return 0
+        return self.layers[layer_index][local_y * self.width + local_x]
+
+
+def write_chunk_pack(tmx_data, tmx_path, chunk_size, pack_path=None):
+    """
+    Découpe une carte déjà chargée en fichier de chunks
+
+    Args:
+        tmx_data: Carte chargée par pytmx (ou CompiledMap)
+        tmx_path (str): Chemin du fichier .tmx source
+        chunk_size (int): Taille d'un chunk en tuiles
+        pack_path (str): Fichier à écrire (par défaut dans .map_cache/)
+
+    Returns:
+        str: Chemin du fichier de chunks écrit
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Taille de chunk invalide : {chunk_size}")
+    pack_path = pack_path or get_chunk_pack_path(tmx_path, chunk_size)
+    width, height = tmx_data.width, tmx_data.height
+    chunks_x = (width + chunk_size - 1) // chunk_size
+    chunks_y = (height + chunk_size - 1) // chunk_size
+
+    tile_layers = [layer for layer in tmx_data.layers if hasattr(layer, 'data')]
+    grid = CollisionGrid.from_tiled_map(tmx_data)
+
+    used_gids = set()
+    records = []
+    for cy in range(chunks_y):
+        start_y = cy * chunk_size
+        end_y = min(height, start_y + chunk_size)
+        for cx in range(chunks_x):
+            start_x = cx * chunk_size
+            end_x = min(width, start_x + chunk_size)
+            layer_blobs = []
+            is_empty = True
+            for layer in tile_layers:
+                data = array('I')
+                for y in range(start_y, end_y):
+                    data.extend(layer.data[y][start_x:end_x])
+                if any(data):
+                    is_empty = False
+                    used_gids.update(data)
+                layer_blobs.append(data.tobytes())
+            cells = b"".join(
+                bytes(grid.cells[y * width + start_x:y * width + end_x]) for y in range(start_y, end_y)
+            )
+            # Un chunk sans tuile ni collision n'occupe aucune place dans le fichier
+            if is_empty and not any(cells):
+                records.append(b"")
+            elif is_empty:
+                records.append(cells)
+            else:
+                records.append(b"".join(layer_blobs) + cells)
+    used_gids.discard(0)
+
+    atlas_blob, atlas_meta = map_cache.build_atlas(tmx_data, used_gids)
+    meta = {
+        'dependencies': map_cache.fingerprint(map_cache.find_dependencies(tmx_path)),
+        'width': width,
+        'height': height,
+        'tilewidth': tmx_data.tilewidth,
+        'tileheight': tmx_data.tileheight,
+        'chunk_size': chunk_size,
+        'layers': [
+            {'name': layer.name, 'visible': bool(getattr(layer, 'visible', True))}
+            for layer in tile_layers
+        ],
+        'tilesets': map_cache.tilesets_meta(tmx_data),
+        'properties': map_cache.build_properties(tmx_data, used_gids),
+        'atlas': atlas_meta,
+        'atlas_blob_size': len(atlas_blob),
+    }
+    meta_blob = json.dumps(meta, separators=(',', ':')).encode("utf-8")
+
+    # Index (position, taille) de chaque chunk, positions absolues dans le fichier
+    index = array('Q')
+    offset = _HEADER.size + len(meta_blob) + len(atlas_blob) + 8 * 2 * len(records)
+    for record in records:
+        index.extend((offset, len(record)))
+        offset += len(record)
+
+    # Écriture atomique pour ne jamais laisser un fichier tronqué
+    os.makedirs(os.path.dirname(pack_path), exist_ok=True)
+    tmp_path = pack_path + ".tmp"
+    with open(tmp_path, "wb") as pack_file:
+        pack_file.write(_HEADER.pack(CHUNK_MAGIC, CHUNK_VERSION, len(meta_blob)))
+        pack_file.write(meta_blob)
+        pack_file.write(atlas_blob)
+        pack_file.write(index.tobytes())
+        for record in records:
+            pack_file.write(record)
+    os.replace(tmp_path, pack_path)
+    return pack_path
+
+
+def open_chunk_pack(tmx_path, chunk_size, pack_path=None, **options):
+    """
+    Ouvre le fichier de chunks d'une carte s'il est à jour
+
+    Args:
+        tmx_path (str): Chemin du fichier .tmx source
+        chunk_size (int): Taille d'un chunk en tuiles
+        pack_path (str): Fichier à lire (par défaut dans .map_cache/)
+        **options: Options transmises à ChunkStreamer (radius, max_chunks, ...)
+
+    Returns:
+        ChunkStreamer: Le streamer, ou None si le fichier est absent, périmé ou invalide
+    """
+    pack_path = pack_path or get_chunk_pack_path(tmx_path, chunk_size)
+    if not os.path.exists(pack_path):
+        return None
+    try:
+        streamer = ChunkStreamer(pack_path, **options)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Fichier de chunks illisible ({pack_path}) : {e}")
+        return None
+    if not map_cache.is_fresh(streamer.dependencies):
+        streamer.close()
+        return None
+    return streamer
+
+
+class ChunkStreamer:
+    """
+    Gestionnaire des chunks chargés autour du joueur.
+
+    Expose aussi les requêtes de collision de CollisionGrid (get, is_blocked, is_tree,
+    any_in_region...) : une case d'un chunk absent est lue à la demande.
+    """
+
+    def __init__(self, pack_path, radius=2, prefetch_distance=2, max_chunks=None, prefetch=True):
+        """
+        Args:
+            pack_path (str): Fichier de chunks écrit par write_chunk_pack
+            radius (int): Rayon (en chunks) chargé autour du joueur
+            prefetch_distance (int): Profondeur (en chunks) préchargée devant le joueur
+            max_chunks (int): Nombre maximal de chunks gardés en mémoire
+            prefetch (bool): Démarre le thread de préchargement
+        """
+        if radius < 0 or prefetch_distance < 0:
+            raise ValueError("Le rayon et la distance de préchargement doivent être positifs")
+        self.radius = radius
+        self.prefetch_distance = prefetch_distance
+        required = (2 * radius + 1) ** 2
+        if max_chunks is None:
+            max_chunks = (2 * (radius + prefetch_distance) + 1) ** 2
+        if max_chunks < required:
+            raise ValueError(f"max_chunks doit être au moins {required} pour un rayon de {radius}")
+        self.max_chunks = max_chunks
+
+        self._file = open(pack_path, "rb")
+        try:
+            magic, version, meta_size = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != CHUNK_MAGIC or version != CHUNK_VERSION:
+                raise ValueError("signature ou version inconnue")
+            meta = json.loads(self._file.read(meta_size).decode("utf-8"))
+            atlas_blob = self._file.read(meta['atlas_blob_size'])
+            self.width = meta['width']
+            self.height = meta['height']
+            self.tilewidth = meta['tilewidth']
+            self.tileheight = meta['tileheight']
+            self.chunk_size = meta['chunk_size']
+            self.layers = [StreamedLayer(layer['name'], layer['visible']) for layer in meta['layers']]
+            self.tilesets = [
+                map_cache.CompiledTileset(t['name'], t['source'], t['firstgid']) for t in meta['tilesets']
+            ]
+            self.dependencies = meta['dependencies']
+            self.chunks_x = (self.width + self.chunk_size - 1) // self.chunk_size
+            self.chunks_y = (self.height + self.chunk_size - 1) // self.chunk_size
+            self._index = array('Q')
+            self._index.frombytes(self._file.read(8 * 2 * self.chunks_x * self.chunks_y))
+            if len(self._index) != 2 * self.chunks_x * self.chunks_y:
+                raise ValueError("index des chunks tronqué")
+        except Exception:
+            self._file.close()
+            raise
+        self.tile_images = map_cache.load_atlas(atlas_blob, meta['atlas'], self.tilewidth, self.tileheight)
+        self.tile_properties = {int(gid): props for gid, props in meta['properties'].items()}
+
+        # Chunks en mémoire, du moins récemment utilisé au plus récent
+        self._chunks = OrderedDict()
+        # Incrémenté à chaque chunk chargé ou évincé (cases connues de la recherche de chemin)
+        self.version = 0
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._center = None
+        # Appelé avec (cx, cy) quand un chunk est évincé
+        self.on_evict = None
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._thread = None
+        if prefetch:
+            self._thread = threading.Thread(target=self._prefetch_worker, name="chunk-prefetch", daemon=True)
+            self._thread.start()
+
+    def get_tile_image_by_gid(self, gid):
+        """Retourne l'image d'une tuile, ou None"""
+        return self.tile_images.get(gid)
+
+    def get_tile_properties_by_gid(self, gid):
+        """Retourne les propriétés d'une tuile, ou None"""
+        return self.tile_properties.get(gid)
+
+    @property
+    def loaded_chunks(self):
+        """Positions (cx, cy) des chunks actuellement en mémoire"""
+        with self._lock:
+            return list(self._chunks.keys())
+
+    def _read_chunk(self, cx, cy):
+        """Lit un chunk depuis le fichier"""
+        start_x = cx * self.chunk_size
+        start_y = cy * self.chunk_size
+        width = min(self.width, start_x + self.chunk_size) - start_x
+        height = min(self.height, start_y + self.chunk_size) - start_y
+        area = width * height
+
+        index = 2 * (cy * self.chunks_x + cx)
+        offset, size = self._index[index], self._index[index + 1]
+        record = b""
+        if size:
+            with self._file_lock:
+                self._file.seek(offset)
+                record = self._file.read(size)
+
+        layers = []
+        if size > area:
+            data = array('I')
+            data.frombytes(record[:-area])
+            layers = [data[i * area:(i + 1) * area] for i in range(len(self.layers))]
+        cells = bytearray(record[-area:]) if size else bytearray(area)
+        return MapChunk(cx, cy, start_x, start_y, width, height, layers, cells)
+
+    def get_chunk(self, cx, cy):
+        """
+        Retourne un chunk, chargé immédiatement s'il n'est pas en mémoire
+
+        Returns:
+            MapChunk: Le chunk, ou None hors de la carte
+        """
+        if not (0 <= cx < self.chunks_x and 0 <= cy < self.chunks_y):
+            return None
+        key = (cx, cy)
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+                return chunk
+        chunk = self._read_chunk(cx, cy)
+        with self._lock:
+            # Le thread de préchargement a pu le charger entre-temps
+            if key in self._chunks:
+                chunk = self._chunks[key]
+            else:
+                self._chunks[key] = chunk
+                self.version += 1
+            self._chunks.move_to_end(key)
+        return chunk
+
+    def update(self, grid_x, grid_y, direction=None):
+        """
+        Charge les chunks autour du joueur et précharge ceux vers lesquels il se dirige
+
+        Args:
+            grid_x (int): Position X du joueur en tuiles
+            grid_y (int): Position Y du joueur en tuiles
+            direction: Direction du joueur ("up", "down", "left", "right") ou vecteur (dx, dy)
+        """
+        center_cx = int(grid_x) // self.chunk_size
+        center_cy = int(grid_y) // self.chunk_size
+        self._center = (center_cx, center_cy)
+
+        # Chunks du rayon : chargés maintenant et marqués comme récemment utilisés
+        for cy in range(center_cy - self.radius, center_cy + self.radius + 1):
+            for cx in range(center_cx - self.radius, center_cx + self.radius + 1):
+                self.get_chunk(cx, cy)
+
+        if self._thread is not None:
+            for key in self._prefetch_targets(center_cx, center_cy, direction):
+                self.request_prefetch(*key)
+
+        self._evict()
+
+    def _prefetch_targets(self, center_cx, center_cy, direction):
+        """Chunks situés juste au-delà du rayon, dans la direction du déplacement"""
+        if isinstance(direction, str):
+            direction = DIRECTION_VECTORS.get(direction)
+        if not direction:
+            return []
+        dx = (direction[0] > 0) - (direction[0] < 0)
+        dy = (direction[1] > 0) - (direction[1] < 0)
+        targets = []
+        for distance in range(self.radius + 1, self.radius + self.prefetch_distance + 1):
+            for side in range(-self.radius, self.radius + 1):
+                if dx:
+                    targets.append((center_cx + dx * distance, center_cy + side))
+                if dy:
+                    targets.append((center_cx + side, center_cy + dy * distance))
+        return targets
+
+    def request_prefetch(self, cx, cy):
+        """Demande le chargement d'un chunk en arrière-plan"""
+        if not (0 <= cx < self.chunks_x and 0 <= cy < self.chunks_y):
+            return
+        key = (cx, cy)
+        with self._lock:
+            if key in self._chunks or key in self._pending:
+                return
+            self._pending.add(key)
+        self._queue.put(key)
+
+    def _prefetch_worker(self):
+        """Boucle du thread de préchargement"""
+        while True:
+            key = self._queue.get()
+            if key is None:
+                break
+            if isinstance(key, threading.Event):
+                key.set()
+                continue
+            try:
+                with self._lock:
+                    loaded = key in self._chunks
+                if not loaded:
+                    chunk = self._read_chunk(*key)
+                    with self._lock:
+                        if key not in self._chunks:
+                            # Inséré comme le moins récent : un préchargement inutile part en premier
+                            self._chunks[key] = chunk
+                            self._chunks.move_to_end(key, last=False)
+                            self.version += 1
+            except (OSError, ValueError) as e:
+                print(f"Erreur lors du préchargement du chunk {key} : {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+    def wait_for_prefetch(self):
+        """Attend la fin des préchargements en cours"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _evict(self):
+        """Évince les chunks les moins récemment utilisés au-delà de max_chunks"""
+        evicted = []
+        with self._lock:
+            while len(self._chunks) > self.max_chunks:
+                key, _ = self._chunks.popitem(last=False)
+                evicted.append(key)
+                self.version += 1
+        if self.on_evict:
+            for key in evicted:
+                self.on_evict(*key)
+
+    def close(self):
+        """Arrête le thread de préchargement et ferme le fichier"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._chunks.clear()
+            self.version += 1
+        self._file.close()
+
+    # Requêtes de collision (même interface que CollisionGrid)
+
+    def in_bounds(self, grid_x, grid_y):
+        """Vérifie si une position est dans les limites de la carte"""
+        return 0 <= grid_x < self.width and 0 <= grid_y < self.height
+
+    def get(self, grid_x, grid_y):
+        """Retourne les drapeaux d'une case (BLOCKED pour une position hors de la carte)"""
+        if not self.in_bounds(grid_x, grid_y):
+            return CollisionGrid.BLOCKED
+        chunk = self.get_chunk(grid_x // self.chunk_size, grid_y // self.chunk_size)
+        return chunk.cells[(grid_y - chunk.y) * chunk.width + grid_x - chunk.x]
+
+    def is_blocked(self, grid_x, grid_y):
+        """Vérifie si une case bloque le passage (toujours vrai hors de la carte)"""
+        return bool(self.get(grid_x, grid_y) & CollisionGrid.BLOCKED)
+
+    def is_blocked_in_memory(self, grid_x, grid_y):
+        """
+        Comme is_blocked, sans charger de chunk : une case d'un chunk absent de la
+        mémoire est bloquante (la recherche de chemin reste dans la zone chargée)
+        """
+        if not self.in_bounds(grid_x, grid_y):
+            return True
+        with self._lock:
+            chunk = self._chunks.get((grid_x // self.chunk_size, grid_y // self.chunk_size))
+        if chunk is None:
+            return True
+        return bool(chunk.cells[(grid_y - chunk.y) * chunk.width + grid_x - chunk.x] & CollisionGrid.BLOCKED)
+
+    def is_tree(self, grid_x, grid_y):
+        """Vérifie si une case est couverte par un arbre"""
+        if not self.in_bounds(grid_x, grid_y):
+            return False
+        return bool(self.get(grid_x, grid_y) & CollisionGrid.TREE)
+
+    def any_in_region(self, grid_x, grid_y, width, height, mask=CollisionGrid.BLOCKED):
+        """Vérifie si au moins une case de la zone porte un des drapeaux du masque"""
+        if mask & CollisionGrid.BLOCKED and not (
+            grid_x >= 0 and grid_y >= 0 and
+            grid_x + width <= self.width and grid_y + height <= self.height
+        ):
+            return True
+        return self.count_in_region(grid_x, grid_y, width, height, mask) > 0
+
+    def count_in_region(self, grid_x, grid_y, width, height, mask=CollisionGrid.BLOCKED):
+        """Compte les cases de la zone (limitée à la carte) portant un des drapeaux du masque"""
+        table = CollisionGrid._mask_table(mask)
+        start_x, end_x = max(0, grid_x), min(self.width, grid_x + width)
+        start_y, end_y = max(0, grid_y), min(self.height, grid_y + height)
+        if start_x >= end_x or start_y >= end_y:
+            return 0
+        count = 0
+        for cy in range(start_y // self.chunk_size, (end_y - 1) // self.chunk_size + 1):
+            for cx in range(start_x // self.chunk_size, (end_x - 1) // self.chunk_size + 1):
+                chunk = self.get_chunk(cx, cy)
+                if chunk is None:
+                    continue
+                left = max(start_x, chunk.x) - chunk.x
+                right = min(end_x, chunk.x + chunk.width) - chunk.x
+                for y in range(max(start_y, chunk.y) - chunk.y, min(end_y, chunk.y + chunk.height) - chunk.y):
+                    offset = y * chunk.width
+                    count += chunk.cells[offset + left:offset + right].translate(table).count(1)
+        return count
+
+    def is_rect_blocked(self, rect, tile_size):
+        """Vérifie si un rectangle en pixels recouvre une case bloquante"""
+        start_x = rect.left // tile_size
+        start_y = rect.top // tile_size
+        end_x = (rect.right - 1) // tile_size
+        end_y = (rect.bottom - 1) // tile_size
+        return self.any_in_region(start_x, start_y, end_x - start_x + 1, end_y - start_y + 1)
+
+    def iter_blocked(self):
+        """Génère les positions (x, y) des cases bloquantes des chunks en mémoire"""
+        with self._lock:
+            chunks = list(self._chunks.values())
+        table = CollisionGrid._mask_table(CollisionGrid.BLOCKED)
+        for chunk in chunks:
+            flags = chunk.cells.translate(table)
+            index = flags.find(1)
+            while index >= 0:
+                yield chunk.x + index % chunk.width, chunk.y + index // chunk.width
+                index = flags.find(1, index + 1)
+
+    def get_blocked_rects(self, tile_size):
+        """Retourne un pygame.Rect par case bloquante des chunks en mémoire"""
+        return [
+            pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+            for x, y in self.iter_blocked()
+        ]
+
+
+if __name__ == "__main__":
+    # Découpage hors jeu : python -m game.chunk_streamer assets/mapV3.tmx [taille]
+    import sys
+    from pytmx.util_pygame import load_pygame
+
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    written = write_chunk_pack(load_pygame(sys.argv[1]), sys.argv[1], size)
+    print(f"Carte {sys.argv[1]} découpée dans {written}")
+    pygame.quit()
@@ -0,0 +1,247 @@
+import pygame
+
+# Noms des calques Tiled dont toute tuile non vide bloque le passage
+COLLISION_LAYER_NAMES = ("collisions", "obstacles", "murs")
+
+# Noms des calques Tiled contenant les arbres (calque de profondeur)
+TREE_LAYER_NAMES = ("three",)
+
+
+class CollisionGrid:
+    """
+    Grille compacte des collisions et du terrain, calculée une seule fois au chargement de la carte.
+
+    Chaque case est stockée sur un octet (bytearray) sous forme de drapeaux combinables,
+    ce qui donne des requêtes ponctuelles en O(1) et des requêtes de zone traitées ligne
+    par ligne en code natif (bytes.translate) au lieu d'une boucle Python par case.
+    """
+    EMPTY = 0
+    BLOCKED = 1
+    TREE = 2
+
+    # Tables de traduction octet -> 0/1 pour chaque masque de drapeaux
+    _mask_tables = {}
+
+    def __init__(self, width, height, cells=None):
+        """
+        Initialise la grille
+
+        Args:
+            width (int): Largeur de la carte en tuiles
+            height (int): Hauteur de la carte en tuiles
+            cells (bytearray): Contenu initial (width * height octets), vide par défaut
+        """
+        self.width = width
+        self.height = height
+        if cells is None:
+            cells = bytearray(width * height)
+        elif len(cells) != width * height:
+            raise ValueError(f"La grille doit contenir {width * height} cases, {len(cells)} reçues")
+        self.cells = bytearray(cells)
+        # Augmente à chaque modification d'une case (invalide les chemins calculés)
+        self.version = 0
+
+    @classmethod
+    def from_tiled_map(cls, tmx_data):
+        """
+        Construit la grille à partir d'une carte pytmx
+
+        Une case est bloquante si une tuile d'un calque de collision l'occupe ou si une
+        de ses tuiles porte la propriété 'collision'. Les tuiles du calque des arbres
+        sont marquées TREE.
+
+        Args:
+            tmx_data (pytmx.TiledMap): Données de la carte chargées par pytmx
+
+        Returns:
+            CollisionGrid: La grille des collisions de la carte
+        """
+        grid = cls(tmx_data.width, tmx_data.height)
+        cells = grid.cells
+        width = grid.width
+
+        # Propriété 'collision' résolue une seule fois par gid
+        blocking_gids = {}
+
+        for layer in tmx_data.layers:
+            if not hasattr(layer, 'data'):
+                continue
+            is_collision_layer = layer.name in COLLISION_LAYER_NAMES
+            is_tree_layer = layer.name in TREE_LAYER_NAMES
+            for y, row in enumerate(layer.data):
+                offset = y * width
+                for x, gid in enumerate(row):
+                    if not gid:
+                        continue
+                    flags = cells[offset + x]
+                    if is_collision_layer:
+                        flags |= cls.BLOCKED
+                    if is_tree_layer:
+                        flags |= cls.TREE
+                    if gid not in blocking_gids:
+                        properties = tmx_data.get_tile_properties_by_gid(gid) or {}
+                        blocking_gids[gid] = bool(properties.get('collision', False))
+                    if blocking_gids[gid]:
+                        flags |= cls.BLOCKED
+                    cells[offset + x] = flags
+        return grid
+
+    @classmethod
+    def from_layers(cls, layers):
+        """
+        Construit la grille à partir de calques sous forme de listes de listes
+
+        Args:
+            layers (dict): Dictionnaire {nom du calque: [[gid, ...], ...]}
+
+        Returns:
+            CollisionGrid: La grille des collisions
+        """
+        first_layer = next(iter(layers.values()))
+        grid = cls(len(first_layer[0]), len(first_layer))
+        for name, rows in layers.items():
+            if name in COLLISION_LAYER_NAMES:
+                flag = cls.BLOCKED
+            elif name in TREE_LAYER_NAMES:
+                flag = cls.TREE
+            else:
+                continue
+            for y, row in enumerate(rows):
+                for x, gid in enumerate(row):
+                    if gid:
+                        grid.cells[y * grid.width + x] |= flag
+        return grid
+
+    def in_bounds(self, grid_x, grid_y):
+        """Vérifie si une position est dans les limites de la grille"""
+        return 0 <= grid_x < self.width and 0 <= grid_y < self.height
+
+    def get(self, grid_x, grid_y):
+        """
+        Retourne les drapeaux d'une case
+
+        Args:
+            grid_x (int): Position X en coordonnées grille
+            grid_y (int): Position Y en coordonnées grille
+
+        Returns:
+            int: Drapeaux de la case (BLOCKED pour une position hors de la carte)
+        """
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return self.cells[grid_y * self.width + grid_x]
+        return self.BLOCKED
+
+    def is_blocked(self, grid_x, grid_y):
+        """Vérifie si une case bloque le passage (toujours vrai hors de la carte)"""
+        return bool(self.get(grid_x, grid_y) & self.BLOCKED)
+
+    def is_tree(self, grid_x, grid_y):
+        """Vérifie si une case est couverte par un arbre"""
+        if not self.in_bounds(grid_x, grid_y):
+            return False
+        return bool(self.cells[grid_y * self.width + grid_x] & self.TREE)
+
+    def set_flag(self, grid_x, grid_y, flag, value=True):
+        """
+        Active ou désactive un drapeau sur une case
+
+        Args:
+            grid_x (int): Position X en coordonnées grille
+            grid_y (int): Position Y en coordonnées grille
+            flag (int): Drapeau à modifier (BLOCKED, TREE)
+            value (bool): True pour activer, False pour désactiver
+        """
+        if not self.in_bounds(grid_x, grid_y):
+            return
+        index = grid_y * self.width + grid_x
+        old = self.cells[index]
+        if value:
+            self.cells[index] |= flag
+        else:
+            self.cells[index] &= ~flag & 0xFF
+        if self.cells[index] != old:
+            self.version += 1
+
+    @classmethod
+    def _mask_table(cls, mask):
+        """Table de traduction qui ramène chaque octet à 1 s'il contient un des drapeaux du masque"""
+        table = cls._mask_tables.get(mask)
+        if table is None:
+            table = bytes(1 if value & mask else 0 for value in range(256))
+            cls._mask_tables[mask] = table
+        return table
+
+    def _region_rows(self, grid_x, grid_y, width, height, mask):
+        """Génère, pour chaque ligne de la zone, ses cases traduites en 0/1 selon le masque"""
+        table = self._mask_table(mask)
+        start_x = max(0, grid_x)
+        end_x = min(self.width, grid_x + width)
+        for y in range(max(0, grid_y), min(self.height, grid_y + height)):
+            offset = y * self.width
+            yield self.cells[offset + start_x:offset + end_x].translate(table)
+
+    def any_in_region(self, grid_x, grid_y, width, height, mask=BLOCKED):
+        """
+        Vérifie si au moins une case de la zone porte un des drapeaux du masque
+
+        Une zone qui déborde de la carte est considérée bloquante pour le masque BLOCKED.
+
+        Args:
+            grid_x (int): Colonne de départ
+            grid_y (int): Ligne de départ
+            width (int): Largeur de la zone en tuiles
+            height (int): Hauteur de la zone en tuiles
+            mask (int): Drapeaux recherchés
+
+        Returns:
+            bool: True si une case correspond
+        """
+        if mask & self.BLOCKED and not (
+            grid_x >= 0 and grid_y >= 0 and
+            grid_x + width <= self.width and grid_y + height <= self.height
+        ):
+            return True
+        for row in self._region_rows(grid_x, grid_y, width, height, mask):
+            if 1 in row:
+                return True
+        return False
+
+    def count_in_region(self, grid_x, grid_y, width, height, mask=BLOCKED):
+        """Compte les cases de la zone (limitée à la carte) portant un des drapeaux du masque"""
+        return sum(row.count(1) for row in self._region_rows(grid_x, grid_y, width, height, mask))
+
+    def is_rect_blocked(self, rect, tile_size):
+        """
+        Vérifie si un rectangle en pixels recouvre une case bloquante
+
+        Args:
+            rect (pygame.Rect): Rectangle en coordonnées pixels de la carte
+            tile_size (int): Taille d'une tuile en pixels
+
+        Returns:
+            bool: True si le rectangle touche une case bloquante ou sort de la carte
+        """
+        start_x = rect.left // tile_size
+        start_y = rect.top // tile_size
+        end_x = (rect.right - 1) // tile_size
+        end_y = (rect.bottom - 1) // tile_size
+        return self.any_in_region(start_x, start_y, end_x - start_x + 1, end_y - start_y + 1)
+
+    def blocked_cells(self):
+        """Retourne un octet par case (ligne par ligne) : 1 si la case bloque le passage, 0 sinon"""
+        return self.cells.translate(self._mask_table(self.BLOCKED))
+
+    def iter_blocked(self):
+        """Génère les positions (x, y) de toutes les cases bloquantes"""
+        flags = self.cells.translate(self._mask_table(self.BLOCKED))
+        index = flags.find(1)
+        while index >= 0:
+            yield index % self.width, index // self.width
+            index = flags.find(1, index + 1)
+
+    def get_blocked_rects(self, tile_size):
+        """Retourne un pygame.Rect par case bloquante"""
+        return [
+            pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+            for x, y in self.iter_blocked()
+        ]
@@ -1,16 +1,25 @@
+from game.collision_grid import CollisionGrid
+
 class CollisionManager:
     def __init__(self, tiled_map, tile_size):
         """
         Initialise le gestionnaire de collisions
         
         Args:
-            tiled_map (TiledMap): Objet TiledMap contenant les données de la map
+            tiled_map (TiledMap | dict): Objet TiledMap contenant les données de la map,
+                ou dictionnaire {nom du calque: grille de gids}
             tile_size (int): Taille d'une tuile en pixels
         """
         self.tiled_map = tiled_map
         self.tile_size = tile_size
-        self.map_width = tiled_map.tmx_data.width
-        self.map_height = tiled_map.tmx_data.height
+        
+        # Réutiliser la grille précalculée de la carte plutôt que de parcourir les calques
+        if isinstance(tiled_map, dict):
+            self.collision_grid = CollisionGrid.from_layers(tiled_map)
+        else:
+            self.collision_grid = tiled_map.collision_grid
+        self.map_width = self.collision_grid.width
+        self.map_height = self.collision_grid.height
 
     def is_collision(self, grid_x, grid_y):
         """
@@ -28,17 +37,7 @@ class CollisionManager:
             return True
             
         # Vérifier s'il y a un mur
-        collision_layer = self.tiled_map.get_layer_by_name('collisions')
-        if collision_layer:
-            # Convertir les coordonnées négatives en positives
-            map_x = grid_x % self.map_width
-            map_y = grid_y % self.map_height
-            
-            # Vérifier s'il y a une tuile de collision à cette position
-            for x, y, gid in collision_layer:
-                if x == map_x and y == map_y and gid:
-                    return True
-        return False
+        return self.collision_grid.is_blocked(grid_x, grid_y)
 
     def can_move_to(self, current_pos, new_pos):
         """
@@ -92,17 +91,7 @@ class CollisionManager:
         if not self._is_within_bounds(grid_x, grid_y):
             return False
             
-        tree_layer = self.tiled_map.get_layer_by_name('three')
-        if tree_layer:
-            # Convertir les coordonnées négatives en positives
-            map_x = grid_x % self.map_width
-            map_y = grid_y % self.map_height
-            
-            # Vérifier s'il y a un arbre à cette position
-            for x, y, gid in tree_layer:
-                if x == map_x and y == map_y and gid:
-                    return True
-        return False
+        return self.collision_grid.is_tree(grid_x, grid_y)
 
     def is_on_ground(self, grid_x, grid_y):
         """
@@ -133,9 +122,4 @@ class CollisionManager:
         Returns:
             bool: True si dans les limites, False sinon
         """
-        # Convertir les coordonnées négatives en positives
-        map_x = grid_x % self.map_width
-        map_y = grid_y % self.map_height
-        
-        return (0 <= map_x < self.map_width and 
-                0 <= map_y < self.map_height)
+        return self.collision_grid.in_bounds(grid_x, grid_y)
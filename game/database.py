@@ -1,131 +1,940 @@
 import sqlite3
 import os
+import atexit
+import itertools
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Tuple
 from .items import Item, ItemType
 
-class GameDatabase:
-    def __init__(self, db_path: str = "game.db"):
-        """Initialise la connexion à la base de données"""
-        self.db_path = db_path
-        self.conn = None
-        self.cursor = None
-        self.connect()
-        self.create_tables()
 
-    def connect(self):
-        """Établit la connexion à la base de données"""
+# Base utilisée par défaut ; configurable par variables d'environnement (voir database_config) :
+#   RPG_DB=":memory:"            base en mémoire (tests, bornes de démonstration)
+#   RPG_DB_SEED="game.db"        base en mémoire initialisée depuis ce fichier
+#   RPG_DB_EXPORT="export.db"    base en mémoire copiée dans ce fichier à la fermeture
+DEFAULT_DB_PATH = "game.db"
+MEMORY_DB = ':memory:'
+
+# Version du schéma, conservée dans PRAGMA user_version (voir upgrade_schema)
+SCHEMA_VERSION = 3
+
+# Réglages appliqués à chaque connexion : journal WAL (les lectures ne bloquent pas
+# l'écriture), synchronisation allégée (sûre en WAL), cache de pages de 16 Mo et
+# lecture par mmap jusqu'à 256 Mo, attente plutôt qu'échec si la base est verrouillée
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -16000),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', 5000),
+)
+
+# Tentatives d'écriture d'un lot différé avant abandon (base verrouillée, disque plein)
+MAX_WRITE_ATTEMPTS = 3
+
+# Requêtes préparées gardées en cache par connexion (le module sqlite3 les retrouve
+# par leur texte : les requêtes sont donc des constantes du module)
+STATEMENT_CACHE_SIZE = 256
+
+INDEXES = (
+    # load_player : dernier joueur créé sous un nom
+    'CREATE INDEX IF NOT EXISTS idx_players_name ON players (name, created_at DESC, id DESC)',
+    # get_player_lifespan_stats : index couvrant (aucune lecture de la table)
+    'CREATE INDEX IF NOT EXISTS idx_lifespan_player ON lifespan (player_id, duration_seconds)',
+)
+
+INSERT_PLAYER = '''
+    INSERT INTO players (name, race, faction, hp, x, y)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+SELECT_PLAYER = '''
+    SELECT id, name, race, faction, hp, x, y
+    FROM players
+    WHERE name = ?
+    ORDER BY created_at DESC, id DESC
+    LIMIT 1
+'''
+
+SELECT_PLAYER_NAME = '''
+    SELECT name
+    FROM players
+    WHERE id = ?
+'''
+
+SELECT_INVENTORY = '''
+    SELECT item_name, item_type, item_value, equipped, slot
+    FROM inventory
+    WHERE player_id = ?
+    ORDER BY slot
+'''
+
+# Statistiques tenues à jour à chaque partie enregistrée (voir LIFESPAN_STATS_TRIGGER) :
+# une seule ligne lue, quel que soit le nombre de parties
+SELECT_LIFESPAN_STATS = '''
+    SELECT
+        games_played,
+        total_duration * 1.0 / games_played as avg_duration,
+        max_duration,
+        min_duration
+    FROM lifespan_stats
+    WHERE player_id = ?
+'''
+
+# Classements : meilleures durées de vie, tous joueurs ou par race / par faction
+SELECT_LEADERBOARD = '''
+    SELECT p.name, s.race, s.faction, s.max_duration, s.games_played
+    FROM lifespan_stats s JOIN players p ON p.id = s.player_id
+    ORDER BY s.max_duration DESC
+    LIMIT ?
+'''
+
+SELECT_LEADERBOARD_BY_RACE = '''
+    SELECT p.name, s.race, s.faction, s.max_duration, s.games_played
+    FROM lifespan_stats s JOIN players p ON p.id = s.player_id
+    WHERE s.race = ?
+    ORDER BY s.max_duration DESC
+    LIMIT ?
+'''
+
+SELECT_LEADERBOARD_BY_FACTION = '''
+    SELECT p.name, s.race, s.faction, s.max_duration, s.games_played
+    FROM lifespan_stats s JOIN players p ON p.id = s.player_id
+    WHERE s.faction = ?
+    ORDER BY s.max_duration DESC
+    LIMIT ?
+'''
+
+
+def open_connection(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Ouvre une connexion avec le cache de requêtes et les réglages du jeu
+
+    La connexion peut changer de thread : DatabasePool garantit qu'un seul thread
+    l'utilise à la fois.
+
+    Args:
+        db_path (str): Chemin de la base
+        read_only (bool): Connexion de lecture (toute écriture y est refusée)
+    """
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    if read_only:
+        conn.execute('PRAGMA query_only = 1')
+    return conn
+
+
+INVENTORY_TABLE = '''
+    CREATE TABLE IF NOT EXISTS inventory (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_id INTEGER,
+        slot INTEGER NOT NULL,
+        item_name TEXT NOT NULL,
+        item_type TEXT NOT NULL,
+        item_value INTEGER,
+        equipped BOOLEAN DEFAULT 0,
+        FOREIGN KEY (player_id) REFERENCES players(id),
+        UNIQUE (player_id, slot)
+    )
+'''
+
+
+def _write_inventory(cursor, player_id: int, full: bool, changes: Dict[int, Optional[Tuple]]):
+    """
+    Écrit les slots modifiés de l'inventaire d'un joueur
+
+    Args:
+        cursor: Curseur de la transaction
+        player_id (int): Identifiant du joueur
+        full (bool): True si changes décrit l'inventaire entier (les autres slots sont supprimés)
+        changes (dict): Slot -> (nom, type, valeur, équipé), ou None pour un slot vidé
+    """
+    if full:
+        cursor.execute('DELETE FROM inventory WHERE player_id = ?', (player_id,))
+    else:
+        cursor.executemany(
+            'DELETE FROM inventory WHERE player_id = ? AND slot = ?',
+            [(player_id, slot) for slot, row in changes.items() if row is None]
+        )
+    cursor.executemany('''
+        INSERT INTO inventory (player_id, slot, item_name, item_type, item_value, equipped)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (player_id, slot) DO UPDATE SET
+            item_name = excluded.item_name,
+            item_type = excluded.item_type,
+            item_value = excluded.item_value,
+            equipped = excluded.equipped
+    ''', [(player_id, slot) + row for slot, row in changes.items() if row is not None])
+
+
+def _merge_inventory_writes(previous: Tuple, current: Tuple) -> Tuple:
+    """Fusionne deux sauvegardes d'inventaire en attente pour le même joueur"""
+    player_id, previous_full, previous_changes = previous
+    _, current_full, current_changes = current
+    if current_full:
+        return current
+    merged = dict(previous_changes)
+    merged.update(current_changes)
+    return (player_id, previous_full, merged)
+
+
+def _write_lifespan(cursor, player_id: int, duration_seconds: int):
+    """Ajoute une durée de vie"""
+    cursor.execute('''
+        INSERT INTO lifespan (player_id, duration_seconds, end_time)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+    ''', (player_id, duration_seconds))
+
+
+def _inventory_changes(inventory, full: bool = False) -> Dict[int, Optional[Tuple]]:
+    """
+    Copie les slots à écrire au moment de la sauvegarde
+
+    Args:
+        inventory (Inventory): Inventaire du joueur
+        full (bool): Tous les slots occupés plutôt que les seuls slots modifiés
+
+    Returns:
+        dict: Slot -> (nom, type, valeur, équipé), ou None pour un slot vidé
+    """
+    equipped_item = inventory.get_equipped_item()
+    changed = inventory.take_changes()
+    rows = {}
+    for slot, item in inventory.get_slot_items():
+        if full or slot in changed:
+            rows[slot] = (item.name, item.item_type.value, item.value, item == equipped_item)
+    if not full:
+        for slot in changed:
+            rows.setdefault(slot, None)
+    return rows
+
+
+PLAYERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS players (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        race TEXT NOT NULL,
+        faction TEXT NOT NULL,
+        hp INTEGER NOT NULL,
+        x INTEGER NOT NULL,
+        y INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+LIFESPAN_TABLE = '''
+    CREATE TABLE IF NOT EXISTS lifespan (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_id INTEGER,
+        start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        end_time TIMESTAMP,
+        duration_seconds INTEGER,
+        FOREIGN KEY (player_id) REFERENCES players(id)
+    )
+'''
+
+
+# Agrégats des durées de vie par joueur, avec sa race et sa faction pour les classements
+LIFESPAN_STATS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS lifespan_stats (
+        player_id INTEGER PRIMARY KEY,
+        race TEXT,
+        faction TEXT,
+        games_played INTEGER NOT NULL,
+        total_duration INTEGER NOT NULL,
+        max_duration INTEGER,
+        min_duration INTEGER,
+        FOREIGN KEY (player_id) REFERENCES players(id)
+    )
+'''
+
+# Mise à jour des agrégats dans la transaction de chaque insertion dans lifespan, quel
+# que soit le chemin d'écriture (direct ou différé). Les lignes de lifespan ne sont
+# jamais modifiées ni supprimées par le jeu.
+LIFESPAN_STATS_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS lifespan_stats_insert AFTER INSERT ON lifespan
+    BEGIN
+        INSERT INTO lifespan_stats (player_id, race, faction, games_played, total_duration,
+                                    max_duration, min_duration)
+        VALUES (
+            NEW.player_id,
+            (SELECT race FROM players WHERE id = NEW.player_id),
+            (SELECT faction FROM players WHERE id = NEW.player_id),
+            1,
+            COALESCE(NEW.duration_seconds, 0),
+            NEW.duration_seconds,
+            NEW.duration_seconds
+        )
+        ON CONFLICT (player_id) DO UPDATE SET
+            games_played = games_played + 1,
+            total_duration = total_duration + excluded.total_duration,
+            max_duration = MAX(COALESCE(max_duration, excluded.max_duration),
+                               COALESCE(excluded.max_duration, max_duration)),
+            min_duration = MIN(COALESCE(min_duration, excluded.min_duration),
+                               COALESCE(excluded.min_duration, min_duration));
+    END
+'''
+
+LIFESPAN_STATS_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_lifespan_stats_max ON lifespan_stats (max_duration DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_lifespan_stats_race ON lifespan_stats (race, max_duration DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_lifespan_stats_faction ON lifespan_stats (faction, max_duration DESC)',
+)
+
+# Agrégats des parties enregistrées avant la version 3
+BACKFILL_LIFESPAN_STATS = '''
+    INSERT INTO lifespan_stats (player_id, race, faction, games_played, total_duration,
+                                max_duration, min_duration)
+    SELECT l.player_id, p.race, p.faction, COUNT(*), COALESCE(SUM(l.duration_seconds), 0),
+           MAX(l.duration_seconds), MIN(l.duration_seconds)
+    FROM lifespan l LEFT JOIN players p ON p.id = l.player_id
+    WHERE l.player_id IS NOT NULL
+    GROUP BY l.player_id
+'''
+
+
+def create_schema(conn):
+    """Crée les tables manquantes puis met à jour le schéma (voir upgrade_schema)"""
+    with conn:
+        conn.execute(PLAYERS_TABLE)
+        # Table de l'inventaire : une ligne par slot occupé
+        conn.execute(INVENTORY_TABLE)
+        conn.execute(LIFESPAN_TABLE)
+    print("Tables créées avec succès")
+    upgrade_schema(conn)
+
+
+def upgrade_schema(conn):
+    """
+    Met à jour une base créée par une version précédente du jeu
+
+    Chaque étape est appliquée une seule fois : la version atteinte est enregistrée
+    dans PRAGMA user_version. Toute la mise à jour se fait dans une transaction
+    explicite (BEGIN IMMEDIATE) : le module sqlite3 n'ouvre pas de transaction avant
+    ALTER ou CREATE, qui seraient sinon validés un par un. Une migration interrompue
+    laisse donc la base dans son état d'origine et sera relancée au prochain démarrage.
+    """
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # Une autre instance a pu faire la mise à jour avant le verrou
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        cursor = conn.cursor()
+        # Version 1 : numéros de slot dans l'inventaire
+        if version < 1:
+            columns = [row[1] for row in cursor.execute('PRAGMA table_info(inventory)')]
+            if 'slot' not in columns:
+                _upgrade_inventory_slots(cursor)
+        # Version 2 : index des recherches par nom et par joueur
+        if version < 2:
+            for statement in INDEXES:
+                cursor.execute(statement)
+        # Version 3 : agrégats des durées de vie tenus à jour par trigger
+        if version < 3:
+            cursor.execute(LIFESPAN_STATS_TABLE)
+            cursor.execute(BACKFILL_LIFESPAN_STATS)
+            cursor.execute(LIFESPAN_STATS_TRIGGER)
+            for statement in LIFESPAN_STATS_INDEXES:
+                cursor.execute(statement)
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    # Statistiques pour le planificateur de requêtes
+    conn.execute('ANALYZE')
+    print(f"Schéma de la base mis à jour (version {version} -> {SCHEMA_VERSION})")
+
+
+def _upgrade_inventory_slots(cursor):
+    """Ajoute les numéros de slot à une table d'inventaire d'une ancienne version"""
+    print("Mise à jour de la table inventory (slots)")
+    cursor.execute('ALTER TABLE inventory RENAME TO inventory_old')
+    cursor.execute(INVENTORY_TABLE)
+    rows = cursor.execute('''
+        SELECT player_id, item_name, item_type, item_value, equipped
+        FROM inventory_old
+        ORDER BY player_id, id
+    ''').fetchall()
+    next_slot = {}
+    numbered = []
+    for player_id, name, item_type, value, equipped in rows:
+        slot = next_slot.get(player_id, 0)
+        next_slot[player_id] = slot + 1
+        numbered.append((player_id, slot, name, item_type, value, equipped))
+    cursor.executemany('''
+        INSERT INTO inventory (player_id, slot, item_name, item_type, item_value, equipped)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', numbered)
+    cursor.execute('DROP TABLE inventory_old')
+
+
+class WriteBehindQueue:
+    """
+    Écritures différées vers la base, exécutées par un thread de fond.
+
+    Les écritures sont mises en file sous une clé : une nouvelle écriture de même clé
+    (l'inventaire d'un joueur, par exemple) remplace celle qui attend encore. Le thread
+    regroupe tout ce qui est en attente dans une seule transaction, sur la connexion
+    d'écriture du pool : la boucle de jeu n'attend jamais le disque.
+
+    Un lot en échec est remis en tête de file et retenté (MAX_WRITE_ATTEMPTS fois) ; s'il
+    est abandonné, les inventaires qu'il contenait seront réécrits en entier à leur
+    prochaine sauvegarde (DatabasePool.resync_inventories).
+    """
+
+    def __init__(self, pool, flush_interval: float = 0.5):
+        """
+        Args:
+            pool (DatabasePool): Pool dont la connexion d'écriture est utilisée
+            flush_interval (float): Délai maximal en secondes avant l'écriture d'un lot
+        """
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.pending = OrderedDict()
+        self.submitted = 0
+        self.coalesced = 0
+        self.transactions = 0
+        self.failures = 0
+        self.dropped = 0
+        self._attempts = 0
+        self._unique_keys = itertools.count()
+        self._condition = threading.Condition()
+        self._writing = False
+        self._flush_requested = False
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation, *args, key=None, merge=None):
+        """
+        Met une écriture en file
+
+        Args:
+            operation (callable): Fonction (curseur, *args) exécutée dans la transaction
+            *args: Arguments de l'écriture
+            key: Clé de regroupement ; None pour une écriture qui s'ajoute toujours
+            merge (callable): Combine les arguments (anciens, nouveaux) d'une écriture de
+                même clé encore en attente ; sans fonction, la nouvelle remplace l'ancienne
+        """
+        with self._condition:
+            if self._stop:
+                raise RuntimeError("File d'écriture fermée")
+            if key is None:
+                key = ('unique', next(self._unique_keys))
+            elif key in self.pending:
+                # L'ancienne écriture est remplacée (ou fusionnée) et passe en fin de file
+                _, previous_args, _ = self.pending.pop(key)
+                if merge is not None:
+                    args = merge(previous_args, args)
+                self.coalesced += 1
+            self.pending[key] = (operation, args, merge)
+            self.submitted += 1
+            self._condition.notify_all()
+
+    def has_pending(self) -> bool:
+        """Vrai si des écritures ne sont pas encore sur disque"""
+        with self._condition:
+            return bool(self.pending) or self._writing
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que toutes les écritures en file soient sur disque
+
+        Returns:
+            bool: False si le délai a expiré avant la fin des écritures
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self.pending and not self._writing, timeout)
+
+    def _run(self):
+        """Boucle du thread d'écriture"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self.pending or self._stop)
+                if not self.pending and self._stop:
+                    return
+                # Laisse les écritures proches s'accumuler dans le même lot
+                self._condition.wait_for(lambda: self._stop or self._flush_requested, self.flush_interval)
+                batch = list(self.pending.items())
+                self.pending.clear()
+                flush_requested = self._flush_requested
+                self._flush_requested = False
+                self._writing = True
+            try:
+                with self.pool.writer() as conn:
+                    written = self._write_batch(conn, batch)
+                # Remis en file avant la fin de l'écriture : flush() attend la nouvelle tentative
+                if not written:
+                    self._retry(batch, flush_requested)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write_batch(self, conn, batch) -> bool:
+        """
+        Exécute un lot d'écritures dans une seule transaction
+
+        Returns:
+            bool: False si la transaction a été annulée
+        """
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.cursor = self.conn.cursor()
-            print(f"Connexion établie avec {self.db_path}")
+            with conn:
+                cursor = conn.cursor()
+                for _, (operation, args, _) in batch:
+                    operation(cursor, *args)
+            self.transactions += 1
+            self._attempts = 0
+            return True
         except sqlite3.Error as e:
-            print(f"Erreur lors de la connexion à la base de données : {e}")
+            self.failures += 1
+            print(f"Erreur lors de l'écriture différée ({len(batch)} opérations) : {e}")
+            return False
+
+    def _retry(self, batch, flush_requested=False):
+        """Remet un lot annulé en tête de file, ou l'abandonne après trop d'échecs"""
+        self._attempts += 1
+        if self._attempts >= MAX_WRITE_ATTEMPTS:
+            self._attempts = 0
+            self._drop(batch)
+            return
+        with self._condition:
+            newer = self.pending
+            self.pending = OrderedDict()
+            for key, (operation, args, merge) in batch:
+                if key in newer:
+                    # Une écriture plus récente de même clé est arrivée entre-temps
+                    _, newer_args, _ = newer.pop(key)
+                    args = merge(args, newer_args) if merge is not None else newer_args
+                self.pending[key] = (operation, args, merge)
+            self.pending.update(newer)
+            # Un flush() en attente fait retenter sans attendre le délai de regroupement
+            self._flush_requested = self._flush_requested or flush_requested
+
+    def _drop(self, batch):
+        """Abandonne un lot ; ses inventaires seront réécrits en entier"""
+        self.dropped += len(batch)
+        print(f"Écriture différée abandonnée ({len(batch)} opérations)")
+        for key, _ in batch:
+            if key[0] == 'inventory':
+                self.pool.resync_inventories.add(key[1])
+
+    def close(self):
+        """Écrit tout ce qui est en attente puis arrête le thread"""
+        with self._condition:
+            if self._stop:
+                return
+            self._stop = True
+            self._condition.notify_all()
+        self._thread.join()
+
+
+class PlayerProfileCache:
+    """
+    Profils des joueurs déjà lus ou écrits, par nom (dernier joueur créé sous ce nom)
+
+    Les profils ne changent en base que par save_player, qui remplace l'entrée du nom :
+    une fois résolu, un profil est servi sans requête SQL pour le reste de la session.
+    """
+
+    def __init__(self):
+        self._by_name = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Retourne une copie du profil en cache, None s'il faut le lire en base"""
+        with self._lock:
+            profile = self._by_name.get(name)
+            if profile is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(profile)
+
+    def put(self, profile: Dict):
+        """Mémorise un profil lu ou écrit en base"""
+        with self._lock:
+            self._by_name[profile['name']] = dict(profile)
+
+    def invalidate(self, name: str):
+        """Oublie le profil d'un nom (un nouveau joueur vient d'être créé sous ce nom)"""
+        with self._lock:
+            self._by_name.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._by_name.clear()
 
-    def create_tables(self):
-        """Crée les tables nécessaires si elles n'existent pas"""
+
+class DatabasePool:
+    """
+    Connexions partagées vers une base : une connexion d'écriture et plusieurs de lecture.
+
+    Règles d'accès entre threads :
+    - la connexion d'écriture n'est utilisée que sous son verrou (writer()), par
+      n'importe quel thread : les écritures sont sérialisées ;
+    - une connexion de lecture est prêtée à un seul thread à la fois (reader()) et
+      refuse les écritures ; en WAL, les lectures ne bloquent pas l'écriture ;
+    - aucune connexion n'est gardée hors de ces blocs.
+
+    Le schéma est créé et mis à jour une seule fois, à l'ouverture du pool. Les scènes
+    n'ouvrent pas de connexion : elles obtiennent un GameDatabase qui emprunte celles
+    du pool partagé (get_pool).
+    """
+
+    def __init__(self, db_path: str, readers: int = 2, seed_path: Optional[str] = None,
+                 export_path: Optional[str] = None):
+        """
+        Args:
+            db_path (str): Chemin de la base, ou :memory: pour une base en mémoire
+            readers (int): Nombre de connexions de lecture (0 : lectures sur la connexion
+                d'écriture, obligatoire pour une base :memory:)
+            seed_path (str): Base copiée dans celle-ci à l'ouverture (si le fichier existe)
+            export_path (str): Fichier où copier la base à la fermeture
+        """
+        self.db_path = db_path
+        self.export_path = export_path
+        if db_path == MEMORY_DB:
+            readers = 0
+        self._writer_conn = open_connection(db_path)
+        self._writer_lock = threading.RLock()
+        self.closed = False
+        self.write_queue = None
+        # Joueurs dont l'inventaire en base est peut-être faux (écriture perdue) : la
+        # prochaine sauvegarde le réécrit en entier
+        self.resync_inventories = set()
+        # Profils partagés par toutes les scènes de la session
+        self.profiles = PlayerProfileCache()
+        print(f"Connexion établie avec {db_path}")
+        # Le schéma est créé ou mis à jour par l'import, sinon ici
         try:
-            # Table des joueurs
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS players (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    race TEXT NOT NULL,
-                    faction TEXT NOT NULL,
-                    hp INTEGER NOT NULL,
-                    x INTEGER NOT NULL,
-                    y INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            # Table de l'inventaire
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS inventory (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_id INTEGER,
-                    item_name TEXT NOT NULL,
-                    item_type TEXT NOT NULL,
-                    item_value INTEGER,
-                    equipped BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (player_id) REFERENCES players(id)
-                )
-            ''')
-
-            # Table des durées de vie
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS lifespan (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_id INTEGER,
-                    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    end_time TIMESTAMP,
-                    duration_seconds INTEGER,
-                    FOREIGN KEY (player_id) REFERENCES players(id)
-                )
-            ''')
-
-            self.conn.commit()
-            print("Tables créées avec succès")
-        except sqlite3.Error as e:
-            print(f"Erreur lors de la création des tables : {e}")
+            if not (seed_path and self.import_from(seed_path)):
+                create_schema(self._writer_conn)
+        except sqlite3.Error:
+            # Migration annulée : la base reste dans son état d'origine
+            self._writer_conn.close()
+            raise
+        self._readers = queue.LifoQueue()
+        for _ in range(readers):
+            self._readers.put(open_connection(db_path, read_only=True))
+        self.reader_count = readers
+        self.handles = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def writer(self):
+        """Prête la connexion d'écriture (exclusive) au thread appelant"""
+        with self._writer_lock:
+            if self.closed:
+                raise sqlite3.ProgrammingError(f"Pool fermé : {self.db_path}")
+            yield self._writer_conn
+
+    @contextmanager
+    def reader(self):
+        """Prête une connexion de lecture au thread appelant"""
+        if self.reader_count == 0:
+            with self.writer() as conn:
+                yield conn
+            return
+        conn = self._readers.get()
+        try:
+            if self.closed:
+                raise sqlite3.ProgrammingError(f"Pool fermé : {self.db_path}")
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def import_from(self, path: str) -> bool:
+        """
+        Remplace le contenu de la base par celui d'un fichier (API de sauvegarde de sqlite)
+
+        Sert surtout à initialiser une base en mémoire depuis game.db.
+
+        Args:
+            path (str): Base à copier
+
+        Returns:
+            bool: False si le fichier n'existe pas (la base reste inchangée)
+        """
+        if not os.path.exists(path):
+            print(f"Base {path} introuvable, base vide")
+            return False
+        if self.write_queue is not None:
+            self.write_queue.flush()
+        source = sqlite3.connect(path)
+        try:
+            with self.writer() as conn:
+                source.backup(conn)
+                # Une base d'une version précédente du jeu est mise à jour
+                create_schema(conn)
+        finally:
+            source.close()
+        # Les profils en cache viennent de l'ancien contenu
+        self.profiles.clear()
+        print(f"Base importée depuis {path}")
+        return True
+
+    def export_to(self, path: str):
+        """
+        Copie la base dans un fichier, sauvegardes différées comprises
+
+        Le fichier est remplacé d'un coup : une copie interrompue ne l'abîme pas.
+
+        Args:
+            path (str): Fichier de destination
+        """
+        if self.write_queue is not None:
+            self.write_queue.flush()
+        temp_path = path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        target = sqlite3.connect(temp_path)
+        try:
+            with self.writer() as conn:
+                conn.backup(target)
+        finally:
+            target.close()
+        os.replace(temp_path, path)
+        print(f"Base exportée dans {path}")
+
+    def get_write_queue(self) -> WriteBehindQueue:
+        """Retourne la file d'écritures différées du pool, créée au premier appel"""
+        with self._lock:
+            if self.write_queue is None:
+                self.write_queue = WriteBehindQueue(self)
+            return self.write_queue
+
+    def acquire(self):
+        """Enregistre un utilisateur du pool"""
+        with self._lock:
+            self.handles += 1
+
+    def release(self):
+        """Libère un utilisateur ; le dernier ferme le pool"""
+        with self._lock:
+            self.handles -= 1
+            last = self.handles <= 0
+        if last:
+            self.close()
+
+    def close(self):
+        """Écrit les sauvegardes différées puis ferme toutes les connexions"""
+        with self._lock:
+            if self.closed:
+                return
+            write_queue = self.write_queue
+            self.write_queue = None
+        # La file écrit ses derniers lots avant la fermeture des connexions
+        if write_queue is not None:
+            write_queue.close()
+        if self.export_path:
+            try:
+                self.export_to(self.export_path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Erreur lors de l'export de la base : {e}")
+        with self._writer_lock:
+            self.closed = True
+            try:
+                # Met à jour les statistiques des index si nécessaire (rapide)
+                self._writer_conn.execute('PRAGMA optimize')
+            except sqlite3.Error:
+                pass
+            self._writer_conn.close()
+        for _ in range(self.reader_count):
+            self._readers.get().close()
+        _forget_pool(self)
+        print("Connexion à la base de données fermée")
+
+
+# Pools ouverts, un par fichier de base
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_path: str) -> str:
+    return db_path if db_path == MEMORY_DB else os.path.abspath(db_path)
+
+
+def database_config(environ=None) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Base par défaut demandée par RPG_DB / RPG_DB_SEED / RPG_DB_EXPORT
+
+    Returns:
+        tuple: (chemin de la base, base d'initialisation, fichier d'export) ; l'import et
+            l'export ne concernent que la base en mémoire
+    """
+    environ = os.environ if environ is None else environ
+    db_path = environ.get("RPG_DB") or DEFAULT_DB_PATH
+    if db_path != MEMORY_DB:
+        return db_path, None, None
+    return db_path, environ.get("RPG_DB_SEED") or None, environ.get("RPG_DB_EXPORT") or None
+
+
+def get_pool(db_path: Optional[str] = None) -> DatabasePool:
+    """
+    Retourne le pool partagé d'une base, ouvert au premier appel
+
+    Args:
+        db_path (str): Chemin de la base, None pour la base par défaut (database_config)
+    """
+    seed_path = export_path = None
+    if db_path is None:
+        db_path, seed_path, export_path = database_config()
+    key = _pool_key(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = DatabasePool(db_path, seed_path=seed_path, export_path=export_path)
+            _pools[key] = pool
+        return pool
+
+
+def _forget_pool(pool: DatabasePool):
+    with _pools_lock:
+        key = _pool_key(pool.db_path)
+        if _pools.get(key) is pool:
+            del _pools[key]
+
+
+def close_all_pools():
+    """Ferme tous les pools (fin du jeu) : les écritures différées sont terminées"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+# Garantie d'écriture à la sortie du programme, même sans fermeture explicite
+atexit.register(close_all_pools)
+
+
+class GameDatabase:
+    def __init__(self, db_path: Optional[str] = None, write_behind: bool = False,
+                 pool: Optional[DatabasePool] = None):
+        """
+        Accès à la base pour une scène, via le pool partagé
+
+        Args:
+            db_path (str): Chemin de la base ou :memory: ; None pour la base par défaut
+                (game.db, ou celle demandée par RPG_DB)
+            write_behind (bool): Sauvegardes d'inventaire et de durée de vie différées
+                et écrites par un thread de fond (voir WriteBehindQueue)
+            pool (DatabasePool): Pool à utiliser (par défaut le pool partagé de db_path)
+        """
+        self.pool = pool if pool is not None else get_pool(db_path)
+        self.db_path = self.pool.db_path
+        self.pool.acquire()
+        self.closed = False
+        self.writer = self.pool.get_write_queue() if write_behind else None
 
     def save_player(self, player) -> int:
         """Sauvegarde les données du joueur et retourne son ID"""
+        profiles = self.pool.profiles
+        profiles.invalidate(player.name)
         try:
-            self.cursor.execute('''
-                INSERT INTO players (name, race, faction, hp, x, y)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (player.name, player.race, player.faction.value, player.hp, player.x, player.y))
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self.pool.writer() as conn, conn:
+                cursor = conn.execute(INSERT_PLAYER, (
+                    player.name, player.race, player.faction.value, player.hp, player.x, player.y
+                ))
+            # Le profil écrit devient le profil courant du nom
+            profiles.put({
+                'id': cursor.lastrowid,
+                'name': player.name,
+                'race': player.race,
+                'faction': player.faction.value,
+                'hp': player.hp,
+                'x': player.x,
+                'y': player.y
+            })
+            return cursor.lastrowid
         except sqlite3.Error as e:
             print(f"Erreur lors de la sauvegarde du joueur : {e}")
             return None
 
-    def save_inventory(self, player_id: int, inventory):
-        """Sauvegarde l'inventaire du joueur"""
+    def save_inventory(self, player_id: int, inventory, full: bool = False):
+        """
+        Sauvegarde l'inventaire du joueur
+
+        Seuls les slots modifiés depuis la sauvegarde précédente sont écrits.
+
+        Args:
+            player_id (int): Identifiant du joueur
+            inventory (Inventory): Inventaire à sauvegarder
+            full (bool): Réécrit l'inventaire entier (première sauvegarde, inventaire
+                sauvegardé auparavant sous un autre joueur)
+        """
+        resync = self.pool.resync_inventories
+        if player_id in resync:
+            # Une écriture précédente a échoué : les slots qu'elle portait ne sont plus
+            # marqués modifiés dans l'inventaire
+            resync.discard(player_id)
+            full = True
+        changes = _inventory_changes(inventory, full)
+        if not changes and not full:
+            return
+        if self.writer is not None:
+            # Les sauvegardes en attente d'un même joueur sont fusionnées
+            self.writer.submit(_write_inventory, player_id, full, changes,
+                               key=('inventory', player_id), merge=_merge_inventory_writes)
+            return
         try:
-            # Supprime l'ancien inventaire
-            self.cursor.execute('DELETE FROM inventory WHERE player_id = ?', (player_id,))
-            
-            # Sauvegarde les nouveaux items
-            for item in inventory.get_items():
-                equipped = item == inventory.get_equipped_item()
-                self.cursor.execute('''
-                    INSERT INTO inventory (player_id, item_name, item_type, item_value, equipped)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (player_id, item.name, item.item_type.value, item.value, equipped))
-            
-            self.conn.commit()
-            print(f"Inventaire sauvegardé pour le joueur {player_id}")
+            with self.pool.writer() as conn, conn:
+                _write_inventory(conn.cursor(), player_id, full, changes)
+            print(f"Inventaire sauvegardé pour le joueur {player_id} ({len(changes)} slots)")
         except sqlite3.Error as e:
             print(f"Erreur lors de la sauvegarde de l'inventaire : {e}")
+            resync.add(player_id)
 
     def save_lifespan(self, player_id: int, duration_seconds: int):
         """Enregistre la durée de vie d'un joueur"""
+        if self.writer is not None:
+            self.writer.submit(_write_lifespan, player_id, duration_seconds)
+            return
         try:
-            self.cursor.execute('''
-                INSERT INTO lifespan (player_id, duration_seconds, end_time)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (player_id, duration_seconds))
-            self.conn.commit()
+            with self.pool.writer() as conn, conn:
+                _write_lifespan(conn.cursor(), player_id, duration_seconds)
             print(f"Durée de vie enregistrée pour le joueur {player_id}")
         except sqlite3.Error as e:
             print(f"Erreur lors de l'enregistrement de la durée de vie : {e}")
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend l'écriture des sauvegardes différées
+
+        Returns:
+            bool: False si le délai a expiré
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+
+    def _read_own_writes(self):
+        """Une lecture voit les sauvegardes différées déjà demandées"""
+        if self.writer is not None and self.writer.has_pending():
+            self.writer.flush()
+
     def load_player(self, player_name: str) -> Optional[Dict]:
-        """Charge les données d'un joueur par son nom"""
+        """Charge les données d'un joueur par son nom (lecture en base au premier appel)"""
+        profile = self.pool.profiles.get(player_name)
+        if profile is not None:
+            return profile
         try:
-            self.cursor.execute('''
-                SELECT id, name, race, faction, hp, x, y
-                FROM players
-                WHERE name = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-            ''', (player_name,))
-            result = self.cursor.fetchone()
+            with self.pool.reader() as conn:
+                result = conn.execute(SELECT_PLAYER, (player_name,)).fetchone()
             
             if result:
-                return {
+                profile = {
                     'id': result[0],
                     'name': result[1],
                     'race': result[2],
@@ -134,27 +943,56 @@ class GameDatabase:
                     'x': result[5],
                     'y': result[6]
                 }
+                self.pool.profiles.put(profile)
+                return profile
+            return None
+        except sqlite3.Error as e:
+            print(f"Erreur lors du chargement du joueur : {e}")
             return None
+
+    def player_profile(self, player) -> Optional[Dict]:
+        """
+        Profil en base du joueur en cours
+
+        Résolu une seule fois : l'identifiant est ensuite gardé sur le joueur (db_id) et
+        le profil dans le cache du pool.
+
+        Args:
+            player (Player): Joueur en cours
+
+        Returns:
+            Optional[Dict]: Le profil, None si le joueur n'est pas en base
+        """
+        profile = self.load_player(player.name)
+        if profile is not None and player.db_id is None:
+            player.db_id = profile['id']
+        return profile
+
+    def player_name(self, player_id: int) -> Optional[str]:
+        """Nom du joueur enregistré sous un identifiant, None s'il n'existe pas"""
+        try:
+            with self.pool.reader() as conn:
+                result = conn.execute(SELECT_PLAYER_NAME, (player_id,)).fetchone()
+            return result[0] if result else None
         except sqlite3.Error as e:
             print(f"Erreur lors du chargement du joueur : {e}")
             return None
 
     def load_inventory(self, player_id: int) -> List[Dict]:
         """Charge l'inventaire d'un joueur"""
+        self._read_own_writes()
         try:
-            self.cursor.execute('''
-                SELECT item_name, item_type, item_value, equipped
-                FROM inventory
-                WHERE player_id = ?
-            ''', (player_id,))
+            with self.pool.reader() as conn:
+                rows = conn.execute(SELECT_INVENTORY, (player_id,)).fetchall()
             
             items = []
-            for row in self.cursor.fetchall():
+            for row in rows:
                 items.append({
                     'name': row[0],
                     'type': row[1],
                     'value': row[2],
-                    'equipped': bool(row[3])
+                    'equipped': bool(row[3]),
+                    'slot': row[4]
                 })
             return items
         except sqlite3.Error as e:
@@ -163,18 +1001,18 @@ class GameDatabase:
 
     def get_player_lifespan_stats(self, player_id: int) -> Dict:
         """Récupère les statistiques de durée de vie d'un joueur"""
+        self._read_own_writes()
         try:
-            self.cursor.execute('''
-                SELECT 
-                    COUNT(*) as games_played,
-                    AVG(duration_seconds) as avg_duration,
-                    MAX(duration_seconds) as max_duration,
-                    MIN(duration_seconds) as min_duration
-                FROM lifespan
-                WHERE player_id = ?
-            ''', (player_id,))
-            
-            result = self.cursor.fetchone()
+            with self.pool.reader() as conn:
+                result = conn.execute(SELECT_LIFESPAN_STATS, (player_id,)).fetchone()
+            if result is None:
+                # Aucune partie enregistrée
+                return {
+                    'games_played': 0,
+                    'avg_duration': None,
+                    'max_duration': None,
+                    'min_duration': None
+                }
             return {
                 'games_played': result[0],
                 'avg_duration': result[1],
@@ -190,8 +1028,51 @@ class GameDatabase:
                 'min_duration': 0
             }
 
+    def get_leaderboard(self, race: Optional[str] = None, faction: Optional[str] = None,
+                        limit: int = 10) -> List[Dict]:
+        """
+        Classement des meilleures durées de vie (une ligne par joueur)
+
+        Lu dans les agrégats par index : le coût ne dépend que de limit.
+
+        Args:
+            race (str): Ne classe que les joueurs de cette race
+            faction (str): Ne classe que les joueurs de cette faction (valeur de FactionName)
+            limit (int): Nombre de joueurs
+
+        Returns:
+            List[Dict]: name, race, faction, max_duration, games_played
+        """
+        self._read_own_writes()
+        if race is not None and faction is not None:
+            raise ValueError("Classement par race ou par faction, pas les deux")
+        if race is not None:
+            query, params = SELECT_LEADERBOARD_BY_RACE, (race, limit)
+        elif faction is not None:
+            query, params = SELECT_LEADERBOARD_BY_FACTION, (faction, limit)
+        else:
+            query, params = SELECT_LEADERBOARD, (limit,)
+        try:
+            with self.pool.reader() as conn:
+                rows = conn.execute(query, params).fetchall()
+            return [
+                {
+                    'name': row[0],
+                    'race': row[1],
+                    'faction': row[2],
+                    'max_duration': row[3],
+                    'games_played': row[4]
+                }
+                for row in rows
+            ]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la lecture du classement : {e}")
+            return []
+
     def close(self):
-        """Ferme la connexion à la base de données"""
-        if self.conn:
-            self.conn.close()
-            print("Connexion à la base de données fermée") 
\ No newline at end of file
+        """Rend l'accès au pool ; le dernier accès rendu ferme les connexions"""
+        if self.closed:
+            return
+        self.closed = True
+        self.writer = None
+        self.pool.release()
@@ -12,6 +12,13 @@ class FactionRelation(Enum):
     NEUTRAL = "neutre"
     HOSTILE = "hostile"
 
+# Augmente à chaque modification d'une relation (voir relations_version)
+_relations_version = 0
+
+def relations_version() -> int:
+    """Numéro de version des relations entre factions, pour invalider les calculs qui en dépendent"""
+    return _relations_version
+
 class Faction:
     def __init__(self, name: FactionName, description: str):
         self.name = name
@@ -19,7 +26,9 @@ class Faction:
         self.relations: Dict[FactionName, FactionRelation] = {}
 
     def set_relation(self, other_faction: FactionName, relation: FactionRelation):
+        global _relations_version
         self.relations[other_faction] = relation
+        _relations_version += 1
 
     def get_relation(self, other_faction: FactionName) -> FactionRelation:
         return self.relations.get(other_faction, FactionRelation.NEUTRAL)
@@ -0,0 +1,152 @@
+"""
+Index des cases libres d'une carte, tenu à jour au fil des apparitions et disparitions.
+
+Chercher une case libre au hasard en parcourant toute la grille coûte O(largeur × hauteur)
+à chaque appel. L'index garde les cases libres dans un tableau dense (tirage aléatoire en
+O(1)) doublé d'un dictionnaire case -> position dans le tableau (test d'appartenance et
+retrait en O(1), le retrait échangeant la case avec la dernière du tableau).
+
+Les cases sont aussi rangées par blocs de bucket_size × bucket_size : une recherche « à
+moins de d cases » ne parcourt que les blocs qui recoupent la zone, quelle que soit la
+taille de la carte.
+"""
+
+from random import randrange
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+
+# Côté d'un bloc en cases pour les recherches par distance
+DEFAULT_BUCKET_SIZE = 8
+
+
+class FreeCellIndex:
+    """Ensemble des cases libres avec tirage aléatoire et recherche par distance"""
+
+    def __init__(self, width: int, height: int, bucket_size: int = DEFAULT_BUCKET_SIZE):
+        """
+        Args:
+            width (int): Largeur de la carte en cases
+            height (int): Hauteur de la carte en cases
+            bucket_size (int): Côté d'un bloc en cases
+        """
+        if bucket_size <= 0:
+            raise ValueError("La taille des blocs doit être strictement positive")
+        self.width = width
+        self.height = height
+        self.bucket_size = bucket_size
+        self._cells: List[Cell] = []
+        self._positions: Dict[Cell, int] = {}
+        self._buckets: Dict[Cell, Set[Cell]] = {}
+
+    @classmethod
+    def from_predicate(cls, width: int, height: int, is_free: Callable[[int, int], bool],
+                       margin: int = 0, bucket_size: int = DEFAULT_BUCKET_SIZE) -> 'FreeCellIndex':
+        """
+        Construit l'index en testant chaque case une seule fois
+
+        Args:
+            width (int): Largeur de la carte en cases
+            height (int): Hauteur de la carte en cases
+            is_free (callable): Fonction (x, y) -> bool, vraie pour une case libre
+            margin (int): Nombre de cases exclues sur chaque bord
+            bucket_size (int): Côté d'un bloc en cases
+
+        Returns:
+            FreeCellIndex: L'index des cases libres
+        """
+        index = cls(width, height, bucket_size)
+        for y in range(margin, height - margin):
+            for x in range(margin, width - margin):
+                if is_free(x, y):
+                    index.add(x, y)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self._positions
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(list(self._cells))
+
+    def _bucket_of(self, x: int, y: int) -> Cell:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def add(self, x: int, y: int) -> bool:
+        """
+        Marque une case comme libre
+
+        Returns:
+            bool: False si la case était déjà libre ou hors de la carte
+        """
+        cell = (x, y)
+        if cell in self._positions or not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        self._positions[cell] = len(self._cells)
+        self._cells.append(cell)
+        self._buckets.setdefault(self._bucket_of(x, y), set()).add(cell)
+        return True
+
+    def discard(self, x: int, y: int) -> bool:
+        """
+        Marque une case comme occupée
+
+        Returns:
+            bool: False si la case n'était pas libre
+        """
+        cell = (x, y)
+        position = self._positions.pop(cell, None)
+        if position is None:
+            return False
+        # La dernière case prend la place de celle retirée
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[position] = last
+            self._positions[last] = position
+        bucket_key = self._bucket_of(x, y)
+        bucket = self._buckets[bucket_key]
+        bucket.discard(cell)
+        if not bucket:
+            del self._buckets[bucket_key]
+        return True
+
+    def random_cell(self) -> Optional[Cell]:
+        """Tire une case libre au hasard en O(1) (None si aucune)"""
+        if not self._cells:
+            return None
+        return self._cells[randrange(len(self._cells))]
+
+    def cells_within(self, x: int, y: int, max_distance: int, min_distance: int = 0) -> List[Cell]:
+        """
+        Liste les cases libres à une distance de Manhattan comprise entre les bornes
+
+        Seuls les blocs qui recoupent le carré englobant la zone sont parcourus.
+
+        Args:
+            x (int): Colonne du centre
+            y (int): Ligne du centre
+            max_distance (int): Distance maximale (incluse)
+            min_distance (int): Distance minimale (incluse)
+
+        Returns:
+            list: Cases (x, y) correspondantes
+        """
+        first_bx, first_by = self._bucket_of(max(0, x - max_distance), max(0, y - max_distance))
+        last_bx, last_by = self._bucket_of(min(self.width - 1, x + max_distance),
+                                           min(self.height - 1, y + max_distance))
+        cells = []
+        for by in range(first_by, last_by + 1):
+            for bx in range(first_bx, last_bx + 1):
+                for cell in self._buckets.get((bx, by), ()):
+                    if min_distance <= abs(cell[0] - x) + abs(cell[1] - y) <= max_distance:
+                        cells.append(cell)
+        return cells
+
+    def random_within(self, x: int, y: int, max_distance: int, min_distance: int = 0) -> Optional[Cell]:
+        """Tire au hasard une case libre à distance comprise entre les bornes (None si aucune)"""
+        cells = self.cells_within(x, y, max_distance, min_distance)
+        if not cells:
+            return None
+        return cells[randrange(len(cells))]
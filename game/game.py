@@ -3,6 +3,7 @@
 Module principal du jeu contenant la classe Game
 """
 
+import os
 import sys
 import pygame
 from game.display_manager import DisplayManager
@@ -11,18 +12,53 @@ from game.scenes.menu_scene import MenuScene
 from game.scenes.game_scene import GameScene
 from game.scenes.character_creation_scene import CharacterCreationScene
 from game.scenes.message_scene import MessageScene
+from game.scenes.base_scene import QUIT_SCENE
+from game import trace as tracing
+from game.profiler import get_profiler
+from game.game_clock import get_clock
+from game import replay
+from game.database import close_all_pools
+from game.save_game import SaveSlots, DEFAULT_SAVE_DIR
+from game.autosave import AUTOSAVE_INTERVAL_MS
+
+# Traces de la boucle principale (désactivées par défaut, voir game/trace.py)
+trace = tracing.get_channel("game")
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, fixed_timestep=1/60, record_path=None, replay_path=None,
+                 save_dir=DEFAULT_SAVE_DIR, autosave_interval_ms=AUTOSAVE_INTERVAL_MS, db_path=None):
+        """
+        Args:
+            headless (bool): Simulation sans rendu ni musique, en temps simulé à pas fixe
+                (voir game/simulation.py)
+            fixed_timestep (float): Durée d'une image simulée en secondes
+            record_path (str): Enregistre les entrées dans ce fichier (sinon RPG_RECORD)
+            replay_path (str): Rejoue les entrées de ce fichier (sinon RPG_REPLAY)
+            save_dir (str): Dossier des emplacements de sauvegarde
+            autosave_interval_ms (int): Délai entre deux sauvegardes périodiques, 0 pour
+                les désactiver
+            db_path (str): Base de données des scènes (:memory: possible), None pour la
+                base par défaut (game.db ou RPG_DB, voir game/database.py)
+        """
         print("Initialisation du jeu...", flush=True)
+        self.headless = headless
+        self.fixed_timestep = fixed_timestep
         try:
-            pygame.mixer.init()  # Initialisation du module de son
-            print("Pygame initialisé avec succès", flush=True)
+            # Traces de débogage activées par RPG_TRACE (écrites dans RPG_TRACE_FILE)
+            if tracing.configure_from_env():
+                print(f"Traces actives, écrites dans {tracing.get_tracer().path}", flush=True)
             
-            # Initialisation de la musique de fond
-            self.background_music = pygame.mixer.Sound("music/Background.mp3")
-            self.background_music.set_volume(0.4)  # Volume à 40%
-            self.background_music.play(loops=-1)  # -1 pour une répétition infinie
+            if headless:
+                # Pas de son en simulation
+                self.background_music = None
+            else:
+                pygame.mixer.init()  # Initialisation du module de son
+                print("Pygame initialisé avec succès", flush=True)
+                
+                # Initialisation de la musique de fond
+                self.background_music = pygame.mixer.Sound("music/Background.mp3")
+                self.background_music.set_volume(0.4)  # Volume à 40%
+                self.background_music.play(loops=-1)  # -1 pour une répétition infinie
             
             # Initialiser le gestionnaire d'affichage
             self.display_manager = DisplayManager()
@@ -33,8 +69,27 @@ class Game:
             pygame.display.set_caption("La Planète des Singes - RPG")
             print("Fenêtre créée avec succès", flush=True)
             
-            # Horloge pour contrôler le FPS
-            self.clock = pygame.time.Clock()
+            # Horloge pour contrôler le FPS (temps simulé sans limite en mode headless)
+            self.clock = get_clock()
+            if headless:
+                self.clock.simulate(fixed_timestep)
+            else:
+                self.clock.use_real_time()
+            # Le rendu est inutile pour la logique : désactivé en simulation
+            self.render_enabled = not headless
+            
+            # Enregistrement ou rejeu des entrées, avant la création des scènes pour que
+            # la graine du générateur aléatoire s'applique à toute la partie
+            if replay_path:
+                self.recorder, self.replayer = None, replay.InputReplayer(replay_path)
+            elif record_path:
+                self.recorder, self.replayer = replay.InputRecorder(record_path), None
+            else:
+                self.recorder, self.replayer = replay.session_from_env()
+            if self.replayer is not None:
+                # Le temps de jeu est celui de la session enregistrée
+                self.clock.simulate(fixed_timestep)
+                print(f"Rejeu de {self.replayer.path} ({len(self.replayer.frames)} images)", flush=True)
             
             print("Initialisation de l'état du jeu...", flush=True)
             # État du jeu
@@ -42,11 +97,18 @@ class Game:
             print("État du jeu initialisé", flush=True)
             
             print("Chargement des scènes...", flush=True)
+            # Emplacements de sauvegarde partagés par le menu et la scène de jeu
+            self.save_slots = SaveSlots(save_dir)
+            
             # Scènes du jeu
             self.scenes = {
-                'menu': MenuScene(self.display_manager.screen, self.game_state, self.display_manager),
-                'game': GameScene(self.display_manager.screen, self.game_state, self.display_manager),
-                'character_creation': CharacterCreationScene(self.display_manager.screen, self.game_state, self.display_manager),
+                'menu': MenuScene(self.display_manager.screen, self.game_state, self.display_manager,
+                                  save_slots=self.save_slots),
+                'game': GameScene(self.display_manager.screen, self.game_state, self.display_manager,
+                                  save_slots=self.save_slots, autosave_interval_ms=autosave_interval_ms,
+                                  db_path=db_path),
+                'character_creation': CharacterCreationScene(self.display_manager.screen, self.game_state,
+                                                             self.display_manager, db_path=db_path),
                 'message': lambda: MessageScene(
                     self.display_manager.screen,
                     self.game_state,
@@ -56,6 +118,13 @@ class Game:
             }
             self.current_scene = 'menu'
             print("Scènes chargées avec succès", flush=True)
+            
+            # Rendu par zones modifiées pour les scènes qui le supportent
+            self.dirty_rendering = True
+            self.presented_scene = None
+            
+            # Profileur d'images affiché avec F3
+            self.profiler = get_profiler()
             print("Initialisation terminée!", flush=True)
         except Exception as e:
             print(f"[ERREUR] Une erreur est survenue lors de l'initialisation : {e}", flush=True)
@@ -63,10 +132,48 @@ class Game:
             traceback.print_exc()
             sys.exit(1)
 
+    def next_events(self):
+        """
+        Retourne les événements de l'image : entrées réelles, enregistrées au besoin,
+        ou entrées de la session rejouée
+        """
+        events = pygame.event.get()
+        if self.replayer is not None:
+            # Pendant un rejeu, seule la fermeture de la fenêtre est prise en compte
+            if self.replayer.finished or any(event.type == pygame.QUIT for event in events):
+                return [pygame.event.Event(pygame.QUIT)]
+            time_ms, events = self.replayer.next_frame()
+            self.clock.set_time(time_ms)
+        elif self.recorder is not None:
+            self.recorder.record_frame(self.clock.get_ticks(), events)
+        return events
+
+    def close_input_session(self):
+        """Termine l'enregistrement ou le rejeu en cours"""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.replayer is not None:
+            stats = self.replayer.summary()
+            print(f"Rejeu terminé : {stats['frames']} images, moy {stats['mean']:.2f} ms, "
+                  f"p50 {stats['p50']:.2f}, p95 {stats['p95']:.2f}, p99 {stats['p99']:.2f} ms", flush=True)
+            frames_path = os.environ.get("RPG_REPLAY_FRAMES")
+            if frames_path:
+                self.replayer.write_frame_times(frames_path)
+            self.replayer = None
+
+    def close_scenes(self):
+        """Ferme les scènes instanciées puis les connexions à la base"""
+        for scene in self.scenes.values():
+            # Les scènes pas encore instanciées sont des fabriques sans close()
+            if hasattr(scene, 'close'):
+                scene.close()
+        close_all_pools()
+
     def handle_events(self):
         """Gère les événements globaux"""
         try:
-            for event in pygame.event.get():
+            for event in self.next_events():
                 if event.type == pygame.QUIT:
                     return False
                     
@@ -79,9 +186,15 @@ class Game:
                             self.scenes[scene_name] = scene()
                         scene = self.scenes[scene_name]
                         scene.screen = self.display_manager.screen
+                        scene.mark_dirty()
                         
                 # Gérer le basculement plein écran (Alt+Enter)
                 elif event.type == pygame.KEYDOWN:
+                    # F3 : surimpression du profileur (durées, puis durées + compteurs)
+                    if event.key == pygame.K_F3:
+                        self.profiler.toggle()
+                        self.mark_all_scenes_dirty()
+                        continue
                     if event.key == pygame.K_RETURN and (event.mod & pygame.KMOD_ALT):
                         old_size = self.display_manager.toggle_fullscreen()
                         # Mettre à jour les scènes avec le nouveau screen
@@ -90,6 +203,7 @@ class Game:
                                 self.scenes[scene_name] = scene()
                             scene = self.scenes[scene_name]
                             scene.screen = self.display_manager.screen
+                            scene.mark_dirty()
                 
                 # Laisse la scène courante gérer l'événement
                 scene = self.scenes[self.current_scene]
@@ -97,6 +211,8 @@ class Game:
                     self.scenes[self.current_scene] = scene()
                     scene = self.scenes[self.current_scene]
                 new_scene = scene.handle_event(event)
+                if new_scene == QUIT_SCENE:
+                    return False
                 if new_scene and new_scene in self.scenes:
                     self.current_scene = new_scene
                 
@@ -107,6 +223,12 @@ class Game:
             traceback.print_exc()
             return False
 
+    def mark_all_scenes_dirty(self):
+        """Force le rendu complet des scènes déjà créées"""
+        for scene in self.scenes.values():
+            if not callable(scene):
+                scene.mark_dirty()
+
     def handle_input(self):
         """Gère les entrées clavier pour le mouvement"""
         keys = pygame.key.get_pressed()
@@ -138,13 +260,13 @@ class Game:
             
             # Si la scène demande un changement
             if new_scene and new_scene in self.scenes:
-                print(f"DEBUG - Changement de scène: {self.current_scene} -> {new_scene}")
+                trace.info("Changement de scène : %s -> %s", self.current_scene, new_scene)
                 self.current_scene = new_scene
                 return
             
             if hasattr(scene, 'player'):
                 move_vector = self.handle_input()
-                scene.player.move(move_vector, 1/60)
+                scene.player.move(move_vector, self.fixed_timestep)
         except Exception as e:
             print(f"[ERREUR] Une erreur est survenue lors de la mise à jour : {e}", flush=True)
             import traceback
@@ -153,47 +275,111 @@ class Game:
     def render(self):
         """Dessine le jeu"""
         try:
-            # Efface l'écran
-            self.display_manager.screen.fill((0, 0, 0))
-            
-            # Dessine la scène courante
             scene = self.scenes[self.current_scene]
             if callable(scene):
                 self.scenes[self.current_scene] = scene()
                 scene = self.scenes[self.current_scene]
-            scene.render(self.display_manager.screen)
+            
+            # La surimpression du profileur change à chaque image : rendu complet
+            if self.dirty_rendering and scene.supports_dirty_rects and not self.profiler.active:
+                self.render_dirty(scene)
+                return
+            
+            with self.profiler.section("render"):
+                # Efface l'écran
+                self.display_manager.screen.fill((0, 0, 0))
+                
+                # Dessine la scène courante
+                scene.render(self.display_manager.screen)
+                self.presented_scene = scene
+            
+            self.profiler.render(self.display_manager.screen)
             
             # Rafraîchit l'affichage
-            pygame.display.flip()
+            with self.profiler.section("flip"):
+                pygame.display.flip()
         except Exception as e:
             print(f"[ERREUR] Une erreur est survenue lors du rendu : {e}", flush=True)
             import traceback
             traceback.print_exc()
 
+    def render_dirty(self, scene):
+        """
+        Redessine et présente uniquement les zones modifiées d'une scène
+        
+        Args:
+            scene (BaseScene): Scène courante (supports_dirty_rects à True)
+        """
+        screen = self.display_manager.screen
+        # Une scène qui vient d'apparaître est redessinée entièrement
+        if scene is not self.presented_scene:
+            scene.mark_dirty()
+            self.presented_scene = scene
+        
+        dirty_rects = scene.collect_dirty_rects(screen)
+        if not dirty_rects:
+            # Rien n'a changé : ni rendu ni présentation
+            return
+        
+        # Le rendu complet de la scène est limité aux zones modifiées
+        with self.profiler.section("render"):
+            screen.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+            screen.fill((0, 0, 0))
+            scene.render(screen)
+            screen.set_clip(None)
+        with self.profiler.section("flip"):
+            pygame.display.update(dirty_rects)
+
+    def step(self):
+        """
+        Exécute une image complète : événements, mise à jour, rendu et attente
+        
+        Returns:
+            bool: False si le jeu doit s'arrêter
+        """
+        self.profiler.begin_frame()
+        if self.replayer is not None and not self.replayer.finished:
+            self.replayer.begin_frame()
+        
+        # Gestion des événements
+        with self.profiler.section("events"):
+            running = self.handle_events()
+        
+        # Mise à jour
+        with self.profiler.section("update"):
+            self.update()
+        
+        # Rendu
+        if self.render_enabled:
+            self.render()
+        self.profiler.end_frame()
+        if self.replayer is not None:
+            self.replayer.end_frame()
+        
+        # Contrôle du FPS (avance simplement le temps simulé en mode headless)
+        self.clock.tick(self.FPS)
+        return running
+
     def run(self):
         """Boucle principale du jeu"""
         print("Démarrage de la boucle de jeu...", flush=True)
+        exit_code = 0
         try:
             running = True
             while running:
-                # Gestion des événements
-                running = self.handle_events()
-                
-                # Mise à jour
-                self.update()
-                
-                # Rendu
-                self.render()
-                
-                # Contrôle du FPS
-                self.clock.tick(self.FPS)
+                running = self.step()
                 
             print("Fermeture du jeu...", flush=True)
-            pygame.quit()
-            sys.exit()
         except Exception as e:
             print(f"[ERREUR] Une erreur est survenue dans la boucle principale : {e}", flush=True)
             import traceback
             traceback.print_exc()
+            exit_code = 1
+        finally:
+            # Les scènes sont fermées avant pygame : la durée de vie enregistrée à la
+            # fermeture lit encore l'horloge du jeu (get_ticks rend 0 après pygame.quit)
+            self.close_input_session()
+            self.close_scenes()
+            tracing.shutdown()
             pygame.quit()
-            sys.exit(1) 
\ No newline at end of file
+        sys.exit(exit_code)
@@ -0,0 +1,89 @@
+"""
+Horloge du jeu : temps réel ou temps simulé à pas fixe.
+
+En jeu normal, l'horloge délègue à pygame (get_ticks, Clock.tick, wait). En mode
+simulé (simulation sans fenêtre, rejeu), le temps n'avance que d'un pas fixe à chaque
+image et ne dort jamais : la logique du jeu tourne aussi vite que le processeur le
+permet et reste reproductible. Le code du jeu lit donc le temps via get_ticks() de ce
+module plutôt que via pygame.time.get_ticks().
+"""
+
+import pygame
+
+
+class GameClock:
+    """Horloge partagée par la boucle principale et les scènes"""
+
+    def __init__(self):
+        self.simulated = False
+        self.fixed_timestep = 1 / 60
+        self.time_ms = 0.0
+        self._clock = pygame.time.Clock()
+
+    def simulate(self, fixed_timestep=1 / 60, start_ms=0):
+        """
+        Passe en temps simulé
+
+        Args:
+            fixed_timestep (float): Durée d'une image en secondes
+            start_ms (int): Temps de départ en millisecondes
+        """
+        self.simulated = True
+        self.fixed_timestep = fixed_timestep
+        self.time_ms = float(start_ms)
+
+    def set_time(self, milliseconds):
+        """Fixe le temps simulé (rejeu d'une session enregistrée)"""
+        self.time_ms = float(milliseconds)
+
+    def use_real_time(self):
+        """Revient au temps réel de pygame"""
+        self.simulated = False
+
+    def get_ticks(self):
+        """Retourne le temps écoulé en millisecondes"""
+        if self.simulated:
+            return int(round(self.time_ms))
+        return pygame.time.get_ticks()
+
+    def tick(self, fps=60):
+        """
+        Termine une image
+
+        En temps réel, limite le nombre d'images par seconde. En temps simulé, avance
+        d'un pas fixe sans attendre.
+
+        Returns:
+            int: Durée de l'image en millisecondes
+        """
+        if self.simulated:
+            self.time_ms += self.fixed_timestep * 1000
+            return int(self.fixed_timestep * 1000)
+        return self._clock.tick(fps)
+
+    def wait(self, milliseconds):
+        """Attend (temps réel) ou avance le temps simulé"""
+        if self.simulated:
+            self.time_ms += milliseconds
+        else:
+            pygame.time.wait(milliseconds)
+
+    def get_fps(self):
+        """Images par seconde mesurées (pas fixe en temps simulé)"""
+        if self.simulated:
+            return 1 / self.fixed_timestep
+        return self._clock.get_fps()
+
+
+# Horloge partagée par tout le jeu
+_clock = GameClock()
+
+
+def get_clock():
+    """Retourne l'horloge du jeu partagée"""
+    return _clock
+
+
+def get_ticks():
+    """Retourne le temps du jeu en millisecondes (réel ou simulé)"""
+    return _clock.get_ticks()
@@ -23,6 +23,9 @@ class GameState:
         self.active_pnj = None
         self.pnj2 = None
         
+        # Emplacement de sauvegarde de la partie en cours (voir game/save_game.py)
+        self.save_slot = None
+        
         # Gestion des scènes et messages
         self.current_scene = 'menu'
         self.temp_message = None
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 from .items import Item, ItemType
 
 class Inventory:
@@ -6,6 +6,11 @@ class Inventory:
         self.max_slots = max_slots
         self.items: List[Item] = []
         self.equipped_item: Optional[Item] = None  # Item actuellement équipé
+        # Slot stable de chaque item (même ordre que items) : retirer un item ne
+        # renumérote pas les autres, la sauvegarde ne réécrit que les slots modifiés
+        self.slots: List[int] = []
+        # Slots ajoutés, vidés ou (dés)équipés depuis la dernière sauvegarde
+        self.changed_slots: Set[int] = set()
 
     def add_item(self, item: Item) -> bool:
         """
@@ -13,10 +18,46 @@ class Inventory:
         Retourne True si l'ajout est réussi, False sinon
         """
         if len(self.items) < self.max_slots:
+            slot = self._free_slot()
             self.items.append(item)
+            self.slots.append(slot)
+            self.changed_slots.add(slot)
             return True
         return False
 
+    def _free_slot(self) -> int:
+        """Retourne le plus petit numéro de slot libre"""
+        used = set(self.slots)
+        slot = 0
+        while slot in used:
+            slot += 1
+        return slot
+
+    def slot_of(self, item: Item) -> Optional[int]:
+        """Retourne le slot d'un item, ou None s'il n'est pas dans l'inventaire"""
+        for index, candidate in enumerate(self.items):
+            if candidate is item:
+                return self.slots[index]
+        return None
+
+    def get_slot_items(self) -> List[Tuple[int, Item]]:
+        """Retourne les couples (slot, item) de l'inventaire"""
+        return list(zip(self.slots, self.items))
+
+    def take_changes(self) -> Set[int]:
+        """Retourne les slots modifiés depuis le dernier appel et les oublie"""
+        changed = self.changed_slots
+        self.changed_slots = set()
+        return changed
+
+    def _mark_equipped_change(self, previous: Optional[Item], current: Optional[Item]):
+        """Signale les slots dont l'état équipé change"""
+        for item in (previous, current):
+            if item is not None:
+                slot = self.slot_of(item)
+                if slot is not None:
+                    self.changed_slots.add(slot)
+
     def remove_item(self, item: Item) -> bool:
         """
         Retire un item de l'inventaire
@@ -25,7 +66,9 @@ class Inventory:
         if item in self.items:
             if self.equipped_item == item:
                 self.equipped_item = None
-            self.items.remove(item)
+            index = self.items.index(item)
+            del self.items[index]
+            self.changed_slots.add(self.slots.pop(index))
             return True
         return False
 
@@ -37,12 +80,14 @@ class Inventory:
         if item not in self.items and item.item_type != ItemType.POTION:
             return False
 
+        self._mark_equipped_change(self.equipped_item, item)
         self.equipped_item = item
         return True
 
     def unequip_item(self) -> Optional[Item]:
         """Déséquipe l'item actuel"""
         previous_item = self.equipped_item
+        self._mark_equipped_change(previous_item, None)
         self.equipped_item = None
         return previous_item
 
@@ -74,7 +119,26 @@ class Inventory:
         """Vérifie si l'inventaire est plein"""
         return len(self.items) >= self.max_slots
 
+    def restore(self, slot_items: List[Tuple[int, Item]], equipped_slot: Optional[int] = None):
+        """
+        Remplace le contenu par des items à des slots donnés (chargement d'une partie)
+
+        Args:
+            slot_items: Couples (slot, item)
+            equipped_slot: Slot de l'item équipé, None si aucun
+        """
+        self.changed_slots.update(self.slots)
+        self.items = [item for slot, item in slot_items]
+        self.slots = [slot for slot, item in slot_items]
+        self.changed_slots.update(self.slots)
+        self.equipped_item = None
+        for slot, item in slot_items:
+            if slot == equipped_slot:
+                self.equipped_item = item
+
     def clear(self):
         """Vide l'inventaire"""
+        self.changed_slots.update(self.slots)
         self.items.clear()
+        self.slots.clear()
         self.equipped_item = None
@@ -84,8 +84,50 @@ def create_collectible_item(name: str, item_type: ItemType, description: str, va
     """
     return CollectibleItem(name, item_type, description, value, position, image_path)
 
+class ItemRegistry(dict):
+    """
+    Dictionnaire des items qui compte ses modifications
+
+    version augmente à chaque ajout, remplacement ou retrait : les tables calculées à
+    partir des items (tables d'apparition) savent ainsi quand se recalculer.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.version += 1
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.version += 1
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
 # Création des items via la factory
-ITEMS = {
+ITEMS = ItemRegistry({
     # Items collectibles sur la carte
     "m16": create_collectible_item(
         "M16",
@@ -123,7 +165,7 @@ ITEMS = {
         "Une banane plantin qui restaure beaucoup de points de vie", 
         30
     )
-}
+})
 
 def test_collectible_item():
     """Tests unitaires pour la classe CollectibleItem"""
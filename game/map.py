@@ -3,6 +3,7 @@ from enum import Enum
 from random import choice
 import pygame
 from .layer_manager import LayerManager, LayerType
+from .free_cells import FreeCellIndex
 
 class TileType(Enum):
     EMPTY = "."      # Case vide
@@ -25,6 +26,13 @@ class Map:
         # Position initiale du joueur (1, 12) comme spécifié
         self.player_pos = (1, 12)
         self.pnjs = []  # Liste pour stocker tous les PNJ
+        self.pnj = None
+        self.npc_pos = None
+        
+        # Objets et ennemis posés sur la carte : (x, y) -> TileType
+        self.occupants = {}
+        # Index des cases libres, construit à la première requête (voir free_cells)
+        self._free_cells = None
         
         # Chargement des tiles
         self._load_tiles()
@@ -61,6 +69,58 @@ class Map:
         # Vérifier s'il y a une collision à cette position
         return not self.layer_manager.is_collision(x, y)
 
+    @property
+    def free_cells(self) -> FreeCellIndex:
+        """
+        Index des cases libres (ni collision, ni PNJ, ni objet, ni ennemi), bords exclus
+
+        Construit une fois puis tenu à jour par add_pnj/remove_pnj et add_item/remove_item.
+        Après une modification directe du calque de collision, appeler refresh_free_cells.
+        """
+        if self._free_cells is None:
+            self._free_cells = FreeCellIndex.from_predicate(
+                self.width, self.height, self._is_cell_free, margin=1)
+        return self._free_cells
+
+    def refresh_free_cells(self):
+        """Oublie l'index des cases libres (reconstruit à la prochaine requête)"""
+        self._free_cells = None
+
+    def _is_cell_free(self, x: int, y: int) -> bool:
+        """Vérifie case par case qu'aucun obstacle ni occupant n'est présent"""
+        return (not self.layer_manager.is_collision(x, y)
+                and not self.layer_manager.get_tile(LayerType.NPC, x, y)
+                and (x, y) not in self.occupants)
+
+    def _update_free_cell(self, x: int, y: int):
+        """Répercute l'état d'une case sur l'index s'il est déjà construit"""
+        if self._free_cells is None or not (0 < x < self.width - 1 and 0 < y < self.height - 1):
+            return
+        if self._is_cell_free(x, y):
+            self._free_cells.add(x, y)
+        else:
+            self._free_cells.discard(x, y)
+
+    def add_item(self, tile_type: TileType, x: int, y: int) -> bool:
+        """
+        Pose un objet ou un ennemi sur une case
+
+        Returns:
+            bool: False si la case est hors de la carte ou déjà occupée
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height) or (x, y) in self.occupants:
+            return False
+        self.occupants[(x, y)] = tile_type
+        self._update_free_cell(x, y)
+        return True
+
+    def remove_item(self, x: int, y: int) -> Optional[TileType]:
+        """Retire l'objet ou l'ennemi d'une case et retourne son type (None si la case était vide)"""
+        tile_type = self.occupants.pop((x, y), None)
+        if tile_type is not None:
+            self._update_free_cell(x, y)
+        return tile_type
+
     def add_pnj(self, pnj: 'PNJ'):
         """Ajoute un PNJ à la map"""
         # Si c'est le premier PNJ, le traiter comme le PNJ principal
@@ -70,12 +130,14 @@ class Map:
         
         self.pnjs.append(pnj)
         self.layer_manager.add_npc(pnj.tile_x, pnj.tile_y)
+        self._update_free_cell(pnj.tile_x, pnj.tile_y)
         pnj.map = self
 
     def remove_pnj(self):
         """Retire le PNJ de la map"""
         if self.pnj:
             self.layer_manager.remove_npc(self.pnj.tile_x, self.pnj.tile_y)
+            self._update_free_cell(self.pnj.tile_x, self.pnj.tile_y)
             if self.pnj in self.pnjs:
                 self.pnjs.remove(self.pnj)
             self.pnj = None
@@ -166,19 +228,9 @@ class Map:
 
     def get_valid_npc_positions(self, max_distance: int = 5) -> List[Tuple[int, int]]:
         """Trouve toutes les positions valides pour le PNJ à une distance maximale donnée"""
-        valid_positions = []
         player_x, player_y = self.player_pos
-
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                # Calcule la distance de Manhattan
-                distance = abs(x - player_x) + abs(y - player_y)
-                # Vérifie si la position est vide et à la bonne distance
-                if (self.layer_manager.is_empty(x, y) and 
-                    0 < distance <= max_distance):
-                    valid_positions.append((x, y))
-
-        return valid_positions
+        # Distance de Manhattan, hors case du joueur ; seuls les blocs proches sont parcourus
+        return self.free_cells.cells_within(player_x, player_y, max_distance, min_distance=1)
 
     def generate_default_map(self):
         """Génère une carte par défaut avec quelques éléments"""
@@ -207,3 +259,4 @@ class Map:
             x, y = choice(valid_positions)
             self.npc_pos = (x, y)
             self.layer_manager.add_npc(x, y)
+            self._update_free_cell(x, y)
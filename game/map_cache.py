@@ -0,0 +1,347 @@
+"""
+Cache binaire des cartes Tiled compilées.
+
+Le chargement d'une carte par pytmx relit le XML/CSV du .tmx et de ses tilesets .tsx,
+puis redécoupe les images du tileset à chaque lancement. Ce module compile une carte
+déjà chargée en un seul fichier binaire versionné :
+
+- un en-tête (signature, version, taille des métadonnées) ;
+- des métadonnées JSON : dimensions, calques, propriétés des tuiles, dépendances ;
+- un atlas des seules tuiles utilisées, en pixels RGBA bruts ;
+- les données de chaque calque, en entiers 32 bits bruts.
+
+Le cache est indexé sur la date de modification et la taille du .tmx et de chacune de
+ses dépendances (.tsx, images). Tant qu'il est à jour, la carte est rechargée sans pytmx.
+"""
+
+import json
+import os
+import struct
+import xml.etree.ElementTree as ET
+from array import array
+
+import pygame
+
+# Signature et version du format de cache
+CACHE_MAGIC = b"PSMC"
+CACHE_VERSION = 1
+
+# En-tête : signature, version, taille des métadonnées JSON
+_HEADER = struct.Struct("<4sHI")
+
+# Dossier du cache, créé à côté du fichier .tmx
+CACHE_DIR_NAME = ".map_cache"
+
+# Nombre de tuiles par ligne dans l'atlas compilé
+ATLAS_COLUMNS = 32
+
+
+class CompiledLayer:
+    """Calque de tuiles chargé depuis le cache (même interface que les calques pytmx)"""
+
+    def __init__(self, name, width, height, data, visible=True):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.visible = visible
+        # Une ligne par rangée de tuiles pour garder l'accès data[y][x] de pytmx
+        self.data = [data[y * width:(y + 1) * width] for y in range(height)]
+
+    def __iter__(self):
+        """Itère sur les tuiles non vides sous forme (x, y, gid)"""
+        for y, row in enumerate(self.data):
+            for x, gid in enumerate(row):
+                if gid:
+                    yield x, y, gid
+
+
+class CompiledTileset:
+    """Description minimale d'un tileset de la carte compilée"""
+
+    def __init__(self, name, source, firstgid):
+        self.name = name
+        self.source = source
+        self.firstgid = firstgid
+
+
+class CompiledMap:
+    """
+    Carte chargée depuis le cache binaire.
+
+    Expose le sous-ensemble de l'interface pytmx utilisé par le jeu : dimensions,
+    calques, tilesets, image et propriétés d'une tuile par gid.
+    """
+
+    def __init__(self, filename, width, height, tilewidth, tileheight, layers, tilesets, tile_images, tile_properties):
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.tilewidth = tilewidth
+        self.tileheight = tileheight
+        self.layers = layers
+        self.tilesets = tilesets
+        self.tile_images = tile_images
+        self.tile_properties = tile_properties
+
+    def get_tile_image_by_gid(self, gid):
+        """Retourne l'image d'une tuile, ou None"""
+        return self.tile_images.get(gid)
+
+    def get_tile_properties_by_gid(self, gid):
+        """Retourne les propriétés d'une tuile, ou None"""
+        return self.tile_properties.get(gid)
+
+
+def get_cache_path(tmx_path):
+    """Retourne le chemin du fichier de cache associé à une carte"""
+    tmx_path = os.path.abspath(tmx_path)
+    cache_dir = os.path.join(os.path.dirname(tmx_path), CACHE_DIR_NAME)
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    return os.path.join(cache_dir, f"{name}.mapc")
+
+
+def find_dependencies(tmx_path):
+    """
+    Liste les fichiers dont dépend une carte : le .tmx, ses .tsx et leurs images
+
+    Args:
+        tmx_path (str): Chemin du fichier .tmx
+
+    Returns:
+        list: Chemins absolus des fichiers sources
+    """
+    tmx_path = os.path.abspath(tmx_path)
+    dependencies = [tmx_path]
+
+    def collect_images(root, base_dir):
+        for image in root.iter("image"):
+            if image.get("source"):
+                dependencies.append(os.path.normpath(os.path.join(base_dir, image.get("source"))))
+
+    tmx_dir = os.path.dirname(tmx_path)
+    root = ET.parse(tmx_path).getroot()
+    for tileset in root.iter("tileset"):
+        source = tileset.get("source")
+        if source:
+            tsx_path = os.path.normpath(os.path.join(tmx_dir, source))
+            dependencies.append(tsx_path)
+            if os.path.exists(tsx_path):
+                collect_images(ET.parse(tsx_path).getroot(), os.path.dirname(tsx_path))
+    collect_images(root, tmx_dir)
+    return dependencies
+
+
+def fingerprint(paths):
+    """Empreinte (chemin, date de modification, taille) de chaque fichier"""
+    fingerprint = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint.append([path, stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+
+def is_fresh(dependencies):
+    """Vérifie qu'aucune dépendance n'a changé depuis la compilation"""
+    try:
+        return fingerprint([entry[0] for entry in dependencies]) == dependencies
+    except OSError:
+        return False
+
+
+def _json_properties(properties):
+    """Ne garde que les propriétés sérialisables en JSON"""
+    return {
+        key: value for key, value in properties.items()
+        if isinstance(value, (str, int, float, bool)) or value is None
+    }
+
+
+def build_atlas(tmx_data, gids):
+    """
+    Range les images des tuiles utilisées dans un atlas en grille
+
+    Args:
+        tmx_data: Carte source (pytmx ou CompiledMap)
+        gids (iterable): gids des tuiles à inclure
+
+    Returns:
+        tuple: (pixels RGBA bruts de l'atlas, métadonnées {'gids', 'size'})
+    """
+    tilewidth, tileheight = tmx_data.tilewidth, tmx_data.tileheight
+    atlas_gids = sorted(gid for gid in gids if gid and tmx_data.get_tile_image_by_gid(gid))
+    rows = (len(atlas_gids) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    atlas = pygame.Surface((ATLAS_COLUMNS * tilewidth, max(1, rows) * tileheight), pygame.SRCALPHA)
+    for index, gid in enumerate(atlas_gids):
+        image = tmx_data.get_tile_image_by_gid(gid)
+        atlas.blit(image, ((index % ATLAS_COLUMNS) * tilewidth, (index // ATLAS_COLUMNS) * tileheight))
+    # Pixels bruts : plus volumineux qu'un PNG mais rechargés sans décompression
+    return pygame.image.tobytes(atlas, "RGBA"), {'gids': atlas_gids, 'size': list(atlas.get_size())}
+
+
+def load_atlas(blob, atlas_meta, tilewidth, tileheight):
+    """
+    Recharge un atlas et le découpe en sous-surfaces : aucune copie de pixels par tuile
+
+    Returns:
+        dict: {gid: pygame.Surface}
+    """
+    atlas = pygame.image.frombytes(blob, tuple(atlas_meta['size']), "RGBA")
+    if pygame.display.get_surface() is not None:
+        atlas = atlas.convert_alpha()
+    tile_images = {}
+    for index, gid in enumerate(atlas_meta['gids']):
+        rect = pygame.Rect((index % ATLAS_COLUMNS) * tilewidth, (index // ATLAS_COLUMNS) * tileheight, tilewidth, tileheight)
+        tile_images[gid] = atlas.subsurface(rect)
+    return tile_images
+
+
+def build_properties(tmx_data, gids):
+    """Table {gid: propriétés} des tuiles utilisées, clés en texte pour le JSON"""
+    properties = {}
+    for gid in gids:
+        tile_properties = tmx_data.get_tile_properties_by_gid(gid) if gid else None
+        if tile_properties:
+            properties[str(gid)] = _json_properties(tile_properties)
+    return properties
+
+
+def tilesets_meta(tmx_data):
+    """Description des tilesets de la carte"""
+    return [
+        {'name': tileset.name, 'source': tileset.source, 'firstgid': tileset.firstgid}
+        for tileset in tmx_data.tilesets
+    ]
+
+
+def compile_map(tmx_data, tmx_path, cache_path=None):
+    """
+    Compile une carte pytmx déjà chargée dans le cache binaire
+
+    Args:
+        tmx_data (pytmx.TiledMap): Carte chargée par pytmx.util_pygame.load_pygame
+        tmx_path (str): Chemin du fichier .tmx source
+        cache_path (str): Fichier de cache à écrire (par défaut dans .map_cache/)
+
+    Returns:
+        str: Chemin du fichier de cache écrit
+    """
+    cache_path = cache_path or get_cache_path(tmx_path)
+    width, height = tmx_data.width, tmx_data.height
+    tilewidth, tileheight = tmx_data.tilewidth, tmx_data.tileheight
+
+    # Calques de tuiles et ensemble des gids réellement utilisés
+    layers = []
+    layer_blobs = []
+    used_gids = set()
+    for layer in tmx_data.layers:
+        if not hasattr(layer, 'data'):
+            continue
+        data = array('I', (gid for row in layer.data for gid in row))
+        used_gids.update(data)
+        layers.append({'name': layer.name, 'visible': bool(getattr(layer, 'visible', True))})
+        layer_blobs.append(data.tobytes())
+    used_gids.discard(0)
+
+    atlas_blob, atlas_meta = build_atlas(tmx_data, used_gids)
+
+    blobs = layer_blobs + [atlas_blob]
+    meta = {
+        'dependencies': fingerprint(find_dependencies(tmx_path)),
+        'width': width,
+        'height': height,
+        'tilewidth': tilewidth,
+        'tileheight': tileheight,
+        'layers': layers,
+        'tilesets': tilesets_meta(tmx_data),
+        'properties': build_properties(tmx_data, used_gids),
+        'atlas': atlas_meta,
+        'blob_sizes': [len(blob) for blob in blobs],
+    }
+    meta_blob = json.dumps(meta, separators=(',', ':')).encode("utf-8")
+
+    # Écriture atomique pour ne jamais laisser un cache tronqué
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as cache_file:
+        cache_file.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(meta_blob)))
+        cache_file.write(meta_blob)
+        for blob in blobs:
+            cache_file.write(blob)
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def load_compiled_map(tmx_path, cache_path=None):
+    """
+    Charge une carte depuis le cache si celui-ci est à jour
+
+    Args:
+        tmx_path (str): Chemin du fichier .tmx source
+        cache_path (str): Fichier de cache à lire (par défaut dans .map_cache/)
+
+    Returns:
+        CompiledMap: La carte compilée, ou None si le cache est absent, périmé ou invalide
+    """
+    cache_path = cache_path or get_cache_path(tmx_path)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            magic, version, meta_size = _HEADER.unpack(cache_file.read(_HEADER.size))
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return None
+            meta = json.loads(cache_file.read(meta_size).decode("utf-8"))
+            if not is_fresh(meta['dependencies']):
+                return None
+            blobs = [cache_file.read(size) for size in meta['blob_sizes']]
+
+        width, height = meta['width'], meta['height']
+        tilewidth, tileheight = meta['tilewidth'], meta['tileheight']
+        # Un fichier tronqué donne des blocs plus courts qu'annoncé
+        _check_blob_sizes(meta, blobs)
+
+        layers = []
+        for layer_meta, blob in zip(meta['layers'], blobs):
+            data = array('I')
+            data.frombytes(blob)
+            layers.append(CompiledLayer(layer_meta['name'], width, height, data, layer_meta['visible']))
+
+        tile_images = load_atlas(blobs[-1], meta['atlas'], tilewidth, tileheight)
+        tilesets = [CompiledTileset(t['name'], t['source'], t['firstgid']) for t in meta['tilesets']]
+        properties = {int(gid): props for gid, props in meta['properties'].items()}
+    except (OSError, ValueError, KeyError, TypeError, IndexError, struct.error, pygame.error) as e:
+        print(f"Cache de carte illisible ({cache_path}) : {e}")
+        return None
+
+    return CompiledMap(tmx_path, width, height, tilewidth, tileheight, layers, tilesets, tile_images, properties)
+
+
+def _check_blob_sizes(meta, blobs):
+    """
+    Vérifie la taille des blocs lus : un calque par case, puis l'atlas en RGBA
+
+    Raises:
+        ValueError: Bloc manquant ou de taille inattendue
+    """
+    layer_size = meta['width'] * meta['height'] * array('I').itemsize
+    atlas_width, atlas_height = meta['atlas']['size']
+    expected = [layer_size] * len(meta['layers']) + [atlas_width * atlas_height * 4]
+    if len(blobs) != len(expected) or len(meta['blob_sizes']) != len(expected):
+        raise ValueError(f"{len(blobs)} blocs au lieu de {len(expected)}")
+    for index, (blob, announced, size) in enumerate(zip(blobs, meta['blob_sizes'], expected)):
+        if len(blob) != announced or announced != size:
+            raise ValueError(f"bloc {index} de {len(blob)} octets au lieu de {size}")
+
+
+if __name__ == "__main__":
+    # Compilation hors jeu : python -m game.map_cache assets/mapV3.tmx
+    import sys
+    from pytmx.util_pygame import load_pygame
+
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    for path in sys.argv[1:]:
+        written = compile_map(load_pygame(path), path)
+        print(f"Carte {path} compilée dans {written}")
+    pygame.quit()
@@ -0,0 +1,251 @@
+"""
+Recherche de chemin A* sur la grille des collisions.
+
+Les tableaux de la recherche (coût depuis le départ, parent, état de chaque case) sont
+alloués une fois par carte et réutilisés d'une requête à l'autre : au lieu de les remettre
+à zéro, chaque recherche porte un numéro et une case n'est valable que si elle a été
+marquée par la recherche en cours. La file de priorité est un tas binaire (heapq).
+
+Les chemins récents sont gardés dans un cache LRU, vidé dès qu'une case de la grille
+change (CollisionGrid.version) : les requêtes répétées (PNJ qui suivent le joueur,
+clics successifs) ne coûtent qu'une recherche dans un dictionnaire.
+
+Sur une carte en streaming (ChunkStreamer), les obstacles ne sont pas copiés : chaque case
+est lue à la demande dans les chunks en mémoire, et les cases des chunks absents sont
+bloquantes. Les tableaux de la recherche sont alors des dictionnaires limités aux cases
+visitées, et le cache est vidé à chaque chunk chargé ou évincé (ChunkStreamer.version).
+
+Déplacements :
+- 4 directions (comme le joueur) avec l'heuristique de Manhattan ;
+- 8 directions avec l'heuristique octile, sans couper les coins des obstacles.
+"""
+
+import heapq
+import math
+from collections import OrderedDict, defaultdict
+from typing import List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+# Nombre de chemins gardés en cache par défaut
+DEFAULT_CACHE_SIZE = 256
+
+_SQRT2 = math.sqrt(2)
+
+
+class _StreamedObstacles:
+    """Obstacles d'une carte en streaming, lus à la demande par indice de case"""
+
+    def __init__(self, streamer, width):
+        self.streamer = streamer
+        self.width = width
+        self._known = {}
+
+    def __getitem__(self, index):
+        blocked = self._known.get(index)
+        if blocked is None:
+            blocked = self.streamer.is_blocked_in_memory(index % self.width, index // self.width)
+            self._known[index] = blocked
+        return blocked
+
+
+class Pathfinder:
+    """Recherche de chemins sur une grille de collisions (CollisionGrid ou ChunkStreamer)"""
+
+    def __init__(self, grid, diagonal: bool = False, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            grid: Grille des collisions : CollisionGrid (obstacles copiés via blocked_cells)
+                ou ChunkStreamer (obstacles lus à la demande via is_blocked_in_memory)
+            diagonal (bool): Autorise les déplacements en diagonale
+            cache_size (int): Nombre de chemins gardés en cache (0 pour désactiver)
+        """
+        self.grid = grid
+        self.diagonal = diagonal
+        self.cache_size = cache_size
+        self.width = grid.width
+        self.height = grid.height
+        self.streamed = not hasattr(grid, 'blocked_cells')
+
+        # Tableaux réutilisés par toutes les recherches
+        if self.streamed:
+            # Carte en streaming : seules les cases visitées sont stockées
+            self._g = {}
+            self._parent = {}
+            self._opened = defaultdict(int)
+            self._closed = defaultdict(int)
+        else:
+            size = self.width * self.height
+            self._g = [0.0] * size
+            self._parent = [-1] * size
+            self._opened = [0] * size
+            self._closed = [0] * size
+        self._search_id = 0
+
+        self._blocked = None
+        self._grid_version = None
+        self._cache = OrderedDict()
+
+        # Compteurs
+        self.searches = 0
+        self.cache_hits = 0
+        self.expanded = 0
+
+    def _refresh(self):
+        """Relit les obstacles et vide le cache si la grille a changé"""
+        version = getattr(self.grid, 'version', 0)
+        if self._blocked is not None and version == self._grid_version:
+            return
+        if self.streamed:
+            self._blocked = _StreamedObstacles(self.grid, self.width)
+            # Les cases des chunks évincés ne sont plus utiles
+            for table in (self._g, self._parent, self._opened, self._closed):
+                table.clear()
+        else:
+            self._blocked = self.grid.blocked_cells()
+        self._grid_version = version
+        self._cache.clear()
+
+    def invalidate(self):
+        """Oublie les obstacles et les chemins en cache (grille modifiée sans numéro de version)"""
+        self._blocked = None
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """Vérifie qu'une case est dans la carte et ne bloque pas le passage"""
+        self._refresh()
+        return 0 <= x < self.width and 0 <= y < self.height and not self._blocked[y * self.width + x]
+
+    def find_path(self, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """
+        Calcule le plus court chemin entre deux cases
+
+        Args:
+            start (tuple): Case de départ (x, y)
+            goal (tuple): Case d'arrivée (x, y)
+
+        Returns:
+            list: Cases à parcourir, départ exclu et arrivée incluse ([] si départ == arrivée),
+                None si l'arrivée est bloquée ou inaccessible
+        """
+        self._refresh()
+        start = (int(start[0]), int(start[1]))
+        goal = (int(goal[0]), int(goal[1]))
+        key = (start, goal)
+        cached = self._cache.get(key)
+        if cached is not None or key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return list(cached) if cached is not None else None
+
+        path = self._search(start, goal)
+        if self.cache_size:
+            self._cache[key] = tuple(path) if path is not None else None
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return path
+
+    def _search(self, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """Recherche A* proprement dite"""
+        width, height = self.width, self.height
+        if not (0 <= start[0] < width and 0 <= start[1] < height):
+            return None
+        if not (0 <= goal[0] < width and 0 <= goal[1] < height):
+            return None
+        blocked = self._blocked
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        if blocked[goal_index]:
+            return None
+        if start_index == goal_index:
+            return []
+
+        self.searches += 1
+        self._search_id += 1
+        search_id = self._search_id
+        g_cost, parent, opened, closed = self._g, self._parent, self._opened, self._closed
+        goal_x, goal_y = goal
+        diagonal = self.diagonal
+
+        g_cost[start_index] = 0.0
+        parent[start_index] = -1
+        opened[start_index] = search_id
+        heap = [(0.0, 0.0, start_index)]
+        push, pop = heapq.heappush, heapq.heappop
+        expanded = 0
+
+        while heap:
+            _, _, current = pop(heap)
+            if closed[current] == search_id:
+                continue
+            if current == goal_index:
+                break
+            closed[current] = search_id
+            expanded += 1
+            cx = current % width
+            cy = current // width
+            base = g_cost[current]
+
+            # Voisins orthogonaux (et libertés de passage pour les diagonales)
+            free_left = cx > 0 and not blocked[current - 1]
+            free_right = cx < width - 1 and not blocked[current + 1]
+            free_up = cy > 0 and not blocked[current - width]
+            free_down = cy < height - 1 and not blocked[current + width]
+            neighbours = []
+            if free_left:
+                neighbours.append((current - 1, cx - 1, cy, 1.0))
+            if free_right:
+                neighbours.append((current + 1, cx + 1, cy, 1.0))
+            if free_up:
+                neighbours.append((current - width, cx, cy - 1, 1.0))
+            if free_down:
+                neighbours.append((current + width, cx, cy + 1, 1.0))
+            if diagonal:
+                # Une diagonale n'est possible que si les deux cases qu'elle longe sont libres
+                if free_left and free_up and not blocked[current - width - 1]:
+                    neighbours.append((current - width - 1, cx - 1, cy - 1, _SQRT2))
+                if free_right and free_up and not blocked[current - width + 1]:
+                    neighbours.append((current - width + 1, cx + 1, cy - 1, _SQRT2))
+                if free_left and free_down and not blocked[current + width - 1]:
+                    neighbours.append((current + width - 1, cx - 1, cy + 1, _SQRT2))
+                if free_right and free_down and not blocked[current + width + 1]:
+                    neighbours.append((current + width + 1, cx + 1, cy + 1, _SQRT2))
+
+            for index, nx, ny, step in neighbours:
+                if closed[index] == search_id:
+                    continue
+                cost = base + step
+                if opened[index] == search_id and cost >= g_cost[index]:
+                    continue
+                opened[index] = search_id
+                g_cost[index] = cost
+                parent[index] = current
+                dx = abs(nx - goal_x)
+                dy = abs(ny - goal_y)
+                if diagonal:
+                    # Distance octile
+                    h = max(dx, dy) + (_SQRT2 - 1) * min(dx, dy)
+                else:
+                    # Distance de Manhattan
+                    h = dx + dy
+                push(heap, (cost + h, h, index))
+        else:
+            self.expanded += expanded
+            return None
+
+        self.expanded += expanded
+        path = []
+        index = goal_index
+        while index != start_index:
+            path.append((index % width, index // width))
+            index = parent[index]
+        path.reverse()
+        return path
+
+    def cache_info(self) -> dict:
+        """Compteurs de la recherche et du cache"""
+        return {
+            'searches': self.searches,
+            'cache_hits': self.cache_hits,
+            'cached_paths': len(self._cache),
+            'expanded': self.expanded,
+        }
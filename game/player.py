@@ -2,6 +2,7 @@ import os
 import pygame
 from .factions import FactionName, FACTIONS
 from .inventory import Inventory
+from .texture_atlas import get_atlas
 
 class Player:
     RACES = {
@@ -57,6 +58,9 @@ class Player:
         # nom du joueur
         self.name = name
 
+        # Identifiant en base, connu après la première sauvegarde
+        self.db_id = None
+
         # position du joueur
         self.x = x
         self.y = y
@@ -130,23 +134,11 @@ class Player:
         if not os.path.exists(sprite_path):
             raise ValueError(f"Sprite non trouvé : {sprite_path}")
             
-        # Charger l'image de base
-        base_sprite = pygame.image.load(sprite_path).convert_alpha()
-        sprite_width = base_sprite.get_width() // 4  # 4 frames par direction
-        sprite_height = base_sprite.get_height() // 4  # 4 directions
-        
-        # Découper le spritesheet pour chaque direction et frame
+        # Découper le spritesheet (4 frames par direction, 4 directions) dans l'atlas partagé
+        frames = get_atlas().load_sheet(sprite_path, 4, 4)
         directions = ["down", "left", "right", "up"]
         for dir_idx, direction in enumerate(directions):
-            sprites[direction] = []
-            for frame in range(4):
-                # Extraire la frame du spritesheet
-                frame_surface = pygame.Surface((sprite_width, sprite_height), pygame.SRCALPHA)
-                frame_surface.blit(base_sprite, 
-                                 (0, 0), 
-                                 (frame * sprite_width, dir_idx * sprite_height, 
-                                  sprite_width, sprite_height))
-                sprites[direction].append(frame_surface)
+            sprites[direction] = frames[dir_idx]
         
         return sprites
 
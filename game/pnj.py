@@ -3,6 +3,7 @@ from game.factions import Faction
 import os
 import math
 from game.dialogue_system import DialogueSystem
+from game.texture_atlas import get_atlas
 import game.quest_system as quest_system
 
 class PNJ:
@@ -35,25 +36,13 @@ class PNJ:
             print(f"Taille du fichier: {os.path.getsize(sprite_path)} bytes")
         
         try:
-            sprite_sheet = pygame.image.load(sprite_path).convert_alpha()
-            sprites = {
-                "down": [],
-                "left": [],
-                "right": [],
-                "up": []
-            }
-            
-            # Dimensions correctes pour le découpage
-            frame_width = sprite_sheet.get_width() // 4
-            frame_height = sprite_sheet.get_height() // 4
-            
+            # Planche découpée dans l'atlas partagé (4 frames, 4 directions)
+            frames = get_atlas().load_sheet(sprite_path, 4, 4)
+            sprites = {}
             for row, direction in enumerate(["down", "left", "right", "up"]):
-                frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
                 # Ne prendre que la première frame de chaque direction pour éviter l'animation
-                frame.blit(sprite_sheet, (0, 0), 
-                         (0, row * frame_height, frame_width, frame_height))
                 # Utiliser la même frame 4 fois pour maintenir la compatibilité
-                sprites[direction] = [frame] * 4
+                sprites[direction] = [frames[row][0]] * 4
             
             return sprites
         except pygame.error as e:
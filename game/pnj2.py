@@ -1,6 +1,10 @@
 import pygame
 from game.pnj import PNJ
 from game.items import ITEMS
+from game.trace import get_channel
+
+# Traces des PNJ (désactivées par défaut, voir game/trace.py)
+trace = get_channel("pnj")
 
 class PNJ2(PNJ):
     """
@@ -53,17 +57,10 @@ class PNJ2(PNJ):
         Surcharge pour désactiver le dialogue tout en mettant à jour la direction du PNJ
         pour qu'il regarde toujours vers le joueur.
         """
-        # Debug: afficher les positions
-        print(f"PNJ2 position: ({self.tile_x}, {self.tile_y})")
-        print(f"Player position: ({player.x}, {player.y})")
-        
         # Calculer les différences en tuiles
         dx = player.x - self.tile_x
         dy = player.y - self.tile_y
         
-        # Debug: afficher les différences
-        print(f"Différences - dx: {dx}, dy: {dy}")
-        
         # Mettre à jour la direction en fonction de la plus grande différence
         old_direction = self.current_direction
         if abs(dx) > abs(dy):
@@ -71,9 +68,9 @@ class PNJ2(PNJ):
         else:
             self.current_direction = "down" if dy > 0 else "up"
             
-        # Debug: afficher le changement de direction
         if old_direction != self.current_direction:
-            print(f"PNJ2 change de direction: {old_direction} -> {self.current_direction}")
+            trace.debug("PNJ2 change de direction : %s -> %s (dx=%s, dy=%s)",
+                        old_direction, self.current_direction, dx, dy)
         
         return False
 
@@ -86,17 +83,13 @@ class PNJ2(PNJ):
         screen_x = self.tile_x * self.TILE_SIZE - camera_x
         screen_y = self.tile_y * self.TILE_SIZE - camera_y
         
-        # Debug: afficher la position de rendu
-        print(f"PNJ2 rendu à la position écran: ({screen_x}, {screen_y})")
-        print(f"Direction actuelle: {self.current_direction}")
-        
         screen_rect = screen.get_rect()
         sprite_rect = pygame.Rect(screen_x, screen_y, self.SPRITE_SIZE, self.SPRITE_SIZE)
         
         if screen_rect.colliderect(sprite_rect):
             current_sprite = self.sprites[self.current_direction][0]
             screen.blit(current_sprite, (screen_x, screen_y))
-            print("PNJ2 affiché avec succès")
+            trace.debug("PNJ2 rendu en (%s, %s), direction %s", screen_x, screen_y, self.current_direction)
 
     def start_dialogue(self):
         """Surcharge pour désactiver le dialogue"""
@@ -0,0 +1,332 @@
+"""
+Profileur d'images affiché en surimpression (touche F3).
+
+Mesure à chaque image la durée des phases de la boucle principale (événements, mise à
+jour, rendu et ses sous-étapes, présentation) et en garde un historique glissant pour
+afficher moyennes, percentiles p50/p95/p99 et histogramme des durées d'image.
+
+La touche F3 fait défiler trois modes :
+- désactivé : les sections mesurées ne coûtent qu'un appel de méthode ;
+- durées : mesures et surimpression ;
+- durées + compteurs : compte aussi les blits et les allocations de Surface. Ce mode
+  installe un hook sys.setprofile, ce qui ralentit le jeu : ses durées sont indicatives.
+"""
+
+import sys
+import time
+from collections import deque
+
+import pygame
+
+# Phases affichées, dans l'ordre : boucle principale puis sous-étapes du rendu
+PHASES = ("events", "update", "render", "map", "items", "player", "npcs", "ui", "flip")
+RENDER_STAGES = ("map", "items", "player", "npcs", "ui")
+
+PHASE_LABELS = {
+    "events": "Événements",
+    "update": "Mise à jour",
+    "render": "Rendu",
+    "map": "  carte",
+    "items": "  objets",
+    "player": "  joueur",
+    "npcs": "  PNJ",
+    "ui": "  interface",
+    "flip": "Présentation",
+}
+
+# Méthodes C comptées comme des blits ou des allocations de surface
+_BLIT_METHODS = frozenset(("blit", "blits", "fblits"))
+_SURFACE_ALLOCATING_METHODS = frozenset(("copy", "convert", "convert_alpha", "subsurface"))
+
+
+def percentile(sorted_values, percent):
+    """
+    Retourne le percentile d'une liste triée (plus proche rang)
+
+    Args:
+        sorted_values (list): Valeurs triées
+        percent (float): Percentile voulu, entre 0 et 100
+
+    Returns:
+        float: La valeur du percentile (0 pour une liste vide)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = int(round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+class _NullSection:
+    """Section sans effet utilisée quand le profileur est désactivé"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class _Section:
+    """Mesure la durée d'un bloc et l'ajoute à la phase correspondante"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """Collecte des durées par phase et affichage de la surimpression"""
+    OFF = 0
+    TIMINGS = 1
+    COUNTERS = 2
+
+    def __init__(self, history=300, refresh_interval=15):
+        """
+        Args:
+            history (int): Nombre d'images conservées pour les statistiques
+            refresh_interval (int): Nombre d'images entre deux mises à jour de la surimpression
+        """
+        self.mode = self.OFF
+        self.history = history
+        self.refresh_interval = refresh_interval
+        self.phase_times = {phase: deque(maxlen=history) for phase in PHASES}
+        self.frame_times = deque(maxlen=history)
+        self.counts = {'blits': 0, 'surfaces': 0}
+        self.count_history = {name: deque(maxlen=history) for name in self.counts}
+        self._current = {}
+        self._frame_start = None
+        self._mark = 0.0
+        self._frames_since_refresh = 0
+        self._overlay = None
+        self._font = None
+        self._null_section = _NullSection()
+        self._original_surface = None
+        self._counting = False
+
+    @property
+    def active(self):
+        """Vrai si le profileur mesure"""
+        return self.mode != self.OFF
+
+    def set_mode(self, mode):
+        """Change de mode et installe ou retire les compteurs"""
+        if mode == self.mode:
+            return
+        if self.mode == self.COUNTERS:
+            self._uninstall_counters()
+        self.mode = mode
+        self.reset()
+        if mode == self.COUNTERS:
+            self._install_counters()
+
+    def toggle(self):
+        """Passe au mode suivant : désactivé -> durées -> durées + compteurs -> désactivé"""
+        self.set_mode((self.mode + 1) % 3)
+
+    def reset(self):
+        """Oublie l'historique des mesures"""
+        for samples in self.phase_times.values():
+            samples.clear()
+        self.frame_times.clear()
+        for samples in self.count_history.values():
+            samples.clear()
+        self._current = {}
+        self._frame_start = None
+        self._overlay = None
+
+    # ------------------------------------------------------------------
+    #   Mesures
+    # ------------------------------------------------------------------
+    def section(self, name):
+        """
+        Retourne un gestionnaire de contexte qui mesure un bloc
+
+        Args:
+            name (str): Phase mesurée (voir PHASES)
+        """
+        if self.mode == self.OFF:
+            return self._null_section
+        return _Section(self, name)
+
+    def add_time(self, name, seconds):
+        """Ajoute une durée à une phase de l'image en cours"""
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def mark(self):
+        """Point de départ des étapes mesurées par lap()"""
+        if self.mode != self.OFF:
+            self._mark = time.perf_counter()
+
+    def lap(self, name):
+        """
+        Attribue le temps écoulé depuis le dernier mark() ou lap() à une phase
+
+        Permet de découper une longue méthode (le rendu d'une scène) en étapes sans
+        l'indenter dans des blocs with.
+
+        Args:
+            name (str): Phase mesurée (voir PHASES)
+        """
+        if self.mode != self.OFF:
+            now = time.perf_counter()
+            self.add_time(name, now - self._mark)
+            self._mark = now
+
+    def begin_frame(self):
+        """Début d'une image"""
+        if self.mode == self.OFF:
+            return
+        self._current = {}
+        self._frame_start = time.perf_counter()
+        self.counts['blits'] = 0
+        self.counts['surfaces'] = 0
+        self._counting = True
+
+    def end_frame(self):
+        """Fin d'une image : archive les mesures dans l'historique"""
+        if self.mode == self.OFF or self._frame_start is None:
+            return
+        self._counting = False
+        self.frame_times.append(time.perf_counter() - self._frame_start)
+        for phase in PHASES:
+            self.phase_times[phase].append(self._current.get(phase, 0.0))
+        if self.mode == self.COUNTERS:
+            for name, value in self.counts.items():
+                self.count_history[name].append(value)
+        self._frame_start = None
+        self._frames_since_refresh += 1
+
+    def frame_percentiles(self):
+        """Retourne (p50, p95, p99) des durées d'image en millisecondes"""
+        values = sorted(self.frame_times)
+        return tuple(percentile(values, p) * 1000 for p in (50, 95, 99))
+
+    def phase_stats(self, phase):
+        """Retourne (moyenne, maximum) d'une phase en millisecondes"""
+        samples = self.phase_times[phase]
+        if not samples:
+            return 0.0, 0.0
+        return sum(samples) / len(samples) * 1000, max(samples) * 1000
+
+    # ------------------------------------------------------------------
+    #   Compteurs de blits et d'allocations
+    # ------------------------------------------------------------------
+    def _install_counters(self):
+        """Remplace pygame.Surface par une sous-classe comptée et installe le hook"""
+        profiler = self
+        original_surface = pygame.Surface
+        self._original_surface = original_surface
+
+        class CountingSurface(original_surface):
+            def __init__(self, *args, **kwargs):
+                if profiler._counting:
+                    profiler.counts['surfaces'] += 1
+                super().__init__(*args, **kwargs)
+
+        pygame.Surface = CountingSurface
+        sys.setprofile(self._profile_hook)
+
+    def _uninstall_counters(self):
+        """Rétablit pygame.Surface et retire le hook"""
+        sys.setprofile(None)
+        if self._original_surface is not None:
+            pygame.Surface = self._original_surface
+            self._original_surface = None
+
+    def _profile_hook(self, frame, event, arg):
+        """Compte les appels C qui blittent ou créent une surface"""
+        if event != 'c_call' or not self._counting:
+            return
+        owner = getattr(arg, '__self__', None)
+        name = arg.__name__
+        if isinstance(owner, self._original_surface):
+            if name in _BLIT_METHODS:
+                self.counts['blits'] += 1
+            elif name in _SURFACE_ALLOCATING_METHODS:
+                self.counts['surfaces'] += 1
+        elif owner is pygame.transform or (name == 'render' and isinstance(owner, pygame.font.Font)):
+            self.counts['surfaces'] += 1
+
+    # ------------------------------------------------------------------
+    #   Surimpression
+    # ------------------------------------------------------------------
+    def render(self, screen):
+        """Dessine la surimpression en haut à droite de l'écran"""
+        if self.mode == self.OFF:
+            return
+        # Ce que dessine le profileur n'est pas compté
+        counting = self._counting
+        self._counting = False
+        if self._overlay is None or self._frames_since_refresh >= self.refresh_interval:
+            self._overlay = self._build_overlay()
+            self._frames_since_refresh = 0
+        screen.blit(self._overlay, (screen.get_width() - self._overlay.get_width() - 10, 10))
+        self._counting = counting
+
+    def _build_overlay(self):
+        """Construit la surface de la surimpression à partir de l'historique"""
+        surface_class = self._original_surface or pygame.Surface
+        if self._font is None:
+            self._font = pygame.font.SysFont("arial", 14)
+        font = self._font
+        line_height = font.get_linesize()
+
+        lines = []
+        p50, p95, p99 = self.frame_percentiles()
+        lines.append((f"Image  p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f} ms", (255, 255, 0)))
+        for phase in PHASES:
+            mean, peak = self.phase_stats(phase)
+            lines.append((f"{PHASE_LABELS[phase]:<14} {mean:6.2f} ms  max {peak:6.2f}", (220, 220, 220)))
+        if self.mode == self.COUNTERS:
+            for name, label in (('blits', "Blits"), ('surfaces', "Surfaces créées")):
+                samples = self.count_history[name]
+                mean = sum(samples) / len(samples) if samples else 0
+                lines.append((f"{label:<14} {mean:6.1f} / image", (150, 200, 255)))
+
+        # Histogramme des durées d'image par tranches de 2 ms (la dernière regroupe le reste)
+        bucket_count, bucket_ms = 17, 2
+        buckets = [0] * bucket_count
+        for value in self.frame_times:
+            buckets[min(bucket_count - 1, int(value * 1000 // bucket_ms))] += 1
+        histogram_height = 40
+
+        width = 280
+        height = 10 + line_height * len(lines) + histogram_height + 25
+        overlay = surface_class((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        y = 5
+        for text, color in lines:
+            overlay.blit(font.render(text, True, color), (8, y))
+            y += line_height
+
+        y += 5
+        tallest = max(buckets) or 1
+        bar_width = (width - 16) // bucket_count
+        for index, count in enumerate(buckets):
+            bar_height = int(histogram_height * count / tallest)
+            # Vert sous 16,7 ms (60 images/s), orange jusqu'à 33 ms, rouge au-delà
+            limit = (index + 1) * bucket_ms
+            color = (80, 200, 80) if limit <= 17 else (230, 160, 40) if limit <= 33 else (220, 60, 60)
+            pygame.draw.rect(overlay, color, (8 + index * bar_width, y + histogram_height - bar_height,
+                                              bar_width - 1, bar_height))
+        overlay.blit(font.render(f"0 – {bucket_count * bucket_ms} ms", True, (180, 180, 180)),
+                     (8, y + histogram_height + 2))
+        return overlay
+
+
+# Profileur partagé par la boucle principale et les scènes
+_profiler = FrameProfiler()
+
+
+def get_profiler():
+    """Retourne le profileur d'images partagé"""
+    return _profiler
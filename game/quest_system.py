@@ -95,6 +95,7 @@ def advance_quest_if_done():
     Vérifie l'état des quêtes et met à jour current_quest_index automatiquement.
     """
     global current_quest_index
+    previous_index = current_quest_index
     
     print("\n=== État du système de quêtes ===")
     print(f"État des quêtes:")
@@ -129,6 +130,10 @@ def advance_quest_if_done():
     
     print(f"Nouvel index de quête: {current_quest_index}")
     print("================================\n")
+    
+    # Sauvegarde automatique à chaque progression
+    if current_quest_index != previous_index and _game_scene is not None:
+        _game_scene.save_game("quête")
 
 # Utilisation :
 # 1. Dans votre code, importez ces variables : from game.quest_system import quest1_done, current_quest_index, etc.
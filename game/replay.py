@@ -0,0 +1,282 @@
+"""
+Enregistrement et rejeu des entrées du joueur.
+
+Une session enregistrée contient la graine du générateur aléatoire (issue des combats,
+fuite dans « Fuir », apparitions...) puis, pour chaque image, le temps de jeu et les
+événements d'entrée reçus par Game.handle_events. Le rejeu réinjecte exactement ces
+événements avec le même temps de jeu (horloge simulée) : la partie se déroule à
+l'identique, ce qui permet de mesurer la même session sur plusieurs versions du jeu.
+
+Format du fichier (.rpl) : un en-tête fixe suivi d'un flux zlib d'images
+    en-tête : "<4sHQ"  signature b"RPLY", version, graine
+    image   : "<HH"    écart de temps en ms depuis l'image précédente, nombre d'événements
+    événement : "<HH"  type pygame, taille, puis attributs en JSON
+
+Configuration par variables d'environnement :
+    RPG_RECORD="session.rpl"          enregistre la partie
+    RPG_REPLAY="session.rpl"          rejoue une session (les entrées réelles sont ignorées)
+    RPG_REPLAY_FRAMES="frames.csv"    durées d'image mesurées pendant le rejeu
+
+Comparaison de deux mesures :
+    python -m game.replay compare avant.csv apres.csv
+"""
+
+import json
+import os
+import random
+import struct
+import time
+import zlib
+
+import pygame
+
+from game.profiler import percentile
+
+MAGIC = b"RPLY"
+VERSION = 1
+HEADER = struct.Struct("<4sHQ")
+FRAME = struct.Struct("<HH")
+EVENT = struct.Struct("<HH")
+
+# Événements enregistrés : ceux que traitent la boucle principale et les scènes
+RECORDED_EVENT_TYPES = frozenset((
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.VIDEORESIZE,
+))
+
+
+def encode_event(event):
+    """Sérialise les attributs simples d'un événement pygame"""
+    attributes = {
+        name: value for name, value in event.dict.items()
+        if isinstance(value, (bool, int, float, str, tuple, list))
+    }
+    return json.dumps(attributes, separators=(",", ":")).encode("utf-8")
+
+
+def decode_event(event_type, payload):
+    """Reconstruit un événement pygame (les listes JSON redeviennent des tuples)"""
+    attributes = json.loads(payload.decode("utf-8"))
+    for name, value in attributes.items():
+        if isinstance(value, list):
+            attributes[name] = tuple(value)
+    return pygame.event.Event(event_type, attributes)
+
+
+class InputRecorder:
+    """Enregistre les entrées de chaque image dans un fichier de session"""
+
+    def __init__(self, path, seed=None, flush_every=600):
+        """
+        Args:
+            path (str): Fichier de session à écrire
+            seed (int): Graine du générateur aléatoire, tirée au hasard si None
+            flush_every (int): Nombre d'images entre deux écritures sur disque
+        """
+        self.path = path
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        random.seed(self.seed)
+        self.flush_every = flush_every
+        self.frames = 0
+        # Temps relatif au lancement du jeu (écarts bornés à 65 s)
+        self._last_ms = 0
+        self._compressor = zlib.compressobj(9)
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.seed))
+
+    def record_frame(self, time_ms, events):
+        """
+        Ajoute une image à la session
+
+        Args:
+            time_ms (int): Temps de jeu au début de l'image
+            events (list): Événements pygame reçus pendant l'image
+        """
+        delta = max(0, min(0xFFFF, time_ms - self._last_ms))
+        self._last_ms += delta
+        recorded = [event for event in events if event.type in RECORDED_EVENT_TYPES]
+        parts = [FRAME.pack(delta, len(recorded))]
+        for event in recorded:
+            payload = encode_event(event)
+            parts.append(EVENT.pack(event.type, len(payload)))
+            parts.append(payload)
+        self._file.write(self._compressor.compress(b"".join(parts)))
+        self.frames += 1
+        # Écriture régulière : une session interrompue reste exploitable
+        if self.frames % self.flush_every == 0:
+            self._file.write(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+            self._file.flush()
+
+    def close(self):
+        """Termine le flux compressé et ferme le fichier"""
+        if self._file is None:
+            return
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        self._file = None
+        print(f"Session enregistrée dans {self.path} ({self.frames} images)", flush=True)
+
+
+def load_session(path):
+    """
+    Lit un fichier de session
+
+    Args:
+        path (str): Fichier .rpl
+
+    Returns:
+        tuple: (graine, liste de (temps en ms, événements) par image)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} n'est pas une session enregistrée (version {VERSION})")
+    # Une session interrompue n'a pas de fin de flux : on lit ce qui est complet
+    stream = zlib.decompressobj().decompress(data[HEADER.size:])
+
+    frames = []
+    time_ms = 0
+    offset = 0
+    while offset + FRAME.size <= len(stream):
+        delta, count = FRAME.unpack_from(stream, offset)
+        frame_end = offset + FRAME.size
+        events = []
+        for _ in range(count):
+            if frame_end + EVENT.size > len(stream):
+                break
+            event_type, size = EVENT.unpack_from(stream, frame_end)
+            frame_end += EVENT.size
+            if frame_end + size > len(stream):
+                break
+            events.append(decode_event(event_type, stream[frame_end:frame_end + size]))
+            frame_end += size
+        if len(events) < count:
+            break
+        time_ms += delta
+        frames.append((time_ms, events))
+        offset = frame_end
+    return seed, frames
+
+
+class InputReplayer:
+    """Rejoue une session et mesure la durée de chaque image"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Fichier de session à rejouer
+        """
+        self.path = path
+        self.seed, self.frames = load_session(path)
+        random.seed(self.seed)
+        self.position = 0
+        self.frame_times = []
+        self._frame_start = None
+
+    @property
+    def finished(self):
+        """Vrai quand toutes les images ont été rejouées"""
+        return self.position >= len(self.frames)
+
+    def next_frame(self):
+        """Retourne (temps en ms, événements) de l'image suivante"""
+        frame = self.frames[self.position]
+        self.position += 1
+        return frame
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self._frame_start is not None:
+            self.frame_times.append(time.perf_counter() - self._frame_start)
+            self._frame_start = None
+
+    def summary(self):
+        """Résumé des durées d'image mesurées (millisecondes)"""
+        return summarize(self.frame_times)
+
+    def write_frame_times(self, path):
+        """Écrit les durées d'image mesurées au format CSV (image, ms)"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("frame,ms\n")
+            for index, seconds in enumerate(self.frame_times):
+                f.write(f"{index},{seconds * 1000:.4f}\n")
+
+
+def summarize(frame_times):
+    """
+    Calcule les statistiques d'une série de durées d'image
+
+    Args:
+        frame_times (list): Durées en secondes
+
+    Returns:
+        dict: frames, mean, p50, p95, p99 et max (millisecondes)
+    """
+    values = sorted(frame_times)
+    if not values:
+        return {'frames': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'frames': len(values),
+        'mean': sum(values) / len(values) * 1000,
+        'p50': percentile(values, 50) * 1000,
+        'p95': percentile(values, 95) * 1000,
+        'p99': percentile(values, 99) * 1000,
+        'max': values[-1] * 1000,
+    }
+
+
+def read_frame_times(path):
+    """Lit un fichier CSV de durées d'image et retourne les durées en secondes"""
+    with open(path, encoding="utf-8") as f:
+        next(f, None)
+        return [float(line.split(",")[1]) / 1000 for line in f if line.strip()]
+
+
+def session_from_env(environ=None):
+    """
+    Crée l'enregistreur ou le lecteur demandé par RPG_RECORD / RPG_REPLAY
+
+    Returns:
+        tuple: (InputRecorder ou None, InputReplayer ou None)
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get("RPG_REPLAY"):
+        return None, InputReplayer(environ["RPG_REPLAY"])
+    if environ.get("RPG_RECORD"):
+        return InputRecorder(environ["RPG_RECORD"]), None
+    return None, None
+
+
+def main(argv=None):
+    """Compare les durées d'image de deux rejeux"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sessions enregistrées du jeu")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare = commands.add_parser("compare", help="Compare des durées d'image (CSV de RPG_REPLAY_FRAMES)")
+    compare.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+
+    reference = None
+    for path in args.files:
+        stats = summarize(read_frame_times(path))
+        line = (f"{path}: {stats['frames']} images, moy {stats['mean']:.2f} ms, "
+                f"p50 {stats['p50']:.2f}, p95 {stats['p95']:.2f}, p99 {stats['p99']:.2f}, max {stats['max']:.2f}")
+        if reference is None:
+            reference = stats
+        elif reference['p50']:
+            line += f" (p50 {100 * (stats['p50'] / reference['p50'] - 1):+.1f} %)"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
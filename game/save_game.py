@@ -0,0 +1,431 @@
+"""
+Sauvegarde complète d'une partie dans des emplacements (slots) binaires versionnés.
+
+Une sauvegarde fige tout ce qui fait la partie : joueur, inventaire (slots stables),
+progression des quêtes (variables de game/quest_system.py), PNJ, items ramassés sur
+la carte et zone de combat. Le format est compact (quelques centaines d'octets) et se lit
+ou s'écrit en bien moins d'une image.
+
+Format d'un fichier (.sav) :
+    en-tête : "<4sHHI"  signature b"RPGS", version, nombre de sections, CRC32 des sections
+    section : "<BH"     étiquette, taille, puis données de la section
+
+Les sections d'étiquette inconnue sont ignorées : une version plus récente du jeu peut en
+ajouter sans casser la lecture. La version n'augmente que si une section change de forme
+(version 2 : identifiant du joueur en base dans PLAYER ; les sauvegardes de la version 1
+restent lisibles).
+Les textes sont codés en UTF-8 précédés de leur taille ("<H").
+
+Utilisation :
+    slots = SaveSlots()
+    slots.save(1, game_state)          # game_state.game_scene : scène de jeu en cours
+    slot = slots.latest()
+    slots.load(slot).restore(game_state)
+"""
+
+import os
+import struct
+import zlib
+
+import game.quest_system as quest_system
+from game.factions import FactionName
+from game.items import ITEMS, Item, ItemType
+
+MAGIC = b"RPGS"
+VERSION = 2
+# Versions lisibles (les plus anciennes sont converties à la lecture)
+READABLE_VERSIONS = (1, 2)
+HEADER = struct.Struct("<4sHHI")
+SECTION = struct.Struct("<BH")
+STRING = struct.Struct("<H")
+
+# Sections
+PLAYER = 1
+INVENTORY = 2
+QUESTS = 3
+NPCS = 4
+MAP_ITEMS = 5
+
+PLAYER_FIELDS = struct.Struct("<ffhhiI")      # x, y, hp, hp max, xp, id en base (0 : aucun)
+PLAYER_FIELDS_V1 = struct.Struct("<ffhhi")    # version 1 : sans id en base
+INVENTORY_FIELDS = struct.Struct("<HHh")      # slots max, nombre d'items, slot équipé (-1 : aucun)
+SLOT_FIELDS = struct.Struct("<HB")            # slot, 1 si item de ITEMS (par clé)
+ITEM_FIELDS = struct.Struct("<i")             # valeur d'un item hors ITEMS
+QUEST_FIELDS = struct.Struct("<Bb")           # quêtes terminées (bits), quête en cours (0 : fini)
+NPC_FIELDS = struct.Struct("<BBhB")           # PNJ visible, PNJ2 visible, HP du PNJ2, zone de combat active
+COUNT = struct.Struct("<H")
+FLAG = struct.Struct("<B")
+
+# Bits de QUEST_FIELDS : quest1_done à quest5_done puis is_enemy_dead
+QUEST_FLAGS = ("quest1_done", "quest2_done", "quest3_done", "quest4_done", "quest5_done", "is_enemy_dead")
+
+DEFAULT_SLOTS = 3
+DEFAULT_SAVE_DIR = "saves"
+
+
+class SaveError(Exception):
+    """Sauvegarde absente, corrompue ou d'une version inconnue"""
+
+
+def _pack_string(text):
+    data = text.encode("utf-8")
+    return STRING.pack(len(data)) + data
+
+
+class _Reader:
+    """Lecture séquentielle des champs d'une section"""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fields):
+        values = fields.unpack_from(self.data, self.offset)
+        self.offset += fields.size
+        return values
+
+    def string(self):
+        (size,) = self.unpack(STRING)
+        text = bytes(self.data[self.offset:self.offset + size]).decode("utf-8")
+        self.offset += size
+        return text
+
+
+def _item_key(item):
+    """Clé de l'item dans ITEMS (même objet), None pour un autre item"""
+    for key, candidate in ITEMS.items():
+        if candidate is item:
+            return key
+    return None
+
+
+class SaveData:
+    """État d'une partie, indépendant des objets pygame (sprites, surfaces)"""
+
+    def __init__(self):
+        self.player = None          # dict : name, race, faction, x, y, hp, max_hp, xp, db_id
+        self.inventory = None       # dict : max_slots, equipped_slot, items [(slot, clé ou spec)]
+        self.quests = {name: False for name in QUEST_FLAGS}
+        self.current_quest_index = 1
+        self.npcs = {'pnj_visible': True, 'pnj2_visible': True, 'pnj2_hp': 100, 'combat_zone': True}
+        self.collected = {}         # clé ITEMS -> ramassé
+
+    # ------------------------------------------------------------------
+    #   Capture et restauration
+    # ------------------------------------------------------------------
+    @classmethod
+    def capture(cls, game_state):
+        """
+        Fige l'état de la partie en cours
+
+        Args:
+            game_state (GameState): État du jeu (game_state.game_scene pour les PNJ)
+
+        Returns:
+            SaveData: Copie de l'état, indépendante de la partie qui continue
+        """
+        save = cls()
+        player = game_state.player
+        if player is not None:
+            save.player = {
+                'name': player.name,
+                'race': player.race,
+                'faction': player.faction.value,
+                'x': player.x,
+                'y': player.y,
+                'hp': player.hp,
+                'max_hp': player.max_hp,
+                'xp': player.xp,
+                # Ligne du joueur en base : le nom ne suffit pas à la retrouver
+                'db_id': player.db_id,
+            }
+            inventory = player.inventory
+            equipped = inventory.equipped_item
+            save.inventory = {
+                'max_slots': inventory.max_slots,
+                'equipped_slot': inventory.slot_of(equipped) if equipped is not None else None,
+                'items': [
+                    (slot, _item_key(item) or (item.name, item.item_type.value, item.value, item.description))
+                    for slot, item in inventory.get_slot_items()
+                ],
+            }
+
+        save.quests = {name: bool(getattr(quest_system, name)) for name in QUEST_FLAGS}
+        save.current_quest_index = quest_system.current_quest_index
+
+        scene = getattr(game_state, 'game_scene', None)
+        if scene is not None:
+            save.npcs = {
+                'pnj_visible': scene.pnj.is_visible,
+                'pnj2_visible': scene.pnj2.is_visible,
+                'pnj2_hp': scene.pnj2.hp,
+                'combat_zone': bool(scene.combat_zone_positions),
+            }
+        save.collected = {key: item.collected for key, item in ITEMS.items() if hasattr(item, 'collected')}
+        return save
+
+    def restore(self, game_state):
+        """
+        Remplace la partie en cours par cet état
+
+        Args:
+            game_state (GameState): État du jeu (game_state.game_scene pour les PNJ)
+        """
+        from game.player import Player
+
+        if self.player is not None:
+            data = self.player
+            player = Player(data['name'], data['x'], data['y'], data['race'], FactionName(data['faction']))
+            player.hp = data['hp']
+            player.max_hp = data['max_hp']
+            player.xp = data['xp']
+            player.db_id = data.get('db_id')
+            if self.inventory is not None:
+                slot_items = []
+                for slot, spec in self.inventory['items']:
+                    if isinstance(spec, str):
+                        # Un item retiré du jeu depuis la sauvegarde est ignoré
+                        if spec in ITEMS:
+                            slot_items.append((slot, ITEMS[spec]))
+                    else:
+                        name, item_type, value, description = spec
+                        slot_items.append((slot, Item(name, ItemType(item_type), description, value)))
+                player.inventory.max_slots = self.inventory['max_slots']
+                player.inventory.restore(slot_items, self.inventory['equipped_slot'])
+            game_state.player = player
+
+        for name, done in self.quests.items():
+            setattr(quest_system, name, done)
+        quest_system.current_quest_index = self.current_quest_index
+        quest_system.hide_victory_message()
+
+        for key, collected in self.collected.items():
+            item = ITEMS.get(key)
+            if item is not None:
+                item.collected = collected
+                item.is_animating = False
+                item.animation = None
+
+        scene = getattr(game_state, 'game_scene', None)
+        if scene is not None:
+            scene.restore_world(self.npcs)
+
+    # ------------------------------------------------------------------
+    #   Format binaire
+    # ------------------------------------------------------------------
+    def to_bytes(self):
+        """Encode l'état au format binaire versionné"""
+        sections = []
+        if self.player is not None:
+            data = self.player
+            sections.append((PLAYER, b"".join((
+                PLAYER_FIELDS.pack(data['x'], data['y'], data['hp'], data['max_hp'], data['xp'],
+                                   data.get('db_id') or 0),
+                _pack_string(data['name']), _pack_string(data['race']), _pack_string(data['faction']),
+            ))))
+        if self.inventory is not None:
+            equipped = self.inventory['equipped_slot']
+            parts = [INVENTORY_FIELDS.pack(self.inventory['max_slots'], len(self.inventory['items']),
+                                           -1 if equipped is None else equipped)]
+            for slot, spec in self.inventory['items']:
+                if isinstance(spec, str):
+                    parts.append(SLOT_FIELDS.pack(slot, 1))
+                    parts.append(_pack_string(spec))
+                else:
+                    name, item_type, value, description = spec
+                    parts.append(SLOT_FIELDS.pack(slot, 0))
+                    parts.append(_pack_string(name))
+                    parts.append(_pack_string(item_type))
+                    parts.append(ITEM_FIELDS.pack(value))
+                    parts.append(_pack_string(description))
+            sections.append((INVENTORY, b"".join(parts)))
+
+        bits = 0
+        for index, name in enumerate(QUEST_FLAGS):
+            if self.quests.get(name):
+                bits |= 1 << index
+        sections.append((QUESTS, QUEST_FIELDS.pack(bits, self.current_quest_index or 0)))
+        npcs = self.npcs
+        sections.append((NPCS, NPC_FIELDS.pack(npcs['pnj_visible'], npcs['pnj2_visible'],
+                                               npcs['pnj2_hp'], npcs['combat_zone'])))
+        parts = [COUNT.pack(len(self.collected))]
+        for key, collected in self.collected.items():
+            parts.append(_pack_string(key))
+            parts.append(FLAG.pack(collected))
+        sections.append((MAP_ITEMS, b"".join(parts)))
+
+        body = b"".join(SECTION.pack(tag, len(payload)) + payload for tag, payload in sections)
+        return HEADER.pack(MAGIC, VERSION, len(sections), zlib.crc32(body)) + body
+
+    @classmethod
+    def from_bytes(cls, data, only=None):
+        """
+        Décode un état binaire
+
+        Args:
+            data (bytes): Contenu d'une sauvegarde
+            only (set): Étiquettes des sections à décoder (toutes si None)
+
+        Returns:
+            SaveData: L'état décodé
+
+        Raises:
+            SaveError: Données tronquées, corrompues ou d'une autre version
+        """
+        if len(data) < HEADER.size:
+            raise SaveError("Sauvegarde tronquée")
+        magic, version, count, checksum = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise SaveError("Ce fichier n'est pas une sauvegarde")
+        if version not in READABLE_VERSIONS:
+            raise SaveError(f"Version de sauvegarde {version} non prise en charge (attendue : {VERSION})")
+        body = memoryview(data)[HEADER.size:]
+        if zlib.crc32(body) != checksum:
+            raise SaveError("Sauvegarde corrompue")
+
+        save = cls()
+        offset = 0
+        try:
+            for _ in range(count):
+                tag, size = SECTION.unpack_from(body, offset)
+                offset += SECTION.size
+                payload = body[offset:offset + size]
+                offset += size
+                if only is None or tag in only:
+                    save._read_section(tag, _Reader(payload), version)
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise SaveError(f"Sauvegarde illisible : {e}")
+        return save
+
+    def _read_section(self, tag, reader, version=VERSION):
+        """Décode une section (les étiquettes inconnues sont ignorées)"""
+        if tag == PLAYER:
+            if version >= 2:
+                x, y, hp, max_hp, xp, db_id = reader.unpack(PLAYER_FIELDS)
+            else:
+                (x, y, hp, max_hp, xp), db_id = reader.unpack(PLAYER_FIELDS_V1), 0
+            self.player = {
+                'name': reader.string(), 'race': reader.string(), 'faction': reader.string(),
+                # Les positions entières restent entières (cases de la carte)
+                'x': int(x) if x.is_integer() else x, 'y': int(y) if y.is_integer() else y,
+                'hp': hp, 'max_hp': max_hp, 'xp': xp, 'db_id': db_id or None,
+            }
+        elif tag == INVENTORY:
+            max_slots, count, equipped = reader.unpack(INVENTORY_FIELDS)
+            items = []
+            for _ in range(count):
+                slot, is_known = reader.unpack(SLOT_FIELDS)
+                if is_known:
+                    items.append((slot, reader.string()))
+                else:
+                    name = reader.string()
+                    item_type = reader.string()
+                    (value,) = reader.unpack(ITEM_FIELDS)
+                    items.append((slot, (name, item_type, value, reader.string())))
+            self.inventory = {'max_slots': max_slots, 'equipped_slot': None if equipped < 0 else equipped,
+                              'items': items}
+        elif tag == QUESTS:
+            bits, current = reader.unpack(QUEST_FIELDS)
+            self.quests = {name: bool(bits & (1 << index)) for index, name in enumerate(QUEST_FLAGS)}
+            self.current_quest_index = current or None
+        elif tag == NPCS:
+            pnj_visible, pnj2_visible, pnj2_hp, combat_zone = reader.unpack(NPC_FIELDS)
+            self.npcs = {'pnj_visible': bool(pnj_visible), 'pnj2_visible': bool(pnj2_visible),
+                         'pnj2_hp': pnj2_hp, 'combat_zone': bool(combat_zone)}
+        elif tag == MAP_ITEMS:
+            (count,) = reader.unpack(COUNT)
+            collected = {}
+            for _ in range(count):
+                key = reader.string()
+                (flag,) = reader.unpack(FLAG)
+                collected[key] = bool(flag)
+            self.collected = collected
+
+
+class SaveSlots:
+    """Emplacements de sauvegarde numérotés à partir de 1, un fichier par emplacement"""
+
+    def __init__(self, directory=DEFAULT_SAVE_DIR, slots=DEFAULT_SLOTS):
+        """
+        Args:
+            directory (str): Dossier des sauvegardes (créé à la première sauvegarde)
+            slots (int): Nombre d'emplacements
+        """
+        self.directory = directory
+        self.slots = slots
+
+    def path(self, slot):
+        if not 1 <= slot <= self.slots:
+            raise ValueError(f"Emplacement invalide : {slot} (1 à {self.slots})")
+        return os.path.join(self.directory, f"slot_{slot}.sav")
+
+    def save(self, slot, game_state):
+        """
+        Sauvegarde la partie en cours dans un emplacement
+
+        Returns:
+            int: Taille de la sauvegarde en octets
+        """
+        return self.write(slot, SaveData.capture(game_state))
+
+    def write(self, slot, save):
+        """Écrit un état dans un emplacement (remplacement atomique du fichier)"""
+        data = save.to_bytes()
+        path = self.path(slot)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            # Sur disque avant le remplacement : un plantage laisse l'ancienne ou la nouvelle
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return len(data)
+
+    def load(self, slot, only=None):
+        """
+        Lit la sauvegarde d'un emplacement
+
+        Raises:
+            SaveError: Emplacement vide ou sauvegarde illisible
+        """
+        try:
+            with open(self.path(slot), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise SaveError(f"Emplacement {slot} vide")
+        return SaveData.from_bytes(data, only)
+
+    def list_slots(self):
+        """
+        Résumé de chaque emplacement (seule la section du joueur est décodée)
+
+        Returns:
+            list: (emplacement, nom du joueur, date de modification) ; nom et date None si vide
+        """
+        summaries = []
+        for slot in range(1, self.slots + 1):
+            try:
+                save = self.load(slot, only={PLAYER})
+                name = save.player['name'] if save.player else ""
+                summaries.append((slot, name, os.path.getmtime(self.path(slot))))
+            except SaveError:
+                summaries.append((slot, None, None))
+        return summaries
+
+    def latest(self):
+        """Emplacement de la sauvegarde valide la plus récente, None s'il n'y en a aucune"""
+        saved = [(modified, slot) for slot, name, modified in self.list_slots() if modified is not None]
+        return max(saved)[1] if saved else None
+
+    def first_free(self):
+        """Premier emplacement vide, None si tous sont occupés"""
+        for slot, name, modified in self.list_slots():
+            if modified is None:
+                return slot
+        return None
+
+    def oldest(self):
+        """Emplacement de la sauvegarde la plus ancienne, None s'il n'y en a aucune"""
+        saved = [(modified, slot) for slot, name, modified in self.list_slots() if modified is not None]
+        return min(saved)[1] if saved else None
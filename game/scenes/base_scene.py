@@ -1,16 +1,73 @@
+# Scène demandée pour quitter le jeu : la boucle principale s'arrête et ferme
+# les scènes (sauvegardes comprises) avant pygame
+QUIT_SCENE = 'quit'
+
 class BaseScene:
+    # Les scènes qui signalent elles-mêmes leurs zones modifiées passent ceci à True :
+    # la boucle principale ne redessine et ne présente alors que ces zones
+    supports_dirty_rects = False
+
     def __init__(self, screen, game_state):
         self.screen = screen
         self.game_state = game_state
-        
+        self._dirty_rects = []
+        self._needs_full_redraw = True
+        self._last_render_state = None
+
     def handle_event(self, event):
         """Gère les événements de la scène"""
         pass
-        
+
     def update(self):
         """Met à jour la scène"""
         pass
-        
+
     def render(self, screen):
         """Dessine la scène"""
-        pass 
\ No newline at end of file
+        pass
+
+    def mark_dirty(self, rect=None):
+        """
+        Signale une zone de l'écran à redessiner
+
+        Args:
+            rect (pygame.Rect): Zone modifiée, ou None pour tout l'écran
+        """
+        if rect is None:
+            self._needs_full_redraw = True
+        else:
+            self._dirty_rects.append(rect.copy())
+
+    def get_render_state(self):
+        """
+        Retourne l'état dont dépend l'affichage de la scène
+
+        Toute différence avec l'état du rendu précédent redessine la scène entière.
+        None désactive cette comparaison.
+        """
+        return None
+
+    def collect_dirty_rects(self, screen):
+        """
+        Retourne les zones à redessiner depuis le dernier rendu et les oublie
+
+        Args:
+            screen (pygame.Surface): Surface d'affichage
+
+        Returns:
+            list: Liste de pygame.Rect (vide si rien n'a changé)
+        """
+        state = self.get_render_state()
+        if state != self._last_render_state:
+            self._last_render_state = state
+            self._needs_full_redraw = True
+
+        screen_rect = screen.get_rect()
+        if self._needs_full_redraw:
+            rects = [screen_rect]
+        else:
+            rects = [rect.clip(screen_rect) for rect in self._dirty_rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+        self._dirty_rects = []
+        self._needs_full_redraw = False
+        return rects
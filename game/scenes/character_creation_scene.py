@@ -6,15 +6,19 @@ from ..player import Player
 from ..factions import FactionName, FACTIONS
 from ..display_manager import DisplayManager
 from ..database import GameDatabase
+from ..game_clock import get_ticks
 
 class CharacterCreationScene(BaseScene):
-    def __init__(self, screen, game_state, display_manager=None):
+    supports_dirty_rects = True
+
+    def __init__(self, screen, game_state, display_manager=None, db_path=None):
         super().__init__(screen, game_state)
         self.screen = screen
         self.display_manager = display_manager
         
-        # Initialisation de la base de données
-        self.db = GameDatabase()
+        # Initialisation de la base de données (inventaire écrit en arrière-plan) ;
+        # db_path None : base par défaut (game.db ou RPG_DB)
+        self.db = GameDatabase(db_path, write_behind=True)
         
         # Tailles de base pour les polices
         self.base_title_size = 48
@@ -211,7 +215,7 @@ class CharacterCreationScene(BaseScene):
 
     def update(self):
         # Mettre à jour le curseur clignotant
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         if now - self.cursor_timer > self.cursor_interval:
             self.cursor_visible = not self.cursor_visible
             self.cursor_timer = now
@@ -241,6 +245,14 @@ class CharacterCreationScene(BaseScene):
                 else:
                     self.faction_alphas[i] = max(self.faction_alphas[i] - self.hover_transition_speed, 0)
 
+    def get_render_state(self):
+        """État affiché : la scène n'est redessinée que lorsqu'il change"""
+        return (
+            self.screen.get_size(), self.creation_step, self.name, self.is_name_field_active,
+            self.selected_race, self.selected_faction, self.back_button_alpha, self.confirm_button_alpha,
+            tuple(self.race_alphas), tuple(self.faction_alphas)
+        )
+
     def render(self, screen):
         # Redimensionner l'image de fond pour qu'elle remplisse l'écran
         scaled_bg = pygame.transform.scale(self.background, screen.get_size())
@@ -476,19 +488,23 @@ class CharacterCreationScene(BaseScene):
             faction=self.factions[self.selected_faction]
         )
         
+        # Nouvelle partie : elle prendra un emplacement libre à sa première sauvegarde
+        self.game_state.save_slot = None
+        
         # Sauvegarde du joueur dans la base de données
         try:
             player_id = self.db.save_player(self.game_state.player)
             if player_id:
                 print(f"Joueur {self.name} sauvegardé avec l'ID {player_id}")
+                self.game_state.player.db_id = player_id
                 # Sauvegarde de l'inventaire initial (vide)
-                self.db.save_inventory(player_id, self.game_state.player.inventory)
+                self.db.save_inventory(player_id, self.game_state.player.inventory, full=True)
             else:
                 print(f"Erreur lors de la sauvegarde du joueur {self.name}")
         except Exception as e:
             print(f"Erreur lors de la sauvegarde du joueur : {e}")
 
-    def __del__(self):
-        """Ferme la connexion à la base de données lors de la destruction de la scène"""
+    def close(self):
+        """Rend l'accès à la base de données"""
         if hasattr(self, 'db'):
-            self.db.close() 
\ No newline at end of file
+            self.db.close()
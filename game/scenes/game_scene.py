@@ -2,22 +2,56 @@ import pygame
 import os
 from .base_scene import BaseScene
 from game.tiled_map import TiledMap
+from game.texture_atlas import get_atlas
+from game.trace import get_channel, DEBUG
+from game.profiler import get_profiler
+from game.game_clock import get_ticks
 from game.pnj import PNJ
 from game.pnj2 import PNJ2
 from game.items import ITEMS, ItemType
+from game.spatial_hash import SpatialHash
+from game.pathfinding import Pathfinder
 from game.ui.dialog_box import DialogBox
 from ..quest_ui import draw_current_quest, QuestJournal
 from ..ui.health_display import HealthDisplay
 from ..ui.inventory_display import InventoryDisplay
 import game.quest_system as quest_system
 from ..database import GameDatabase
+from ..save_game import SaveSlots
+from ..autosave import AutoSaver, AUTOSAVE_INTERVAL_MS
 import math
+from collections import deque
+
+# Traces de la scène de jeu (désactivées par défaut, voir game/trace.py)
+trace = get_channel("scene")
+# Mesure des étapes du rendu pour la surimpression F3
+profiler = get_profiler()
 
 class GameScene(BaseScene):
-    def __init__(self, screen, game_state, display_manager=None):
+    # Cases de la zone de combat autour du PNJ2
+    COMBAT_ZONE = frozenset({
+        (14, 9), (14, 11), (13, 10), (15, 10),
+        (13, 9), (15, 9), (13, 11), (15, 11)
+    })
+    # Délai entre deux pas du joueur quand il suit un chemin (clic), en millisecondes
+    PATH_STEP_MS = 120
+    # Touches équivalentes à chaque pas (dx, dy) d'un chemin
+    STEP_KEYS = {(0, -1): pygame.K_z, (0, 1): pygame.K_s, (-1, 0): pygame.K_q, (1, 0): pygame.K_d}
+
+    def __init__(self, screen, game_state, display_manager=None, save_slots=None,
+                 autosave_interval_ms=AUTOSAVE_INTERVAL_MS, db_path=None):
+        """
+        Args:
+            save_slots (SaveSlots): Emplacements de sauvegarde (./saves par défaut)
+            autosave_interval_ms (int): Délai entre deux sauvegardes périodiques,
+                0 pour les désactiver (F5, quêtes et combats sauvegardent toujours)
+            db_path (str): Base de données, None pour la base par défaut (game.db ou RPG_DB)
+        """
         super().__init__(screen, game_state)
         self.screen = screen
         self.display_manager = display_manager
+        # Accès à la scène de jeu pour le combat et les sauvegardes
+        self.game_state.game_scene = self
         
         # Enregistrer cette scène dans le système de quêtes pour les messages
         quest_system.set_game_scene(self)
@@ -40,7 +74,15 @@ class GameScene(BaseScene):
         self.base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         map_path = os.path.join(self.base_path, "assets", "mapV3.tmx")
         self.tiled_map = TiledMap(map_path)
-        self.collision_rects = self.tiled_map.get_collider_rects()
+        self.collision_grid = self.tiled_map.collision_grid
+        
+        # Déplacement au clic : chemin calculé sur la grille des collisions, suivi case par case
+        self.pathfinder = Pathfinder(self.collision_grid)
+        self.path = deque()
+        self.last_path_step = 0
+        
+        # Objets du monde (items de la carte, PNJ) indexés par case
+        self.world_index = SpatialHash()
         
         # Chargement des items
         self.items = {}
@@ -48,9 +90,9 @@ class GameScene(BaseScene):
             if hasattr(item, 'image_path'):
                 image_path = os.path.join(self.base_path, item.image_path)
                 if os.path.exists(image_path):
-                    item_image = pygame.image.load(image_path)
-                    item_image = pygame.transform.scale(item_image, (self.tiled_map.tile_size, self.tiled_map.tile_size))
+                    item_image = get_atlas().load_image(image_path, (self.tiled_map.tile_size, self.tiled_map.tile_size))
                     self.items[item_name] = {'item': item, 'image': item_image}
+                    self.world_index.insert(item, *item.position, "item")
         
         # Position initiale du joueur
         if self.game_state.player:
@@ -68,6 +110,8 @@ class GameScene(BaseScene):
         # Initialisation du PNJ2 et ajout au game_state
         self.pnj2 = PNJ2(position=(14, 10))
         self.game_state.pnj2 = self.pnj2  # Ajout du PNJ2 au game_state
+        self.world_index.insert(self.pnj, self.pnj.tile_x, self.pnj.tile_y, "pnj")
+        self.world_index.insert(self.pnj2, self.pnj2.tile_x, self.pnj2.tile_y, "pnj")
         if self.game_state.player:
             self.pnj2.sync_faction(self.game_state.player)
         
@@ -86,18 +130,21 @@ class GameScene(BaseScene):
         self.current_item = None
         
         # Zone de combat
-        self.combat_zone_positions = {
-            (14, 9), (14, 11), (13, 10), (15, 10),
-            (13, 9), (15, 9), (13, 11), (15, 11)
-        }
+        self.combat_zone_positions = set(self.COMBAT_ZONE)
         self.in_combat_zone = False
         self.combat_dialog_active = False
         
-        # Initialisation de la base de données
-        self.db = GameDatabase()
+        # Initialisation de la base de données : les sauvegardes en cours de partie
+        # sont écrites par un thread de fond
+        self.db = GameDatabase(db_path, write_behind=True)
+        self.closed = False
+        
+        # Sauvegardes de la partie (F5, périodiques, quêtes et combats), écrites en fond
+        self.save_slots = save_slots if save_slots is not None else SaveSlots()
+        self.autosaver = AutoSaver(self.save_slots, autosave_interval_ms)
         
         # Temps de début de la partie
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = get_ticks()
 
     def update_fonts(self):
         """Met à jour les polices en fonction de l'échelle"""
@@ -120,10 +167,10 @@ class GameScene(BaseScene):
         # Si une boîte de dialogue est active, la gérer en priorité
         if self.dialog_box and self.dialog_box.active:
             if self.dialog_box.handle_event(event):
-                print("→ Dialogue terminé, fermeture de la boîte")
+                trace.debug("Dialogue terminé, fermeture de la boîte")
                 # Si un choix a été fait
                 if self.current_item and self.dialog_box.result is not None:
-                    print(f"DEBUG: Résultat du dialogue: {self.dialog_box.result}")
+                    trace.debug("Résultat du dialogue : %s", self.dialog_box.result)
                     if self.dialog_box.result:
                         # Ajouter l'item à l'inventaire
                         if self.add_item_to_inventory(self.current_item):
@@ -140,10 +187,10 @@ class GameScene(BaseScene):
                                 quest_system.quest3_done = True
                                 quest_system.advance_quest_if_done()
                         else:
-                            print(f"DEBUG: Impossible d'ajouter {self.current_item.name} à l'inventaire (plein?)")
+                            trace.debug("Impossible d'ajouter %s à l'inventaire (plein ?)", self.current_item.name)
                             self.current_item.collected = False  # Remettre l'item comme non collecté
                     else:
-                        print(f"DEBUG: {self.current_item.name} laissé sur place.")
+                        trace.debug("%s laissé sur place", self.current_item.name)
                 self.dialog_box = None
                 self.current_item = None
             return None
@@ -152,9 +199,15 @@ class GameScene(BaseScene):
         if event.type == pygame.MOUSEBUTTONDOWN and self.inventory_display.visible:
             if self.inventory_display.handle_click(event.pos, self.game_state.player.inventory, self.game_state.player):
                 return None  # Empêche la propagation de l'événement
+        # Clic gauche sur la carte : le joueur s'y rend, sauf si un panneau ou un
+        # dialogue est ouvert (le clic lui est destiné)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.game_state.player:
+            if not self.overlay_active():
+                self.move_player_to(*self.screen_to_tile(event.pos))
+            return None
 
         if event.type == pygame.KEYDOWN:
-            print(f"DEBUG: Appui sur la touche {event.key}")
+            trace.debug("Appui sur la touche %s", event.key)
             if event.key == pygame.K_ESCAPE:
                 # Si l'inventaire est visible, le fermer
                 if self.inventory_display.visible:
@@ -169,6 +222,8 @@ class GameScene(BaseScene):
             elif event.key == pygame.K_e:
                 if self.pnj.is_visible and self.game_state.player and self.pnj.can_trigger_dialogue(self.game_state.player):
                     if not self.pnj.is_in_dialogue:
+                        # Le joueur s'arrête pour parler
+                        self.cancel_path()
                         message = self.pnj.start_dialogue()
                         if message:
                             print(f"PNJ dit : {message}")
@@ -187,8 +242,12 @@ class GameScene(BaseScene):
             # Gestion de l'inventaire avec la touche I
             elif event.key == pygame.K_i:
                 self.inventory_display.toggle()
-            # Gestion du mouvement du joueur
+            # Sauvegarde de la partie avec la touche F5
+            elif event.key == pygame.K_F5:
+                self.save_game(overwrite=True)
+            # Gestion du mouvement du joueur (interrompt un déplacement au clic)
             elif event.key in [pygame.K_z, pygame.K_s, pygame.K_q, pygame.K_d]:
+                self.cancel_path()
                 self.handle_player_movement(event.key)
             # Gestion de l'interaction avec les items
             elif event.key == pygame.K_e:
@@ -200,8 +259,13 @@ class GameScene(BaseScene):
             
         return None
 
+    def overlay_active(self):
+        """Un panneau (inventaire, journal des quêtes) ou un dialogue de PNJ est ouvert"""
+        return (self.inventory_display.visible or self.quest_journal.visible
+                or self.pnj.is_in_dialogue or self.pnj2.is_in_dialogue)
+
     def handle_player_movement(self, key):
-        print(f"=== DEBUG: Mouvement du joueur avec la touche {key} ===")
+        trace.debug("Mouvement du joueur avec la touche %s", key)
         if self.game_state.player:
             dx, dy = 0, 0
             if key == pygame.K_z:
@@ -221,23 +285,12 @@ class GameScene(BaseScene):
             new_x = max(0, min(self.tiled_map.width - 1, self.game_state.player.x + dx))
             new_y = max(0, min(self.tiled_map.height - 1, self.game_state.player.y + dy))
             
-            # Debug: Afficher les coordonnées avant mouvement
-            print(f"Avant mouvement - Tuiles: ({self.game_state.player.x}, {self.game_state.player.y}), Pixels: ({self.game_state.player.rect.x}, {self.game_state.player.rect.y})")
-            
-            # Création d'un rectangle pour le joueur à la nouvelle position
-            new_player_rect = pygame.Rect(
-                new_x * self.tiled_map.tile_size,
-                new_y * self.tiled_map.tile_size,
-                self.tiled_map.tile_size,
-                self.tiled_map.tile_size
-            )
+            trace.debug("Avant mouvement - Tuiles: (%s, %s), Pixels: (%s, %s)",
+                        self.game_state.player.x, self.game_state.player.y,
+                        self.game_state.player.rect.x, self.game_state.player.rect.y)
             
-            # Vérification des collisions
-            can_move = True
-            for collision_rect in self.collision_rects:
-                if new_player_rect.colliderect(collision_rect):
-                    can_move = False
-                    break
+            # Vérification des collisions (accès direct à la grille)
+            can_move = not self.collision_grid.is_blocked(new_x, new_y)
             
             # Mise à jour de la position si aucune collision
             if can_move:
@@ -246,26 +299,77 @@ class GameScene(BaseScene):
                 self.game_state.player.rect.x = new_x * self.tiled_map.tile_size
                 self.game_state.player.rect.y = new_y * self.tiled_map.tile_size
                 
-                # Debug: Afficher les coordonnées après mouvement
-                print(f"Après mouvement - Tuiles: ({self.game_state.player.x}, {self.game_state.player.y}), Pixels: ({self.game_state.player.rect.x}, {self.game_state.player.rect.y})")
+                trace.debug("Après mouvement - Tuiles: (%s, %s), Pixels: (%s, %s)",
+                            new_x, new_y, self.game_state.player.rect.x, self.game_state.player.rect.y)
                 
                 # Mettre à jour l'animation
-                self.animation_timer = pygame.time.get_ticks()
+                self.animation_timer = get_ticks()
                 self.animation_frame = (self.animation_frame + 1) % 4
                 
+    def screen_to_tile(self, pos):
+        """Convertit une position à l'écran en case de la carte (caméra courante)"""
+        self.update_camera()
+        tile_size = self.tiled_map.tile_size
+        return (pos[0] + self.camera_x) // tile_size, (pos[1] + self.camera_y) // tile_size
+
+    def move_player_to(self, grid_x, grid_y):
+        """
+        Déplacement au clic : calcule le chemin du joueur jusqu'à une case
+
+        Args:
+            grid_x (int): Colonne visée
+            grid_y (int): Ligne visée
+
+        Returns:
+            bool: True si un chemin existe (le joueur le suivra case par case)
+        """
+        player = self.game_state.player
+        path = self.pathfinder.find_path((player.x, player.y), (grid_x, grid_y))
+        if path is None:
+            trace.debug("Aucun chemin vers (%s, %s)", grid_x, grid_y)
+            self.cancel_path()
+            return False
+        trace.debug("Chemin vers (%s, %s) : %s cases", grid_x, grid_y, len(path))
+        self.path = deque(path)
+        # Le premier pas est fait à la prochaine mise à jour
+        self.last_path_step = get_ticks() - self.PATH_STEP_MS
+        return True
+
+    def cancel_path(self):
+        """Arrête le déplacement au clic en cours"""
+        self.path.clear()
+
+    def follow_path(self):
+        """Fait avancer le joueur d'une case sur son chemin quand le délai est écoulé"""
+        if not self.path or not self.game_state.player:
+            return
+        now = get_ticks()
+        if now - self.last_path_step < self.PATH_STEP_MS:
+            return
+        self.last_path_step = now
+        player = self.game_state.player
+        next_x, next_y = self.path[0]
+        key = self.STEP_KEYS.get((next_x - player.x, next_y - player.y))
+        if key is not None:
+            self.handle_player_movement(key)
+        if (player.x, player.y) == (next_x, next_y):
+            self.path.popleft()
+        else:
+            # Le joueur a été déplacé ou la case est devenue bloquante
+            self.cancel_path()
+
     def handle_item_interaction(self):
         """Gère l'interaction avec les items lorsque la touche E est pressée"""
-        print("=== DEBUG: Interaction avec les items ===")
+        trace.debug("Interaction avec les items")
         if not self.game_state.player or self.dialog_box:
             return
 
         # Obtenir la position actuelle du joueur en tuiles
         player_pos = (self.game_state.player.x, self.game_state.player.y)
         
-        # Vérifier tous les items non collectés
-        for item_name, item_data in list(self.items.items()):  
-            item = item_data['item']
-            if not item.collected and hasattr(item, 'position') and item.position == player_pos:
+        # Seuls les items de la case du joueur sont examinés
+        for item in self.world_index.at(*player_pos, kind="item"):
+            if not item.collected:
                 self.current_item = item
                 # Créer une boîte de dialogue pour confirmer la collecte
                 stats_text = None
@@ -285,25 +389,22 @@ class GameScene(BaseScene):
 
     def add_item_to_inventory(self, item):
         """Ajoute un item à l'inventaire du joueur"""
-        print("=== DEBUG: Tentative d'ajout d'item à l'inventaire ===")
-        print(f"Item name: {item.name}")
-        print(f"Items actuels: {list(self.items.keys())}")
+        trace.debug("Tentative d'ajout de %s à l'inventaire (items de la carte : %s)", item.name, list(self.items.keys()))
         
         if not self.game_state.player or not hasattr(self.game_state.player, 'inventory'):
-            print("DEBUG: Pas de joueur ou d'inventaire")
+            trace.debug("Pas de joueur ou d'inventaire")
             return False
 
         if self.game_state.player.inventory.add_item(item):
-            print(f"DEBUG: {item.name} ajouté à l'inventaire avec succès")
+            trace.debug("%s ajouté à l'inventaire", item.name)
             # Marquer l'item comme collecté
             item.collected = True
-            print(f"DEBUG: Item {item.name} marqué comme collecté")
             
-            # Sauvegarder l'inventaire dans la base de données
+            # Sauvegarder l'inventaire dans la base de données (écriture différée)
             try:
-                player_data = self.db.load_player(self.game_state.player.name)
-                if player_data:
-                    self.db.save_inventory(player_data['id'], self.game_state.player.inventory)
+                player_id = self.get_player_id()
+                if player_id:
+                    self.db.save_inventory(player_id, self.game_state.player.inventory)
             except Exception as e:
                 print(f"Erreur lors de la sauvegarde de l'inventaire : {e}")
             
@@ -313,23 +414,14 @@ class GameScene(BaseScene):
             
             return True
         else:
-            print("DEBUG: Inventaire plein!")
+            trace.debug("Inventaire plein")
             return False
 
     def handle_movement(self, keys):
         """Gère le mouvement du joueur"""
-        print("=== DEBUG: Mouvement du joueur ===")
         if not self.game_state.player:
             return
 
-        # Sauvegarde de l'ancienne position pour le debug
-        old_x = self.game_state.player.x
-        old_y = self.game_state.player.y
-        old_rect_x = self.game_state.player.rect.x
-        old_rect_y = self.game_state.player.rect.y
-
-        print(f"Avant mouvement - Tuiles: ({old_x}, {old_y}), Pixels: ({old_rect_x}, {old_rect_y})")
-        
         # Vérification des touches pressées et appel de handle_player_movement pour chaque direction
         if keys[pygame.K_z]:
             self.handle_player_movement(pygame.K_z)
@@ -340,9 +432,13 @@ class GameScene(BaseScene):
         if keys[pygame.K_d]:
             self.handle_player_movement(pygame.K_d)
 
-        print(f"Après mouvement - Tuiles: ({self.game_state.player.x}, {self.game_state.player.y}), Pixels: ({self.game_state.player.rect.x}, {self.game_state.player.rect.y})")
-
     def update(self):
+        # Sauvegarde périodique (l'écriture se fait en fond)
+        self.autosaver.tick(self.game_state)
+        
+        # Déplacement au clic
+        self.follow_path()
+
         # Mettre à jour les animations des items
         for item_data in self.items.values():
             item = item_data['item']
@@ -362,33 +458,25 @@ class GameScene(BaseScene):
                 self.in_combat_zone = False
                 self.combat_dialog_active = False
             
-            print(f"DEBUG - Position du joueur: {player_pos}")
-            print(f"DEBUG - Dans la zone de combat: {self.in_combat_zone}")
-            print(f"DEBUG - Combat dialog active: {self.combat_dialog_active}")
-            print(f"DEBUG - Était dans la zone: {was_in_combat_zone}")
-            print(f"DEBUG - Positions de la zone de combat: {self.combat_zone_positions}")
+            trace.debug("Joueur en %s, zone de combat : %s (avant : %s), dialogue de combat : %s",
+                        player_pos, self.in_combat_zone, was_in_combat_zone, self.combat_dialog_active)
             
             # Si le joueur entre dans la zone de combat et que le PNJ2 est visible
             if self.in_combat_zone and (not was_in_combat_zone or not self.combat_dialog_active):
-                print("DEBUG - Conditions pour afficher le message remplies")
+                trace.debug("Entrée dans la zone de combat")
                 if not self.game_state.temp_message:  # Vérifier si le message n'est pas déjà défini
                     self.game_state.temp_message = "Vous êtes dans la zone de combat !\nPréparez vous !"
                     self.combat_dialog_active = True
-                    print("DEBUG - Changement vers la scène de message")
+                    trace.debug("Changement vers la scène de message")
                     return 'message'
             # Si le joueur sort de la zone de combat
             elif not self.in_combat_zone and was_in_combat_zone:
-                print("DEBUG - Le joueur sort de la zone de combat")
+                trace.debug("Le joueur sort de la zone de combat")
                 self.combat_dialog_active = False
                 self.game_state.temp_message = None
 
         """Met à jour l'état du jeu"""
         if self.game_state.player:
-            # Debug: Position actuelle
-            print(f"\n=== Vérification position finale ===")
-            print(f"Position actuelle en tuiles: ({self.game_state.player.x}, {self.game_state.player.y})")
-            print(f"Quest4 done? {quest_system.quest4_done}")
-            
             # Définir la zone de déclenchement de la quête finale
             # Un ensemble de tuples (x,y) où la quête peut être validée
             zone_finale = {(21,1), (22,1), (23,1), (24,1)}
@@ -398,12 +486,13 @@ class GameScene(BaseScene):
             # et si la quête 4 n'est pas encore terminée
             position_joueur = (int(self.game_state.player.x), int(self.game_state.player.y))
             if position_joueur in zone_finale and not quest_system.quest5_done:
-                print(f"→ Position finale {position_joueur} détectée (zone valide: {zone_finale})!")
-                print("→ Première fois dans la zone finale")
+                trace.info("Position finale %s atteinte, quête 5 terminée", position_joueur)
                 quest_system.quest5_done = True
-                print("→ quest5_done mis à True")
                 quest_system.advance_quest_if_done()
-                print("→ advance_quest_if_done appelé")
+            
+            # Charger les chunks autour du joueur (cartes en streaming)
+            self.tiled_map.update_stream(self.game_state.player.x, self.game_state.player.y,
+                                         self.game_state.player.direction)
             
             # Mise à jour de la position de la caméra
             self.camera_x = -self.game_state.player.x * self.tiled_map.tile_size + self.screen.get_width() // 2
@@ -424,7 +513,6 @@ class GameScene(BaseScene):
 
     def update_camera(self):
         """Met à jour la position de la caméra pour suivre le joueur"""
-        print("=== DEBUG: Mise à jour de la caméra ===")
         if not self.game_state.player:
             return
             
@@ -440,28 +528,26 @@ class GameScene(BaseScene):
         self.camera_x = max(0, min(self.camera_x, self.tiled_map.pixel_width - self.screen.get_width()))
         self.camera_y = max(0, min(self.camera_y, self.tiled_map.pixel_height - self.screen.get_height()))
         
-        print(f"Camera position: ({self.camera_x}, {self.camera_y})")
+        trace.debug("Position de la caméra : (%s, %s)", self.camera_x, self.camera_y)
 
     def render(self, screen):
         """Rendu de la scène de jeu"""
-        print("=== DEBUG: Rendu de la scène de jeu ===")
         # Effacer l'écran
         #screen.fill((0, 0, 0))
         
         if self.tiled_map and self.game_state.player:
             # Mettre à jour la position de la caméra
             self.update_camera()
+            profiler.mark()
             
             # Dessiner la carte avec l'offset de la caméra
             self.tiled_map.render(screen, (-self.camera_x, -self.camera_y))
+            profiler.lap("map")
             
             # Afficher les items non collectés ou en cours d'animation
-            print("\n=== DEBUG: Rendu des items ===")
-            print(f"Nombre d'items à afficher: {len(self.items)}")
             for item_name, item_data in list(self.items.items()):
                 item = item_data['item']
                 if not item.collected:
-                    print(f"DEBUG: Affichage de l'item {item_name} (collected: {item.collected}, animating: {item.is_animating})")
                     item_x = item.position[0] * self.tiled_map.tile_size - self.camera_x
                     item_y = item.position[1] * self.tiled_map.tile_size - self.camera_y
                     
@@ -472,8 +558,7 @@ class GameScene(BaseScene):
                         surface_to_render = item_data['image']
                         
                     screen.blit(surface_to_render, (item_x, item_y))
-                else:
-                    print(f"DEBUG: Item {item_name} est collecté, on ne l'affiche pas")
+            profiler.lap("items")
 
             # Afficher les coordonnées du joueur
             padding = 10
@@ -485,6 +570,7 @@ class GameScene(BaseScene):
             bg_surface.set_alpha(128)
             screen.blit(bg_surface, (0, 0))
             screen.blit(text_surface, (padding, padding))
+            profiler.lap("ui")
             
             # Affichage du joueur avec son sprite animé
             current_sprite = self.game_state.player.sprites[self.last_direction][self.animation_frame]
@@ -504,25 +590,20 @@ class GameScene(BaseScene):
             
             # Afficher le sprite du joueur
             screen.blit(current_sprite, player_pos)
+            profiler.lap("player")
 
             # Afficher le PNJ s'il est visible
             if self.pnj.is_visible:
                 self.pnj.render(screen, self.camera_x, self.camera_y)
-            # Debug: Affichage du second PNJ
+            # Affichage du second PNJ
             if hasattr(self, 'pnj2') and self.pnj2.is_visible:
-                print("DEBUG: Affichage du PNJ2")
-                # Calculer la position de rendu attendue pour PNJ2
-                if hasattr(self.pnj2, 'position'):
-                    coords = self.pnj2.position
-                elif hasattr(self.pnj2, 'x') and hasattr(self.pnj2, 'y'):
-                    coords = (self.pnj2.x, self.pnj2.y)
-                else:
-                    coords = (0, 0)
-
-                pnj2_screen_x = coords[0] * self.tiled_map.tile_size - self.camera_x
-                pnj2_screen_y = coords[1] * self.tiled_map.tile_size - self.camera_y
-                print(f"DEBUG: PNJ2 position de rendu attendue: ({pnj2_screen_x}, {pnj2_screen_y})")
+                # Position de rendu attendue, calculée seulement si la trace est active
+                if trace.enabled(DEBUG):
+                    trace.debug("PNJ2 rendu en (%s, %s)",
+                                self.pnj2.tile_x * self.tiled_map.tile_size - self.camera_x,
+                                self.pnj2.tile_y * self.tiled_map.tile_size - self.camera_y)
                 self.pnj2.render(screen, self.camera_x, self.camera_y)
+            profiler.lap("npcs")
 
             # Afficher le message directif si le joueur est proche du PNJ
             if self.pnj and self.pnj.is_visible and self.game_state.player and self.pnj.can_trigger_dialogue(self.game_state.player):
@@ -589,7 +670,7 @@ class GameScene(BaseScene):
                     next_y = bubble_y + bubble_height - 30
                     
                     # Petit effet de pulsation pour le texte "Espace"
-                    alpha = int(230 + 75 * abs(math.sin(pygame.time.get_ticks() * 0.003)))
+                    alpha = int(230 + 75 * abs(math.sin(get_ticks() * 0.003)))
                     next_surface.set_alpha(alpha)
                     screen.blit(next_surface, (next_x, next_y))
 
@@ -613,6 +694,7 @@ class GameScene(BaseScene):
             
             # Dessiner le message de victoire s'il est actif
             quest_system.draw_victory_message(screen)
+            profiler.lap("ui")
 
     def test_coordinates(self):
         """Test du système de coordonnées"""
@@ -687,23 +769,95 @@ class GameScene(BaseScene):
         print("→ État final de la boîte de dialogue:", self.dialog_box is not None)
         print("=====================================\n")
 
+    def save_game(self, reason="manuelle", overwrite=False):
+        """
+        Sauvegarde la partie dans son emplacement (le premier libre à la première sauvegarde)
+
+        L'état est figé immédiatement ; l'écriture est faite par le thread de sauvegarde.
+
+        Args:
+            reason (str): Origine de la sauvegarde (touche F5, quête, combat...)
+            overwrite (bool): Sans emplacement libre, remplace la sauvegarde la plus
+                ancienne (touche F5) ; sinon la sauvegarde est ignorée
+
+        Returns:
+            bool: True si la sauvegarde est demandée
+        """
+        return self.autosaver.request(self.game_state, reason, overwrite)
+
+    def restore_world(self, npcs):
+        """
+        Rétablit les PNJ et la zone de combat d'une partie chargée
+
+        Args:
+            npcs (dict): pnj_visible, pnj2_visible, pnj2_hp, combat_zone (voir SaveData)
+        """
+        self.pnj.is_visible = npcs['pnj_visible']
+        self.pnj.is_in_dialogue = False
+        self.pnj2.is_visible = npcs['pnj2_visible']
+        self.pnj2.hp = npcs['pnj2_hp']
+        self.game_state.pnj2 = self.pnj2
+        self.combat_zone_positions = set(self.COMBAT_ZONE) if npcs['combat_zone'] else set()
+        self.cancel_path()
+        self.in_combat_zone = False
+        self.combat_dialog_active = False
+        self.dialog_box = None
+        self.current_item = None
+        self.start_time = get_ticks()
+        player = self.game_state.player
+        if player:
+            self.pnj.sync_faction(player)
+            self.pnj2.sync_faction(player)
+            self.link_loaded_player(player)
+        self.mark_dirty()
+
+    def link_loaded_player(self, player):
+        """
+        Relie le joueur d'une partie chargée à sa ligne en base
+
+        L'identifiant gardé dans la sauvegarde n'est repris que s'il désigne bien ce
+        personnage : le nom n'est pas unique, et l'inventaire en base est réécrit en
+        entier. Sinon (sauvegarde d'une ancienne version ou d'une autre base), le
+        personnage est enregistré comme nouveau joueur plutôt que d'écraser l'inventaire
+        ou de compléter les durées de vie d'un homonyme.
+        """
+        if player.db_id is not None and self.db.player_name(player.db_id) == player.name:
+            # L'inventaire en base suit la partie chargée
+            self.db.save_inventory(player.db_id, player.inventory, full=True)
+            return
+        print(f"Joueur {player.name} absent de la base sous l'identifiant {player.db_id}, enregistré à nouveau")
+        player.db_id = self.db.save_player(player)
+        if player.db_id:
+            self.db.save_inventory(player.db_id, player.inventory, full=True)
+
+    def get_player_id(self):
+        """Identifiant du joueur en base, cherché une seule fois par partie"""
+        player = self.game_state.player
+        if player.db_id is None:
+            self.db.player_profile(player)
+        return player.db_id
+
     def save_player_lifespan(self):
         """Sauvegarde la durée de vie du joueur"""
         if self.game_state.player:
             try:
                 # Calculer la durée en secondes
-                duration = (pygame.time.get_ticks() - self.start_time) // 1000
+                duration = (get_ticks() - self.start_time) // 1000
                 
-                # Charger les données du joueur
-                player_data = self.db.load_player(self.game_state.player.name)
-                if player_data:
+                player_id = self.get_player_id()
+                if player_id:
                     # Sauvegarder la durée de vie
-                    self.db.save_lifespan(player_data['id'], duration)
+                    self.db.save_lifespan(player_id, duration)
             except Exception as e:
                 print(f"Erreur lors de la sauvegarde de la durée de vie : {e}")
 
-    def __del__(self):
-        """Ferme la connexion à la base de données et sauvegarde la durée de vie"""
-        self.save_player_lifespan()
-        if hasattr(self, 'db'):
-            self.db.close()
\ No newline at end of file
+    def close(self):
+        """Sauvegarde la durée de vie du joueur et rend l'accès à la base (une seule fois)"""
+        if getattr(self, 'closed', True):
+            return
+        self.closed = True
+        self.autosaver.close()
+        # Après la fermeture de la base (sortie du programme) il n'y a plus rien à écrire
+        if not self.db.pool.closed:
+            self.save_player_lifespan()
+        self.db.close()
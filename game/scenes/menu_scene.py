@@ -1,13 +1,18 @@
 import pygame
-import sys
 import os
-from .base_scene import BaseScene
+from .base_scene import BaseScene, QUIT_SCENE
+from ..game_clock import get_clock
+from ..save_game import SaveSlots, SaveError
 
 class MenuScene(BaseScene):
-    def __init__(self, screen, game_state, display_manager=None):
+    supports_dirty_rects = True
+
+    def __init__(self, screen, game_state, display_manager=None, save_slots=None):
         super().__init__(screen, game_state)
         self.screen = screen
         self.display_manager = display_manager
+        # Emplacements proposés par « Charger Partie » (ceux de la scène de jeu)
+        self.save_slots = save_slots if save_slots is not None else SaveSlots()
         
         # Tailles de base pour les polices
         self.base_title_size = 48
@@ -50,6 +55,12 @@ class MenuScene(BaseScene):
         # Alphas pour les animations
         self.menu_alphas = [0] * len(self.menu_options)
         self.hover_transition_speed = 20
+        
+        # Dernier état affiché de chaque bouton (alpha, sélection), pour ne redessiner que ceux qui changent
+        self.rendered_button_states = [None] * len(self.menu_options)
+        
+        # Fond redimensionné mis en cache pour la taille d'écran courante
+        self.scaled_background = None
 
     def update_fonts(self):
         """Met à jour les polices en fonction de l'échelle"""
@@ -68,7 +79,8 @@ class MenuScene(BaseScene):
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
-            mouse_pos = pygame.mouse.get_pos()
+            # Position portée par l'événement : identique en jeu et au rejeu d'une session
+            mouse_pos = event.pos
             self.hovered_option = -1
             for i, rect in enumerate(self.menu_rects):
                 if rect.collidepoint(mouse_pos):
@@ -88,8 +100,7 @@ class MenuScene(BaseScene):
             elif event.key == pygame.K_RETURN:
                 return self._handle_option_selection()
             elif event.key == pygame.K_ESCAPE:
-                pygame.quit()
-                sys.exit()
+                return QUIT_SCENE
                 
         elif event.type == pygame.VIDEORESIZE:
             self.update_fonts()
@@ -101,16 +112,31 @@ class MenuScene(BaseScene):
         if option == "Nouvelle Partie":
             return 'character_creation'
         elif option == "Charger Partie":
-            self.game_state.temp_message = "Aucune partie sauvegardée"
-            return 'message'
+            return self.load_latest_save()
         elif option == "Options":
             self.game_state.temp_message = "En cours de construction"
             return 'message'
         elif option == "Quitter":
-            pygame.quit()
-            sys.exit()
+            return QUIT_SCENE
         return None
 
+    def load_latest_save(self):
+        """Charge la sauvegarde la plus récente et retourne la scène suivante"""
+        slots = self.save_slots
+        slot = slots.latest()
+        if slot is None or not hasattr(self.game_state, 'game_scene'):
+            self.game_state.temp_message = "Aucune partie sauvegardée"
+            return 'message'
+        try:
+            slots.load(slot).restore(self.game_state)
+        except SaveError as e:
+            print(f"Erreur lors du chargement de la partie : {e}")
+            self.game_state.temp_message = "Sauvegarde illisible"
+            return 'message'
+        self.game_state.save_slot = slot
+        print(f"Partie chargée depuis l'emplacement {slot}")
+        return 'game'
+
     def update(self):
         mouse_pos = pygame.mouse.get_pos()
         
@@ -120,16 +146,34 @@ class MenuScene(BaseScene):
                 self.menu_alphas[i] = min(self.menu_alphas[i] + self.hover_transition_speed, 255)
             else:
                 self.menu_alphas[i] = max(self.menu_alphas[i] - self.hover_transition_speed, 0)
+            
+            # Seuls les boutons dont l'apparence change sont redessinés
+            button_state = (self.menu_alphas[i], i == self.selected_option)
+            if button_state != self.rendered_button_states[i]:
+                self.rendered_button_states[i] = button_state
+                self.mark_dirty(rect)
+
+    def get_render_state(self):
+        """La scène entière est redessinée quand la taille de l'écran change"""
+        return self.screen.get_size()
+
+    def get_background(self, size):
+        """Retourne le fond d'écran assombri, redimensionné une seule fois par taille d'écran"""
+        if self.scaled_background is None or self.scaled_background.get_size() != size:
+            background = pygame.Surface(size)
+            background.blit(pygame.transform.scale(self.background, size), (0, 0))
+            # Overlay semi-transparent
+            overlay = pygame.Surface(size, pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 128))
+            background.blit(overlay, (0, 0))
+            if pygame.display.get_surface() is not None:
+                background = background.convert()
+            self.scaled_background = background
+        return self.scaled_background
 
     def render(self, screen):
-        # Fond d'écran
-        scaled_bg = pygame.transform.scale(self.background, screen.get_size())
-        screen.blit(scaled_bg, (0, 0))
-        
-        # Overlay semi-transparent
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        screen.blit(overlay, (0, 0))
+        # Fond d'écran avec overlay semi-transparent
+        screen.blit(self.get_background(screen.get_size()), (0, 0))
         
         # Affichage du titre et sous-titre
         title_text = self.title_font.render("Planète des Singes", True, self.text_color)
@@ -189,4 +233,4 @@ class MenuScene(BaseScene):
         self.screen.blit(msg_surface, msg_rect)
         pygame.display.flip()
         
-        pygame.time.wait(1500)
\ No newline at end of file
+        get_clock().wait(1500)
\ No newline at end of file
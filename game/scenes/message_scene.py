@@ -1,13 +1,15 @@
 import pygame
 import os
-import sys 
-from .base_scene import BaseScene
+from .base_scene import BaseScene, QUIT_SCENE
 from game.combat_system import CombatSystem
 from game.ui.inventory_display import InventoryDisplay
 import game.quest_system as quest_system
+from game.game_clock import get_ticks
 import random
 
 class MessageScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, screen, game_state, message, display_manager=None, dialogue_getter=None):
         super().__init__(screen, game_state)
         self.screen = screen
@@ -305,6 +307,10 @@ class MessageScene(BaseScene):
                 quest_system.quest4_done = True
                 quest_system.advance_quest_if_done()
                 
+                # Sauvegarde automatique de la victoire (écrite en fond)
+                if hasattr(self.game_state, 'game_scene'):
+                    self.game_state.game_scene.save_game("combat")
+                
                 # On remplace les 3 boutons par un seul "Continuer"
                 self.combat_buttons = []
                 continue_button = {
@@ -356,7 +362,7 @@ class MessageScene(BaseScene):
             if not self.inventory_display:
                 self.inventory_display = InventoryDisplay(self.screen)
             self.inventory_display.toggle()
-            self.inventory_timer = pygame.time.get_ticks()  # Démarrer le timer
+            self.inventory_timer = get_ticks()  # Démarrer le timer
             return None
 
         elif action == "Retour au combat":
@@ -460,9 +466,7 @@ class MessageScene(BaseScene):
                 for button in self.defeat_buttons:
                     if button['rect'].collidepoint(event.pos):
                         if button['text'] == "Quitter":
-                            print("Fermeture du jeu...")
-                            pygame.quit()
-                            sys.exit(0)
+                            return QUIT_SCENE
                             
         elif event.type == pygame.MOUSEMOTION:
             # Mise à jour du survol pour l'inventaire
@@ -491,7 +495,7 @@ class MessageScene(BaseScene):
                         self.inventory_display.hide()
                     else:
                         self.inventory_display.toggle()
-                        self.inventory_timer = pygame.time.get_ticks()
+                        self.inventory_timer = get_ticks()
                     
         elif event.type == pygame.VIDEORESIZE:
             self.update_fonts()
@@ -503,7 +507,7 @@ class MessageScene(BaseScene):
     def update(self):
         # Gestion du timer de l'inventaire
         if self.inventory_display and self.inventory_display.visible:
-            current_time = pygame.time.get_ticks()
+            current_time = get_ticks()
             if current_time - self.inventory_timer > 5000:  # 5 secondes
                 self.inventory_display.hide()
         
@@ -515,6 +519,26 @@ class MessageScene(BaseScene):
     # --------------------------------------------------------------------
     #   RENDU
     # --------------------------------------------------------------------
+    def get_render_state(self):
+        """État affiché : la scène n'est redessinée que lorsqu'il change"""
+        buttons = self.combat_buttons + self.defense_buttons + self.defeat_buttons
+        inventory = self.inventory_display
+        inventory_state = None
+        if inventory and inventory.visible:
+            player_inventory = self.game_state.player.inventory if self.game_state.player else None
+            inventory_state = (
+                id(inventory.hovered_item), id(inventory.dialog_box), inventory.scroll_position,
+                tuple(map(id, player_inventory.items)) if player_inventory else (),
+                id(getattr(player_inventory, 'equipped_item', None))
+            )
+        return (
+            self.screen.get_size(), tuple(self.dialog_rect), tuple(self.wrapped_lines),
+            self.is_defeated, self.in_defense_mode, self.quit_button_hover,
+            tuple((button['text'], button['hover']) for button in buttons),
+            self.game_state.player.hp if self.game_state.player else None,
+            inventory_state
+        )
+
     def render(self, screen):
         # Pas de fond noir général
         dialog_surface = pygame.Surface((self.dialog_rect.width, self.dialog_rect.height))
@@ -0,0 +1,239 @@
+"""
+Simulation du jeu sans fenêtre, en temps simulé à pas fixe.
+
+La logique complète (scènes, quêtes, combats, apparitions) tourne avec le pilote vidéo
+SDL « dummy », sans rendu ni limite d'images par seconde : des milliers d'images par
+seconde, avec des entrées scriptées et un temps reproductible. Sert aux parties
+automatisées, aux tests de charge et aux mesures de performance en intégration continue.
+
+Utilisation :
+    simulation = Simulation(seed=42)
+    simulation.start_new_game("Testeur")
+    simulation.press(pygame.K_d, at_tick=10)
+    report = simulation.run(5000)
+
+En ligne de commande :
+    python -m game.simulation --ticks 10000 --seed 42
+
+Les sauvegardes d'une simulation (F5, quêtes, combats) vont dans un dossier temporaire
+supprimé à la fermeture, et les sauvegardes périodiques sont désactivées : une
+simulation ne touche pas aux emplacements du joueur, sauf si save_dir ou autosave
+sont demandés. De même, la base de données est en mémoire sauf si db_path est donné.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+
+# Le pilote vidéo doit être choisi avant l'initialisation de pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.game import Game
+from game.autosave import AUTOSAVE_INTERVAL_MS
+from game.database import MEMORY_DB
+
+
+class SimulationReport:
+    """Résultat d'une série d'images simulées"""
+
+    def __init__(self, ticks, elapsed, simulated_ms, running):
+        self.ticks = ticks
+        self.elapsed = elapsed
+        self.simulated_ms = simulated_ms
+        self.running = running
+
+    @property
+    def ticks_per_second(self):
+        """Nombre d'images simulées par seconde réelle"""
+        return self.ticks / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def __repr__(self):
+        return (f"SimulationReport(ticks={self.ticks}, elapsed={self.elapsed:.3f}s, "
+                f"ticks_per_second={self.ticks_per_second:.0f}, simulated_ms={self.simulated_ms})")
+
+
+class Simulation:
+    """Pilote une instance de Game sans fenêtre avec des entrées scriptées"""
+
+    def __init__(self, seed=0, fixed_timestep=1/60, render=False, record_path=None, replay_path=None,
+                 save_dir=None, autosave=False, db_path=MEMORY_DB):
+        """
+        Args:
+            seed (int): Graine du générateur aléatoire (combats, apparitions)
+            fixed_timestep (float): Durée d'une image simulée en secondes
+            render (bool): Dessine aussi les scènes (sur la surface factice)
+            record_path (str): Enregistre la session simulée (voir game/replay.py)
+            replay_path (str): Rejoue une session enregistrée au lieu du script
+            save_dir (str): Dossier des sauvegardes (par défaut un dossier temporaire)
+            autosave (bool): Active les sauvegardes périodiques
+            db_path (str): Base de données (en mémoire par défaut, None pour game.db ou RPG_DB)
+        """
+        pygame.init()
+        self.seed = seed
+        random.seed(seed)
+        # Dossier temporaire supprimé par close()
+        self.temp_save_dir = None
+        if save_dir is None:
+            save_dir = self.temp_save_dir = tempfile.mkdtemp(prefix="rpg-saves-")
+        self.game = Game(headless=True, fixed_timestep=fixed_timestep,
+                         record_path=record_path, replay_path=replay_path, save_dir=save_dir,
+                         autosave_interval_ms=AUTOSAVE_INTERVAL_MS if autosave else 0, db_path=db_path)
+        self.game.render_enabled = render
+        self.tick_count = 0
+        # Événements scriptés par numéro d'image
+        self.script = {}
+
+    @property
+    def scene(self):
+        """Scène courante (instanciée si besoin)"""
+        scene = self.game.scenes[self.game.current_scene]
+        if callable(scene):
+            scene = self.game.scenes[self.game.current_scene] = scene()
+        return scene
+
+    @property
+    def game_state(self):
+        return self.game.game_state
+
+    # ------------------------------------------------------------------
+    #   Entrées scriptées
+    # ------------------------------------------------------------------
+    def post(self, event, at_tick=None):
+        """
+        Programme un événement pygame
+
+        Args:
+            event (pygame.event.Event): Événement à injecter
+            at_tick (int): Image où l'injecter, None pour la prochaine image
+        """
+        tick = self.tick_count if at_tick is None else at_tick
+        self.script.setdefault(tick, []).append(event)
+
+    def press(self, key, unicode="", at_tick=None):
+        """Programme l'appui puis le relâchement d'une touche"""
+        self.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=unicode, scancode=0), at_tick)
+        self.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode=unicode, scancode=0), at_tick)
+
+    def type_text(self, text, at_tick=None):
+        """Programme la saisie d'un texte, un caractère par touche"""
+        for char in text:
+            self.press(pygame.key.key_code(char.lower()) if char.isalnum() else 0, char, at_tick)
+
+    def click(self, pos, button=1, at_tick=None):
+        """Programme un clic de souris à une position de l'écran"""
+        pos = tuple(pos)
+        self.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)), at_tick)
+        self.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button), at_tick)
+        self.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button), at_tick)
+
+    def start_new_game(self, name="Simulation"):
+        """
+        Crée un personnage en passant par le menu et l'écran de création
+
+        Args:
+            name (str): Nom du personnage
+
+        Returns:
+            bool: True si la scène de jeu est atteinte
+        """
+        # Menu : « Nouvelle Partie » est l'option sélectionnée par défaut
+        self.press(pygame.K_RETURN)
+        self.step()
+        creation = self.scene
+        # Nom, puis confirmation de la race et de la faction par défaut
+        self.click(creation.name_input_rect.center)
+        self.type_text(name)
+        self.press(pygame.K_RETURN)
+        self.click(creation.confirm_button.center)
+        self.click(creation.confirm_button.center)
+        self.step()
+        return self.game.current_scene == 'game'
+
+    # ------------------------------------------------------------------
+    #   Boucle
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Simule une image : injecte les événements scriptés puis exécute Game.step
+
+        Returns:
+            bool: False si le jeu demande à s'arrêter
+        """
+        for event in self.script.pop(self.tick_count, ()):
+            pygame.event.post(event)
+        running = self.game.step()
+        self.tick_count += 1
+        return running
+
+    def run(self, ticks, until=None):
+        """
+        Simule plusieurs images aussi vite que possible
+
+        Args:
+            ticks (int): Nombre maximal d'images
+            until (callable): Condition d'arrêt anticipé, appelée avec la simulation
+
+        Returns:
+            SimulationReport: Nombre d'images, durée réelle et temps simulé
+        """
+        start = time.perf_counter()
+        start_ms = self.game.clock.get_ticks()
+        done = 0
+        running = True
+        while done < ticks and running:
+            running = self.step()
+            done += 1
+            if until is not None and until(self):
+                break
+        return SimulationReport(done, time.perf_counter() - start,
+                                self.game.clock.get_ticks() - start_ms, running)
+
+    def close(self):
+        """
+        Termine l'enregistrement éventuel, ferme les scènes, rend l'horloge au temps réel
+        et supprime le dossier temporaire des sauvegardes
+        """
+        self.game.close_input_session()
+        self.game.close_scenes()
+        self.game.clock.use_real_time()
+        if self.temp_save_dir is not None:
+            shutil.rmtree(self.temp_save_dir, ignore_errors=True)
+            self.temp_save_dir = None
+
+
+def main(argv=None):
+    """Lance une simulation et affiche sa vitesse"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulation du jeu sans fenêtre")
+    parser.add_argument("--ticks", type=int, default=10000, help="Nombre d'images à simuler")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    parser.add_argument("--timestep", type=float, default=1/60, help="Durée d'une image en secondes")
+    parser.add_argument("--render", action="store_true", help="Dessine aussi les scènes")
+    parser.add_argument("--save-dir", help="Dossier des sauvegardes (temporaire par défaut)")
+    parser.add_argument("--autosave", action="store_true", help="Active les sauvegardes périodiques")
+    parser.add_argument("--db", default=MEMORY_DB, help="Base de données (en mémoire par défaut)")
+    args = parser.parse_args(argv)
+
+    simulation = Simulation(seed=args.seed, fixed_timestep=args.timestep, render=args.render,
+                            save_dir=args.save_dir, autosave=args.autosave, db_path=args.db)
+    if not simulation.start_new_game():
+        print("[ERREUR] Impossible d'atteindre la scène de jeu", flush=True)
+        return 1
+    # Aller-retour du joueur pour faire tourner la logique de déplacement
+    for tick in range(0, args.ticks, 30):
+        simulation.press(pygame.K_d if (tick // 300) % 2 == 0 else pygame.K_q, at_tick=simulation.tick_count + tick)
+    report = simulation.run(args.ticks)
+    simulation.close()
+    print(f"{report.ticks} images simulées en {report.elapsed:.2f} s "
+          f"({report.ticks_per_second:.0f} images/s, {report.simulated_ms / 1000:.1f} s de jeu)", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
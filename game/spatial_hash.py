@@ -0,0 +1,136 @@
+"""
+Index spatial des objets du monde (items, ennemis, PNJ) rangés par case.
+
+Chaque case occupée a son panier d'objets (plusieurs objets peuvent partager une case) et
+chaque objet connaît sa case : « qu'y a-t-il en (x, y) ? » coûte O(1), « qu'y a-t-il à
+moins de r cases ? » ne parcourt que les cases du voisinage (ou les cases occupées si elles
+sont moins nombreuses), quel que soit le nombre d'objets dans le monde.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """Objets du monde indexés par case, avec une catégorie facultative (« item », « pnj »...)"""
+
+    def __init__(self):
+        self._buckets: Dict[Cell, List[Any]] = {}
+        # Objet -> (case, catégorie)
+        self._entries: Dict[Any, Tuple[Cell, Optional[Hashable]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, obj: Any) -> bool:
+        return obj in self._entries
+
+    def insert(self, obj: Any, x: int, y: int, kind: Optional[Hashable] = None):
+        """
+        Place un objet sur une case (le déplace s'il est déjà indexé)
+
+        Args:
+            obj: Objet à indexer (clé de dictionnaire : identité ou égalité de l'objet)
+            x (int): Colonne de la case
+            y (int): Ligne de la case
+            kind (hashable): Catégorie de l'objet pour filtrer les requêtes
+        """
+        if obj in self._entries:
+            self.remove(obj)
+        cell = (x, y)
+        self._buckets.setdefault(cell, []).append(obj)
+        self._entries[obj] = (cell, kind)
+
+    def remove(self, obj: Any) -> bool:
+        """
+        Retire un objet de l'index
+
+        Returns:
+            bool: False si l'objet n'était pas indexé
+        """
+        entry = self._entries.pop(obj, None)
+        if entry is None:
+            return False
+        cell = entry[0]
+        bucket = self._buckets[cell]
+        bucket.remove(obj)
+        if not bucket:
+            del self._buckets[cell]
+        return True
+
+    def move(self, obj: Any, x: int, y: int):
+        """Déplace un objet indexé en gardant sa catégorie"""
+        kind = self._entries[obj][1] if obj in self._entries else None
+        self.insert(obj, x, y, kind)
+
+    def position_of(self, obj: Any) -> Optional[Cell]:
+        """Case d'un objet indexé (None s'il ne l'est pas)"""
+        entry = self._entries.get(obj)
+        return entry[0] if entry else None
+
+    def kind_of(self, obj: Any) -> Optional[Hashable]:
+        """Catégorie d'un objet indexé"""
+        entry = self._entries.get(obj)
+        return entry[1] if entry else None
+
+    def at(self, x: int, y: int, kind: Optional[Hashable] = None) -> List[Any]:
+        """
+        Objets présents sur une case, dans l'ordre d'insertion
+
+        Args:
+            x (int): Colonne
+            y (int): Ligne
+            kind (hashable): Ne garder que cette catégorie (toutes si None)
+
+        Returns:
+            list: Objets de la case
+        """
+        bucket = self._buckets.get((x, y))
+        if not bucket:
+            return []
+        if kind is None:
+            return list(bucket)
+        return [obj for obj in bucket if self._entries[obj][1] == kind]
+
+    def first_at(self, x: int, y: int, kind: Optional[Hashable] = None) -> Optional[Any]:
+        """Premier objet de la case (de la catégorie donnée), None si aucun"""
+        objects = self.at(x, y, kind)
+        return objects[0] if objects else None
+
+    def within(self, x: int, y: int, radius: float, kind: Optional[Hashable] = None) -> List[Any]:
+        """
+        Objets à une distance euclidienne (en cases) inférieure ou égale à radius
+
+        Args:
+            x (int): Colonne du centre
+            y (int): Ligne du centre
+            radius (float): Rayon en cases
+            kind (hashable): Ne garder que cette catégorie (toutes si None)
+
+        Returns:
+            list: Objets trouvés, du plus proche au plus éloigné
+        """
+        reach = int(radius)
+        limit = radius * radius
+        if (2 * reach + 1) ** 2 <= len(self._buckets):
+            cells = [(x + dx, y + dy)
+                     for dy in range(-reach, reach + 1) for dx in range(-reach, reach + 1)
+                     if (x + dx, y + dy) in self._buckets]
+        else:
+            # Peu de cases occupées : moins cher de les parcourir toutes
+            cells = list(self._buckets)
+        found = []
+        for cell in cells:
+            distance = (cell[0] - x) ** 2 + (cell[1] - y) ** 2
+            if distance <= limit:
+                for obj in self._buckets[cell]:
+                    if kind is None or self._entries[obj][1] == kind:
+                        found.append((distance, obj))
+        found.sort(key=lambda pair: pair[0])
+        return [obj for _, obj in found]
+
+    def clear(self):
+        """Vide l'index"""
+        self._buckets.clear()
+        self._entries.clear()
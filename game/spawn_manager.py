@@ -1,16 +1,23 @@
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from random import randint, choice, random
 from .items import ITEMS, Item, ItemType
 from .map import Map, TileType
 from .enemy import Enemy
-from .factions import FactionName, FACTIONS, FactionRelation
+from .factions import FactionName, FACTIONS, FactionRelation, relations_version
 from .player import Player
+from .spawn_table import AliasTable, SpawnTables
+from .spatial_hash import SpatialHash
+from .spawn_scheduler import SpawnScheduler
 
 class SpawnManager:
     def __init__(self, game_map: Map):
         self.game_map = game_map
         self.spawned_items: List[Tuple[Item, int, int]] = []  # Liste des items avec leurs positions
         self.spawned_enemies: List[Enemy] = []
+        # Items (entrées de spawned_items) et ennemis indexés par case
+        self.spatial = SpatialHash()
+        # Apparitions périodiques mises en file et étalées sur plusieurs images
+        self.scheduler = SpawnScheduler(self)
         
         # Ajustement des maximums pour la nouvelle taille de carte
         map_size = self.game_map.width * self.game_map.height
@@ -24,96 +31,209 @@ class SpawnManager:
             ItemType.POTION: 0.35     # 35% de chance pour les potions
         }
         
+        # Poids propres à certaines zones (nom de zone -> poids par type), sinon spawn_weights
+        self.zone_weights: Dict[str, Dict[ItemType, float]] = {}
+        # Tables d'alias compilées à partir des poids, de ITEMS et des relations
+        self.spawn_tables = SpawnTables()
+        
         # Changement de la probabilité de spawn pour les ennemis à 100%
         self.enemy_spawn_chance = 1.0  # 100% de chance qu'un ennemi apparaisse lors d'une mise à jour
 
     def get_random_empty_position(self) -> Optional[Tuple[int, int]]:
-        """Trouve une position vide aléatoire sur la carte"""
-        empty_positions = []
-        
-        # Parcourt la carte pour trouver toutes les positions vides
-        for y in range(1, self.game_map.height - 1):  # Évite les bords
-            for x in range(1, self.game_map.width - 1):  # Évite les bords
-                if self.game_map.grid[y][x] == TileType.EMPTY.value:
-                    empty_positions.append((x, y))
-        
-        # Retourne une position aléatoire parmi les positions vides
-        return choice(empty_positions) if empty_positions else None
-
-    def select_random_item(self) -> Item:
-        """Sélectionne un item aléatoire selon les probabilités définies"""
-        # Filtre les items par type
-        items_by_type = {type_: [] for type_ in ItemType}
-        for item in ITEMS.values():
-            items_by_type[item.item_type].append(item)
-
-        # Sélectionne d'abord le type selon les poids
-        rand = random()
-        cumulative = 0
-        selected_type = None
-        for item_type, weight in self.spawn_weights.items():
-            cumulative += weight
-            if rand <= cumulative:
-                selected_type = item_type
-                break
-
-        # Sélectionne un item aléatoire du type choisi
-        available_items = items_by_type[selected_type]
-        return choice(available_items)
+        """Trouve une position vide aléatoire sur la carte (bords exclus) en O(1)"""
+        free_cells = self.game_map.free_cells
+        position = free_cells.random_cell()
+        # Le joueur n'est pas dans l'index (il bouge à chaque image) : on retire au sort
+        # si le tirage tombe sur sa case
+        if position == self.game_map.player_pos:
+            if len(free_cells) == 1:
+                return None
+            while position == self.game_map.player_pos:
+                position = free_cells.random_cell()
+        return position
+
+    def item_table(self, zone: Optional[str] = None) -> Optional[AliasTable]:
+        """
+        Table d'apparition des items d'une zone, recompilée seulement si ITEMS ou les poids changent
+
+        Le poids d'un type est partagé entre ses items ; un type sans item n'est jamais tiré.
+
+        Args:
+            zone (str): Zone de la carte (poids de zone_weights), None pour spawn_weights
+
+        Returns:
+            AliasTable: Table des items, None si aucun item ne peut apparaître
+        """
+        weights = self.zone_weights.get(zone, self.spawn_weights)
+        signature = (ITEMS.version, tuple((item_type.value, weight) for item_type, weight in weights.items()))
+
+        def build_weights():
+            items_by_type = {type_: [] for type_ in ItemType}
+            for item in ITEMS.values():
+                items_by_type[item.item_type].append(item)
+            item_weights = {}
+            for item_type, weight in weights.items():
+                for item in items_by_type[item_type]:
+                    item_weights[item] = weight / len(items_by_type[item_type])
+            return item_weights
+
+        return self.spawn_tables.get(("items", zone), signature, build_weights)
+
+    def set_zone_weights(self, zone: str, weights: Dict[ItemType, float]):
+        """Définit les probabilités de chaque type d'item pour une zone"""
+        self.zone_weights[zone] = dict(weights)
+
+    def select_random_item(self, zone: Optional[str] = None) -> Optional[Item]:
+        """Sélectionne un item aléatoire selon les probabilités définies (O(1))"""
+        table = self.item_table(zone)
+        return table.sample() if table else None
+
+    def select_random_items(self, count: int, zone: Optional[str] = None) -> List[Item]:
+        """Sélectionne count items d'un coup (apparitions groupées)"""
+        table = self.item_table(zone)
+        return table.sample_many(count) if table else []
+
+    def hostile_faction_table(self, player_faction: FactionName) -> Optional[AliasTable]:
+        """Factions hostiles à celle du joueur (tirage uniforme), recompilée si les relations changent"""
+        return self.spawn_tables.get(
+            ("hostiles", player_faction), relations_version(),
+            lambda: {faction: 1 for faction in FactionName
+                     if FACTIONS[player_faction].get_relation(faction) == FactionRelation.HOSTILE})
+
+    def weapon_table(self) -> Optional[AliasTable]:
+        """Armes pouvant équiper un ennemi (tirage uniforme), recompilée si ITEMS change"""
+        return self.spawn_tables.get(
+            ("armes",), ITEMS.version,
+            lambda: {item: 1 for item in ITEMS.values() if item.item_type == ItemType.WEAPON})
+
+    def race_table(self) -> AliasTable:
+        """Races des ennemis (tirage uniforme)"""
+        races = tuple(Player.RACES)
+        return self.spawn_tables.get(("races",), races, lambda: {race: 1 for race in races})
 
     def spawn_item(self) -> bool:
-        """Tente de faire apparaître un nouvel item sur la carte"""
+        """Tente de faire apparaître un nouvel item sur la carte (immédiatement)"""
         if len(self.spawned_items) >= self.max_items:
             return False
             
+        plan = self.place_item()
+        if plan is None:
+            return False
+        self.commit_item(*plan)
+        return True
+
+    def place_item(self, zone: Optional[str] = None) -> Optional[Tuple[Item, int, int]]:
+        """
+        Première étape d'une apparition d'item : choisit l'item et réserve sa case
+
+        Returns:
+            tuple: (item, x, y) à passer à commit_item, None si rien ne peut apparaître
+        """
+        item = self.select_random_item(zone)
+        if item is None:
+            return None
         position = self.get_random_empty_position()
         if not position:
-            return False
-            
-        item = self.select_random_item()
+            return None
         x, y = position
-        
         self.game_map.add_item(TileType.ITEM, x, y)
-        self.spawned_items.append((item, x, y))
-        return True
+        return item, x, y
+
+    def commit_item(self, item: Item, x: int, y: int):
+        """Seconde étape : enregistre l'item placé par place_item"""
+        entry = (item, x, y)
+        self.spawned_items.append(entry)
+        self.spatial.insert(entry, x, y, "item")
+
+    def place_enemy(self, player_faction: FactionName, near: Optional[Tuple[int, int]] = None,
+                    radius: int = 5) -> Optional[Tuple[FactionName, str, Optional[Item], int, int]]:
+        """
+        Première étape d'une apparition d'ennemi : tire faction, race et arme, réserve la case
+
+        Args:
+            player_faction (FactionName): Faction du joueur
+            near (tuple): Case autour de laquelle apparaître (n'importe où si None)
+            radius (int): Distance maximale à near, en cases
+
+        Returns:
+            tuple: (faction, race, arme, x, y) à passer à commit_enemy, None si impossible
+        """
+        hostile_factions = self.hostile_faction_table(player_faction)
+        if not hostile_factions:
+            return None
+        if near is None:
+            position = self.get_random_empty_position()
+        else:
+            position = self.game_map.free_cells.random_within(near[0], near[1], radius, min_distance=1)
+        if not position:
+            return None
+        x, y = position
+        self.game_map.add_item(TileType.ENEMY, x, y)
+        weapons = self.weapon_table()
+        return (hostile_factions.sample(), self.race_table().sample(),
+                weapons.sample() if weapons else None, x, y)
+
+    def commit_enemy(self, faction: FactionName, race: str, weapon: Optional[Item], x: int, y: int) -> Enemy:
+        """Seconde étape : crée l'ennemi placé par place_enemy"""
+        enemy = Enemy(f"Ennemi {race.capitalize()}", faction, x, y, race, weapon)
+        self.spawned_enemies.append(enemy)
+        self.spatial.insert(enemy, x, y, "enemy")
+        return enemy
 
     def remove_item(self, x: int, y: int) -> Optional[Item]:
         """Retire un item de la carte et retourne l'item s'il existe"""
-        for i, (item, item_x, item_y) in enumerate(self.spawned_items):
-            if item_x == x and item_y == y:
-                self.spawned_items.pop(i)
-                self.game_map.remove_item(x, y)
-                return item
-        return None
+        entry = self.spatial.first_at(x, y, "item")
+        if entry is None:
+            return None
+        self.spatial.remove(entry)
+        self.spawned_items.remove(entry)
+        self.game_map.remove_item(x, y)
+        return entry[0]
+
+    def _request_items(self):
+        """Met en file un item avec une probabilité qui baisse à mesure que la carte se remplit"""
+        missing = self.max_items - len(self.spawned_items) - self.scheduler.pending("item")
+        if random() < missing * 0.2:
+            self.scheduler.request_item()
 
     def update(self):
-        """Met à jour le spawn manager (appelé périodiquement)"""
+        """Met à jour le spawn manager (appelé à chaque image) : demandes puis travail dans le budget"""
         # Gestion du spawn des items
-        spawn_chance = (self.max_items - len(self.spawned_items)) * 0.2
-        if random() < spawn_chance:
-            self.spawn_item()
-            
-        # Gestion du spawn des ennemis
-        if len(self.spawned_enemies) < self.max_enemies and random() < self.enemy_spawn_chance:
-            # On ne peut pas spawner d'ennemis car il nous manque la faction du joueur
-            return
+        self._request_items()
+        # Les ennemis demandent la faction du joueur (voir update_with_player_faction)
+        self.scheduler.tick()
 
     def update_with_player_faction(self, player_faction: FactionName):
         """Met à jour le spawn manager avec la faction du joueur"""
-        if len(self.spawned_enemies) < self.max_enemies:
-            self.spawn_enemy(player_faction)
+        if (len(self.spawned_enemies) + self.scheduler.pending("enemy") < self.max_enemies
+                and random() < self.enemy_spawn_chance):
+            self.scheduler.request_enemy(player_faction)
         
         # Gestion du spawn des items
-        spawn_chance = (self.max_items - len(self.spawned_items)) * 0.2
-        if random() < spawn_chance:
-            self.spawn_item()
+        self._request_items()
+        self.scheduler.tick()
+
+    def remove_enemy(self, enemy: Enemy) -> bool:
+        """Retire un ennemi (vaincu) et libère sa case"""
+        if enemy not in self.spawned_enemies:
+            return False
+        self.spawned_enemies.remove(enemy)
+        self.spatial.remove(enemy)
+        self.game_map.remove_item(enemy.x, enemy.y)
+        return True
 
     def get_item_at_position(self, x: int, y: int) -> Optional[Item]:
         """Retourne l'item à la position donnée s'il existe"""
-        for item, item_x, item_y in self.spawned_items:
-            if item_x == x and item_y == y:
-                return item
-        return None
+        entry = self.spatial.first_at(x, y, "item")
+        return entry[0] if entry else None
+
+    def get_enemy_at_position(self, x: int, y: int) -> Optional[Enemy]:
+        """Retourne l'ennemi à la position donnée s'il existe"""
+        return self.spatial.first_at(x, y, "enemy")
+
+    def enemies_within(self, x: int, y: int, radius: float) -> List[Enemy]:
+        """Ennemis à moins de radius cases, du plus proche au plus éloigné"""
+        return self.spatial.within(x, y, radius, "enemy")
 
     def spawn_enemy(self, player_faction: FactionName) -> bool:
         """Fait apparaître un ennemi à la position (3,5) avec une faction hostile"""
@@ -128,29 +248,28 @@ class SpawnManager:
         x, y = 3, 5
         
         # Vérifie si la position est disponible
-        if self.game_map.grid[y][x] != TileType.EMPTY.value:
+        if (x, y) not in self.game_map.free_cells:
             print("La position est déjà occupée")  # Debug
             return False
         
         # Sélectionne une faction hostile au joueur
-        hostile_factions = [faction for faction in FactionName 
-                          if FACTIONS[player_faction].get_relation(faction) == FactionRelation.HOSTILE]
-        
-        print(f"Factions hostiles trouvées : {[f.value for f in hostile_factions]}")  # Debug
+        hostile_factions = self.hostile_faction_table(player_faction)
         
         if not hostile_factions:
             print("Aucune faction hostile disponible")  # Debug
             return False
+        
+        print(f"Factions hostiles trouvées : {[f.value for f in hostile_factions.keys]}")  # Debug
             
-        enemy_faction = choice(hostile_factions)
+        enemy_faction = hostile_factions.sample()
         print(f"Faction ennemie choisie : {enemy_faction.value}")  # Debug
         
         # Sélectionne une race aléatoire
-        enemy_race = choice(list(Player.RACES.keys()))
+        enemy_race = self.race_table().sample()
         
         # Sélectionne une arme aléatoire
-        weapons = [item for item in ITEMS.values() if item.item_type == ItemType.WEAPON]
-        enemy_weapon = choice(weapons) if weapons else None
+        weapons = self.weapon_table()
+        enemy_weapon = weapons.sample() if weapons else None
         
         # Crée l'ennemi
         enemy = Enemy(
@@ -163,8 +282,9 @@ class SpawnManager:
         )
         
         # Place l'ennemi sur la carte
-        self.game_map.grid[y][x] = TileType.ENEMY.value
+        self.game_map.add_item(TileType.ENEMY, x, y)
         self.spawned_enemies.append(enemy)
+        self.spatial.insert(enemy, x, y, "enemy")
         
         print(f"Un {enemy_race.capitalize()} de la faction {enemy_faction.value} est apparu en ({x}, {y})")
         if enemy_weapon:
@@ -192,17 +312,17 @@ class SpawnManager:
                 if x <= 0 or x >= self.game_map.width - 1:
                     continue
                     
-                if self.game_map.grid[y][x] == TileType.EMPTY.value:
+                if (x, y) in self.game_map.free_cells:
                     # Sélectionne une faction hostile au joueur
-                    hostile_factions = [faction for faction in FactionName 
-                                      if FACTIONS[player_faction].get_relation(faction).value == "hostile"]
+                    hostile_factions = self.hostile_faction_table(player_faction)
                     if not hostile_factions:
                         return False
                     
-                    enemy_faction = choice(hostile_factions)
+                    enemy_faction = hostile_factions.sample()
                     enemy = Enemy(f"Ennemi {len(self.spawned_enemies) + 1}", enemy_faction, x, y)
                     self.game_map.add_item(TileType.ENEMY, x, y)
                     self.spawned_enemies.append(enemy)
+                    self.spatial.insert(enemy, x, y, "enemy")
                     print(f"\nUn ennemi est apparu en position ({x}, {y}) !")  # Debug
                     return True
         
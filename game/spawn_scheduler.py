@@ -0,0 +1,175 @@
+"""
+Ordonnanceur des apparitions : les demandes sont mises en file et traitées par petites
+étapes, dans un budget de temps et d'opérations par image.
+
+Une apparition se fait en deux étapes :
+- placement : choix de la case (réservée aussitôt sur la carte) et de ce qui apparaît ;
+- mise en place : création de l'objet ou de l'ennemi et enregistrement dans les index.
+
+Une vague de 30 ennemis est ainsi étalée sur plusieurs images au lieu de tout faire dans
+la même, ce qui évite les à-coups. Les compteurs (profondeur de file, demandes reportées,
+durée des passages) permettent de régler le budget.
+"""
+
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+from .factions import FactionName
+
+# Nombre maximal d'étapes par image
+DEFAULT_MAX_OPERATIONS = 4
+# Temps maximal passé par image, en millisecondes (au moins une étape est toujours faite)
+DEFAULT_TIME_BUDGET_MS = 1.0
+
+
+class SpawnRequest:
+    """Demande d'apparition en attente"""
+
+    def __init__(self, kind: str, player_faction: Optional[FactionName] = None, zone: Optional[str] = None,
+                 near: Optional[Tuple[int, int]] = None, radius: int = 5):
+        """
+        Args:
+            kind (str): "item" ou "enemy"
+            player_faction (FactionName): Faction du joueur (ennemis : faction hostile)
+            zone (str): Zone de la carte pour les poids des items
+            near (tuple): Case autour de laquelle apparaître (n'importe où si None)
+            radius (int): Distance maximale à near, en cases
+        """
+        self.kind = kind
+        self.player_faction = player_faction
+        self.zone = zone
+        self.near = near
+        self.radius = radius
+        # Résultat du placement, None tant qu'il n'est pas fait
+        self.plan = None
+
+
+class SpawnScheduler:
+    """File d'apparitions traitée dans un budget par image"""
+
+    def __init__(self, spawn_manager, max_operations: int = DEFAULT_MAX_OPERATIONS,
+                 time_budget_ms: float = DEFAULT_TIME_BUDGET_MS):
+        """
+        Args:
+            spawn_manager (SpawnManager): Gestionnaire qui réalise les étapes
+            max_operations (int): Nombre maximal d'étapes par image
+            time_budget_ms (float): Temps maximal par image en millisecondes
+        """
+        self.spawn_manager = spawn_manager
+        self.max_operations = max_operations
+        self.time_budget_ms = time_budget_ms
+        self._queue = deque()
+        # Demandes en file et demandes placées (case réservée) par type
+        self._queued = {"item": 0, "enemy": 0}
+        self._placed = {"item": 0, "enemy": 0}
+        # Compteurs
+        self.operations = 0
+        self.spawned = 0
+        self.failed = 0
+        self.deferred = 0
+        self.last_tick_ms = 0.0
+        self.max_tick_ms = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de demandes en attente"""
+        return len(self._queue)
+
+    def pending(self, kind: str) -> int:
+        """Nombre de demandes en attente d'un type donné"""
+        return self._queued.get(kind, 0)
+
+    def request_item(self, zone: Optional[str] = None) -> SpawnRequest:
+        """Met en file l'apparition d'un item"""
+        return self._enqueue(SpawnRequest("item", zone=zone))
+
+    def request_enemy(self, player_faction: FactionName, near: Optional[Tuple[int, int]] = None,
+                      radius: int = 5) -> SpawnRequest:
+        """Met en file l'apparition d'un ennemi hostile au joueur"""
+        return self._enqueue(SpawnRequest("enemy", player_faction, near=near, radius=radius))
+
+    def request_wave(self, count: int, player_faction: FactionName, near: Tuple[int, int],
+                     radius: int = 5):
+        """Met en file une vague d'ennemis autour d'une case (embuscade)"""
+        for _ in range(count):
+            self.request_enemy(player_faction, near, radius)
+
+    def _enqueue(self, request: SpawnRequest) -> SpawnRequest:
+        """Ajoute une demande en fin de file"""
+        self._queue.append(request)
+        self._queued[request.kind] += 1
+        return request
+
+    def _step(self, request: SpawnRequest) -> bool:
+        """
+        Fait l'étape suivante d'une demande
+
+        Returns:
+            bool: True si la demande est terminée (apparue ou abandonnée)
+        """
+        manager = self.spawn_manager
+        kind = request.kind
+        if request.plan is None:
+            # Les demandes déjà placées comptent dans les maximums
+            if kind == "item":
+                if len(manager.spawned_items) + self._placed[kind] < manager.max_items:
+                    request.plan = manager.place_item(request.zone)
+            elif len(manager.spawned_enemies) + self._placed[kind] < manager.max_enemies:
+                request.plan = manager.place_enemy(request.player_faction, request.near, request.radius)
+            if request.plan is None:
+                self.failed += 1
+                self._queued[kind] -= 1
+                return True
+            self._placed[kind] += 1
+            return False
+        if kind == "item":
+            manager.commit_item(*request.plan)
+        else:
+            manager.commit_enemy(*request.plan)
+        self._placed[kind] -= 1
+        self._queued[kind] -= 1
+        self.spawned += 1
+        return True
+
+    def tick(self) -> int:
+        """
+        Traite les demandes en file dans le budget de l'image
+
+        Returns:
+            int: Nombre d'étapes faites
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_budget_ms / 1000
+        operations = 0
+        while self._queue and operations < self.max_operations:
+            if operations and time.perf_counter() >= deadline:
+                break
+            if self._step(self._queue[0]):
+                self._queue.popleft()
+            operations += 1
+        self.operations += operations
+        # Demandes reportées à l'image suivante
+        self.deferred += len(self._queue)
+        self.last_tick_ms = (time.perf_counter() - start) * 1000
+        self.max_tick_ms = max(self.max_tick_ms, self.last_tick_ms)
+        return operations
+
+    def flush(self):
+        """Traite toute la file sans limite de budget (chargement, tests)"""
+        while self._queue:
+            if self._step(self._queue[0]):
+                self._queue.popleft()
+            self.operations += 1
+
+    def stats(self) -> dict:
+        """Compteurs de l'ordonnanceur"""
+        return {
+            'queue_depth': self.queue_depth,
+            'deferred': self.deferred,
+            'operations': self.operations,
+            'spawned': self.spawned,
+            'failed': self.failed,
+            'last_tick_ms': self.last_tick_ms,
+            'max_tick_ms': self.max_tick_ms,
+        }
@@ -0,0 +1,113 @@
+"""
+Tables d'apparition pondérées, compilées une fois en tables d'alias (méthode de Walker/Vose).
+
+Un tirage pondéré naïf parcourt les poids cumulés à chaque appel (O(n)). Une table d'alias
+se construit en O(n) puis chaque tirage coûte un nombre aléatoire entier et un flottant :
+on choisit une colonne au hasard, puis soit sa propre valeur soit son alias.
+
+Les tables sont mises en cache sous un nom et une signature (versions de ITEMS et des
+relations entre factions, poids utilisés) : elles ne sont recompilées que si l'une change.
+"""
+
+from random import random, randrange
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class AliasTable:
+    """Tirage pondéré en O(1) parmi un ensemble fixe de valeurs"""
+
+    def __init__(self, weights: Dict[Any, float]):
+        """
+        Args:
+            weights (dict): Valeur -> poids (les poids nuls ou négatifs sont ignorés)
+
+        Raises:
+            ValueError: Si aucun poids n'est strictement positif
+        """
+        self.keys = [key for key, weight in weights.items() if weight > 0]
+        if not self.keys:
+            raise ValueError("Une table d'apparition doit contenir au moins un poids positif")
+        count = len(self.keys)
+        total = float(sum(weights[key] for key in self.keys))
+        # Poids ramenés à une moyenne de 1 par colonne
+        scaled = [weights[key] * count / total for key in self.keys]
+        self._prob = [1.0] * count
+        self._alias = list(range(count))
+
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            # La colonne « less » est complétée par la valeur « more »
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Les restes (erreurs d'arrondi) gardent une probabilité de 1
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def sample(self) -> Any:
+        """Tire une valeur selon les poids"""
+        column = randrange(len(self.keys))
+        if random() < self._prob[column]:
+            return self.keys[column]
+        return self.keys[self._alias[column]]
+
+    def sample_many(self, count: int) -> List[Any]:
+        """Tire count valeurs indépendantes d'un coup"""
+        keys, prob, alias = self.keys, self._prob, self._alias
+        size = len(keys)
+        samples = []
+        for _ in range(count):
+            column = randrange(size)
+            samples.append(keys[column] if random() < prob[column] else keys[alias[column]])
+        return samples
+
+    def probability(self, key: Any) -> float:
+        """Probabilité de tirer une valeur, recalculée depuis la table"""
+        size = len(self.keys)
+        total = 0.0
+        for column in range(size):
+            if self.keys[column] == key:
+                total += self._prob[column]
+            if self.keys[self._alias[column]] == key:
+                total += 1.0 - self._prob[column]
+        return total / size
+
+
+class SpawnTables:
+    """Cache de tables d'alias nommées, recompilées quand leur signature change"""
+
+    def __init__(self):
+        self._tables: Dict[Hashable, Tuple[Hashable, Optional[AliasTable]]] = {}
+        self.builds = 0
+
+    def get(self, name: Hashable, signature: Hashable,
+            build_weights: Callable[[], Dict[Any, float]]) -> Optional[AliasTable]:
+        """
+        Retourne la table compilée pour ce nom
+
+        Args:
+            name (hashable): Nom de la table (par exemple ("items", zone))
+            signature (hashable): Tout ce dont dépendent les poids ; une signature
+                différente de celle de la table en cache provoque sa recompilation
+            build_weights (callable): Calcule le dictionnaire valeur -> poids
+
+        Returns:
+            AliasTable: La table, None si aucun poids n'est positif
+        """
+        cached = self._tables.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        weights = build_weights()
+        table = AliasTable(weights) if any(weight > 0 for weight in weights.values()) else None
+        self._tables[name] = (signature, table)
+        self.builds += 1
+        return table
+
+    def clear(self):
+        """Oublie toutes les tables compilées"""
+        self._tables.clear()
@@ -0,0 +1,176 @@
+"""
+Atlas de textures partagé par les personnages, les PNJ, les objets et l'interface.
+
+Chaque image chargée (éventuellement redimensionnée ou découpée en frames) est copiée
+une seule fois dans une grande page au format de l'écran, puis exposée sous forme de
+sous-surface nommée. Les blits du jeu portent ainsi sur quelques pages déjà converties
+au lieu d'une multitude de petites surfaces, souvent non converties.
+"""
+
+import os
+
+import pygame
+
+# Dossier racine du projet, base des chemins relatifs
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TextureAtlas:
+    """
+    Atlas rangeant les images par étagères (shelf packing) dans des pages de taille fixe.
+
+    Les sous-surfaces retournées restent valides quand d'autres images sont ajoutées :
+    une page n'est jamais déplacée, seules ses zones libres sont remplies.
+    """
+    DEFAULT_PAGE_SIZE = 1024
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE, padding=1):
+        """
+        Args:
+            page_size (int): Côté d'une page en pixels
+            padding (int): Marge en pixels entre deux images
+        """
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        # Étagère courante de chaque page : [x, y, hauteur]
+        self._shelves = []
+        self._regions = {}
+
+    def __contains__(self, name):
+        return name in self._regions
+
+    def __len__(self):
+        return len(self._regions)
+
+    def get(self, name):
+        """Retourne la sous-surface d'une image déjà rangée, ou None"""
+        return self._regions.get(name)
+
+    def _new_page(self, width, height):
+        """Crée une page transparente, convertie au format de l'écran si possible"""
+        page = pygame.Surface((width, height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._shelves.append([0, 0, 0])
+        return len(self.pages) - 1
+
+    def _allocate(self, width, height):
+        """Réserve une zone libre de la taille demandée et retourne (page, x, y)"""
+        padded_width = width + self.padding
+        padded_height = height + self.padding
+        # Une image plus grande qu'une page occupe sa propre page
+        if padded_width > self.page_size or padded_height > self.page_size:
+            return self._new_page(width, height), 0, 0
+
+        for index, shelf in enumerate(self._shelves):
+            page = self.pages[index]
+            if page.get_width() != self.page_size:
+                continue
+            x, y, shelf_height = shelf
+            # Place sur l'étagère courante
+            if x + padded_width <= self.page_size and y + max(shelf_height, padded_height) <= self.page_size:
+                shelf[0] = x + padded_width
+                shelf[2] = max(shelf_height, padded_height)
+                return index, x, y
+            # Nouvelle étagère sous la précédente
+            if y + shelf_height + padded_height <= self.page_size:
+                shelf[:] = [padded_width, y + shelf_height, padded_height]
+                return index, 0, y + shelf_height
+
+        index = self._new_page(self.page_size, self.page_size)
+        self._shelves[index] = [padded_width, 0, padded_height]
+        return index, 0, 0
+
+    def add(self, name, surface):
+        """
+        Range une image dans l'atlas
+
+        Args:
+            name (str): Nom de l'image dans l'atlas
+            surface (pygame.Surface): Image à copier
+
+        Returns:
+            pygame.Surface: Sous-surface de l'atlas contenant l'image
+        """
+        if name in self._regions:
+            return self._regions[name]
+        width, height = surface.get_size()
+        index, x, y = self._allocate(width, height)
+        page = self.pages[index]
+        # Copie exacte des pixels et de l'alpha sur la zone transparente de la page
+        page.blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        region = page.subsurface(pygame.Rect(x, y, width, height))
+        self._regions[name] = region
+        return region
+
+    def load_image(self, path, size=None):
+        """
+        Charge une image (redimensionnée si demandé) dans l'atlas
+
+        Args:
+            path (str): Chemin de l'image, absolu ou relatif à la racine du projet
+            size (tuple): Taille (largeur, hauteur) voulue, ou None pour la taille d'origine
+
+        Returns:
+            pygame.Surface: Sous-surface de l'atlas contenant l'image
+        """
+        name = self._image_name(path, size)
+        if name in self._regions:
+            return self._regions[name]
+        image = pygame.image.load(os.path.join(BASE_PATH, path))
+        if size is not None and image.get_size() != tuple(size):
+            image = pygame.transform.scale(image, size)
+        return self.add(name, image)
+
+    def load_sheet(self, path, columns, rows):
+        """
+        Charge une planche de sprites et la découpe en frames
+
+        Args:
+            path (str): Chemin de la planche, absolu ou relatif à la racine du projet
+            columns (int): Nombre de frames par ligne
+            rows (int): Nombre de lignes
+
+        Returns:
+            list: Une liste de frames (sous-surfaces) par ligne
+        """
+        name = self._image_name(path)
+        sheet = self._regions.get(name)
+        if sheet is None:
+            sheet = self.add(name, pygame.image.load(os.path.join(BASE_PATH, path)))
+        frame_width = sheet.get_width() // columns
+        frame_height = sheet.get_height() // rows
+        return [
+            [sheet.subsurface(pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height))
+             for col in range(columns)]
+            for row in range(rows)
+        ]
+
+    def _image_name(self, path, size=None):
+        """Nom d'une image dans l'atlas : chemin relatif au projet et taille éventuelle"""
+        path = os.path.join(BASE_PATH, path)
+        name = os.path.relpath(path, BASE_PATH).replace(os.sep, "/")
+        if size is not None:
+            name = f"{name}@{size[0]}x{size[1]}"
+        return name
+
+
+# Atlas partagé par tout le jeu, créé à la première utilisation
+_shared_atlas = None
+
+
+def get_atlas():
+    """Retourne l'atlas de textures partagé"""
+    global _shared_atlas
+    if _shared_atlas is None:
+        _shared_atlas = TextureAtlas()
+    return _shared_atlas
+
+
+def reset_atlas():
+    """Oublie l'atlas partagé (changement de mode vidéo, tests)"""
+    global _shared_atlas
+    _shared_atlas = None
@@ -2,9 +2,33 @@ import pygame
 import pytmx
 from pytmx.util_pygame import load_pygame
 import os
+from game.collision_grid import CollisionGrid
+from game import map_cache
+from game import chunk_streamer
+from game.trace import get_channel
+
+# Traces du rendu de la carte (désactivées par défaut, voir game/trace.py)
+trace = get_channel("map")
 
 class TiledMap:
-    def __init__(self, filename):
+    # Taille par défaut (en tuiles) d'un chunk pré-rendu
+    DEFAULT_CHUNK_SIZE = 16
+
+    # Rayon (en chunks) gardé en mémoire autour du joueur en mode streaming
+    DEFAULT_STREAM_RADIUS = 2
+
+    def __init__(self, filename, chunk_size=DEFAULT_CHUNK_SIZE, use_cache=True, streaming=False,
+                 stream_radius=DEFAULT_STREAM_RADIUS):
+        """
+        Charge une carte Tiled
+
+        Args:
+            filename (str): Chemin du fichier .tmx
+            chunk_size (int): Taille (en tuiles) d'un chunk pré-rendu
+            use_cache (bool): Utilise le cache compilé de la carte
+            streaming (bool): Ne charge que les chunks proches du joueur (très grandes cartes)
+            stream_radius (int): Rayon (en chunks) chargé autour du joueur en mode streaming
+        """
         try:
             # Vérification que le fichier TMX existe
             abs_tmx_path = os.path.abspath(filename)
@@ -14,8 +38,20 @@ class TiledMap:
             # Sauvegarder le répertoire de base pour les chemins relatifs
             self.base_dir = os.path.dirname(abs_tmx_path)
             
-            # Charger la carte TMX
-            self.map = load_pygame(filename)
+            if chunk_size <= 0:
+                raise ValueError(f"Taille de chunk invalide : {chunk_size}")
+            
+            self.streamer = None
+            if streaming:
+                self._open_streamer(filename, chunk_size, stream_radius)
+            else:
+                # Charger la carte depuis le cache compilé s'il est à jour, sinon via pytmx
+                self.map = map_cache.load_compiled_map(filename) if use_cache else None
+                self.from_cache = self.map is not None
+                if not self.from_cache:
+                    self.map = load_pygame(filename)
+                    if use_cache:
+                        self._write_cache(filename)
             
             # Initialiser les propriétés de base
             self.width = self.map.width
@@ -26,10 +62,59 @@ class TiledMap:
             
             print(f"Dimensions de la carte - Tuiles: {self.width}x{self.height}, Pixels: {self.pixel_width}x{self.pixel_height}")
             
+            # Cache des chunks pré-rendus des calques statiques
+            self.chunk_size = chunk_size
+            self.chunk_pixel_size = self.chunk_size * self.tile_size
+            self._chunk_cache = {}
+            
+            if self.streamer:
+                # Les collisions sont lues dans les chunks chargés ; un chunk évincé
+                # libère aussi sa surface pré-rendue
+                self.collision_grid = self.streamer
+                self.streamer.on_evict = lambda cx, cy: self._chunk_cache.pop((cx, cy), None)
+            else:
+                # Grille des collisions calculée une seule fois au chargement
+                self.collision_grid = CollisionGrid.from_tiled_map(self.map)
+            
         except Exception as e:
             print(f"Erreur lors du chargement de la carte: {str(e)}")
             raise
 
+    def _write_cache(self, filename):
+        """Compile la carte chargée par pytmx pour accélérer les prochains lancements"""
+        try:
+            map_cache.compile_map(self.map, filename)
+        except (OSError, pygame.error) as e:
+            print(f"Impossible d'écrire le cache de la carte : {e}")
+
+    def _open_streamer(self, filename, chunk_size, stream_radius):
+        """Ouvre le fichier de chunks de la carte, en le créant s'il est absent ou périmé"""
+        self.streamer = chunk_streamer.open_chunk_pack(filename, chunk_size, radius=stream_radius)
+        self.from_cache = self.streamer is not None
+        if not self.from_cache:
+            # Découpage unique : les lancements suivants ne relisent plus le .tmx
+            pack_path = chunk_streamer.write_chunk_pack(load_pygame(filename), filename, chunk_size)
+            self.streamer = chunk_streamer.ChunkStreamer(pack_path, radius=stream_radius)
+        self.map = self.streamer
+
+    def update_stream(self, grid_x, grid_y, direction=None):
+        """
+        Charge les chunks autour du joueur en mode streaming (sans effet sinon)
+
+        Args:
+            grid_x (int): Position X du joueur en tuiles
+            grid_y (int): Position Y du joueur en tuiles
+            direction: Direction du joueur, pour précharger les chunks vers lesquels il va
+        """
+        if self.streamer:
+            self.streamer.update(grid_x, grid_y, direction)
+
+    def close(self):
+        """Libère les ressources du mode streaming"""
+        if self.streamer:
+            self.streamer.close()
+            self.streamer = None
+
     def _get_camera_offset(self, screen, player_rect):
         """Calcule le décalage de la caméra pour centrer sur le joueur"""
         # Calculer le centre de l'écran
@@ -40,72 +125,135 @@ class TiledMap:
         target_x = player_rect.x - screen_width // 2 + self.tile_size // 2
         target_y = player_rect.y - screen_height // 2 + self.tile_size // 2
         
-        # Debug: Afficher les positions de la caméra
-        print(f"Camera - Target: ({target_x}, {target_y}), Screen: ({screen_width}, {screen_height})")
-        print(f"Map Size: {self.pixel_width}x{self.pixel_height}, Player: ({player_rect.x}, {player_rect.y})")
+        trace.debug("Caméra - cible (%s, %s), écran %sx%s, joueur (%s, %s)",
+                    target_x, target_y, screen_width, screen_height, player_rect.x, player_rect.y)
         
         # Limiter la caméra aux bords de la carte
         camera_x = max(0, min(target_x, max(0, self.pixel_width - screen_width)))
         camera_y = max(0, min(target_y, max(0, self.pixel_height - screen_height)))
         
-        # Debug: Afficher les offsets finaux
-        print(f"Camera Offset: ({-camera_x}, {-camera_y})")
+        trace.debug("Décalage de la caméra : (%s, %s)", -camera_x, -camera_y)
         
         # Retourner le décalage négatif pour le rendu
         return -camera_x, -camera_y
 
     def is_collision(self, grid_x, grid_y):
-        """Vérifie s'il y a une collision à la position donnée"""
-        print(f"Vérification collision à ({grid_x}, {grid_y})")
-        
-        # Vérifier les limites de la carte
-        if grid_x < 0 or grid_x >= self.width or grid_y < 0 or grid_y >= self.height:
-            print(f"Hors limites de la carte")
-            return True
-            
-        # Vérifier les collisions sur le calque obstacles
-        obstacles_layer = self.get_layer_by_name("obstacles")
-        if obstacles_layer and hasattr(obstacles_layer, 'data'):
-            tile_gid = obstacles_layer.data[grid_y][grid_x]
-            print(f"ID de la tuile d'obstacle : {tile_gid}")
-            if tile_gid > 0:  # Si la tuile n'est pas vide
-                print(f"Collision trouvée !")
-                return True
-        
-        print(f"Pas de collision")
-        return False
+        """Vérifie s'il y a une collision à la position donnée (toujours vrai hors de la carte)"""
+        return self.collision_grid.is_blocked(grid_x, grid_y)
 
     def render(self, screen, camera_offset):
-        """Rendu de la carte"""
+        """Rendu de la carte à partir des chunks pré-rendus"""
         # Obtenir les dimensions de l'écran
         screen_width = screen.get_width()
         screen_height = screen.get_height()
         
-        # Calculer les tuiles visibles basées sur l'offset de la caméra
-        start_x = max(0, -camera_offset[0] // self.tile_size)
-        start_y = max(0, -camera_offset[1] // self.tile_size)
-        end_x = min(self.width, (-camera_offset[0] + screen_width) // self.tile_size + 1)
-        end_y = min(self.height, (-camera_offset[1] + screen_height) // self.tile_size + 1)
+        # Calculer les chunks visibles basés sur l'offset de la caméra
+        start_cx = max(0, int(-camera_offset[0] // self.chunk_pixel_size))
+        start_cy = max(0, int(-camera_offset[1] // self.chunk_pixel_size))
+        end_cx = min(self.chunks_x, int((-camera_offset[0] + screen_width - 1) // self.chunk_pixel_size) + 1)
+        end_cy = min(self.chunks_y, int((-camera_offset[1] + screen_height - 1) // self.chunk_pixel_size) + 1)
         
-        print(f"Rendering tiles from ({start_x}, {start_y}) to ({end_x}, {end_y})")
-        print(f"Camera offset: {camera_offset}")
+        trace.debug("Rendu des chunks de (%s, %s) à (%s, %s), caméra %s",
+                    start_cx, start_cy, end_cx, end_cy, camera_offset)
         
-        # Dessiner chaque calque visible
+        # Un seul blit par chunk visible au lieu d'un blit par tuile
+        for cy in range(start_cy, end_cy):
+            for cx in range(start_cx, end_cx):
+                chunk = self._get_chunk(cx, cy)
+                if chunk:
+                    pos_x = cx * self.chunk_pixel_size + camera_offset[0]
+                    pos_y = cy * self.chunk_pixel_size + camera_offset[1]
+                    screen.blit(chunk, (pos_x, pos_y))
+
+    @property
+    def chunks_x(self):
+        """Nombre de chunks sur l'axe horizontal"""
+        return (self.width + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def chunks_y(self):
+        """Nombre de chunks sur l'axe vertical"""
+        return (self.height + self.chunk_size - 1) // self.chunk_size
+
+    def _get_chunk(self, cx, cy):
+        """Retourne la surface du chunk (cx, cy), pré-rendue à la première demande"""
+        key = (cx, cy)
+        if key not in self._chunk_cache:
+            self._chunk_cache[key] = self._bake_chunk(cx, cy)
+        return self._chunk_cache[key]
+
+    def _bake_chunk(self, cx, cy):
+        """Pré-rend tous les calques de tuiles d'un chunk sur une seule surface"""
+        start_x = cx * self.chunk_size
+        start_y = cy * self.chunk_size
+        end_x = min(self.width, start_x + self.chunk_size)
+        end_y = min(self.height, start_y + self.chunk_size)
+        
+        surface = pygame.Surface(
+            ((end_x - start_x) * self.tile_size, (end_y - start_y) * self.tile_size),
+            pygame.SRCALPHA
+        )
+        
+        if self.streamer:
+            return self._bake_streamed_chunk(surface, cx, cy)
+        
+        is_empty = True
         for layer in self.map.layers:
-            if hasattr(layer, 'data'):  # Si c'est un calque de tuiles
-                for y in range(int(start_y), int(end_y)):
-                    for x in range(int(start_x), int(end_x)):
-                        gid = layer.data[y][x]
-                        if gid:
-                            tile = self.map.get_tile_image_by_gid(gid)
-                            if tile:
-                                # Position de la tuile avec offset de caméra
-                                pos_x = x * self.tile_size + camera_offset[0]
-                                pos_y = y * self.tile_size + camera_offset[1]
-                                
-                                # Ne dessiner que si la tuile est visible à l'écran
-                                if -self.tile_size <= pos_x <= screen_width and -self.tile_size <= pos_y <= screen_height:
-                                    screen.blit(tile, (pos_x, pos_y))
+            # Comme le rendu tuile par tuile, les calques cachés dans Tiled sont dessinés
+            if not hasattr(layer, 'data'):
+                continue
+            for y in range(start_y, end_y):
+                row = layer.data[y]
+                for x in range(start_x, end_x):
+                    gid = row[x]
+                    if gid:
+                        tile = self.map.get_tile_image_by_gid(gid)
+                        if tile:
+                            surface.blit(tile, ((x - start_x) * self.tile_size, (y - start_y) * self.tile_size))
+                            is_empty = False
+        
+        # Un chunk vide n'a pas besoin d'être dessiné
+        if is_empty:
+            return None
+        
+        # Convertir au format de l'écran une seule fois pour accélérer les blits
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def _bake_streamed_chunk(self, surface, cx, cy):
+        """Pré-rend un chunk à partir des données chargées par le streamer"""
+        chunk = self.streamer.get_chunk(cx, cy)
+        if chunk is None or not chunk.layers:
+            return None
+        
+        is_empty = True
+        for data in chunk.layers:
+            for index, gid in enumerate(data):
+                if gid:
+                    tile = self.streamer.get_tile_image_by_gid(gid)
+                    if tile:
+                        surface.blit(tile, ((index % chunk.width) * self.tile_size, (index // chunk.width) * self.tile_size))
+                        is_empty = False
+        
+        if is_empty:
+            return None
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def invalidate_chunks(self, grid_x=None, grid_y=None):
+        """
+        Invalide le cache des chunks pré-rendus
+        
+        Args:
+            grid_x (int): Position X de la tuile modifiée (None pour tout invalider)
+            grid_y (int): Position Y de la tuile modifiée (None pour tout invalider)
+        """
+        if grid_x is None or grid_y is None:
+            self._chunk_cache.clear()
+        else:
+            self._chunk_cache.pop((grid_x // self.chunk_size, grid_y // self.chunk_size), None)
 
     def get_layer_by_name(self, name):
         """Récupère un calque par son nom"""
@@ -115,26 +263,12 @@ class TiledMap:
         return None
 
     def get_collider_rects(self):
-        """Retourne une liste de pygame.Rect pour toutes les tuiles avec collision"""
-        collider_rects = []
+        """
+        Retourne une liste de pygame.Rect pour toutes les tuiles avec collision
         
-        # Parcourir tous les calques
-        for layer in self.map.layers:
-            if hasattr(layer, 'data'):  # Si c'est un calque de tuiles
-                for y in range(self.height):
-                    for x in range(self.width):
-                        tile = layer.data[y][x]
-                        if tile and hasattr(tile, 'properties') and tile.properties.get('collision', False):
-                            # Créer un rectangle de collision pour cette tuile
-                            rect = pygame.Rect(
-                                x * self.tile_size,
-                                y * self.tile_size,
-                                self.tile_size,
-                                self.tile_size
-                            )
-                            collider_rects.append(rect)
-        
-        return collider_rects
+        En mode streaming, seules les tuiles des chunks en mémoire sont retournées.
+        """
+        return self.collision_grid.get_blocked_rects(self.tile_size)
 
     def is_wall(self, x, y):
         """Vérifie si la position donnée contient un mur (collision)"""
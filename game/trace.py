@@ -0,0 +1,282 @@
+"""
+Traces de débogage par canal, sans coût quand elles sont désactivées.
+
+Chaque sous-système obtient un canal nommé (« map », « scene », « pnj »...) doté d'un
+niveau minimal. Un appel de trace sur un canal désactivé se réduit à une comparaison
+d'entiers : le message n'est jamais formaté. Sur un canal actif, l'enregistrement
+(horodatage, canal, niveau, format et arguments) est ajouté tel quel à un tampon
+circulaire en mémoire ; le formatage et l'écriture dans le fichier de traces sont faits
+par un thread de fond, hors de la boucle de jeu.
+
+Configuration par variables d'environnement :
+    RPG_TRACE="scene=debug,map=info"   (ou "*=debug" pour tous les canaux)
+    RPG_TRACE_FILE="trace.log"
+
+Utilisation :
+    trace = get_channel("map")
+    trace.debug("Chunks visibles de %s à %s", start, end)
+    if trace.enabled(DEBUG):
+        ...  # calcul réservé aux traces
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+# Niveaux de trace
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {
+    'debug': DEBUG,
+    'info': INFO,
+    'warning': WARNING,
+    'error': ERROR,
+    'off': OFF,
+}
+_LEVEL_LABELS = {level: name.upper() for name, level in LEVEL_NAMES.items()}
+
+# Fichier de traces par défaut
+DEFAULT_TRACE_FILE = "trace.log"
+
+
+class TraceChannel:
+    """Canal de trace d'un sous-système"""
+    __slots__ = ('name', 'level', 'tracer')
+
+    def __init__(self, name, tracer, level=OFF):
+        self.name = name
+        self.tracer = tracer
+        self.level = level
+
+    def enabled(self, level=DEBUG):
+        """Vérifie si un message de ce niveau serait enregistré"""
+        return level >= self.level
+
+    def log(self, level, message, *args):
+        """
+        Enregistre un message si le canal est actif pour ce niveau
+
+        Args:
+            level (int): Niveau du message
+            message: Format (style %) ou fonction sans argument retournant le texte
+            *args: Arguments du format, formatés uniquement à l'écriture
+        """
+        if level >= self.level:
+            self.tracer.record(self.name, level, message, args)
+
+    def debug(self, message, *args):
+        if DEBUG >= self.level:
+            self.tracer.record(self.name, DEBUG, message, args)
+
+    def info(self, message, *args):
+        if INFO >= self.level:
+            self.tracer.record(self.name, INFO, message, args)
+
+    def warning(self, message, *args):
+        if WARNING >= self.level:
+            self.tracer.record(self.name, WARNING, message, args)
+
+    def error(self, message, *args):
+        if ERROR >= self.level:
+            self.tracer.record(self.name, ERROR, message, args)
+
+
+class Tracer:
+    """
+    Collecteur des traces : tampon circulaire en mémoire et écriture asynchrone.
+
+    Le tampon est borné : quand il est plein, les enregistrements les plus anciens sont
+    perdus (et comptés) plutôt que de ralentir le jeu.
+    """
+
+    def __init__(self, capacity=8192, default_level=OFF):
+        """
+        Args:
+            capacity (int): Nombre maximal d'enregistrements en attente d'écriture
+            default_level (int): Niveau des canaux non configurés
+        """
+        self.capacity = capacity
+        self.default_level = default_level
+        self.channels = {}
+        self.levels = {}
+        self.buffer = deque(maxlen=capacity)
+        self.recorded = 0
+        self.written = 0
+        self.path = None
+        self._file = None
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.flush_interval = 0.5
+
+    def channel(self, name):
+        """Retourne le canal d'un sous-système, créé au premier appel"""
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = TraceChannel(name, self, self.levels.get(name, self.default_level))
+            self.channels[name] = channel
+        return channel
+
+    def set_level(self, name, level):
+        """
+        Change le niveau d'un canal
+
+        Args:
+            name (str): Nom du canal, ou "*" pour tous les canaux
+            level: Niveau (int) ou nom de niveau ("debug", "info"...)
+        """
+        if isinstance(level, str):
+            level = LEVEL_NAMES[level.lower()]
+        if name == "*":
+            self.default_level = level
+            self.levels.clear()
+            for channel in self.channels.values():
+                channel.level = level
+            return
+        self.levels[name] = level
+        if name in self.channels:
+            self.channels[name].level = level
+
+    def configure(self, spec):
+        """
+        Applique une configuration "canal=niveau,canal=niveau"
+
+        Args:
+            spec (str): Configuration, par exemple "*=info,scene=debug"
+        """
+        entries = [entry.strip() for entry in spec.split(",") if entry.strip()]
+        # Le joker s'applique d'abord pour que les canaux nommés le surchargent
+        entries.sort(key=lambda entry: not entry.startswith("*"))
+        for entry in entries:
+            name, _, level = entry.partition("=")
+            try:
+                self.set_level(name.strip(), level.strip() or "debug")
+            except KeyError:
+                print(f"Niveau de trace inconnu : {entry}")
+
+    @property
+    def dropped(self):
+        """Nombre d'enregistrements perdus faute de place dans le tampon"""
+        return self.recorded - self.written - len(self.buffer)
+
+    def record(self, channel, level, message, args):
+        """Ajoute un enregistrement brut au tampon (deque.append est atomique)"""
+        self.recorded += 1
+        self.buffer.append((time.perf_counter(), channel, level, message, args))
+
+    @staticmethod
+    def format_record(entry):
+        """Formate un enregistrement en une ligne de texte"""
+        timestamp, channel, level, message, args = entry
+        try:
+            if callable(message):
+                text = message()
+            elif args:
+                text = message % args
+            else:
+                text = str(message)
+        except Exception as e:
+            text = f"{message!r} {args!r} (formatage impossible : {e})"
+        return f"{timestamp:12.6f} {_LEVEL_LABELS.get(level, level):<7} [{channel}] {text}\n"
+
+    def drain(self):
+        """Retire et retourne tous les enregistrements en attente"""
+        entries = []
+        try:
+            while True:
+                entries.append(self.buffer.popleft())
+        except IndexError:
+            pass
+        return entries
+
+    def open(self, path=DEFAULT_TRACE_FILE, flush_interval=0.5):
+        """
+        Démarre l'écriture asynchrone des traces dans un fichier
+
+        Args:
+            path (str): Fichier de traces (ajout en fin de fichier)
+            flush_interval (float): Délai maximal en secondes entre deux écritures
+        """
+        self.close()
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = open(path, "a", encoding="utf-8")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._writer, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def _writer(self):
+        """Boucle du thread d'écriture"""
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Écrit immédiatement les enregistrements en attente"""
+        with self._write_lock:
+            # Sans fichier, les traces restent dans le tampon
+            if self._file is None:
+                return
+            entries = self.drain()
+            if entries:
+                self._file.write("".join(self.format_record(entry) for entry in entries))
+                self._file.flush()
+                self.written += len(entries)
+
+    def request_flush(self):
+        """Réveille le thread d'écriture sans attendre"""
+        self._wakeup.set()
+
+    def close(self):
+        """Arrête le thread d'écriture après avoir tout écrit, puis ferme le fichier"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+# Collecteur partagé par tout le jeu
+_tracer = Tracer()
+
+
+def get_tracer():
+    """Retourne le collecteur de traces partagé"""
+    return _tracer
+
+
+def get_channel(name):
+    """Retourne le canal de trace d'un sous-système"""
+    return _tracer.channel(name)
+
+
+def configure_from_env(environ=None):
+    """
+    Configure les traces à partir de RPG_TRACE et RPG_TRACE_FILE
+
+    Returns:
+        bool: True si au moins un canal a été activé
+    """
+    environ = os.environ if environ is None else environ
+    spec = environ.get("RPG_TRACE", "")
+    if not spec:
+        return False
+    _tracer.configure(spec)
+    _tracer.open(environ.get("RPG_TRACE_FILE", DEFAULT_TRACE_FILE))
+    return True
+
+
+def shutdown():
+    """Écrit les dernières traces et ferme le fichier"""
+    _tracer.close()
@@ -1,4 +1,5 @@
 import pygame
+from game.game_clock import get_ticks
 
 class DialogBox:
     def __init__(self, screen, message, font_size=24, stats_text=None):
@@ -13,7 +14,7 @@ class DialogBox:
         self.result = None
         
         # Délai de protection pour éviter la fermeture immédiate
-        self.creation_time = pygame.time.get_ticks()
+        self.creation_time = get_ticks()
         self.protection_delay = 300  # 300ms de délai avant de pouvoir fermer
         
         # Couleurs
@@ -72,7 +73,7 @@ class DialogBox:
         print(f"Type d'événement reçu: {event.type}")
         
         # Vérifier si on est encore dans le délai de protection
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         time_since_creation = current_time - self.creation_time
         if time_since_creation < self.protection_delay:
             print(f"→ Dans le délai de protection ({time_since_creation}ms < {self.protection_delay}ms)")
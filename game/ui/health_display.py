@@ -1,5 +1,6 @@
 import pygame
 import os
+from game.texture_atlas import get_atlas
 
 class HealthDisplay:
     def __init__(self, screen):
@@ -10,10 +11,8 @@ class HealthDisplay:
         # Charger l'image du cœur
         base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         heart_path = os.path.join(base_path, "assets", "images_ui", "heart.png")
-        self.heart_image = pygame.image.load(heart_path)
-        
-        # Redimensionner l'image du cœur (30x30 pixels)
-        self.heart_image = pygame.transform.scale(self.heart_image, (30, 30))
+        # Image du cœur redimensionnée (30x30 pixels) et rangée dans l'atlas partagé
+        self.heart_image = get_atlas().load_image(heart_path, (30, 30))
         
     def render(self, player_hp):
         """Affiche le niveau de vie du joueur avec une icône de cœur"""
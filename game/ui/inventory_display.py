@@ -1,6 +1,6 @@
 import pygame
 from game.items import ItemType  # Ajout de l'import manquant
-import os
+from game.texture_atlas import get_atlas
 
 class InventoryDisplay:
     def __init__(self, screen):
@@ -62,10 +62,8 @@ class InventoryDisplay:
         """Charge et met en cache l'image d'un item"""
         if image_path not in self.item_images:
             try:
-                base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                full_path = os.path.join(base_path, image_path)
-                image = pygame.image.load(full_path)
-                self.item_images[image_path] = pygame.transform.scale(image, self.item_image_size)
+                # Image redimensionnée une seule fois et rangée dans l'atlas partagé
+                self.item_images[image_path] = get_atlas().load_image(image_path, self.item_image_size)
             except Exception as e:
                 print(f"Erreur lors du chargement de l'image {image_path}: {e}")
                 return None
@@ -6,8 +6,14 @@ La Planète des Singes - RPG
 import os
 import sys
 import venv
+import hashlib
 import subprocess
 
+# Empreinte de l'installation, écrite dans le venv une fois les dépendances installées
+FINGERPRINT_FILE = ".rpg-fingerprint"
+# Force la reconstruction du venv (sinon réutilisé tant que l'empreinte est la même)
+REBUILD_FLAG = "--rebuild"
+
 def is_venv():
     """Vérifie si nous sommes dans un environnement virtuel"""
     return (hasattr(sys, 'real_prefix') or
@@ -28,12 +34,72 @@ def clean_venv(venv_path):
         print(f"[ATTENTION] Impossible de nettoyer complètement l'environnement : {e}", flush=True)
         print("Tentative de continuer malgré tout...", flush=True)
 
-def setup_environment():
-    """Configure l'environnement virtuel et installe les dépendances"""
-    print("\n=== Configuration de l'environnement de jeu ===", flush=True)
-    
+def venv_python_path(venv_path):
+    """Chemin de l'exécutable Python d'un environnement virtuel"""
+    if sys.platform == "win32":
+        return os.path.join(venv_path, "Scripts", "python.exe")
+    return os.path.join(venv_path, "bin", "python")
+
+def venv_fingerprint(requirements_file):
+    """
+    Empreinte de ce dont dépend le venv : contenu de requirements.txt et interpréteur
+    qui l'a créé (version, implémentation, plateforme)
+
+    Args:
+        requirements_file (str): Chemin du fichier requirements.txt
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    with open(requirements_file, "rb") as f:
+        digest.update(f.read())
+    interpreter = f"{sys.implementation.name} {sys.version} {sys.platform} {os.path.realpath(sys.executable)}"
+    digest.update(interpreter.encode("utf-8"))
+    return digest.hexdigest()
+
+def read_fingerprint(venv_path):
+    """Empreinte enregistrée lors de la dernière installation réussie (None si absente)"""
+    try:
+        with open(os.path.join(venv_path, FINGERPRINT_FILE), encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def write_fingerprint(venv_path, fingerprint):
+    """Enregistre l'empreinte d'une installation réussie dans le venv"""
+    with open(os.path.join(venv_path, FINGERPRINT_FILE), "w", encoding="utf-8") as f:
+        f.write(fingerprint)
+
+def is_venv_up_to_date(venv_path, fingerprint):
+    """
+    Vérifie si le venv existant peut être réutilisé sans réinstallation
+
+    Args:
+        venv_path (str): Dossier du venv
+        fingerprint (str): Empreinte attendue (voir venv_fingerprint)
+
+    Returns:
+        bool: True si l'exécutable est présent et l'empreinte identique
+    """
+    return os.path.exists(venv_python_path(venv_path)) and read_fingerprint(venv_path) == fingerprint
+
+def setup_environment(force_rebuild=False, base_dir=None):
+    """
+    Configure l'environnement virtuel et installe les dépendances
+
+    Le venv existant est réutilisé tel quel si requirements.txt et l'interpréteur n'ont pas
+    changé depuis la dernière installation réussie : le lancement est alors immédiat.
+
+    Args:
+        force_rebuild (bool): Reconstruit le venv même s'il est à jour
+        base_dir (str): Dossier du jeu (par défaut celui de main.py)
+
+    Returns:
+        str: Chemin de l'exécutable Python du venv, None en cas d'échec
+    """
     # Chemins importants
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
     venv_path = os.path.join(base_dir, "venv")
     requirements_file = os.path.join(base_dir, "requirements.txt")
     
@@ -43,7 +109,12 @@ def setup_environment():
         return None
         
     try:
-        # Nettoyage de l'ancien venv si nécessaire
+        fingerprint = venv_fingerprint(requirements_file)
+        if not force_rebuild and is_venv_up_to_date(venv_path, fingerprint):
+            return venv_python_path(venv_path)
+
+        print("\n=== Configuration de l'environnement de jeu ===", flush=True)
+        # Nettoyage de l'ancien venv (dépendances ou interpréteur différents)
         clean_venv(venv_path)
         
         # Création du venv
@@ -52,12 +123,7 @@ def setup_environment():
         print("[OK] Environnement virtuel créé avec succès", flush=True)
         
         # Détermination du chemin de l'exécutable Python du venv
-        if sys.platform == "win32":
-            venv_python = os.path.join(venv_path, "Scripts", "python.exe")
-            venv_pip = os.path.join(venv_path, "Scripts", "pip.exe")
-        else:
-            venv_python = os.path.join(venv_path, "bin", "python")
-            venv_pip = os.path.join(venv_path, "bin", "pip")
+        venv_python = venv_python_path(venv_path)
             
         if not os.path.exists(venv_python):
             print("[ERREUR] L'exécutable Python n'a pas été trouvé dans le venv!", flush=True)
@@ -78,6 +144,9 @@ def setup_environment():
                 return None
                 
         print("[OK] Dépendances installées avec succès\n", flush=True)
+        # Écrite en dernier : une installation interrompue sera refaite au prochain lancement
+        write_fingerprint(venv_path, fingerprint)
+        print("\n=== Configuration terminée avec succès ===", flush=True)
         
         return venv_python
         
@@ -96,17 +165,16 @@ def main():
         # Vérifie si nous sommes dans le venv
         if not is_venv():
             # Si nous ne sommes pas dans le venv, on le configure et on relance le script
-            python_path = setup_environment()
+            args = [arg for arg in sys.argv[1:] if arg != REBUILD_FLAG]
+            python_path = setup_environment(force_rebuild=REBUILD_FLAG in sys.argv[1:])
             if python_path:
-                print("\n=== Configuration terminée avec succès ===", flush=True)
-                print("Relancement du jeu dans l'environnement virtuel...\n", flush=True)
+                print("Lancement du jeu dans l'environnement virtuel...\n", flush=True)
                 try:
                     # Sous Windows, on utilise subprocess.call au lieu de os.execv
                     if sys.platform == "win32":
-                        subprocess.call([python_path, __file__])
-                        sys.exit(0)
+                        sys.exit(subprocess.call([python_path, __file__] + args))
                     else:
-                        os.execv(python_path, [python_path, __file__])
+                        os.execv(python_path, [python_path, __file__] + args)
                 except Exception as e:
                     print(f"[ERREUR] Erreur lors du relancement du jeu : {e}", flush=True)
                     sys.exit(1)
@@ -117,32 +185,10 @@ def main():
         else:
             # Nous sommes dans le venv, on peut importer les dépendances
             try:
-                # Import des dépendances seulement une fois dans le venv
-                print("\n=== Chargement des dépendances ===", flush=True)
-                
-                print("1. Importation de Pygame...", flush=True)
                 import pygame
                 pygame.init()
-                print("[OK] Pygame importé et initialisé avec succès", flush=True)
-                
-                print("\n2. Importation des modules du jeu...", flush=True)
-                from game.display_manager import DisplayManager
-                from game.player import Player
-                from game.factions import FactionName, FACTIONS
-                from game.inventory import Inventory
-                from game.items import ITEMS, ItemType
-                from game.map import Map, TileType
-                from game.spawn_manager import SpawnManager
-                from game.combat_system import CombatSystem
-                from game.dialogue_system import DialogueSystem
-                from game.game_state import GameState
-                from game.scenes.menu_scene import MenuScene
-                from game.scenes.game_scene import GameScene
-                from game.scenes.character_creation_scene import CharacterCreationScene
-                from game.scenes.message_scene import MessageScene
-                print("[OK] Tous les modules du jeu ont été importés avec succès\n", flush=True)
                 
-                # Lancement du jeu
+                # Lancement du jeu : Game importe lui-même les modules et scènes dont il a besoin
                 print("=== Démarrage du jeu ===\n", flush=True)
                 from game.game import Game  # On importe Game seulement maintenant
                 game = Game()
@@ -0,0 +1,16 @@
+import pytest
+from game import database
+
+@pytest.fixture(autouse=True)
+def memory_database(monkeypatch):
+    """
+    Base par défaut en mémoire pour chaque test : la suite n'écrit pas dans game.db
+
+    Les tests qui passent un chemin de base (dossier temporaire) ne sont pas concernés.
+    Les pools ouverts pendant le test sont fermés ensuite : chaque test part d'une base vide.
+    """
+    monkeypatch.setenv("RPG_DB", database.MEMORY_DB)
+    monkeypatch.delenv("RPG_DB_SEED", raising=False)
+    monkeypatch.delenv("RPG_DB_EXPORT", raising=False)
+    yield
+    database.close_all_pools()
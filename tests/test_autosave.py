@@ -0,0 +1,145 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+import game.quest_system as quest_system
+from game.autosave import AutoSaver
+from game.factions import FactionName
+from game.game_clock import get_clock
+from game.game_state import GameState
+from game.player import Player
+from game.save_game import SaveSlots
+
+class SlowSlots(SaveSlots):
+    """Emplacements dont l'écriture attend un signal (disque lent)"""
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.release = threading.Event()
+        self.written = []
+
+    def write(self, slot, save):
+        self.release.wait(5)
+        self.written.append((slot, save.player['hp']))
+        return super().write(slot, save)
+
+class TestAutoSaver(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.slots = SlowSlots(os.path.join(self.tmp_dir, "saves"))
+        self.saver = AutoSaver(self.slots, interval_ms=1000)
+        self.game_state = GameState()
+        self.game_state.player = Player("Auto", 6, 28, "chimpanze", FactionName.VEILLEURS)
+
+    def tearDown(self):
+        self.slots.release.set()
+        self.saver.close()
+        get_clock().use_real_time()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_request_does_not_wait_for_disk(self):
+        """Demander une sauvegarde ne coûte que la copie de l'état"""
+        start = time.perf_counter()
+        self.assertTrue(self.saver.request(self.game_state))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(self.saver.has_pending())
+        self.slots.release.set()
+        self.assertTrue(self.saver.flush(timeout=5))
+        self.assertEqual(self.game_state.save_slot, 1)
+        self.assertEqual(self.slots.load(1).player['name'], "Auto")
+
+    def test_snapshot_is_taken_at_request(self):
+        """La partie peut changer pendant l'écriture : l'état demandé est celui sauvegardé"""
+        self.saver.request(self.game_state)
+        self.game_state.player.hp = 5
+        self.slots.release.set()
+        self.saver.flush(timeout=5)
+        self.assertEqual(self.slots.load(1).player['hp'], 100)
+
+    def test_pending_requests_are_coalesced(self):
+        """Pendant une écriture, seule la dernière demande est gardée"""
+        for hp in (90, 80, 70, 60):
+            self.game_state.player.hp = hp
+            self.saver.request(self.game_state)
+        self.slots.release.set()
+        self.assertTrue(self.saver.flush(timeout=5))
+        self.assertEqual(self.slots.written[-1], (1, 60))
+        self.assertLessEqual(len(self.slots.written), 2)
+        self.assertEqual(self.saver.saves_written, len(self.slots.written))
+
+    def test_periodic_save(self):
+        """Une sauvegarde est demandée à chaque intervalle de temps de jeu"""
+        self.slots.release.set()
+        clock = get_clock()
+        clock.simulate(start_ms=0)
+        self.saver.tick(self.game_state)
+        clock.set_time(999)
+        self.saver.tick(self.game_state)
+        self.assertEqual(self.saver.requests, 0)
+        clock.set_time(1000)
+        self.saver.tick(self.game_state)
+        self.assertEqual(self.saver.requests, 1)
+        clock.set_time(1500)
+        self.saver.tick(self.game_state)
+        self.assertEqual(self.saver.requests, 1)
+
+    def test_new_game_does_not_overwrite_full_slots(self):
+        """Tous les emplacements occupés : une nouvelle partie n'en remplace aucun automatiquement"""
+        self.slots.release.set()
+        for slot in range(1, self.slots.slots + 1):
+            other = GameState()
+            other.player = Player(f"Ancien {slot}", 6, 28, "chimpanze", FactionName.VEILLEURS)
+            self.slots.save(slot, other)
+            os.utime(self.slots.path(slot), (slot, slot))
+
+        for reason in ("périodique", "quête", "combat"):
+            self.assertTrue(self.saver.request(self.game_state, reason))
+            self.assertTrue(self.saver.flush(timeout=5))
+        self.assertIsNone(self.game_state.save_slot)
+        self.assertEqual(self.saver.saves_written, 0)
+        self.assertEqual(self.saver.skipped, 3)
+        self.assertEqual([name for _, name, _ in self.slots.list_slots()], ["Ancien 1", "Ancien 2", "Ancien 3"])
+
+        # F5 : la sauvegarde la plus ancienne est remplacée, les suivantes restent dans cet emplacement
+        self.assertTrue(self.saver.request(self.game_state, "manuelle", overwrite=True))
+        self.assertTrue(self.saver.flush(timeout=5))
+        self.assertEqual(self.game_state.save_slot, 1)
+        self.saver.request(self.game_state, "périodique")
+        self.assertTrue(self.saver.flush(timeout=5))
+        self.assertEqual([name for _, name, _ in self.slots.list_slots()], ["Auto", "Ancien 2", "Ancien 3"])
+
+    def test_close_writes_pending_save(self):
+        """Fermer la sauvegarde automatique écrit la dernière demande"""
+        self.saver.request(self.game_state)
+        self.slots.release.set()
+        self.saver.close()
+        self.assertEqual(self.slots.load(1).player['name'], "Auto")
+        self.assertFalse(self.saver.request(self.game_state))
+
+class TestQuestAutosave(unittest.TestCase):
+    def setUp(self):
+        self.saved_state = (quest_system._game_scene, quest_system.quest1_done, quest_system.current_quest_index)
+
+    def tearDown(self):
+        quest_system._game_scene, quest_system.quest1_done, quest_system.current_quest_index = self.saved_state
+
+    def test_quest_progress_requests_save(self):
+        """Chaque progression de quête demande une sauvegarde, pas les vérifications sans effet"""
+        reasons = []
+
+        class Scene:
+            def save_game(self, reason):
+                reasons.append(reason)
+
+        quest_system._game_scene = Scene()
+        quest_system.quest1_done = False
+        quest_system.current_quest_index = 1
+        quest_system.advance_quest_if_done()
+        self.assertEqual(reasons, [])
+        quest_system.quest1_done = True
+        quest_system.advance_quest_if_done()
+        self.assertEqual(reasons, ["quête"])
+
+if __name__ == '__main__':
+    unittest.main()
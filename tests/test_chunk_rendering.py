@@ -0,0 +1,94 @@
+import unittest
+import pygame
+import os
+from game.tiled_map import TiledMap
+
+class TestChunkRendering(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Initialisation une seule fois pour toute la classe de test"""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """Initialisation avant chaque test"""
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.map_path = os.path.join(base_path, "assets", "mapV3.tmx")
+
+    def render_tile_by_tile(self, tiled_map, screen, camera_offset):
+        """Rendu de référence : un blit par tuile, comme avant le cache de chunks"""
+        for layer in tiled_map.map.layers:
+            if hasattr(layer, 'data'):
+                for y in range(tiled_map.height):
+                    for x in range(tiled_map.width):
+                        gid = layer.data[y][x]
+                        if gid:
+                            tile = tiled_map.map.get_tile_image_by_gid(gid)
+                            if tile:
+                                screen.blit(tile, (x * tiled_map.tile_size + camera_offset[0],
+                                                   y * tiled_map.tile_size + camera_offset[1]))
+
+    def test_chunk_render_matches_tile_render(self):
+        """Le rendu par chunks doit être identique au rendu tuile par tuile"""
+        tiled_map = TiledMap(self.map_path, chunk_size=7)
+        camera_offset = (-150, -230)
+
+        chunk_screen = pygame.Surface((800, 600))
+        tile_screen = pygame.Surface((800, 600))
+        tiled_map.render(chunk_screen, camera_offset)
+        self.render_tile_by_tile(tiled_map, tile_screen, camera_offset)
+
+        for x in range(0, 800, 37):
+            for y in range(0, 600, 29):
+                self.assertEqual(chunk_screen.get_at((x, y)), tile_screen.get_at((x, y)))
+
+    def test_hidden_layers_are_drawn(self):
+        """Un calque caché dans Tiled est dessiné, comme dans le rendu tuile par tuile"""
+        tiled_map = TiledMap(self.map_path, chunk_size=7)
+        tile_layers = [layer for layer in tiled_map.map.layers if hasattr(layer, 'data')]
+        tile_layers[-1].visible = False
+        camera_offset = (-150, -230)
+
+        chunk_screen = pygame.Surface((800, 600))
+        tile_screen = pygame.Surface((800, 600))
+        tiled_map.render(chunk_screen, camera_offset)
+        self.render_tile_by_tile(tiled_map, tile_screen, camera_offset)
+
+        for x in range(0, 800, 37):
+            for y in range(0, 600, 29):
+                self.assertEqual(chunk_screen.get_at((x, y)), tile_screen.get_at((x, y)))
+
+    def test_only_visible_chunks_are_baked(self):
+        """Seuls les chunks qui recouvrent la caméra sont pré-rendus"""
+        tiled_map = TiledMap(self.map_path, chunk_size=8)
+        self.assertEqual((tiled_map.chunks_x, tiled_map.chunks_y), (4, 4))
+
+        screen = pygame.Surface((256, 256))
+        tiled_map.render(screen, (0, 0))
+        self.assertEqual(set(tiled_map._chunk_cache.keys()), {(0, 0)})
+
+    def test_invalidate_chunks(self):
+        """L'invalidation retire le chunk contenant la tuile modifiée"""
+        tiled_map = TiledMap(self.map_path, chunk_size=16)
+        tiled_map.render(pygame.Surface((800, 600)), (0, 0))
+        self.assertIn((1, 1), tiled_map._chunk_cache)
+
+        tiled_map.invalidate_chunks(20, 17)
+        self.assertNotIn((1, 1), tiled_map._chunk_cache)
+        self.assertIn((0, 0), tiled_map._chunk_cache)
+
+        tiled_map.invalidate_chunks()
+        self.assertEqual(tiled_map._chunk_cache, {})
+
+    def test_invalid_chunk_size(self):
+        """Une taille de chunk nulle est refusée"""
+        with self.assertRaises(ValueError):
+            TiledMap(self.map_path, chunk_size=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+import pygame
+import os
+import shutil
+import tempfile
+from array import array
+from game import chunk_streamer, map_cache
+from game.collision_grid import CollisionGrid
+from game.pathfinding import Pathfinder
+from game.tiled_map import TiledMap
+
+class TestChunkStreamer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Initialisation une seule fois pour toute la classe de test"""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """Copie la carte et ses dépendances dans un dossier temporaire"""
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.tmp_dir = tempfile.mkdtemp()
+        shutil.copytree(os.path.join(base_path, "assets", "tilesets"), os.path.join(self.tmp_dir, "tilesets"))
+        self.map_path = os.path.join(self.tmp_dir, "mapV3.tmx")
+        shutil.copy(os.path.join(base_path, "assets", "mapV3.tmx"), self.map_path)
+        self.streamers = []
+
+    def tearDown(self):
+        for streamer in self.streamers:
+            streamer.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def make_large_map(self, size=512):
+        """Carte synthétique : un sol partout, des murs et des arbres en motif"""
+        tiles = {}
+        for gid, color in [(1, (40, 160, 40)), (2, (90, 90, 90)), (3, (20, 90, 20))]:
+            tiles[gid] = pygame.Surface((32, 32), pygame.SRCALPHA)
+            tiles[gid].fill(color)
+        ground = array('I', [1]) * (size * size)
+        walls = array('I', (2 if (x * 7 + y * 3) % 11 == 0 else 0 for y in range(size) for x in range(size)))
+        trees = array('I', (3 if (x + y) % 13 == 0 else 0 for y in range(size) for x in range(size)))
+        layers = [
+            map_cache.CompiledLayer("sol", size, size, ground),
+            map_cache.CompiledLayer("murs", size, size, walls),
+            map_cache.CompiledLayer("three", size, size, trees),
+        ]
+        tilesets = [map_cache.CompiledTileset("test", "test.tsx", 1)]
+        return map_cache.CompiledMap(self.map_path, size, size, 32, 32, layers, tilesets, tiles, {})
+
+    def open_streamer(self, tmx_data, chunk_size=16, **options):
+        """Découpe la carte et ouvre son streamer"""
+        chunk_streamer.write_chunk_pack(tmx_data, self.map_path, chunk_size)
+        streamer = chunk_streamer.open_chunk_pack(self.map_path, chunk_size, **options)
+        self.assertIsNotNone(streamer)
+        self.streamers.append(streamer)
+        return streamer
+
+    def test_chunks_match_source(self):
+        """Les gids et les collisions des chunks correspondent à la carte source"""
+        tmx_data = self.make_large_map(100)
+        grid = CollisionGrid.from_tiled_map(tmx_data)
+        streamer = self.open_streamer(tmx_data, chunk_size=16)
+        self.assertEqual((streamer.chunks_x, streamer.chunks_y), (7, 7))
+
+        for x, y in [(0, 0), (15, 16), (33, 47), (99, 99), (96, 5)]:
+            self.assertEqual(streamer.get(x, y), grid.get(x, y))
+            chunk = streamer.get_chunk(x // 16, y // 16)
+            self.assertEqual(chunk.get_gid(1, x - chunk.x, y - chunk.y), tmx_data.layers[1].data[y][x])
+        # Chunk de bord plus petit
+        self.assertEqual((streamer.get_chunk(6, 6).width, streamer.get_chunk(6, 6).height), (4, 4))
+        self.assertTrue(streamer.is_blocked(-1, 0))
+        self.assertEqual(streamer.count_in_region(10, 10, 40, 40), grid.count_in_region(10, 10, 40, 40))
+        self.assertEqual(
+            streamer.count_in_region(0, 0, 100, 100, CollisionGrid.TREE),
+            grid.count_in_region(0, 0, 100, 100, CollisionGrid.TREE)
+        )
+
+    def test_memory_stays_bounded(self):
+        """En traversant la carte, le nombre de chunks en mémoire reste borné"""
+        streamer = self.open_streamer(self.make_large_map(512), radius=1, prefetch_distance=1)
+        evicted = []
+        streamer.on_evict = lambda cx, cy: evicted.append((cx, cy))
+
+        for x in range(0, 512, 8):
+            streamer.update(x, x // 2, "right")
+            self.assertLessEqual(len(streamer.loaded_chunks), streamer.max_chunks)
+        self.assertTrue(evicted)
+        self.assertNotIn((0, 0), streamer.loaded_chunks)
+        self.assertIn((31, 15), streamer.loaded_chunks)
+
+    def test_prefetch_ahead(self):
+        """Les chunks situés devant le joueur sont préchargés en arrière-plan"""
+        streamer = self.open_streamer(self.make_large_map(256), radius=1, prefetch_distance=2)
+        streamer.update(128, 128, "left")
+        streamer.wait_for_prefetch()
+        loaded = set(streamer.loaded_chunks)
+        self.assertTrue({(6, 7), (5, 8), (5, 9)} <= loaded)
+        self.assertNotIn((10, 8), loaded)
+
+    def test_invalid_radius(self):
+        """Un budget mémoire inférieur au rayon demandé est refusé"""
+        chunk_streamer.write_chunk_pack(self.make_large_map(64), self.map_path, 16)
+        with self.assertRaises(ValueError):
+            chunk_streamer.ChunkStreamer(chunk_streamer.get_chunk_pack_path(self.map_path, 16), radius=2, max_chunks=4)
+
+    def test_stale_pack_is_ignored(self):
+        """Modifier le .tmx invalide le fichier de chunks"""
+        chunk_streamer.write_chunk_pack(self.make_large_map(64), self.map_path, 16)
+        stat = os.stat(self.map_path)
+        os.utime(self.map_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(chunk_streamer.open_chunk_pack(self.map_path, 16))
+
+    def test_pathfinding_follows_loaded_chunks(self):
+        """La recherche de chemin suit les chunks chargés et évincés, sans copier toute la carte"""
+        tmx_data = self.make_large_map(64)
+        grid = CollisionGrid.from_tiled_map(tmx_data)
+        streamer = self.open_streamer(tmx_data, chunk_size=16, radius=0, max_chunks=2, prefetch=False)
+        streamer.update(8, 8)
+        pathfinder = Pathfinder(streamer)
+        reference = Pathfinder(grid)
+        start = next((x, 8) for x in range(16) if not grid.is_blocked(x, 8))
+        goal = next((x, 8) for x in range(20, 32) if not grid.is_blocked(x, 8))
+
+        # Chunk de l'arrivée pas encore chargé : ses cases sont bloquantes
+        self.assertIsNone(pathfinder.find_path(start, goal))
+        streamer.update(goal[0], goal[1])
+        path = pathfinder.find_path(start, goal)
+        self.assertEqual(len(path), len(reference.find_path(start, goal)))
+        self.assertTrue(all(not grid.is_blocked(x, y) for x, y in path))
+        self.assertLess(len(pathfinder._opened), 2 * 16 * 16)
+
+        # Chunk du départ évincé
+        streamer.update(40, 8)
+        self.assertIsNone(pathfinder.find_path(start, goal))
+
+    def test_streamed_tiled_map(self):
+        """Une carte en streaming se rend et se comporte comme la carte chargée en entier"""
+        full = TiledMap(self.map_path, chunk_size=8)
+        streamed = TiledMap(self.map_path, chunk_size=8, streaming=True, stream_radius=1)
+        self.streamers.append(streamed.streamer)
+        streamed.update_stream(12, 12, "down")
+
+        full_screen = pygame.Surface((800, 600))
+        streamed_screen = pygame.Surface((800, 600))
+        full.render(full_screen, (-100, -200))
+        streamed.render(streamed_screen, (-100, -200))
+        for x in range(0, 800, 37):
+            for y in range(0, 600, 29):
+                self.assertEqual(full_screen.get_at((x, y)), streamed_screen.get_at((x, y)))
+
+        for x in range(30):
+            for y in range(30):
+                self.assertEqual(full.is_collision(x, y), streamed.is_collision(x, y))
+        self.assertEqual(streamed.get_layer_by_name('wallpaper').name, 'wallpaper')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
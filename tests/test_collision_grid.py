@@ -0,0 +1,79 @@
+import unittest
+import pygame
+import os
+from game.collision_grid import CollisionGrid
+from game.tiled_map import TiledMap
+
+class TestCollisionGrid(unittest.TestCase):
+    def setUp(self):
+        """Initialisation avant chaque test"""
+        # Mini-map 4x3 : 1 = collision / arbre
+        self.grid = CollisionGrid.from_layers({
+            'collisions': [
+                [0, 1, 0, 0],
+                [0, 0, 0, 1],
+                [1, 0, 0, 0]
+            ],
+            'three': [
+                [0, 0, 0, 0],
+                [0, 1, 0, 0],
+                [0, 0, 0, 0]
+            ]
+        })
+
+    def test_point_queries(self):
+        """Requêtes ponctuelles sur la grille"""
+        self.assertTrue(self.grid.is_blocked(1, 0))
+        self.assertFalse(self.grid.is_blocked(0, 0))
+        self.assertTrue(self.grid.is_tree(1, 1))
+        self.assertFalse(self.grid.is_blocked(1, 1))
+
+    def test_out_of_bounds(self):
+        """Une position hors de la carte est bloquante mais n'est pas un arbre"""
+        self.assertTrue(self.grid.is_blocked(-1, 0))
+        self.assertTrue(self.grid.is_blocked(4, 0))
+        self.assertTrue(self.grid.is_blocked(0, 3))
+        self.assertFalse(self.grid.is_tree(-1, -1))
+
+    def test_region_queries(self):
+        """Requêtes sur une zone rectangulaire"""
+        self.assertFalse(self.grid.any_in_region(0, 0, 1, 2))
+        self.assertTrue(self.grid.any_in_region(0, 0, 2, 2))
+        self.assertEqual(self.grid.count_in_region(0, 0, 4, 3), 3)
+        self.assertEqual(self.grid.count_in_region(0, 0, 4, 3, CollisionGrid.TREE), 1)
+        # Une zone qui déborde de la carte est bloquante
+        self.assertTrue(self.grid.any_in_region(2, 1, 3, 1))
+        self.assertFalse(self.grid.any_in_region(-1, -1, 2, 2, CollisionGrid.TREE))
+
+    def test_rect_query(self):
+        """Un rectangle en pixels est testé sur toutes les tuiles qu'il recouvre"""
+        self.assertFalse(self.grid.is_rect_blocked(pygame.Rect(0, 0, 32, 64), 32))
+        self.assertTrue(self.grid.is_rect_blocked(pygame.Rect(16, 0, 32, 32), 32))
+
+    def test_set_flag(self):
+        """Modification incrémentale d'une case"""
+        self.grid.set_flag(2, 2, CollisionGrid.BLOCKED)
+        self.assertTrue(self.grid.is_blocked(2, 2))
+        self.grid.set_flag(2, 2, CollisionGrid.BLOCKED, False)
+        self.assertFalse(self.grid.is_blocked(2, 2))
+
+    def test_blocked_rects(self):
+        """Les rectangles de collision correspondent aux cases bloquantes"""
+        self.assertEqual(list(self.grid.iter_blocked()), [(1, 0), (3, 1), (0, 2)])
+        self.assertEqual(self.grid.get_blocked_rects(32)[0], pygame.Rect(32, 0, 32, 32))
+
+    def test_tiled_map_grid(self):
+        """La grille d'une carte Tiled reprend la propriété 'collision' des tuiles"""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        tiled_map = TiledMap(os.path.join(base_path, "assets", "mapV3.tmx"))
+        grid = tiled_map.collision_grid
+        self.assertEqual((grid.width, grid.height), (30, 30))
+        self.assertTrue(tiled_map.is_collision(0, 0))
+        self.assertFalse(tiled_map.is_collision(6, 28))
+        self.assertEqual(len(tiled_map.get_collider_rects()), grid.count_in_region(0, 0, 30, 30))
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,581 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock
+from game.database import (GameDatabase, DatabasePool, get_pool, database_config, SCHEMA_VERSION, SELECT_PLAYER,
+                           SELECT_LIFESPAN_STATS, SELECT_LEADERBOARD_BY_RACE, MAX_WRITE_ATTEMPTS)
+from game.inventory import Inventory
+from game.items import Item, ItemType
+from game.factions import FactionName
+
+class FakePlayer:
+    """Joueur minimal pour la sauvegarde en base"""
+    def __init__(self, name):
+        self.name = name
+        self.race = "Chimpanzé"
+        self.faction = FactionName.VEILLEURS
+        self.hp = 100
+        self.x = 6
+        self.y = 28
+
+class TestWriteBehindDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "game.db")
+        self.db = GameDatabase(self.db_path, write_behind=True)
+        # Les lots ne partent que sur flush() pendant les tests
+        self.db.writer.flush_interval = 60
+        self.player_id = self.db.save_player(FakePlayer("Cornelius"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def count_rows(self, table):
+        """Lit la base sur une connexion indépendante (ce qui est réellement sur disque)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def make_inventory(self, count):
+        inventory = Inventory(max_slots=50)
+        for i in range(count):
+            inventory.add_item(Item(f"Objet {i}", ItemType.POTION, f"Objet de test {i}", i))
+        return inventory
+
+    def test_saves_are_deferred_and_coalesced(self):
+        """Les sauvegardes d'inventaire d'un joueur sont regroupées en une seule écriture"""
+        for count in range(1, 11):
+            self.db.save_inventory(self.player_id, self.make_inventory(count))
+        self.assertEqual(self.count_rows("inventory"), 0)
+        self.assertEqual(self.db.writer.coalesced, 9)
+
+        self.assertTrue(self.db.flush(timeout=5))
+        self.assertEqual(self.count_rows("inventory"), 10)
+        self.assertEqual(self.db.writer.transactions, 1)
+
+    def test_inventory_snapshot(self):
+        """L'inventaire est copié au moment de la sauvegarde, pas à l'écriture"""
+        inventory = self.make_inventory(3)
+        self.db.save_inventory(self.player_id, inventory)
+        inventory.clear()
+        self.assertEqual(len(self.db.load_inventory(self.player_id)), 3)
+
+    def test_lifespans_are_not_coalesced(self):
+        """Chaque durée de vie est conservée"""
+        self.db.save_lifespan(self.player_id, 10)
+        self.db.save_lifespan(self.player_id, 20)
+        stats = self.db.get_player_lifespan_stats(self.player_id)
+        self.assertEqual(stats['games_played'], 2)
+        self.assertEqual(stats['max_duration'], 20)
+
+    def test_close_flushes(self):
+        """Fermer la base écrit les sauvegardes en attente"""
+        self.db.save_inventory(self.player_id, self.make_inventory(4))
+        self.db.save_lifespan(self.player_id, 42)
+        self.db.close()
+        self.assertEqual(self.count_rows("inventory"), 4)
+        self.assertEqual(self.count_rows("lifespan"), 1)
+
+    def test_synchronous_mode(self):
+        """Sans écriture différée, la sauvegarde est immédiate"""
+        db = GameDatabase(self.db_path)
+        try:
+            db.save_inventory(self.player_id, self.make_inventory(2))
+            self.assertEqual(self.count_rows("inventory"), 2)
+        finally:
+            db.close()
+
+    def test_failed_batch_is_retried(self):
+        """Un lot annulé (base verrouillée) est retenté : aucune écriture du lot n'est perdue"""
+        inventory = self.make_inventory(3)
+        self.db.save_inventory(self.player_id, inventory, full=True)
+        self.db.flush()
+        inventory.remove_item(inventory.get_items()[0])
+        self.db.save_inventory(self.player_id, inventory)
+        self.db.save_lifespan(self.player_id, 42)
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def locked_once(cursor):
+            if failures:
+                raise failures.pop()
+        self.db.writer.submit(locked_once)
+
+        self.assertTrue(self.db.flush(timeout=5))
+        self.assertEqual((self.db.writer.failures, self.db.writer.dropped), (1, 0))
+        self.assertEqual(self.count_rows("inventory"), 2)
+        self.assertEqual(self.count_rows("lifespan"), 1)
+
+    def test_dropped_batch_forces_full_inventory_write(self):
+        """Après l'abandon d'un lot, l'inventaire est réécrit en entier à la sauvegarde suivante"""
+        inventory = self.make_inventory(3)
+        self.db.save_inventory(self.player_id, inventory, full=True)
+        self.db.flush()
+        inventory.remove_item(inventory.get_items()[0])
+        self.db.save_inventory(self.player_id, inventory)
+
+        def always_locked(cursor):
+            raise sqlite3.OperationalError("database is locked")
+        self.db.writer.submit(always_locked)
+        self.assertTrue(self.db.flush(timeout=5))
+        self.assertEqual(self.db.writer.failures, MAX_WRITE_ATTEMPTS)
+        self.assertEqual(self.count_rows("inventory"), 3)
+
+        # Aucun slot n'est plus marqué modifié, mais la sauvegarde suivante rattrape la base
+        self.db.save_inventory(self.player_id, inventory)
+        self.db.flush()
+        self.assertEqual(self.count_rows("inventory"), 2)
+
+class TestInventoryDiff(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "game.db")
+        self.db = GameDatabase(self.db_path)
+        self.player_id = self.db.save_player(FakePlayer("Zira"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def total_changes(self):
+        with self.db.pool.writer() as conn:
+            return conn.total_changes
+
+    def test_only_changed_slots_are_written(self):
+        """Une modification d'un grand inventaire n'écrit que le slot concerné"""
+        inventory = Inventory(max_slots=1000)
+        items = [Item(f"Objet {i}", ItemType.WEAPON, "", i) for i in range(1000)]
+        for item in items:
+            inventory.add_item(item)
+        self.db.save_inventory(self.player_id, inventory, full=True)
+
+        before = self.total_changes()
+        inventory.remove_item(items[500])
+        self.db.save_inventory(self.player_id, inventory)
+        self.assertEqual(self.total_changes() - before, 1)
+
+        before = self.total_changes()
+        inventory.equip_item(items[10])
+        inventory.equip_item(items[20])
+        self.db.save_inventory(self.player_id, inventory)
+        self.assertEqual(self.total_changes() - before, 2)
+
+        saved = self.db.load_inventory(self.player_id)
+        self.assertEqual(len(saved), 999)
+        self.assertNotIn(500, [row['slot'] for row in saved])
+        self.assertEqual([row['name'] for row in saved if row['equipped']], ["Objet 20"])
+
+    def test_failed_write_forces_full_rewrite(self):
+        """Une sauvegarde directe en échec est rattrapée par la suivante"""
+        inventory = Inventory()
+        items = [Item(name, ItemType.ARMOR, "", 5) for name in ("A", "B", "C")]
+        for item in items:
+            inventory.add_item(item)
+        self.db.save_inventory(self.player_id, inventory, full=True)
+        inventory.remove_item(items[1])
+        with mock.patch('game.database._write_inventory', side_effect=sqlite3.OperationalError("disk I/O error")):
+            self.db.save_inventory(self.player_id, inventory)
+        self.assertEqual(len(self.db.load_inventory(self.player_id)), 3)
+        self.db.save_inventory(self.player_id, inventory)
+        self.assertEqual([row['name'] for row in self.db.load_inventory(self.player_id)], ["A", "C"])
+
+    def test_freed_slot_is_reused(self):
+        """Un nouvel item prend le premier slot libre, sans renuméroter les autres"""
+        inventory = Inventory()
+        first, second, third = (Item(name, ItemType.ARMOR, "", 5) for name in ("A", "B", "C"))
+        inventory.add_item(first)
+        inventory.add_item(second)
+        self.db.save_inventory(self.player_id, inventory)
+        inventory.remove_item(first)
+        inventory.add_item(third)
+        self.assertEqual(inventory.slot_of(third), 0)
+        self.assertEqual(inventory.slot_of(second), 1)
+        self.db.save_inventory(self.player_id, inventory)
+        saved = self.db.load_inventory(self.player_id)
+        self.assertEqual([(row['slot'], row['name']) for row in saved], [(0, "C"), (1, "B")])
+
+    def test_pending_diffs_are_merged(self):
+        """En écriture différée, les modifications successives d'un joueur se cumulent"""
+        db = GameDatabase(self.db_path, write_behind=True)
+        db.writer.flush_interval = 60
+        try:
+            inventory = Inventory()
+            items = [Item(name, ItemType.POTION, "", 10) for name in ("A", "B", "C")]
+            for item in items:
+                inventory.add_item(item)
+                db.save_inventory(self.player_id, inventory)
+            inventory.remove_item(items[0])
+            db.save_inventory(self.player_id, inventory)
+            saved = db.load_inventory(self.player_id)
+            self.assertEqual([row['name'] for row in saved], ["B", "C"])
+            self.assertEqual(db.writer.transactions, 1)
+        finally:
+            db.close()
+
+    def make_legacy_database(self):
+        """Remplace la base par une base d'une ancienne version (inventaire sans slots)"""
+        self.db.close()
+        os.remove(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, player_id INTEGER, item_name TEXT NOT NULL,
+                item_type TEXT NOT NULL, item_value INTEGER, equipped BOOLEAN DEFAULT 0
+            )
+        ''')
+        conn.executemany('INSERT INTO inventory (player_id, item_name, item_type, item_value) VALUES (?, ?, ?, ?)',
+                         [(1, "A", "weapon", 1), (2, "X", "armor", 2), (1, "B", "weapon", 3)])
+        conn.commit()
+        conn.close()
+
+    def test_legacy_inventory_table_is_upgraded(self):
+        """Une base sans colonne slot est migrée en numérotant les items"""
+        self.make_legacy_database()
+        self.db = GameDatabase(self.db_path)
+        self.assertEqual([(row['slot'], row['name']) for row in self.db.load_inventory(1)], [(0, "A"), (1, "B")])
+        self.assertEqual([(row['slot'], row['name']) for row in self.db.load_inventory(2)], [(0, "X")])
+
+    def test_failed_upgrade_keeps_inventory(self):
+        """Une migration interrompue est annulée en entier puis relancée au démarrage suivant"""
+        self.make_legacy_database()
+        # Échec d'une étape postérieure au renommage de la table inventory
+        with mock.patch('game.database.BACKFILL_LIFESPAN_STATS', 'SELECT * FROM table_absente'):
+            with self.assertRaises(sqlite3.OperationalError):
+                GameDatabase(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            self.assertNotIn("inventory_old", tables)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0], 3)
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+        self.db = GameDatabase(self.db_path)
+        self.assertEqual([(row['slot'], row['name']) for row in self.db.load_inventory(1)], [(0, "A"), (1, "B")])
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "game.db")
+        self.db = GameDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def pragma(self, name):
+        with self.db.pool.reader() as conn:
+            return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def query_plan(self, sql, params):
+        with self.db.pool.reader() as conn:
+            return " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    def test_connection_settings(self):
+        """La base est en WAL avec la version de schéma courante"""
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("user_version"), SCHEMA_VERSION)
+
+    def test_lookups_use_indexes(self):
+        """Les recherches par nom et par joueur passent par les index"""
+        player_plan = self.query_plan(SELECT_PLAYER, ("Zira",))
+        self.assertIn("idx_players_name", player_plan)
+        self.assertNotIn("TEMP B-TREE", player_plan)
+        self.assertIn("USING INTEGER PRIMARY KEY", self.query_plan(SELECT_LIFESPAN_STATS, (1,)))
+        leaderboard_plan = self.query_plan(SELECT_LEADERBOARD_BY_RACE, ("gorille", 10))
+        self.assertIn("idx_lifespan_stats_race", leaderboard_plan)
+        self.assertNotIn("TEMP B-TREE", leaderboard_plan)
+
+    def test_latest_player_is_loaded(self):
+        """Le joueur le plus récent d'un nom est chargé, même créé dans la même seconde"""
+        first = self.db.save_player(FakePlayer("Zira"))
+        second = self.db.save_player(FakePlayer("Zira"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.db.load_player("Zira")['id'], second)
+
+    def test_upgrade_is_applied_once(self):
+        """Rouvrir une base à jour ne relance pas la migration"""
+        self.db.close()
+        self.db = GameDatabase(self.db_path)
+        self.assertEqual(self.pragma("user_version"), SCHEMA_VERSION)
+
+class TestLifespanStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "game.db")
+        self.db = GameDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def make_player(self, name, race, faction=FactionName.VEILLEURS):
+        player = FakePlayer(name)
+        player.race = race
+        player.faction = faction
+        return self.db.save_player(player)
+
+    def test_stats_follow_each_session(self):
+        """Les agrégats sont mis à jour à chaque durée de vie enregistrée"""
+        player_id = self.make_player("Zira", "chimpanze")
+        self.assertEqual(self.db.get_player_lifespan_stats(player_id)['games_played'], 0)
+        for duration in (30, 10, 50):
+            self.db.save_lifespan(player_id, duration)
+        self.assertEqual(self.db.get_player_lifespan_stats(player_id),
+                         {'games_played': 3, 'avg_duration': 30.0, 'max_duration': 50, 'min_duration': 10})
+
+    def test_write_behind_sessions_are_counted(self):
+        """Les durées écrites par le thread de fond passent aussi par les agrégats"""
+        player_id = self.make_player("Zira", "chimpanze")
+        db = GameDatabase(self.db_path, write_behind=True)
+        try:
+            db.save_lifespan(player_id, 12)
+            db.save_lifespan(player_id, 8)
+            self.assertEqual(db.get_player_lifespan_stats(player_id)['games_played'], 2)
+        finally:
+            db.close()
+
+    def test_leaderboards(self):
+        """Classements général, par race et par faction, du plus long au plus court"""
+        durations = {
+            ("Zira", "chimpanze", FactionName.VEILLEURS): (40, 90),
+            ("Ursus", "gorille", FactionName.OMBRES): (120,),
+            ("Attar", "gorille", FactionName.VEILLEURS): (60, 20),
+        }
+        for (name, race, faction), sessions in durations.items():
+            player_id = self.make_player(name, race, faction)
+            for duration in sessions:
+                self.db.save_lifespan(player_id, duration)
+
+        self.assertEqual([row['name'] for row in self.db.get_leaderboard()], ["Ursus", "Zira", "Attar"])
+        self.assertEqual([(row['name'], row['max_duration']) for row in self.db.get_leaderboard(race="gorille")],
+                         [("Ursus", 120), ("Attar", 60)])
+        veilleurs = self.db.get_leaderboard(faction=FactionName.VEILLEURS.value, limit=1)
+        self.assertEqual([(row['name'], row['games_played']) for row in veilleurs], [("Zira", 2)])
+        with self.assertRaises(ValueError):
+            self.db.get_leaderboard(race="gorille", faction=FactionName.OMBRES.value)
+
+    def test_existing_sessions_are_aggregated_on_upgrade(self):
+        """Une base de la version 2 voit ses parties passées reportées dans les agrégats"""
+        player_id = self.make_player("Zira", "chimpanze")
+        self.db.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DROP TRIGGER lifespan_stats_insert")
+        conn.execute("DROP TABLE lifespan_stats")
+        conn.executemany("INSERT INTO lifespan (player_id, duration_seconds) VALUES (?, ?)",
+                         [(player_id, 15), (player_id, 25)])
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+        conn.close()
+
+        self.db = GameDatabase(self.db_path)
+        self.assertEqual(self.db.get_player_lifespan_stats(player_id)['max_duration'], 25)
+        self.db.save_lifespan(player_id, 35)
+        stats = self.db.get_player_lifespan_stats(player_id)
+        self.assertEqual((stats['games_played'], stats['min_duration'], stats['max_duration']), (3, 15, 35))
+
+class TestDatabasePool(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "game.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_scenes_share_one_pool(self):
+        """Deux accès à la même base partagent les connexions et la file d'écriture"""
+        first = GameDatabase(self.db_path, write_behind=True)
+        second = GameDatabase(os.path.join(self.tmp_dir, ".", "game.db"), write_behind=True)
+        try:
+            self.assertIs(first.pool, second.pool)
+            self.assertIs(first.writer, second.writer)
+            self.assertEqual(first.pool.handles, 2)
+        finally:
+            first.close()
+            second.close()
+
+    def test_last_handle_closes_pool(self):
+        """Le pool reste ouvert tant qu'un accès l'utilise"""
+        first = GameDatabase(self.db_path)
+        second = GameDatabase(self.db_path)
+        pool = first.pool
+        first.close()
+        first.close()
+        self.assertFalse(pool.closed)
+        player_id = second.save_player(FakePlayer("Nova"))
+        self.assertEqual(second.load_player("Nova")['id'], player_id)
+        second.close()
+        self.assertTrue(pool.closed)
+        # Un nouvel accès ouvre un nouveau pool
+        third = GameDatabase(self.db_path)
+        try:
+            self.assertIsNot(third.pool, pool)
+            self.assertEqual(third.load_player("Nova")['id'], player_id)
+        finally:
+            third.close()
+
+    def test_readers_are_read_only(self):
+        """Les connexions de lecture refusent les écritures"""
+        pool = DatabasePool(self.db_path, readers=1)
+        try:
+            with pool.reader() as conn:
+                with self.assertRaises(sqlite3.OperationalError):
+                    conn.execute("DELETE FROM players")
+        finally:
+            pool.close()
+
+    def test_readers_see_committed_writes(self):
+        """Une lecture sur une autre connexion voit ce que l'écriture a validé"""
+        db = GameDatabase(self.db_path)
+        try:
+            self.assertIsNone(db.load_player("Zaius"))
+            player_id = db.save_player(FakePlayer("Zaius"))
+            self.assertEqual(db.load_player("Zaius")['id'], player_id)
+        finally:
+            db.close()
+
+    def test_memory_database_reads_on_writer(self):
+        """Une base en mémoire n'a qu'une connexion, partagée par lectures et écritures"""
+        pool = get_pool(":memory:")
+        db = GameDatabase(":memory:", pool=pool)
+        try:
+            self.assertEqual(pool.reader_count, 0)
+            player_id = db.save_player(FakePlayer("Ari"))
+            self.assertEqual(db.load_player("Ari")['id'], player_id)
+        finally:
+            db.close()
+        self.assertTrue(pool.closed)
+
+class TestPlayerProfileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "game.db")
+        self.db = GameDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_profile_is_read_once(self):
+        """Un profil lu en base est ensuite servi par le cache"""
+        player_id = self.db.save_player(FakePlayer("Lucius"))
+        profiles = self.db.pool.profiles
+        profiles.clear()
+        self.assertEqual(self.db.load_player("Lucius")['id'], player_id)
+        self.assertEqual((profiles.misses, profiles.hits), (1, 0))
+        for _ in range(5):
+            self.assertEqual(self.db.load_player("Lucius")['id'], player_id)
+        self.assertEqual((profiles.misses, profiles.hits), (1, 5))
+
+    def test_save_player_replaces_profile(self):
+        """Un nouveau joueur du même nom remplace le profil en cache"""
+        first = self.db.save_player(FakePlayer("Lucius"))
+        self.assertEqual(self.db.load_player("Lucius")['id'], first)
+        second = self.db.save_player(FakePlayer("Lucius"))
+        self.assertEqual(self.db.load_player("Lucius")['id'], second)
+
+    def test_profile_is_shared_and_copied(self):
+        """Les scènes partagent le cache ; modifier un profil retourné ne l'altère pas"""
+        self.db.save_player(FakePlayer("Lucius"))
+        other = GameDatabase(self.db_path)
+        try:
+            profile = other.load_player("Lucius")
+            profile['hp'] = 0
+            self.assertEqual(other.load_player("Lucius")['hp'], 100)
+            self.assertEqual(other.pool.profiles.misses, 0)
+        finally:
+            other.close()
+
+    def test_player_profile_sets_db_id(self):
+        """Le profil du joueur en cours renseigne son identifiant"""
+        player = FakePlayer("Lucius")
+        player.db_id = None
+        player_id = self.db.save_player(player)
+        self.assertEqual(self.db.player_profile(player)['id'], player_id)
+        self.assertEqual(player.db_id, player_id)
+        unknown = FakePlayer("Inconnu")
+        unknown.db_id = None
+        self.assertIsNone(self.db.player_profile(unknown))
+        self.assertIsNone(unknown.db_id)
+
+class TestMemoryDatabase(unittest.TestCase):
+    def setUp(self):
+        """Une base sur disque avec un joueur sert de modèle"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.seed_path = os.path.join(self.tmp_dir, "game.db")
+        self.export_path = os.path.join(self.tmp_dir, "export.db")
+        db = GameDatabase(self.seed_path)
+        self.player_id = db.save_player(FakePlayer("Zira"))
+        db.save_lifespan(self.player_id, 30)
+        db.close()
+        self.seed_mtime = os.path.getmtime(self.seed_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_seeded_memory_database(self):
+        """La base en mémoire part du fichier sans jamais l'écrire"""
+        pool = DatabasePool(":memory:", seed_path=self.seed_path)
+        db = GameDatabase(pool=pool)
+        try:
+            self.assertEqual(db.load_player("Zira")['id'], self.player_id)
+            self.assertEqual(db.get_player_lifespan_stats(self.player_id)['games_played'], 1)
+            db.save_player(FakePlayer("Cornelius"))
+            self.assertIsNotNone(db.load_player("Cornelius"))
+        finally:
+            db.close()
+        self.assertEqual(os.path.getmtime(self.seed_path), self.seed_mtime)
+        conn = sqlite3.connect(self.seed_path)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM players").fetchone()[0], 1)
+        finally:
+            conn.close()
+
+    def test_export_on_close(self):
+        """La base en mémoire est copiée dans le fichier d'export à la fermeture, écritures différées comprises"""
+        pool = DatabasePool(":memory:", seed_path=self.seed_path, export_path=self.export_path)
+        db = GameDatabase(pool=pool, write_behind=True)
+        db.save_lifespan(self.player_id, 90)
+        db.close()
+        exported = GameDatabase(self.export_path)
+        try:
+            stats = exported.get_player_lifespan_stats(self.player_id)
+            self.assertEqual((stats['games_played'], stats['max_duration']), (2, 90))
+        finally:
+            exported.close()
+
+    def test_missing_seed_gives_empty_database(self):
+        """Sans fichier modèle, la base en mémoire démarre vide avec le schéma courant"""
+        pool = DatabasePool(":memory:", seed_path=os.path.join(self.tmp_dir, "absent.db"))
+        try:
+            with pool.reader() as conn:
+                self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM players").fetchone()[0], 0)
+        finally:
+            pool.close()
+
+    def test_environment_selects_memory_database(self):
+        """RPG_DB=:memory: remplace game.db pour toutes les scènes"""
+        self.assertEqual(database_config({}), ("game.db", None, None))
+        self.assertEqual(database_config({"RPG_DB": "autre.db", "RPG_DB_SEED": "x.db"}), ("autre.db", None, None))
+        environ = {"RPG_DB": ":memory:", "RPG_DB_SEED": self.seed_path, "RPG_DB_EXPORT": self.export_path}
+        with mock.patch.dict(os.environ, environ):
+            first = GameDatabase()
+            second = GameDatabase(write_behind=True)
+        try:
+            self.assertEqual(first.db_path, ":memory:")
+            self.assertIs(first.pool, second.pool)
+            self.assertEqual(second.load_player("Zira")['id'], self.player_id)
+        finally:
+            first.close()
+            second.close()
+        self.assertTrue(os.path.exists(self.export_path))
+
+if __name__ == '__main__':
+    unittest.main()
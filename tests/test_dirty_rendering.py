@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+import pygame
+from game.game import Game
+from game.profiler import FrameProfiler
+from game.scenes.base_scene import BaseScene
+
+class CounterScene(BaseScene):
+    """Scène minimale qui ne change que lorsqu'on le lui demande"""
+    supports_dirty_rects = True
+
+    def __init__(self, screen, game_state):
+        super().__init__(screen, game_state)
+        self.value = 0
+        self.render_count = 0
+
+    def get_render_state(self):
+        return self.value
+
+    def render(self, screen):
+        self.render_count += 1
+        screen.fill((255, 0, 0))
+
+class TestDirtyRendering(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Initialisation une seule fois pour toute la classe de test"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((200, 100))
+
+    def setUp(self):
+        """Boucle de jeu minimale, sans musique ni scènes réelles"""
+        self.scene = CounterScene(self.screen, None)
+        self.game = Game.__new__(Game)
+        self.game.display_manager = mock.Mock(screen=self.screen)
+        self.game.scenes = {'test': self.scene}
+        self.game.current_scene = 'test'
+        self.game.dirty_rendering = True
+        self.game.presented_scene = None
+        self.game.profiler = FrameProfiler()
+
+    def test_first_frame_is_full(self):
+        """Une scène qui apparaît est présentée en entier"""
+        with mock.patch("pygame.display.update") as update, mock.patch("pygame.display.flip") as flip:
+            self.game.render()
+        update.assert_called_once_with([pygame.Rect(0, 0, 200, 100)])
+        flip.assert_not_called()
+
+    def test_static_frame_is_skipped(self):
+        """Une image sans changement n'est ni dessinée ni présentée"""
+        self.game.render()
+        with mock.patch("pygame.display.update") as update:
+            self.game.render()
+        update.assert_not_called()
+        self.assertEqual(self.scene.render_count, 1)
+
+    def test_only_dirty_rects_are_presented(self):
+        """Seules les zones signalées sont redessinées et présentées"""
+        self.game.render()
+        self.screen.fill((0, 0, 255))
+        self.scene.mark_dirty(pygame.Rect(10, 10, 20, 20))
+        self.scene.mark_dirty(pygame.Rect(190, 90, 50, 50))
+        with mock.patch("pygame.display.update") as update:
+            self.game.render()
+        update.assert_called_once_with([pygame.Rect(10, 10, 20, 20), pygame.Rect(190, 90, 10, 10)])
+        # Le rendu est limité à l'enveloppe des zones modifiées
+        self.assertEqual(self.screen.get_at((15, 15)), pygame.Color(255, 0, 0))
+        self.assertEqual(self.screen.get_at((5, 5)), pygame.Color(0, 0, 255))
+        self.assertEqual(self.screen.get_clip(), self.screen.get_rect())
+
+    def test_state_change_redraws_scene(self):
+        """Un changement de l'état affiché redessine toute la scène"""
+        self.game.render()
+        self.scene.value = 1
+        with mock.patch("pygame.display.update") as update:
+            self.game.render()
+        update.assert_called_once_with([pygame.Rect(0, 0, 200, 100)])
+
+    def test_opt_out_scene_flips(self):
+        """Les scènes qui ne supportent pas le mode restent présentées en entier"""
+        self.game.dirty_rendering = False
+        with mock.patch("pygame.display.flip") as flip:
+            self.game.render()
+            self.game.render()
+        self.assertEqual(flip.call_count, 2)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import random
+import time
+from unittest.mock import patch
+from game.free_cells import FreeCellIndex
+from game.items import ITEMS
+from game.layer_manager import LayerType
+from game.map import Map, TileType
+from game.spawn_manager import SpawnManager
+
+class TestFreeCellIndex(unittest.TestCase):
+    def test_add_and_discard(self):
+        """Ajouts et retraits gardent le tableau dense cohérent avec l'ensemble"""
+        index = FreeCellIndex(10, 10, bucket_size=4)
+        for x in range(10):
+            self.assertTrue(index.add(x, 2))
+        self.assertFalse(index.add(3, 2))
+        self.assertFalse(index.add(10, 2))
+        self.assertTrue(index.discard(0, 2))
+        self.assertTrue(index.discard(9, 2))
+        self.assertFalse(index.discard(0, 2))
+        self.assertEqual(len(index), 8)
+        self.assertEqual(sorted(index), [(x, 2) for x in range(1, 9)])
+        for _ in range(50):
+            self.assertIn(index.random_cell(), index)
+        for x in range(1, 9):
+            index.discard(x, 2)
+        self.assertIsNone(index.random_cell())
+
+    def test_cells_within(self):
+        """La recherche par distance rend exactement les cases du losange, sur plusieurs blocs"""
+        free = lambda x, y: (x + y) % 3 != 0
+        index = FreeCellIndex.from_predicate(40, 30, free, margin=1, bucket_size=4)
+        expected = sorted(
+            (x, y) for y in range(1, 29) for x in range(1, 39)
+            if free(x, y) and 1 <= abs(x - 12) + abs(y - 7) <= 6
+        )
+        self.assertEqual(sorted(index.cells_within(12, 7, 6, min_distance=1)), expected)
+        self.assertIn(index.random_within(12, 7, 6, 1), expected)
+        self.assertIsNone(FreeCellIndex(5, 5).random_within(2, 2, 3))
+
+    def test_sampling_does_not_depend_on_map_size(self):
+        """Un tirage sur une grande carte coûte autant que sur une petite"""
+        index = FreeCellIndex.from_predicate(1000, 1000, lambda x, y: True)
+        start = time.perf_counter()
+        for _ in range(10000):
+            index.random_cell()
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+class TestMapFreeCells(unittest.TestCase):
+    def setUp(self):
+        """Carte 12x10 sans tuiles, bordée de murs"""
+        with patch('game.map.Map._load_tiles'):
+            self.game_map = Map(12, 10)
+        for x in range(12):
+            self.game_map.layer_manager.set_tile(LayerType.COLLISION, x, 0, 1)
+            self.game_map.layer_manager.set_tile(LayerType.COLLISION, x, 9, 1)
+        self.game_map.layer_manager.set_tile(LayerType.COLLISION, 5, 5, 1)
+
+    def scan(self):
+        """Référence : parcours complet de la grille"""
+        return sorted(
+            (x, y) for y in range(1, 9) for x in range(1, 11)
+            if not self.game_map.layer_manager.is_collision(x, y)
+            and not self.game_map.layer_manager.get_tile(LayerType.NPC, x, y)
+            and (x, y) not in self.game_map.occupants
+        )
+
+    def test_index_follows_items_and_npcs(self):
+        """Objets, ennemis et PNJ posés ou retirés mettent l'index à jour"""
+        free_cells = self.game_map.free_cells
+        self.assertEqual(sorted(free_cells), self.scan())
+        self.assertNotIn((5, 5), free_cells)
+        self.assertTrue(self.game_map.add_item(TileType.ITEM, 2, 3))
+        self.assertFalse(self.game_map.add_item(TileType.ENEMY, 2, 3))
+        self.game_map.add_item(TileType.ENEMY, 7, 7)
+
+        class FakePNJ:
+            tile_x, tile_y = 4, 4
+
+        self.game_map.add_pnj(FakePNJ())
+        self.assertEqual(sorted(free_cells), self.scan())
+        self.assertEqual(self.game_map.remove_item(2, 3), TileType.ITEM)
+        self.assertIsNone(self.game_map.remove_item(2, 3))
+        self.game_map.remove_pnj()
+        self.assertEqual(sorted(free_cells), self.scan())
+        self.assertIs(self.game_map.free_cells, free_cells)
+
+    def test_valid_npc_positions(self):
+        """Positions du PNJ : libres, à distance 1..d du joueur"""
+        self.game_map.player_pos = (4, 5)
+        self.game_map.add_item(TileType.ITEM, 4, 6)
+        positions = self.game_map.get_valid_npc_positions(2)
+        expected = [cell for cell in self.scan() if 1 <= abs(cell[0] - 4) + abs(cell[1] - 5) <= 2]
+        self.assertEqual(sorted(positions), expected)
+        self.assertNotIn((4, 5), positions)
+        self.assertNotIn((4, 6), positions)
+
+class TestSpawnManagerFreeCells(unittest.TestCase):
+    def setUp(self):
+        with patch('game.map.Map._load_tiles'):
+            self.game_map = Map(6, 5)
+        self.spawner = SpawnManager(self.game_map)
+        # Le tirage de l'objet n'est pas testé ici
+        self.spawner.select_random_item = lambda zone=None: ITEMS["banane"]
+
+    def test_spawned_items_take_free_cells(self):
+        """Chaque objet apparu occupe une case différente, jamais celle du joueur"""
+        random.seed(3)
+        self.game_map.player_pos = (1, 1)
+        self.spawner.max_items = 11
+        for _ in range(11):
+            self.assertTrue(self.spawner.spawn_item())
+        positions = {(x, y) for _, x, y in self.spawner.spawned_items}
+        self.assertEqual(len(positions), 11)
+        self.assertNotIn((1, 1), positions)
+        # Seule reste la case du joueur
+        self.assertEqual(list(self.game_map.free_cells), [(1, 1)])
+        self.assertIsNone(self.spawner.get_random_empty_position())
+
+        item, x, y = self.spawner.spawned_items[0]
+        self.assertIs(self.spawner.remove_item(x, y), item)
+        self.assertIn((x, y), self.game_map.free_cells)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from game.scenes.game_scene import GameScene
 from game.game_state import GameState
 from game.player import Player
 from game.factions import FactionName
+from game.items import ITEMS
 
 class MockDisplayManager:
     def __init__(self):
@@ -65,5 +66,31 @@ def test_combat_zone_positions(game_setup):
         game_scene.update()
         assert game_scene.in_combat_zone, f"Position ({x}, {y}) devrait être dans la zone de combat"
 
+def test_item_interaction_uses_world_index(game_setup):
+    """Seuls les items non collectés de la case du joueur proposent un ramassage"""
+    game_scene, game_state = game_setup
+    m16 = ITEMS["m16"]
+    was_collected = m16.collected
+    m16.collected = False
+    try:
+        assert game_scene.world_index.first_at(*m16.position, kind="item") is m16
+        assert game_scene.world_index.first_at(20, 27, kind="pnj") is game_scene.pnj
+
+        game_state.player.x, game_state.player.y = 10, 10
+        game_scene.handle_item_interaction()
+        assert game_scene.dialog_box is None
+
+        game_state.player.x, game_state.player.y = m16.position
+        game_scene.handle_item_interaction()
+        assert game_scene.current_item is m16
+        assert game_scene.dialog_box is not None
+
+        game_scene.dialog_box = None
+        m16.collected = True
+        game_scene.handle_item_interaction()
+        assert game_scene.dialog_box is None
+    finally:
+        m16.collected = was_collected
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__]) 
\ No newline at end of file
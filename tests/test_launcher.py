@@ -0,0 +1,70 @@
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+import venv
+from unittest import mock
+import main
+
+class TestLauncher(unittest.TestCase):
+    def setUp(self):
+        """Dossier de jeu temporaire ; création du venv et pip simulés (pas de réseau)"""
+        self.base_dir = tempfile.mkdtemp()
+        self.requirements = os.path.join(self.base_dir, "requirements.txt")
+        with open(self.requirements, "w") as f:
+            f.write("pygame==2.6.1\n")
+        self.venv_path = os.path.join(self.base_dir, "venv")
+        self.create = mock.patch.object(venv, "create", side_effect=self.fake_create).start()
+        self.pip = mock.patch.object(subprocess, "check_call").start()
+        mock.patch("time.sleep").start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        shutil.rmtree(self.base_dir)
+
+    def fake_create(self, path, with_pip=True):
+        """Crée seulement l'exécutable du venv"""
+        python = main.venv_python_path(path)
+        os.makedirs(os.path.dirname(python))
+        open(python, "w").close()
+
+    def test_fingerprint(self):
+        """L'empreinte ne change qu'avec requirements.txt"""
+        first = main.venv_fingerprint(self.requirements)
+        self.assertEqual(main.venv_fingerprint(self.requirements), first)
+        with open(self.requirements, "a") as f:
+            f.write("pytmx==3.32\n")
+        self.assertNotEqual(main.venv_fingerprint(self.requirements), first)
+
+    def test_venv_reused_when_unchanged(self):
+        """Le second lancement réutilise le venv sans rien réinstaller"""
+        python = main.setup_environment(base_dir=self.base_dir)
+        self.assertEqual(python, main.venv_python_path(self.venv_path))
+        self.assertEqual((self.create.call_count, self.pip.call_count), (1, 1))
+        self.assertEqual(main.setup_environment(base_dir=self.base_dir), python)
+        self.assertEqual((self.create.call_count, self.pip.call_count), (1, 1))
+
+    def test_venv_rebuilt_on_change(self):
+        """Des dépendances modifiées, une installation interrompue ou --rebuild reconstruisent le venv"""
+        main.setup_environment(base_dir=self.base_dir)
+        with open(self.requirements, "a") as f:
+            f.write("pytmx==3.32\n")
+        main.setup_environment(base_dir=self.base_dir)
+        self.assertEqual(self.create.call_count, 2)
+
+        os.remove(os.path.join(self.venv_path, main.FINGERPRINT_FILE))
+        main.setup_environment(base_dir=self.base_dir)
+        self.assertEqual(self.create.call_count, 3)
+
+        main.setup_environment(force_rebuild=True, base_dir=self.base_dir)
+        self.assertEqual(self.create.call_count, 4)
+
+    def test_failed_install_is_not_recorded(self):
+        """Une installation échouée n'enregistre pas d'empreinte"""
+        self.pip.side_effect = subprocess.CalledProcessError(1, "pip")
+        self.assertIsNone(main.setup_environment(base_dir=self.base_dir))
+        self.assertIsNone(main.read_fingerprint(self.venv_path))
+
+if __name__ == '__main__':
+    unittest.main()
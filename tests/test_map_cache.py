@@ -0,0 +1,99 @@
+import unittest
+import pygame
+import os
+import shutil
+import tempfile
+from pytmx.util_pygame import load_pygame
+from game import map_cache
+from game.tiled_map import TiledMap
+
+class TestMapCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Initialisation une seule fois pour toute la classe de test"""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """Copie la carte et ses dépendances dans un dossier temporaire"""
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.tmp_dir = tempfile.mkdtemp()
+        shutil.copytree(os.path.join(base_path, "assets", "tilesets"), os.path.join(self.tmp_dir, "tilesets"))
+        self.map_path = os.path.join(self.tmp_dir, "mapV3.tmx")
+        shutil.copy(os.path.join(base_path, "assets", "mapV3.tmx"), self.map_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_dependencies(self):
+        """Les dépendances incluent le .tmx, le .tsx et l'image du tileset"""
+        names = [os.path.basename(path) for path in map_cache.find_dependencies(self.map_path)]
+        self.assertEqual(names, ["mapV3.tmx", "OGAtilesetsremixed.tsx", "OGAtilesetsremixed.png"])
+
+    def test_cache_roundtrip(self):
+        """La carte compilée contient les mêmes calques, tuiles et propriétés"""
+        tmx_data = load_pygame(self.map_path)
+        map_cache.compile_map(tmx_data, self.map_path)
+        compiled = map_cache.load_compiled_map(self.map_path)
+
+        self.assertIsNotNone(compiled)
+        self.assertEqual((compiled.width, compiled.height), (tmx_data.width, tmx_data.height))
+        self.assertEqual(compiled.tilesets[0].source, tmx_data.tilesets[0].source)
+        for layer, compiled_layer in zip(tmx_data.layers, compiled.layers):
+            self.assertEqual(layer.name, compiled_layer.name)
+            self.assertEqual([list(row) for row in layer.data], [list(row) for row in compiled_layer.data])
+
+        gid = tmx_data.layers[0].data[0][0]
+        self.assertEqual(compiled.get_tile_properties_by_gid(gid)['collision'], True)
+        original = tmx_data.get_tile_image_by_gid(gid)
+        cached = compiled.get_tile_image_by_gid(gid)
+        for point in [(0, 0), (16, 16), (31, 31)]:
+            self.assertEqual(original.get_at(point), cached.get_at(point))
+
+    def test_tiled_map_uses_cache(self):
+        """Le premier chargement écrit le cache, le suivant l'utilise"""
+        first = TiledMap(self.map_path)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(os.path.exists(map_cache.get_cache_path(self.map_path)))
+
+        second = TiledMap(self.map_path)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(first.collision_grid.cells, second.collision_grid.cells)
+
+    def test_stale_cache_is_ignored(self):
+        """Modifier une dépendance invalide le cache"""
+        TiledMap(self.map_path)
+        tsx_path = os.path.join(self.tmp_dir, "tilesets", "images", "OGAtilesetsremixed.tsx")
+        stat = os.stat(tsx_path)
+        os.utime(tsx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertIsNone(map_cache.load_compiled_map(self.map_path))
+        self.assertFalse(TiledMap(self.map_path).from_cache)
+
+    def test_invalid_cache_is_ignored(self):
+        """Un fichier de cache corrompu est ignoré"""
+        cache_path = map_cache.get_cache_path(self.map_path)
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, "wb") as cache_file:
+            cache_file.write(b"pas un cache")
+        self.assertIsNone(map_cache.load_compiled_map(self.map_path))
+
+    def test_truncated_cache_is_ignored(self):
+        """Un cache tronqué (calques ou atlas incomplets) est ignoré et la carte rechargée depuis le .tmx"""
+        TiledMap(self.map_path)
+        cache_path = map_cache.get_cache_path(self.map_path)
+        with open(cache_path, "rb") as cache_file:
+            data = cache_file.read()
+        for size in (len(data) - 1000, len(data) // 2):
+            with open(cache_path, "wb") as cache_file:
+                cache_file.write(data[:size])
+            self.assertIsNone(map_cache.load_compiled_map(self.map_path))
+            self.assertFalse(TiledMap(self.map_path).from_cache)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
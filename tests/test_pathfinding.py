@@ -0,0 +1,216 @@
+import unittest
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import deque
+import pygame
+from game.collision_grid import CollisionGrid
+from game.pathfinding import Pathfinder
+from game.simulation import Simulation
+from game.tiled_map import TiledMap
+
+def make_grid(rows):
+    """Grille à partir de lignes de texte ('#' = case bloquante)"""
+    grid = CollisionGrid(len(rows[0]), len(rows))
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            if char == "#":
+                grid.set_flag(x, y, CollisionGrid.BLOCKED)
+    return grid
+
+def bfs_length(grid, start, goal):
+    """Référence : longueur du plus court chemin en 4 directions (parcours en largeur)"""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return distances[goal]
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (nx, ny) not in distances and not grid.is_blocked(nx, ny):
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                queue.append((nx, ny))
+    return None
+
+class TestPathfinder(unittest.TestCase):
+    def setUp(self):
+        self.grid = make_grid([
+            ".....",
+            ".###.",
+            "...#.",
+            "##.#.",
+            "..#..",
+        ])
+
+    def assert_valid(self, start, path, diagonal=False):
+        """Chaque pas est d'une case, sur une case libre"""
+        previous = start
+        for x, y in path:
+            dx, dy = abs(x - previous[0]), abs(y - previous[1])
+            self.assertTrue((dx, dy) in ((1, 0), (0, 1)) or (diagonal and (dx, dy) == (1, 1)))
+            self.assertFalse(self.grid.is_blocked(x, y))
+            previous = (x, y)
+
+    def test_shortest_path_around_walls(self):
+        """Le chemin contourne les murs et est le plus court"""
+        pathfinder = Pathfinder(self.grid)
+        path = pathfinder.find_path((0, 2), (3, 4))
+        self.assert_valid((0, 2), path)
+        self.assertEqual(path[-1], (3, 4))
+        self.assertEqual(len(path), bfs_length(self.grid, (0, 2), (3, 4)))
+        self.assertEqual(pathfinder.find_path((2, 2), (2, 2)), [])
+
+    def test_unreachable_and_blocked_goals(self):
+        """Une case bloquante, hors carte ou enfermée n'a pas de chemin"""
+        pathfinder = Pathfinder(self.grid)
+        self.assertIsNone(pathfinder.find_path((0, 0), (1, 1)))
+        self.assertIsNone(pathfinder.find_path((0, 0), (9, 9)))
+        self.assertIsNone(pathfinder.find_path((0, 0), (0, 4)))
+
+    def test_diagonal_does_not_cut_corners(self):
+        """En 8 directions, le chemin est plus court mais ne passe pas entre deux murs"""
+        grid = make_grid([
+            "....",
+            ".#..",
+            "..#.",
+            "....",
+        ])
+        pathfinder = Pathfinder(grid, diagonal=True)
+        path = pathfinder.find_path((0, 0), (3, 3))
+        self.assertEqual(len(path), 5)
+        self.assertEqual(len(Pathfinder(grid).find_path((0, 0), (3, 3))), 6)
+        # (1, 2) -> (2, 1) en un pas passerait entre les deux murs
+        path = pathfinder.find_path((1, 2), (2, 1))
+        self.assertEqual(len(path), 6)
+        previous = (1, 2)
+        for x, y in path:
+            if x != previous[0] and y != previous[1]:
+                self.assertFalse(grid.is_blocked(x, previous[1]) or grid.is_blocked(previous[0], y))
+            previous = (x, y)
+
+    def test_cache_invalidated_when_tiles_change(self):
+        """Les chemins sont servis par le cache jusqu'à la modification d'une case"""
+        pathfinder = Pathfinder(self.grid)
+        first = pathfinder.find_path((0, 0), (4, 4))
+        self.assertEqual(pathfinder.find_path((0, 0), (4, 4)), first)
+        self.assertEqual((pathfinder.searches, pathfinder.cache_hits), (1, 1))
+        self.grid.set_flag(4, 2, CollisionGrid.BLOCKED)
+        self.assertIsNone(pathfinder.find_path((0, 0), (4, 4)))
+        self.assertEqual(pathfinder.searches, 2)
+        self.grid.set_flag(4, 2, CollisionGrid.BLOCKED, False)
+        self.assertEqual(pathfinder.find_path((0, 0), (4, 4)), first)
+
+    def test_cache_is_bounded(self):
+        """Les chemins les moins récemment utilisés sont évincés"""
+        pathfinder = Pathfinder(self.grid, cache_size=2)
+        pathfinder.find_path((0, 0), (4, 0))
+        pathfinder.find_path((0, 0), (4, 1))
+        pathfinder.find_path((0, 0), (4, 0))
+        pathfinder.find_path((0, 0), (4, 2))
+        self.assertEqual(pathfinder.cache_info()['cached_paths'], 2)
+        pathfinder.find_path((0, 0), (4, 0))
+        self.assertEqual(pathfinder.cache_hits, 2)
+
+    def test_optimal_on_random_grids(self):
+        """Les tableaux réutilisés ne faussent pas les recherches suivantes"""
+        rng = random.Random(5)
+        for _ in range(5):
+            grid = CollisionGrid(20, 20)
+            for _ in range(120):
+                grid.set_flag(rng.randrange(20), rng.randrange(20), CollisionGrid.BLOCKED)
+            pathfinder = Pathfinder(grid, cache_size=0)
+            for _ in range(40):
+                start = (rng.randrange(20), rng.randrange(20))
+                goal = (rng.randrange(20), rng.randrange(20))
+                if grid.is_blocked(*start):
+                    continue
+                path = pathfinder.find_path(start, goal)
+                expected = bfs_length(grid, start, goal) if not grid.is_blocked(*goal) else None
+                self.assertEqual(None if path is None else len(path), expected)
+
+class TestPathfindingOnMap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        cls.grid = TiledMap(os.path.join(base_path, "assets", "mapV3.tmx")).collision_grid
+
+    def test_hundreds_of_queries_per_frame(self):
+        """Des centaines de recherches sans cache tiennent dans une image sur mapV3"""
+        free = [(x, y) for y in range(self.grid.height) for x in range(self.grid.width)
+                if not self.grid.is_blocked(x, y)]
+        rng = random.Random(1)
+        queries = [(rng.choice(free), rng.choice(free)) for _ in range(200)]
+        pathfinder = Pathfinder(self.grid, cache_size=0)
+        start = time.perf_counter()
+        for origin, goal in queries:
+            pathfinder.find_path(origin, goal)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        # Avec le cache, les mêmes requêtes ne coûtent presque rien
+        cached = Pathfinder(self.grid)
+        for origin, goal in queries:
+            cached.find_path(origin, goal)
+        start = time.perf_counter()
+        for origin, goal in queries:
+            cached.find_path(origin, goal)
+        self.assertLess(time.perf_counter() - start, 0.02)
+        self.assertEqual(cached.cache_hits, 200)
+
+class TestClickToMove(unittest.TestCase):
+    def setUp(self):
+        """Partie simulée dans un dossier temporaire"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.simulation = Simulation()
+
+    def tearDown(self):
+        self.simulation.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_click_moves_player_along_path(self):
+        """Un clic sur une case y emmène le joueur pas à pas, une touche l'interrompt"""
+        self.assertTrue(self.simulation.start_new_game("Cliqueur"))
+        scene = self.simulation.scene
+        player = self.simulation.game_state.player
+        start = (player.x, player.y)
+        # Une case accessible à quelques pas du départ
+        target = next(cell for cell in ((x, y) for y in range(20, 30) for x in range(1, 12))
+                      if 4 <= len(scene.pathfinder.find_path(start, cell) or ()) <= 6)
+        tile_size = scene.tiled_map.tile_size
+        scene.update_camera()
+        self.simulation.click((target[0] * tile_size - scene.camera_x + tile_size // 2,
+                               target[1] * tile_size - scene.camera_y + tile_size // 2))
+        self.simulation.step()
+        self.assertTrue(scene.path)
+        self.simulation.run(120, until=lambda sim: not scene.path)
+        self.assertEqual((player.x, player.y), target)
+
+        # Un nouveau clic puis une touche de déplacement arrête le trajet
+        scene.move_player_to(*start)
+        self.simulation.press(pygame.K_z)
+        self.simulation.step()
+        self.assertFalse(scene.path)
+
+        # Journal des quêtes ouvert ou dialogue en cours : le clic ne déplace pas le joueur
+        position = (player.x, player.y)
+        scene.update_camera()
+        click_pos = (start[0] * tile_size - scene.camera_x + tile_size // 2,
+                     start[1] * tile_size - scene.camera_y + tile_size // 2)
+        scene.quest_journal.visible = True
+        self.simulation.click(click_pos)
+        self.simulation.step()
+        self.assertFalse(scene.path)
+        scene.quest_journal.visible = False
+        scene.pnj.is_in_dialogue = True
+        self.simulation.click(click_pos)
+        self.simulation.run(20)
+        self.assertFalse(scene.path)
+        self.assertEqual((player.x, player.y), position)
+
+if __name__ == '__main__':
+    unittest.main()
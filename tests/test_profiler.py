@@ -0,0 +1,103 @@
+import unittest
+import sys
+import time
+import pygame
+from game.profiler import FrameProfiler, percentile
+
+class TestProfiler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Initialisation une seule fois pour toute la classe de test"""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        self.profiler = FrameProfiler(history=50, refresh_interval=1)
+
+    def tearDown(self):
+        # Toujours rétablir pygame.Surface et retirer le hook
+        self.profiler.set_mode(FrameProfiler.OFF)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Désactivé, le profileur ne mesure rien"""
+        self.profiler.begin_frame()
+        with self.profiler.section("update"):
+            pass
+        self.profiler.lap("map")
+        self.profiler.end_frame()
+        self.assertEqual(len(self.profiler.frame_times), 0)
+        self.assertEqual(self.profiler.phase_stats("update"), (0.0, 0.0))
+
+    def test_sections_and_laps(self):
+        """Les sections et les étapes sont cumulées par phase"""
+        self.profiler.toggle()
+        for _ in range(3):
+            self.profiler.begin_frame()
+            with self.profiler.section("update"):
+                time.sleep(0.002)
+            self.profiler.mark()
+            time.sleep(0.001)
+            self.profiler.lap("map")
+            self.profiler.lap("ui")
+            self.profiler.end_frame()
+        self.assertEqual(len(self.profiler.frame_times), 3)
+        self.assertGreaterEqual(self.profiler.phase_stats("update")[0], 2.0)
+        self.assertGreaterEqual(self.profiler.phase_stats("map")[0], 1.0)
+        self.assertLess(self.profiler.phase_stats("ui")[0], 1.0)
+        # Phase absente de l'image : durée nulle
+        self.assertEqual(self.profiler.phase_stats("flip"), (0.0, 0.0))
+
+    def test_percentiles(self):
+        """Les percentiles sont calculés sur l'historique glissant"""
+        values = sorted(range(1, 101))
+        self.assertEqual(percentile(values, 50), 51)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+        self.profiler.toggle()
+        self.profiler.frame_times.extend([0.010] * 90 + [0.030] * 10)
+        p50, p95, p99 = self.profiler.frame_percentiles()
+        self.assertAlmostEqual(p50, 10.0)
+        self.assertAlmostEqual(p99, 30.0)
+
+    def test_counters(self):
+        """Le mode compteurs compte les blits et les surfaces créées"""
+        original_surface = pygame.Surface
+        self.profiler.set_mode(FrameProfiler.COUNTERS)
+        target = pygame.Surface((10, 10))
+        self.profiler.begin_frame()
+        source = pygame.Surface((4, 4))
+        target.blit(source, (0, 0))
+        target.blit(source, (2, 2))
+        pygame.transform.scale(source, (8, 8))
+        self.profiler.end_frame()
+        self.assertEqual(self.profiler.count_history['blits'][-1], 2)
+        self.assertEqual(self.profiler.count_history['surfaces'][-1], 2)
+
+        self.profiler.toggle()
+        self.assertIs(pygame.Surface, original_surface)
+        self.assertIsNone(sys.getprofile())
+
+    def test_overlay_render(self):
+        """La surimpression se dessine en haut à droite de l'écran"""
+        self.profiler.set_mode(FrameProfiler.COUNTERS)
+        screen = pygame.Surface((800, 600))
+        for _ in range(5):
+            self.profiler.begin_frame()
+            with self.profiler.section("render"):
+                screen.fill((255, 255, 255))
+            self.profiler.render(screen)
+            self.profiler.end_frame()
+        # Le dessin de la surimpression n'est pas compté
+        self.assertEqual(self.profiler.count_history['blits'][-1], 0)
+        # Fond assombri sous la surimpression, écran intact ailleurs
+        self.assertLess(screen.get_at((780, 12)).r, 255)
+        self.assertEqual(screen.get_at((10, 590)), pygame.Color(255, 255, 255))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import random
+import shutil
+import tempfile
+import pygame
+from game import replay
+from game.simulation import Simulation
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        """Les sessions et la base de données sont créées dans un dossier temporaire"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.session_path = os.path.join(self.tmp_dir, "session.rpl")
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def record_session(self):
+        """Enregistre une partie scriptée et retourne son état final"""
+        simulation = Simulation(record_path=self.session_path)
+        self.assertTrue(simulation.start_new_game("Rejeu"))
+        start = simulation.tick_count
+        for i, key in enumerate([pygame.K_d, pygame.K_d, pygame.K_z, pygame.K_i, pygame.K_i]):
+            simulation.press(key, at_tick=start + i * 3)
+        simulation.run(40)
+        state = (simulation.game_state.player.x, simulation.game_state.player.y,
+                 simulation.game.clock.get_ticks(), random.random())
+        simulation.close()
+        return state, simulation.tick_count
+
+    def test_replay_reproduces_session(self):
+        """Le rejeu retrouve la même position, le même temps et le même tirage aléatoire"""
+        recorded_state, frames = self.record_session()
+        random.seed(12345)
+
+        simulation = Simulation(replay_path=self.session_path)
+        report = simulation.run(frames + 10)
+        # Le rejeu s'arrête de lui-même à la fin de la session
+        self.assertFalse(report.running)
+        self.assertEqual(report.ticks, frames + 1)
+        player = simulation.game_state.player
+        self.assertEqual((player.x, player.y), recorded_state[:2])
+        self.assertEqual(len(simulation.game.replayer.frame_times), frames)
+        simulation.close()
+
+    def test_session_format(self):
+        """Le fichier est compact et garde le temps et les événements de chaque image"""
+        recorder = replay.InputRecorder(self.session_path, seed=99)
+        key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_d, mod=0, unicode="d", scancode=7)
+        click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(10, 20), button=1)
+        ignored = pygame.event.Event(pygame.USEREVENT, value=1)
+        for frame in range(1000):
+            events = [key, click, ignored] if frame == 500 else []
+            recorder.record_frame(frame * 16, events)
+        recorder.close()
+        self.assertLess(os.path.getsize(self.session_path), 200)
+
+        seed, frames = replay.load_session(self.session_path)
+        self.assertEqual(seed, 99)
+        self.assertEqual(len(frames), 1000)
+        time_ms, events = frames[500]
+        self.assertEqual(time_ms, 8000)
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN])
+        self.assertEqual(events[0].unicode, "d")
+        self.assertEqual(events[1].pos, (10, 20))
+
+    def test_interrupted_session_is_readable(self):
+        """Une session interrompue (jeu fermé brutalement) se relit jusqu'à la dernière écriture"""
+        recorder = replay.InputRecorder(self.session_path, seed=1, flush_every=100)
+        for frame in range(250):
+            recorder.record_frame(frame * 16, [])
+        recorder._file.flush()
+        _, frames = replay.load_session(self.session_path)
+        self.assertEqual(len(frames), 200)
+        recorder.close()
+
+    def test_summarize(self):
+        """Les statistiques de durées d'image sont en millisecondes"""
+        stats = replay.summarize([0.001] * 99 + [0.1])
+        self.assertEqual(stats['frames'], 100)
+        self.assertAlmostEqual(stats['p50'], 1.0)
+        self.assertAlmostEqual(stats['max'], 100.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
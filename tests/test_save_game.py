@@ -0,0 +1,200 @@
+import unittest
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+import pygame
+import game.quest_system as quest_system
+from game import save_game
+from game.items import ITEMS, Item, ItemType
+from game.player import Player
+from game.save_game import SaveData, SaveSlots, SaveError, QUEST_FLAGS
+from game.simulation import Simulation
+
+def make_save():
+    """État de partie complet sans scène ni sprites"""
+    save = SaveData()
+    save.player = {'name': "Cornélius", 'race': "chimpanze", 'faction': "Le Cercle des Ombres",
+                   'x': 14, 'y': 9, 'hp': 73, 'max_hp': 100, 'xp': 40, 'db_id': 7}
+    save.inventory = {'max_slots': 15, 'equipped_slot': 2,
+                      'items': [(0, "banane"), (2, "m16"), (3, ("Caillou", "misc", 1, "Un simple caillou"))]}
+    save.quests = {name: name in ("quest1_done", "quest2_done") for name in QUEST_FLAGS}
+    save.current_quest_index = 3
+    save.npcs = {'pnj_visible': False, 'pnj2_visible': True, 'pnj2_hp': 55, 'combat_zone': True}
+    save.collected = {"m16": True, "banane": False}
+    return save
+
+class TestSaveFormat(unittest.TestCase):
+    def test_round_trip(self):
+        """Un état encodé puis décodé est identique"""
+        save = make_save()
+        loaded = SaveData.from_bytes(save.to_bytes())
+        for name in ("player", "inventory", "quests", "current_quest_index", "npcs", "collected"):
+            self.assertEqual(getattr(loaded, name), getattr(save, name), name)
+
+    def test_finished_quests(self):
+        """La fin des quêtes (index None) est conservée"""
+        save = make_save()
+        save.current_quest_index = None
+        self.assertIsNone(SaveData.from_bytes(save.to_bytes()).current_quest_index)
+
+    def test_compact_and_fast(self):
+        """Une sauvegarde tient en quelques centaines d'octets et se traite en bien moins d'une image"""
+        save = make_save()
+        data = save.to_bytes()
+        self.assertLess(len(data), 512)
+        start = time.perf_counter()
+        for _ in range(100):
+            SaveData.from_bytes(save.to_bytes())
+        self.assertLess((time.perf_counter() - start) / 100, 0.002)
+
+    def test_corruption_is_detected(self):
+        """Un octet modifié, une autre version ou un fichier tronqué sont refusés"""
+        data = bytearray(make_save().to_bytes())
+        data[-1] ^= 0xFF
+        with self.assertRaises(SaveError):
+            SaveData.from_bytes(bytes(data))
+        other_version = save_game.HEADER.pack(save_game.MAGIC, save_game.VERSION + 1, 0, zlib.crc32(b""))
+        with self.assertRaises(SaveError):
+            SaveData.from_bytes(other_version)
+        with self.assertRaises(SaveError):
+            SaveData.from_bytes(b"RPG")
+
+    def test_unknown_sections_are_skipped(self):
+        """Une section ajoutée par une version plus récente n'empêche pas la lecture"""
+        data = make_save().to_bytes()
+        magic, version, count, _ = save_game.HEADER.unpack_from(data)
+        body = data[save_game.HEADER.size:] + save_game.SECTION.pack(200, 3) + b"new"
+        data = save_game.HEADER.pack(magic, version, count + 1, zlib.crc32(body)) + body
+        self.assertEqual(SaveData.from_bytes(data).player['name'], "Cornélius")
+
+    def test_version_1_is_readable(self):
+        """Une sauvegarde de la version 1 (sans id en base) se lit encore"""
+        data = make_save().player
+        payload = b"".join((
+            save_game.PLAYER_FIELDS_V1.pack(data['x'], data['y'], data['hp'], data['max_hp'], data['xp']),
+            save_game._pack_string(data['name']), save_game._pack_string(data['race']),
+            save_game._pack_string(data['faction']),
+        ))
+        body = save_game.SECTION.pack(save_game.PLAYER, len(payload)) + payload
+        old = save_game.HEADER.pack(save_game.MAGIC, 1, 1, zlib.crc32(body)) + body
+        player = SaveData.from_bytes(old).player
+        self.assertEqual((player['name'], player['hp'], player['db_id']), ("Cornélius", 73, None))
+
+class TestSaveSlots(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.slots = SaveSlots(os.path.join(self.tmp_dir, "saves"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_slots(self):
+        """Chaque emplacement garde sa partie ; le plus récent est proposé au chargement"""
+        self.assertIsNone(self.slots.latest())
+        self.assertEqual(self.slots.first_free(), 1)
+        first = make_save()
+        second = make_save()
+        second.player = dict(second.player, name="Zira")
+        self.slots.write(1, first)
+        self.slots.write(3, second)
+        os.utime(self.slots.path(1), (1, 1))
+        self.assertEqual(self.slots.latest(), 3)
+        self.assertEqual(self.slots.first_free(), 2)
+        self.assertEqual([(slot, name) for slot, name, _ in self.slots.list_slots()],
+                         [(1, "Cornélius"), (2, None), (3, "Zira")])
+        self.assertEqual(self.slots.load(1).player['name'], "Cornélius")
+        with self.assertRaises(SaveError):
+            self.slots.load(2)
+        with self.assertRaises(ValueError):
+            self.slots.path(4)
+        # Tous les emplacements occupés : aucun n'est libre, le plus ancien est le 1
+        self.slots.write(2, first)
+        self.assertIsNone(self.slots.first_free())
+        self.assertEqual(self.slots.oldest(), 1)
+
+class TestSaveAndLoadGame(unittest.TestCase):
+    def setUp(self):
+        """Partie simulée dans un dossier temporaire (base et sauvegardes)"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.quest_state = {name: getattr(quest_system, name) for name in QUEST_FLAGS + ("current_quest_index",)}
+        self.collected = {key: item.collected for key, item in ITEMS.items() if hasattr(item, 'collected')}
+
+    def tearDown(self):
+        for name, value in self.quest_state.items():
+            setattr(quest_system, name, value)
+        for key, collected in self.collected.items():
+            ITEMS[key].collected = collected
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_then_load_from_menu(self):
+        """F5 sauvegarde la partie ; « Charger Partie » la restaure entièrement"""
+        simulation = Simulation()
+        self.assertTrue(simulation.start_new_game("Sauvegarde"))
+        scene = simulation.scene
+        player = simulation.game_state.player
+        player.x, player.y, player.hp = 9, 12, 64
+        caillou = Item("Caillou", ItemType.MISC, "Un simple caillou", 1)
+        player.inventory.add_item(ITEMS["m16"])
+        player.inventory.add_item(caillou)
+        player.inventory.equip_item(ITEMS["m16"])
+        ITEMS["m16"].collected = True
+        quest_system.quest1_done = quest_system.quest2_done = True
+        quest_system.current_quest_index = 3
+        scene.pnj.is_visible = False
+        scene.pnj2.hp = 42
+
+        simulation.press(pygame.K_F5)
+        simulation.step()
+        self.assertTrue(scene.autosaver.flush(timeout=5))
+        self.assertEqual(simulation.game_state.save_slot, 1)
+        self.assertTrue(os.path.exists(simulation.game.save_slots.path(1)))
+        # Un homonyme créé ensuite ne doit pas être confondu avec le joueur sauvegardé
+        homonym = Player("Sauvegarde", 6, 28, player.race, player.faction)
+        homonym_id = scene.db.save_player(homonym)
+        homonym.inventory.add_item(ITEMS["banane"])
+        scene.db.save_inventory(homonym_id, homonym.inventory, full=True)
+
+        # La partie continue et change, puis on recharge depuis le menu
+        player.hp = 1
+        ITEMS["m16"].collected = False
+        quest_system.quest2_done = False
+        quest_system.current_quest_index = 1
+        scene.pnj.is_visible = True
+        simulation.press(pygame.K_ESCAPE)
+        simulation.step()
+        self.assertEqual(simulation.game.current_scene, 'menu')
+        simulation.press(pygame.K_DOWN)
+        simulation.press(pygame.K_RETURN)
+        simulation.step()
+        self.assertEqual(simulation.game.current_scene, 'game')
+
+        loaded = simulation.game_state.player
+        self.assertIsNot(loaded, player)
+        self.assertEqual((loaded.name, loaded.x, loaded.y, loaded.hp), ("Sauvegarde", 9, 12, 64))
+        self.assertIs(loaded.inventory.get_equipped_weapon(), ITEMS["m16"])
+        self.assertEqual([item.name for item in loaded.inventory.get_items()], ["M16", "Caillou"])
+        self.assertTrue(ITEMS["m16"].collected)
+        self.assertTrue(quest_system.quest2_done)
+        self.assertEqual(quest_system.current_quest_index, 3)
+        self.assertFalse(scene.pnj.is_visible)
+        self.assertEqual(scene.pnj2.hp, 42)
+        self.assertEqual(loaded.db_id, player.db_id)
+        self.assertEqual([row['name'] for row in scene.db.load_inventory(player.db_id)], ["M16", "Caillou"])
+        self.assertEqual([row['name'] for row in scene.db.load_inventory(homonym_id)], ["Banane"])
+
+        # Un id inconnu de la base : le joueur est enregistré à nouveau, l'homonyme reste intact
+        loaded.db_id = homonym_id + 100
+        scene.link_loaded_player(loaded)
+        self.assertNotIn(loaded.db_id, (player.db_id, homonym_id, homonym_id + 100))
+        self.assertEqual([row['name'] for row in scene.db.load_inventory(loaded.db_id)], ["M16", "Caillou"])
+        self.assertEqual([row['name'] for row in scene.db.load_inventory(homonym_id)], ["Banane"])
+        simulation.close()
+
+if __name__ == '__main__':
+    unittest.main()
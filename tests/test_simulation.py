@@ -0,0 +1,128 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+import pygame
+from game.simulation import Simulation
+from game.game_clock import GameClock, get_ticks
+from game.database import GameDatabase, MEMORY_DB
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        """Les fichiers éventuels de la simulation sont créés dans un dossier temporaire"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.simulations = []
+
+    def tearDown(self):
+        for simulation in self.simulations:
+            simulation.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def make_simulation(self, **options):
+        simulation = Simulation(**options)
+        self.simulations.append(simulation)
+        return simulation
+
+    def play(self, seed):
+        """Partie scriptée : création du personnage puis déplacements"""
+        simulation = self.make_simulation(seed=seed)
+        self.assertTrue(simulation.start_new_game("Testeur"))
+        start = simulation.tick_count
+        for i, key in enumerate([pygame.K_d] * 4 + [pygame.K_z] * 3 + [pygame.K_q]):
+            simulation.press(key, at_tick=start + i * 5)
+        report = simulation.run(120)
+        player = simulation.game_state.player
+        return (player.x, player.y), report
+
+    def test_fixed_timestep_without_frame_cap(self):
+        """Le temps simulé avance d'un pas fixe par image, sans attente réelle"""
+        simulation = self.make_simulation()
+        report = simulation.run(600)
+        self.assertEqual(report.ticks, 600)
+        self.assertEqual(report.simulated_ms, 10000)
+        # 600 images à 60 FPS prendraient 10 secondes en temps réel
+        self.assertLess(report.elapsed, 5)
+
+    def test_scripted_playthrough_is_deterministic(self):
+        """Deux parties jouées avec le même script aboutissent au même état"""
+        first_position, first_report = self.play(seed=7)
+        second_position, second_report = self.play(seed=7)
+        self.assertEqual(first_position, second_position)
+        self.assertNotEqual(first_position, (6, 28))
+        self.assertEqual(first_report.simulated_ms, second_report.simulated_ms)
+
+    def test_run_until(self):
+        """La simulation s'arrête dès que la condition est remplie"""
+        simulation = self.make_simulation()
+        simulation.press(pygame.K_RETURN, at_tick=3)
+        report = simulation.run(100, until=lambda sim: sim.game.current_scene == 'character_creation')
+        self.assertEqual(report.ticks, 4)
+
+    def test_simulation_keeps_player_saves(self):
+        """Sans demande explicite, une simulation ne sauvegarde pas dans ./saves ni périodiquement"""
+        simulation = self.make_simulation()
+        self.assertTrue(simulation.start_new_game("Testeur"))
+        simulation.run(1200)
+        self.assertEqual(simulation.scene.autosaver.requests, 0)
+        self.assertFalse(os.path.exists("saves"))
+        save_dir = simulation.game.save_slots.directory
+        simulation.close()
+        self.assertFalse(os.path.exists(save_dir))
+
+        # Sauvegardes périodiques demandées, dans un dossier choisi
+        simulation = self.make_simulation(save_dir="simulation_saves", autosave=True)
+        self.assertTrue(simulation.start_new_game("Testeur"))
+        simulation.run(1200)
+        self.assertTrue(simulation.scene.autosaver.flush(timeout=5))
+        self.assertGreater(simulation.scene.autosaver.saves_written, 0)
+        self.assertTrue(os.path.exists(os.path.join("simulation_saves", "slot_1.sav")))
+
+    def test_simulation_uses_memory_database(self):
+        """La simulation garde sa base en mémoire, quelle que soit la base par défaut"""
+        with mock.patch.dict(os.environ, {"RPG_DB": "partie.db"}):
+            simulation = self.make_simulation()
+            self.assertTrue(simulation.start_new_game("Testeur"))
+        self.assertEqual(simulation.scene.db.db_path, MEMORY_DB)
+        self.assertIsNotNone(simulation.scene.db.load_player("Testeur"))
+        self.assertFalse(os.path.exists("partie.db"))
+
+    def test_quit_records_positive_lifespan(self):
+        """Quitter depuis le menu ferme les scènes avant pygame : la durée de vie enregistrée est positive"""
+        simulation = self.make_simulation()
+        self.assertTrue(simulation.start_new_game("Testeur"))
+        # Temps réel, comme en jeu : get_ticks() repart de 0 après pygame.quit()
+        simulation.game.clock.use_real_time()
+        simulation.scene.start_time = get_ticks()
+        time.sleep(1.1)
+        # Retour au menu puis Échap dans le menu
+        for _ in range(2):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode="", scancode=0))
+        with mock.patch.object(GameDatabase, 'save_lifespan', autospec=True) as save_lifespan:
+            with self.assertRaises(SystemExit) as exit_info:
+                simulation.game.run()
+        self.assertEqual(exit_info.exception.code, 0)
+        self.assertEqual(save_lifespan.call_count, 1)
+        self.assertGreater(save_lifespan.call_args.args[2], 0)
+
+    def test_real_time_clock(self):
+        """Hors simulation, l'horloge suit le temps de pygame"""
+        clock = GameClock()
+        clock.simulate(0.5, start_ms=1000)
+        clock.wait(250)
+        clock.tick()
+        self.assertEqual(clock.get_ticks(), 1750)
+        clock.use_real_time()
+        self.assertFalse(clock.simulated)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+from game.enemy import Enemy
+from game.factions import FactionName
+from game.items import ITEMS
+from game.map import Map
+from game.spatial_hash import SpatialHash
+from game.spawn_manager import SpawnManager
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        self.index = SpatialHash()
+
+    def test_multi_occupancy(self):
+        """Plusieurs objets peuvent partager une case et être filtrés par catégorie"""
+        self.index.insert("épée", 3, 4, "item")
+        self.index.insert("banane", 3, 4, "item")
+        self.index.insert("garde", 3, 4, "pnj")
+        self.assertEqual(self.index.at(3, 4), ["épée", "banane", "garde"])
+        self.assertEqual(self.index.at(3, 4, "item"), ["épée", "banane"])
+        self.assertEqual(self.index.first_at(3, 4, "pnj"), "garde")
+        self.assertIsNone(self.index.first_at(0, 0))
+        self.assertTrue(self.index.remove("épée"))
+        self.assertFalse(self.index.remove("épée"))
+        self.assertEqual(self.index.at(3, 4, "item"), ["banane"])
+        self.assertEqual(len(self.index), 2)
+
+    def test_move(self):
+        """Déplacer un objet le retire de son ancienne case et garde sa catégorie"""
+        self.index.insert("garde", 1, 1, "pnj")
+        self.index.move("garde", 2, 5)
+        self.assertEqual(self.index.at(1, 1), [])
+        self.assertEqual(self.index.position_of("garde"), (2, 5))
+        self.assertEqual(self.index.kind_of("garde"), "pnj")
+
+    def test_within(self):
+        """La recherche par rayon rend les objets triés par distance, quel que soit le parcours"""
+        for x in range(0, 50):
+            for y in range(0, 50):
+                self.index.insert((x, y), x, y, "case" if (x + y) % 2 else "autre")
+        near = self.index.within(10, 10, 1.5)
+        self.assertEqual(near[0], (10, 10))
+        self.assertEqual(len(near), 9)
+        self.assertEqual(sorted(self.index.within(10, 10, 2, "case")),
+                         [(9, 10), (10, 9), (10, 11), (11, 10)])
+
+        sparse = SpatialHash()
+        sparse.insert("loin", 40, 40)
+        sparse.insert("proche", 12, 10)
+        self.assertEqual(sparse.within(10, 10, 100), ["proche", "loin"])
+        self.assertEqual(sparse.within(10, 10, 3), ["proche"])
+
+class TestSpawnManagerIndex(unittest.TestCase):
+    def setUp(self):
+        with patch('game.map.Map._load_tiles'):
+            self.spawner = SpawnManager(Map(8, 8))
+        self.spawner.select_random_item = lambda zone=None: ITEMS["glock"]
+
+    def test_item_lookup_and_removal(self):
+        """Les items apparus se retrouvent et se retirent par leur case"""
+        self.spawner.max_items = 5
+        for _ in range(5):
+            self.spawner.spawn_item()
+        for item, x, y in list(self.spawner.spawned_items):
+            self.assertIs(self.spawner.get_item_at_position(x, y), item)
+        _, x, y = self.spawner.spawned_items[2]
+        self.assertIs(self.spawner.remove_item(x, y), ITEMS["glock"])
+        self.assertIsNone(self.spawner.get_item_at_position(x, y))
+        self.assertIsNone(self.spawner.remove_item(x, y))
+        self.assertEqual(len(self.spawner.spawned_items), 4)
+
+    def test_enemy_lookup(self):
+        """Les ennemis apparus sont indexés jusqu'à leur retrait"""
+        self.assertTrue(self.spawner.spawn_enemy(FactionName.VEILLEURS))
+        enemy = self.spawner.spawned_enemies[0]
+        self.assertIs(self.spawner.get_enemy_at_position(3, 5), enemy)
+        self.assertEqual(self.spawner.enemies_within(5, 5, 2), [enemy])
+        self.assertEqual(self.spawner.enemies_within(6, 6, 2), [])
+        self.assertTrue(self.spawner.remove_enemy(enemy))
+        self.assertIsNone(self.spawner.get_enemy_at_position(3, 5))
+        self.assertIn((3, 5), self.spawner.game_map.free_cells)
+
+if __name__ == '__main__':
+    unittest.main()
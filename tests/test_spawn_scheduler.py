@@ -0,0 +1,70 @@
+import unittest
+import random
+from unittest.mock import patch
+from game.factions import FactionName
+from game.map import Map
+from game.spawn_manager import SpawnManager
+
+class TestSpawnScheduler(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+        with patch('game.map.Map._load_tiles'):
+            self.spawner = SpawnManager(Map(30, 30))
+        self.scheduler = self.spawner.scheduler
+
+    def test_wave_is_spread_over_frames(self):
+        """Une embuscade de 30 ennemis est traitée quelques étapes par image"""
+        self.spawner.max_enemies = 30
+        self.scheduler.max_operations = 4
+        # Seul le nombre d'étapes limite ici chaque image
+        self.scheduler.time_budget_ms = 1000
+        self.scheduler.request_wave(30, FactionName.VEILLEURS, near=(15, 15), radius=6)
+        self.assertEqual(self.scheduler.queue_depth, 30)
+        self.assertEqual(self.scheduler.tick(), 4)
+        self.assertEqual(len(self.spawner.spawned_enemies), 2)
+        frames = 1
+        while self.scheduler.queue_depth:
+            self.assertLessEqual(self.scheduler.tick(), 4)
+            frames += 1
+        self.assertEqual(frames, 15)
+        self.assertEqual(self.scheduler.spawned, 30)
+        self.assertGreater(self.scheduler.deferred, 0)
+
+        positions = {(enemy.x, enemy.y) for enemy in self.spawner.spawned_enemies}
+        self.assertEqual(len(positions), 30)
+        for x, y in positions:
+            self.assertTrue(1 <= abs(x - 15) + abs(y - 15) <= 6)
+            self.assertNotIn((x, y), self.spawner.game_map.free_cells)
+
+    def test_time_budget(self):
+        """Un budget de temps épuisé limite l'image à une seule étape"""
+        self.spawner.max_enemies = 10
+        self.scheduler.time_budget_ms = 0
+        self.scheduler.request_wave(3, FactionName.OMBRES, near=(5, 5))
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.assertEqual(self.scheduler.queue_depth, 3)
+        self.assertGreaterEqual(self.scheduler.stats()['max_tick_ms'], 0)
+
+    def test_limits_count_reserved_cells(self):
+        """Les demandes en cours comptent dans le maximum : l'excédent est abandonné"""
+        self.spawner.max_items = 3
+        for _ in range(5):
+            self.scheduler.request_item()
+        self.scheduler.flush()
+        self.assertEqual(len(self.spawner.spawned_items), 3)
+        stats = self.scheduler.stats()
+        self.assertEqual((stats['spawned'], stats['failed'], stats['queue_depth']), (3, 2, 0))
+        self.assertEqual(self.scheduler.pending("item"), 0)
+
+    def test_update_queues_requests(self):
+        """Les mises à jour périodiques passent par la file au lieu d'apparaître d'un coup"""
+        self.spawner.max_items = 4
+        self.scheduler.max_operations = 1
+        for _ in range(100):
+            self.spawner.update_with_player_faction(FactionName.FORET)
+        self.assertEqual(len(self.spawner.spawned_items), 4)
+        self.assertEqual(len(self.spawner.spawned_enemies), self.spawner.max_enemies)
+        self.assertLessEqual(self.scheduler.operations, 100)
+
+if __name__ == '__main__':
+    unittest.main()
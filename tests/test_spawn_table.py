@@ -0,0 +1,89 @@
+import unittest
+import random
+from collections import Counter
+from unittest.mock import patch
+from game.factions import FACTIONS, FactionName, FactionRelation
+from game.items import ITEMS, Item, ItemType
+from game.map import Map
+from game.spawn_manager import SpawnManager
+from game.spawn_table import AliasTable, SpawnTables
+
+class TestAliasTable(unittest.TestCase):
+    def test_probabilities(self):
+        """La table reproduit exactement les poids normalisés"""
+        weights = {"a": 1, "b": 3, "c": 0.5, "d": 5.5, "zero": 0}
+        table = AliasTable(weights)
+        self.assertEqual(len(table), 4)
+        for key in "abcd":
+            self.assertAlmostEqual(table.probability(key), weights[key] / 10)
+        self.assertEqual(table.probability("zero"), 0)
+
+    def test_sampling_distribution(self):
+        """Les tirages suivent les poids, un par un ou par lot"""
+        random.seed(7)
+        table = AliasTable({"rare": 1, "commun": 9})
+        counts = Counter(table.sample_many(20000))
+        self.assertAlmostEqual(counts["commun"] / 20000, 0.9, delta=0.01)
+        self.assertEqual(set(table.sample() for _ in range(200)), {"rare", "commun"})
+        self.assertEqual(table.sample_many(0), [])
+
+    def test_invalid_weights(self):
+        """Une table sans poids positif est refusée"""
+        with self.assertRaises(ValueError):
+            AliasTable({"a": 0})
+
+    def test_cache(self):
+        """Une table n'est recompilée que si sa signature change"""
+        tables = SpawnTables()
+        first = tables.get("t", 1, lambda: {"a": 1})
+        self.assertIs(tables.get("t", 1, lambda: {"b": 1}), first)
+        self.assertEqual(tables.get("t", 2, lambda: {"b": 1}).keys, ["b"])
+        self.assertIsNone(tables.get("vide", 1, dict))
+        self.assertEqual(tables.builds, 3)
+
+class TestSpawnManagerTables(unittest.TestCase):
+    def setUp(self):
+        with patch('game.map.Map._load_tiles'):
+            self.spawner = SpawnManager(Map(10, 10))
+
+    def tearDown(self):
+        ITEMS.pop("test_armure", None)
+        FACTIONS[FactionName.VEILLEURS].set_relation(FactionName.BRUMES, FactionRelation.NEUTRAL)
+
+    def test_item_weights(self):
+        """Le poids d'un type est partagé entre ses items ; un type sans item n'est pas tiré"""
+        table = self.spawner.item_table()
+        weapons = [item for item in ITEMS.values() if item.item_type == ItemType.WEAPON]
+        potions = [item for item in ITEMS.values() if item.item_type == ItemType.POTION]
+        for item in weapons:
+            self.assertAlmostEqual(table.probability(item), 0.35 / 0.70 / len(weapons))
+        for item in potions:
+            self.assertAlmostEqual(table.probability(item), 0.35 / 0.70 / len(potions))
+        self.assertEqual(len(self.spawner.select_random_items(5)), 5)
+
+    def test_rebuilt_only_when_items_change(self):
+        """Ajouter un item recompile la table, sinon elle est réutilisée"""
+        table = self.spawner.item_table()
+        self.assertIs(self.spawner.item_table(), table)
+        ITEMS["test_armure"] = Item("Plastron", ItemType.ARMOR, "Un plastron de cuir", 10)
+        rebuilt = self.spawner.item_table()
+        self.assertIsNot(rebuilt, table)
+        self.assertAlmostEqual(rebuilt.probability(ITEMS["test_armure"]), 0.30)
+
+    def test_zone_weights(self):
+        """Une zone peut avoir ses propres probabilités"""
+        self.spawner.set_zone_weights("armurerie", {ItemType.WEAPON: 1.0})
+        items = self.spawner.select_random_items(50, zone="armurerie")
+        self.assertTrue(all(item.item_type == ItemType.WEAPON for item in items))
+        self.assertIsNot(self.spawner.item_table("armurerie"), self.spawner.item_table())
+
+    def test_hostile_factions_follow_relations(self):
+        """La table des factions hostiles suit les changements de relations"""
+        table = self.spawner.hostile_faction_table(FactionName.VEILLEURS)
+        self.assertEqual(table.keys, [FactionName.OMBRES])
+        FACTIONS[FactionName.VEILLEURS].set_relation(FactionName.BRUMES, FactionRelation.HOSTILE)
+        table = self.spawner.hostile_faction_table(FactionName.VEILLEURS)
+        self.assertEqual(set(table.keys), {FactionName.OMBRES, FactionName.BRUMES})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import pygame
+from game.texture_atlas import TextureAtlas, get_atlas, reset_atlas
+from game.player import Player
+from game.factions import FactionName
+
+class TestTextureAtlas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Initialisation une seule fois pour toute la classe de test"""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """Initialisation avant chaque test"""
+        reset_atlas()
+
+    def test_images_share_pages(self):
+        """Plusieurs images sont rangées dans une même page sans se chevaucher"""
+        atlas = TextureAtlas(page_size=128)
+        regions = []
+        for index in range(6):
+            surface = pygame.Surface((40, 30), pygame.SRCALPHA)
+            surface.fill((index * 40, 100, 200, 255))
+            regions.append(atlas.add(f"image{index}", surface))
+
+        self.assertEqual(len(atlas.pages), 1)
+        rects = [pygame.Rect(region.get_offset(), region.get_size()) for region in regions]
+        for i, rect in enumerate(rects):
+            self.assertEqual(rect.collidelist(rects[:i] + rects[i + 1:]), -1)
+        self.assertEqual(atlas.get("image3").get_at((5, 5)), pygame.Color(120, 100, 200, 255))
+
+    def test_new_page_when_full(self):
+        """Une page pleine en ouvre une nouvelle, une image trop grande a sa propre page"""
+        atlas = TextureAtlas(page_size=64)
+        for index in range(5):
+            atlas.add(f"image{index}", pygame.Surface((30, 30)))
+        self.assertEqual(len(atlas.pages), 2)
+        big = atlas.add("big", pygame.Surface((100, 80)))
+        self.assertEqual(big.get_parent().get_size(), (100, 80))
+
+    def test_alpha_is_preserved(self):
+        """La transparence des images est copiée à l'identique"""
+        atlas = TextureAtlas()
+        surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+        surface.fill((200, 50, 10, 128))
+        self.assertEqual(atlas.add("semi", surface).get_at((1, 1)), pygame.Color(200, 50, 10, 128))
+
+    def test_load_is_cached_by_name(self):
+        """Une même image à la même taille n'est chargée qu'une fois"""
+        atlas = get_atlas()
+        heart = atlas.load_image("assets/images_ui/heart.png", (30, 30))
+        self.assertIs(atlas.load_image("assets/images_ui/heart.png", (30, 30)), heart)
+        self.assertEqual(heart.get_size(), (30, 30))
+        self.assertIn("assets/images_ui/heart.png@30x30", atlas)
+
+    def test_player_sprites_from_atlas(self):
+        """Les frames du joueur sont des sous-surfaces de l'atlas partagé"""
+        player = Player("Test", 0, 0, "gorille", FactionName.VEILLEURS)
+        frame = player.sprites["left"][2]
+        self.assertEqual(frame.get_size(), (64, 64))
+        self.assertIn(frame.get_abs_parent(), get_atlas().pages)
+
+        sheet = pygame.image.load("assets/character/gorille.png")
+        self.assertEqual(frame.get_at((32, 32)), sheet.get_at((2 * 64 + 32, 64 + 32)))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage après tous les tests"""
+        reset_atlas()
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
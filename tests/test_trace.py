@@ -0,0 +1,69 @@
+import unittest
+import os
+import tempfile
+from game.trace import Tracer, DEBUG, INFO, WARNING, OFF
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        """Initialisation avant chaque test"""
+        self.tracer = Tracer(capacity=4)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "trace.log")
+
+    def tearDown(self):
+        self.tracer.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.tmp_dir)
+
+    def test_disabled_channel_is_lazy(self):
+        """Un canal désactivé n'enregistre rien et ne formate jamais le message"""
+        channel = self.tracer.channel("map")
+        self.assertEqual(channel.level, OFF)
+
+        def expensive():
+            raise AssertionError("le message ne doit pas être formaté")
+
+        channel.debug(expensive)
+        channel.error("Erreur %s", 1)
+        self.assertEqual(len(self.tracer.buffer), 0)
+        self.assertFalse(channel.enabled(DEBUG))
+
+    def test_configure_levels(self):
+        """La configuration active les canaux au niveau demandé"""
+        self.tracer.configure("scene=debug,*=warning")
+        scene = self.tracer.channel("scene")
+        other = self.tracer.channel("pnj")
+        self.assertTrue(scene.enabled(DEBUG))
+        self.assertFalse(other.enabled(INFO))
+        self.assertTrue(other.enabled(WARNING))
+
+    def test_ring_buffer_drops_oldest(self):
+        """Le tampon circulaire garde les derniers enregistrements"""
+        channel = self.tracer.channel("scene")
+        self.tracer.set_level("scene", DEBUG)
+        for index in range(6):
+            channel.debug("message %d", index)
+        self.assertEqual(len(self.tracer.buffer), 4)
+        self.assertEqual(self.tracer.dropped, 2)
+        self.assertEqual(self.tracer.buffer[0][4], (2,))
+
+    def test_flush_to_file(self):
+        """Les traces sont formatées et écrites dans le fichier"""
+        self.tracer.set_level("*", INFO)
+        channel = self.tracer.channel("game")
+        self.tracer.open(self.path, flush_interval=60)
+        channel.info("Changement de scène : %s -> %s", "menu", "game")
+        channel.debug("ignoré")
+        channel.warning(lambda: "formaté à l'écriture")
+        self.tracer.close()
+
+        with open(self.path, encoding="utf-8") as trace_file:
+            lines = trace_file.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith("INFO    [game] Changement de scène : menu -> game"))
+        self.assertTrue(lines[1].endswith("WARNING [game] formaté à l'écriture"))
+        self.assertEqual(self.tracer.written, 2)
+
+if __name__ == '__main__':
+    unittest.main()